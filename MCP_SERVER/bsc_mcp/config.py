@@ -8,12 +8,16 @@ All paths, constants, and settings are defined here.
 Environment Variables:
 ---------------------
 - DATA_ROOT: Path to DATA directory (default: auto-detect)
-- CACHE_TTL: Cache time-to-live in seconds (default: 300)
+- CACHE_TTL: Default cache time-to-live in seconds (default: 300)
+- CACHE_MAX_MB: Memory ceiling of the DataLoader cache in MB (default: 2048)
+- TOOL_WORKERS: Heavy tools running concurrently (default: 4)
+- TOOL_TIMEOUT: Default heavy tool timeout in seconds (default: 60)
+- MAX_CONCURRENT_LOADS: Parquet files read from disk at once (default: 2)
 """
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 
 def find_project_root() -> Path:
@@ -50,9 +54,33 @@ class Config:
     Attributes:
         PROJECT_ROOT (Path): Root directory of the Vietnam_dashboard project
         DATA_ROOT (Path): Path to DATA directory containing parquet files
-        CACHE_TTL (int): Cache time-to-live in seconds
+        CACHE_TTL (int): Default cache time-to-live in seconds
+        CACHE_MAX_BYTES (int): Memory ceiling of the DataLoader cache
     """
 
+    # Per-dataset TTL overrides (seconds), keyed by DataLoader cache key.
+    # TTLs only apply to datasets not tracked by DATA/.data_versions.json;
+    # tracked ones are reloaded when their content hash changes.
+    CACHE_TTL_OVERRIDES: Dict[str, int] = {
+        # Intraday alert snapshots
+        "breakout_alerts": 60,
+        "ma_crossover_alerts": 60,
+        "volume_spike_alerts": 60,
+        "combined_alerts": 60,
+        "pattern_alerts": 60,
+        # Quarterly / weekly updates
+        "company_fundamentals": 3600,
+        "company_full": 3600,
+        "bank_fundamentals": 3600,
+        "insurance_fundamentals": 3600,
+        "security_fundamentals": 3600,
+        "sector_fundamentals": 3600,
+        "bsc_individual": 3600,
+        "bsc_sector": 3600,
+        "bsc_combined": 3600,
+        "macro_commodity": 3600,
+    }
+
     def __init__(self):
         """Initialize configuration with auto-detected or environment paths."""
         # Project root (auto-detect)
@@ -70,6 +98,12 @@ class Config:
 
         # Cache settings
         self.CACHE_TTL = int(os.environ.get("CACHE_TTL", 300))  # 5 minutes
+        self.CACHE_MAX_BYTES = int(os.environ.get("CACHE_MAX_MB", 2048)) * 1024 * 1024
+
+        # Tool execution (utils/concurrency.py) and disk load limits
+        self.TOOL_WORKERS = int(os.environ.get("TOOL_WORKERS", 4))
+        self.TOOL_TIMEOUT = float(os.environ.get("TOOL_TIMEOUT", 60))
+        self.MAX_CONCURRENT_LOADS = int(os.environ.get("MAX_CONCURRENT_LOADS", 2))
 
         # Validate paths exist
         self._validate_paths()
@@ -131,6 +165,10 @@ class Config:
     # Metadata Paths
     SECTOR_REGISTRY_PATH = "metadata/sector_industry_registry.json"
 
+    def get_cache_ttl(self, cache_key: str) -> int:
+        """TTL in seconds for a DataLoader cache key."""
+        return self.CACHE_TTL_OVERRIDES.get(cache_key, self.CACHE_TTL)
+
     def get_parquet_path(self, name: str) -> Path:
         """
         Get full path to a parquet file by name.
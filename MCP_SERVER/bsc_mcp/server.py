@@ -66,7 +66,7 @@ from bsc_mcp.tools import macro_tools
 
 # Register all tools with the server
 discovery_tools.register(mcp)
-logger.info("Discovery tools registered (5 tools)")
+logger.info("Discovery tools registered (6 tools)")
 
 fundamental_tools.register(mcp)
 logger.info("Fundamental tools registered (5 tools)")
@@ -86,7 +86,7 @@ logger.info("Sector tools registered (3 tools)")
 macro_tools.register(mcp)
 logger.info("Macro tools registered (3 tools)")
 
-logger.info("All 28 tools registered successfully!")
+logger.info("All 29 tools registered successfully!")
 
 # =============================================================================
 # Main Entry Point
@@ -95,4 +95,12 @@ logger.info("All 28 tools registered successfully!")
 if __name__ == "__main__":
     logger.info("Starting bsc_mcp server...")
     logger.info(f"Project root: {parent_dir}")
+
+    # Build the shared ticker index and screener snapshot on the worker pool,
+    # so the first discovery/screening calls don't pay for the cold loads
+    from bsc_mcp.services.data_loader import get_data_loader
+    from bsc_mcp.utils.concurrency import warm_up
+    loader = get_data_loader()
+    warm_up(loader.get_ticker_index, loader.get_screener_snapshot)
+
     mcp.run()
@@ -9,17 +9,30 @@ repeated disk reads.
 Features:
 ---------
 - Lazy loading: Files are only loaded when first accessed
-- TTL caching: Data is cached for 5 minutes (configurable)
+- Version-checked caching: datasets tracked in DATA/.data_versions.json (written
+  by every pipeline step) are reloaded only when their content hash changes;
+  untracked files fall back to a per-dataset TTL (Config.get_cache_ttl)
+- Memory-bounded: LRU eviction keeps the cached frames under CACHE_MAX_MB
+- Single-flight loading: concurrent misses on one dataset read it once
+- Metrics: get_cache_stats() (hits, misses, evictions, load time, bytes)
+- Per-ticker partitions: technical datasets are sorted by (symbol, date) at
+  load time; get_partitions() slices one ticker without filtering or sorting
 - Type-specific loaders: Separate methods for each data type
 """
 
+import json
 import time
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Optional, List
 import pandas as pd
 
 from bsc_mcp.config import get_config, Config
+from bsc_mcp.services.ohlcv_reader import OHLCVSymbolReader
+from bsc_mcp.services.partitions import SymbolPartitions, sort_by_symbol_date
+from bsc_mcp.services.screener import build_snapshot
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -27,12 +40,27 @@ logger = logging.getLogger(__name__)
 
 class DataLoader:
     """
-    Centralized data loading service with TTL caching.
+    Centralized data loading service with version-checked caching.
 
     This class provides methods to load various data files (parquet format)
     with built-in caching to improve performance.
     """
 
+    # Written by the pipelines (config/data_mapping/data_versions.py)
+    MANIFEST_NAME = ".data_versions.json"
+
+    # Datasets kept sorted by (symbol, date) with a SymbolPartitions index;
+    # each has a get_<cache_key>() loader
+    PARTITIONED_DATASETS = frozenset({
+        "technical_basic",
+        "money_flow",
+        "breakout_alerts",
+        "ma_crossover_alerts",
+        "volume_spike_alerts",
+        "pattern_alerts",
+        "combined_alerts",
+    })
+
     def __init__(self, config: Optional[Config] = None):
         """
         Initialize DataLoader with configuration.
@@ -41,20 +69,102 @@ class DataLoader:
             config: Configuration instance. If None, uses global config.
         """
         self.config = config or get_config()
-        self._cache: Dict[str, pd.DataFrame] = {}
+        # LRU order: least recently used first
+        self._cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
         self._cache_timestamps: Dict[str, float] = {}
+        self._cache_versions: Dict[str, Optional[str]] = {}
+        self._cache_bytes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._partitions: Dict[str, SymbolPartitions] = {}
+
+        # Tool calls may run on worker threads: one lock for the cache state,
+        # one per dataset so concurrent misses load the file only once
+        self._lock = threading.RLock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        # Caps parquet reads across datasets so parallel tools don't spike memory
+        self._load_semaphore = threading.BoundedSemaphore(self.config.MAX_CONCURRENT_LOADS)
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'load_seconds': 0.0,
+            'bytes_loaded': 0,
+        }
+        # Bumped whenever a cached dataset is (re)loaded or cleared
+        self._cache_generation = 0
+
+        # Ticker → entity/sector/date index, rebuilt once per cache generation
+        self._ticker_index: Dict[str, Dict] = {}
+        self._ticker_index_generation: Optional[int] = None
+
+        # Latest fundamentals + valuation snapshot (one row per ticker)
+        self._screener_snapshot: Optional[pd.DataFrame] = None
+        self._screener_generation: Optional[int] = None
+
+        # Data version manifest (re-read only when the manifest file changes)
+        self._manifest_path = self.config.DATA_ROOT / self.MANIFEST_NAME
+        self._manifest_mtime_ns: Optional[int] = None
+        self._manifest_datasets: Dict[str, Dict] = {}
+
+        # Symbol-indexed reader for single-ticker raw OHLCV requests
+        self._ohlcv_reader = OHLCVSymbolReader(
+            self.config.DATA_ROOT / "raw" / "ohlcv" / "OHLCV_mktcap.parquet"
+        )
 
         logger.info(f"DataLoader initialized with DATA_ROOT: {self.config.DATA_ROOT}")
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid (not expired)."""
+    def _refresh_manifest(self) -> None:
+        """Reload the data version manifest if the pipeline rewrote it."""
+        try:
+            mtime_ns = self._manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        if mtime_ns == self._manifest_mtime_ns:
+            return
+        datasets: Dict[str, Dict] = {}
+        if mtime_ns is not None:
+            try:
+                with open(self._manifest_path, "r", encoding="utf-8") as f:
+                    datasets = json.load(f).get("datasets", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Cannot read data version manifest: {e}")
+        self._manifest_datasets = datasets
+        self._manifest_mtime_ns = mtime_ns
+
+    def _get_data_version(self, relative_path: str) -> Optional[str]:
+        """Content hash of a dataset from the manifest (None if untracked)."""
+        self._refresh_manifest()
+        entry = self._manifest_datasets.get(Path(relative_path).as_posix())
+        return entry.get("hash") if entry else None
+
+    def _is_cache_valid(self, cache_key: str, relative_path: Optional[str] = None) -> bool:
+        """
+        Check if cached data is still valid.
+
+        Tracked datasets are valid while their manifest hash is unchanged;
+        untracked ones expire after their TTL (Config.get_cache_ttl).
+        """
         if cache_key not in self._cache:
             return False
 
+        if relative_path is not None:
+            version = self._get_data_version(relative_path)
+            if version is not None:
+                return version == self._cache_versions.get(cache_key)
+
         cache_time = self._cache_timestamps.get(cache_key, 0)
         elapsed = time.time() - cache_time
 
-        return elapsed < self.config.CACHE_TTL
+        return elapsed < self.config.get_cache_ttl(cache_key)
+
+    def _get_cached(self, cache_key: str, relative_path: str) -> Optional[pd.DataFrame]:
+        """Cached frame if valid (marks it most recently used), else None."""
+        with self._lock:
+            if not self._is_cache_valid(cache_key, relative_path):
+                return None
+            self._cache.move_to_end(cache_key)
+            self._stats['hits'] += 1
+            return self._cache[cache_key]
 
     def _load_cached(
         self,
@@ -65,6 +175,9 @@ class DataLoader:
         """
         Load data from cache or disk with caching logic.
 
+        Concurrent misses on the same dataset are coalesced: one caller loads,
+        the others wait on the per-dataset lock and get the cached frame.
+
         Args:
             cache_key: Unique key for this data in the cache
             relative_path: Path relative to DATA_ROOT
@@ -74,47 +187,144 @@ class DataLoader:
             pd.DataFrame: The loaded data
         """
         # Check cache validity
-        if not force_refresh and self._is_cache_valid(cache_key):
-            logger.debug(f"Cache hit for {cache_key}")
-            return self._cache[cache_key]
-
-        # Load from disk
-        full_path = self.config.DATA_ROOT / relative_path
-
-        if not full_path.exists():
-            raise FileNotFoundError(
-                f"Data file not found: {full_path}\n"
-                f"Please run the data pipeline to generate this file."
-            )
+        if not force_refresh:
+            df = self._get_cached(cache_key, relative_path)
+            if df is not None:
+                logger.debug(f"Cache hit for {cache_key}")
+                return df
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(cache_key, threading.Lock())
+
+        with load_lock:
+            if not force_refresh:
+                # Another caller may have loaded it while we waited
+                df = self._get_cached(cache_key, relative_path)
+                if df is not None:
+                    return df
+
+            # Load from disk
+            full_path = self.config.DATA_ROOT / relative_path
+
+            if not full_path.exists():
+                raise FileNotFoundError(
+                    f"Data file not found: {full_path}\n"
+                    f"Please run the data pipeline to generate this file."
+                )
+
+            logger.info(f"Loading {cache_key} from disk: {full_path}")
+            start_time = time.time()
+
+            # Version first: a rewrite during the read is caught on the next call
+            with self._lock:
+                version = self._get_data_version(relative_path)
+            with self._load_semaphore:
+                df = pd.read_parquet(full_path)
+            partitions = None
+            if cache_key in self.PARTITIONED_DATASETS:
+                df = sort_by_symbol_date(df)
+                partitions = SymbolPartitions(df)
+            nbytes = int(df.memory_usage(index=True, deep=True).sum())
+
+            # Validate empty DataFrame
+            if df.empty:
+                logger.warning(f"Loaded empty DataFrame for {cache_key} from {full_path}")
+
+            elapsed = time.time() - start_time
+            logger.info(f"Loaded {cache_key}: {len(df)} rows, {nbytes / 1e6:.1f} MB in {elapsed:.2f}s")
+
+            # Update cache
+            with self._lock:
+                self._drop_entry(cache_key)
+                self._cache[cache_key] = df
+                self._cache_bytes[cache_key] = nbytes
+                self._cache_timestamps[cache_key] = time.time()
+                self._cache_versions[cache_key] = version
+                if partitions is not None:
+                    self._partitions[cache_key] = partitions
+                self._total_bytes += nbytes
+                self._cache_generation += 1
+
+                self._stats['misses'] += 1
+                self._stats['load_seconds'] += elapsed
+                self._stats['bytes_loaded'] += nbytes
+                self._evict(keep=cache_key)
 
-        logger.info(f"Loading {cache_key} from disk: {full_path}")
-        start_time = time.time()
-
-        df = pd.read_parquet(full_path)
+        return df
 
-        # Validate empty DataFrame
-        if df.empty:
-            logger.warning(f"Loaded empty DataFrame for {cache_key} from {full_path}")
+    def _drop_entry(self, cache_key: str) -> bool:
+        """Remove one entry and its accounting (caller holds the lock)."""
+        if cache_key not in self._cache:
+            return False
+        del self._cache[cache_key]
+        self._total_bytes -= self._cache_bytes.pop(cache_key, 0)
+        self._cache_timestamps.pop(cache_key, None)
+        self._cache_versions.pop(cache_key, None)
+        self._partitions.pop(cache_key, None)
+        return True
+
+    def _evict(self, keep: str) -> None:
+        """Evict least recently used datasets until under CACHE_MAX_BYTES."""
+        for cache_key in list(self._cache):
+            if self._total_bytes <= self.config.CACHE_MAX_BYTES:
+                break
+            if cache_key == keep:
+                continue
+            self._drop_entry(cache_key)
+            self._stats['evictions'] += 1
+            logger.info(f"Evicted {cache_key} from cache (memory ceiling)")
 
-        elapsed = time.time() - start_time
-        logger.info(f"Loaded {cache_key}: {len(df)} rows in {elapsed:.2f}s")
+    def clear_cache(self, cache_key: Optional[str] = None):
+        """Clear cached data."""
+        with self._lock:
+            self._cache_generation += 1
+            if cache_key:
+                self._drop_entry(cache_key)
+                logger.info(f"Cleared cache for {cache_key}")
+            else:
+                for key in list(self._cache):
+                    self._drop_entry(key)
+                logger.info("Cleared all cache")
+
+    def get_partitions(self, cache_key: str, force_refresh: bool = False) -> SymbolPartitions:
+        """
+        Per-ticker partitions of a dataset in PARTITIONED_DATASETS.
 
-        # Update cache
-        self._cache[cache_key] = df
-        self._cache_timestamps[cache_key] = time.time()
+        Args:
+            cache_key: e.g. "technical_basic", "pattern_alerts"
+            force_refresh: Reload the dataset from disk
 
-        return df
+        Returns:
+            SymbolPartitions over the cached frame sorted by (symbol, date)
+        """
+        if cache_key not in self.PARTITIONED_DATASETS:
+            raise ValueError(f"{cache_key} is not a partitioned dataset")
+        df = getattr(self, f"get_{cache_key}")(force_refresh=force_refresh)
+        with self._lock:
+            partitions = self._partitions.get(cache_key)
+            if partitions is None or partitions.frame is not df:
+                # Entry evicted or replaced between the load and this lookup
+                partitions = SymbolPartitions(sort_by_symbol_date(df))
+        return partitions
+
+    def get_cache_stats(self) -> Dict:
+        """
+        Cache counters for monitoring.
 
-    def clear_cache(self, cache_key: Optional[str] = None):
-        """Clear cached data."""
-        if cache_key:
-            self._cache.pop(cache_key, None)
-            self._cache_timestamps.pop(cache_key, None)
-            logger.info(f"Cleared cache for {cache_key}")
-        else:
-            self._cache.clear()
-            self._cache_timestamps.clear()
-            logger.info("Cleared all cache")
+        Returns:
+            Dict with hits, misses, hit_rate, evictions, load_seconds,
+            bytes_loaded, entries, bytes, max_bytes and per-dataset sizes
+        """
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0,
+                'entries': len(self._cache),
+                'bytes': self._total_bytes,
+                'max_bytes': self.config.CACHE_MAX_BYTES,
+                'datasets': dict(self._cache_bytes),
+            }
 
     # =========================================================================
     # Fundamental Data Loaders
@@ -367,7 +577,9 @@ class DataLoader:
         Read directly from raw OHLCV parquet.
 
         Use this for real-time access to OHLCV after adjustment refresh,
-        bypassing processed pipeline delays.
+        bypassing processed pipeline delays. Single-ticker requests read only
+        that symbol's row groups (OHLCVSymbolReader); without a ticker the
+        whole file is scanned.
 
         Args:
             ticker: Optional ticker filter (e.g., "VCB")
@@ -383,14 +595,14 @@ class DataLoader:
             logger.warning(f"OHLCV file not found: {ohlcv_path}")
             return pd.DataFrame()
 
-        df = pd.read_parquet(ohlcv_path)
-        df['date'] = pd.to_datetime(df['date'])
-
         if ticker:
-            df = df[df['symbol'] == ticker.upper()]
+            df = self._ohlcv_reader.get_bars(ticker.upper(), limit=limit)
+        else:
+            df = pd.read_parquet(ohlcv_path)
+            df['date'] = pd.to_datetime(df['date'])
 
         # Get most recent N days per symbol
-        if not df.empty:
+        if not df.empty and not ticker:
             df = df.sort_values(['symbol', 'date'], ascending=[True, False])
             df = df.groupby('symbol').head(limit)
             df = df.sort_values(['symbol', 'date'])
@@ -404,72 +616,155 @@ class DataLoader:
 
     def check_cache_invalidation(self):
         """
-        Check for external cache invalidation marker.
+        Check for the legacy external cache invalidation marker.
 
-        Called at start of data loading to detect when data pipeline
-        has updated parquet files and cache should be cleared.
+        Pipelines now record DATA/.data_versions.json and stale datasets are
+        detected per file in _is_cache_valid; the marker is still honoured
+        for older writers.
         """
         marker_path = self.config.DATA_ROOT / ".cache_invalidated"
 
         if marker_path.exists():
             self.clear_cache()
-            marker_path.unlink()
+            marker_path.unlink(missing_ok=True)
             logger.info("Cache invalidated by external update (OHLCV refresh)")
 
     # =========================================================================
     # Utility Methods
     # =========================================================================
 
-    def get_available_tickers(self) -> List[str]:
-        """Get list of all available tickers from technical data."""
-        self.check_cache_invalidation()
-        try:
-            df = self.get_technical_basic()
-            return sorted(df['symbol'].unique().tolist())
-        except Exception:
-            return []
+    # Entity sources in lookup priority order (a ticker present in several
+    # fundamentals files gets the first matching type)
+    ENTITY_SOURCES = (
+        ('BANK', 'get_bank_fundamentals'),
+        ('INSURANCE', 'get_insurance_fundamentals'),
+        ('SECURITY', 'get_security_fundamentals'),
+        ('COMPANY', 'get_company_fundamentals'),
+    )
 
-    def get_ticker_entity_type(self, ticker: str) -> Optional[str]:
+    def get_ticker_index(self) -> Dict[str, Dict]:
         """
-        Determine entity type for a ticker.
+        Ticker → metadata index shared by the discovery and entity-branching tools.
 
-        Returns: 'BANK', 'COMPANY', 'INSURANCE', 'SECURITY', or None
+        Each entry has: entity_type, sector, exchange (from the latest row of the
+        ticker's fundamentals file), first_date / last_date (technical data) and
+        has_technical. Built once per cache generation; the source frames are
+        re-validated on every call, so a pipeline update rebuilds the index.
+
+        Returns:
+            Dict keyed by upper-case ticker (do not mutate)
         """
-        ticker = ticker.upper()
+        self.check_cache_invalidation()
 
-        # Check banks
+        sources = []
+        for entity_type, getter in self.ENTITY_SOURCES:
+            try:
+                sources.append((entity_type, getattr(self, getter)()))
+            except FileNotFoundError:
+                pass
         try:
-            bank_df = self.get_bank_fundamentals()
-            if ticker in bank_df['symbol'].values:
-                return 'BANK'
+            tech_parts = self.get_partitions("technical_basic")
         except FileNotFoundError:
-            pass
+            tech_parts = None
+
+        if self._ticker_index_generation == self._cache_generation:
+            return self._ticker_index
+
+        index: Dict[str, Dict] = {}
+        for entity_type, df in sources:
+            if df.empty or 'symbol' not in df.columns:
+                continue
+            meta_cols = [c for c in ('sector', 'exchange') if c in df.columns]
+            latest = df[['symbol'] + meta_cols].drop_duplicates('symbol', keep='last')
+            for row in latest.itertuples(index=False):
+                if row.symbol in index:
+                    continue
+                values = row._asdict()
+                index[row.symbol] = {
+                    'entity_type': entity_type,
+                    'sector': values.get('sector') if pd.notna(values.get('sector')) else None,
+                    'exchange': values.get('exchange') if pd.notna(values.get('exchange')) else None,
+                    'first_date': None,
+                    'last_date': None,
+                    'has_technical': False,
+                }
+
+        if tech_parts is not None:
+            dates = tech_parts.frame['date'] if 'date' in tech_parts.frame.columns else None
+            for symbol in tech_parts.symbols():
+                start, end = tech_parts.bounds(symbol)
+                entry = index.setdefault(symbol, {
+                    'entity_type': None,
+                    'sector': None,
+                    'exchange': None,
+                })
+                entry.update(
+                    first_date=dates.iat[start] if dates is not None else None,
+                    last_date=dates.iat[end - 1] if dates is not None else None,
+                    has_technical=True
+                )
+
+        self._ticker_index = index
+        self._ticker_index_generation = self._cache_generation
+        logger.info(f"Ticker index built: {len(index)} tickers")
+        return index
+
+    def get_screener_snapshot(self) -> pd.DataFrame:
+        """
+        Latest fundamentals + latest PE/PB per ticker (see services/screener.py).
 
-        # Check insurance
-        try:
-            ins_df = self.get_insurance_fundamentals()
-            if ticker in ins_df['symbol'].values:
-                return 'INSURANCE'
-        except FileNotFoundError:
-            pass
+        Built once per cache generation, like the ticker index.
 
-        # Check securities
-        try:
-            sec_df = self.get_security_fundamentals()
-            if ticker in sec_df['symbol'].values:
-                return 'SECURITY'
-        except FileNotFoundError:
-            pass
+        Returns:
+            Snapshot DataFrame (shared, do not mutate)
+        """
+        self.check_cache_invalidation()
+
+        fundamentals = []
+        for entity_type, getter in self.ENTITY_SOURCES:
+            try:
+                fundamentals.append((entity_type, getattr(self, getter)()))
+            except FileNotFoundError:
+                pass
+        valuations = {}
+        for column, getter in (('pe_ratio', self.get_pe_historical), ('pb_ratio', self.get_pb_historical)):
+            try:
+                valuations[column] = getter()
+            except FileNotFoundError:
+                pass
+
+        if self._screener_snapshot is not None and self._screener_generation == self._cache_generation:
+            return self._screener_snapshot
+
+        start_time = time.time()
+        self._screener_snapshot = build_snapshot(fundamentals, valuations)
+        self._screener_generation = self._cache_generation
+        logger.info(
+            f"Screener snapshot built: {len(self._screener_snapshot)} tickers "
+            f"in {time.time() - start_time:.2f}s"
+        )
+        return self._screener_snapshot
 
-        # Check companies
+    def get_ticker_info(self, ticker: str) -> Optional[Dict]:
+        """Index entry for a ticker (None if unknown)."""
+        return self.get_ticker_index().get(ticker.upper())
+
+    def get_available_tickers(self) -> List[str]:
+        """Get list of all available tickers from technical data."""
         try:
-            company_df = self.get_company_fundamentals()
-            if ticker in company_df['symbol'].values:
-                return 'COMPANY'
-        except FileNotFoundError:
-            pass
+            index = self.get_ticker_index()
+        except Exception:
+            return []
+        return sorted(t for t, info in index.items() if info['has_technical'])
+
+    def get_ticker_entity_type(self, ticker: str) -> Optional[str]:
+        """
+        Determine entity type for a ticker.
 
-        return None
+        Returns: 'BANK', 'COMPANY', 'INSURANCE', 'SECURITY', or None
+        """
+        info = self.get_ticker_info(ticker)
+        return info['entity_type'] if info else None
 
 
 # =============================================================================
@@ -0,0 +1,203 @@
+"""
+OHLCV Symbol Reader
+===================
+
+Symbol-indexed access to DATA/raw/ohlcv/OHLCV_mktcap.parquet.
+
+The file is written sorted by (symbol, date) in bounded row groups, so the
+parquet footer alone tells which row groups hold a symbol (min/max statistics
+of the symbol column). Fetching the last N bars of one ticker reads only the
+trailing row group(s) of that symbol, independent of how many years of history
+the file holds.
+
+Features:
+---------
+- Row-group index per file version (built from the footer; falls back to one
+  pass over the symbol column when statistics are missing or unsorted)
+- Small LRU tail cache: the most recent ``tail_bars`` bars per symbol
+- File version = (mtime, size): a pipeline rewrite rebuilds the index
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+
+class OHLCVSymbolReader:
+    """
+    Reads recent bars for one symbol without scanning the whole OHLCV file.
+
+    Args:
+        path: OHLCV parquet path
+        tail_bars: Bars kept per symbol in the tail cache
+        max_cached_symbols: Symbols kept in the tail cache (LRU)
+    """
+
+    def __init__(self, path: Path, tail_bars: int = 250, max_cached_symbols: int = 512):
+        self.path = Path(path)
+        self.tail_bars = tail_bars
+        self.max_cached_symbols = max_cached_symbols
+
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple[int, int]] = None
+        self._metadata: Optional[pq.FileMetaData] = None
+        self._columns: List[str] = []
+        self._row_groups: Dict[str, List[int]] = {}
+        self._statistics_index = False
+        self._tails: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _ensure_index(self) -> None:
+        """(Re)build the symbol → row groups index if the file changed."""
+        stat = self.path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._version:
+            return
+
+        parquet_file = pq.ParquetFile(self.path)
+        metadata = parquet_file.metadata
+        row_groups = self._index_from_statistics(metadata)
+        self._statistics_index = row_groups is not None
+        if row_groups is None:
+            row_groups = self._index_from_column(parquet_file)
+
+        self._metadata = metadata
+        self._columns = parquet_file.schema_arrow.names
+        self._row_groups = row_groups
+        self._tails.clear()
+        self._version = version
+        logger.info(
+            f"OHLCV index built ({'statistics' if self._statistics_index else 'symbol column'}): "
+            f"{metadata.num_row_groups} row groups, {metadata.num_rows:,} rows"
+        )
+
+    @staticmethod
+    def _index_from_statistics(metadata: pq.FileMetaData) -> Optional[Dict[str, List[int]]]:
+        """
+        Symbol → row groups from row-group min/max statistics.
+
+        Returns None when statistics are missing or the row groups are not
+        sorted by symbol (ranges would overlap). In a sorted file a symbol
+        that is neither min nor max of any row group lies strictly inside one
+        row group, so the index keeps the ranges and resolves those lazily.
+        """
+        schema_names = [metadata.schema.column(i).name for i in range(metadata.num_columns)]
+        if 'symbol' not in schema_names:
+            return None
+        col_idx = schema_names.index('symbol')
+
+        ranges = []
+        for rg in range(metadata.num_row_groups):
+            stats = metadata.row_group(rg).column(col_idx).statistics
+            if stats is None or not stats.has_min_max:
+                return None
+            ranges.append((stats.min, stats.max))
+
+        for (_, prev_max), (next_min, _) in zip(ranges, ranges[1:]):
+            if next_min < prev_max:
+                return None
+
+        index: Dict[str, List[int]] = {}
+        for rg, (lo, hi) in enumerate(ranges):
+            for symbol in {lo, hi}:
+                index.setdefault(symbol, []).append(rg)
+        return index
+
+    @staticmethod
+    def _index_from_column(parquet_file: pq.ParquetFile) -> Dict[str, List[int]]:
+        """One pass over the symbol column (dictionary-encoded, cheap)."""
+        index: Dict[str, List[int]] = {}
+        for rg in range(parquet_file.metadata.num_row_groups):
+            symbols = parquet_file.read_row_group(rg, columns=['symbol']).column('symbol')
+            for symbol in pc.unique(symbols).to_pylist():
+                index.setdefault(symbol, []).append(rg)
+        return index
+
+    def _row_groups_for(self, symbol: str) -> List[int]:
+        """Row groups that may contain ``symbol``."""
+        groups = self._row_groups.get(symbol)
+        if groups is not None or self._metadata is None or not self._statistics_index:
+            return groups or []
+        # Interior symbol of a sorted file: the single row group covering it
+        col_idx = self._columns.index('symbol')
+        for rg in range(self._metadata.num_row_groups):
+            stats = self._metadata.row_group(rg).column(col_idx).statistics
+            if stats.min < symbol < stats.max:
+                return [rg]
+        return []
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _read_tail(self, symbol: str, n_bars: int) -> pd.DataFrame:
+        """
+        Last ``n_bars`` bars of ``symbol``.
+
+        Sorted files are read from the symbol's last row group backwards until
+        enough bars are collected; unsorted files read all its row groups.
+        """
+        parquet_file = pq.ParquetFile(self.path, metadata=self._metadata)
+        frames = []
+        n_rows = 0
+        for rg in reversed(self._row_groups_for(symbol)):
+            table = parquet_file.read_row_group(rg)
+            table = table.filter(pc.equal(table['symbol'], symbol))
+            if table.num_rows == 0:
+                continue
+            frames.append(table)
+            n_rows += table.num_rows
+            if self._statistics_index and n_rows >= n_bars:
+                break
+
+        if not frames:
+            return pd.DataFrame(columns=self._columns)
+
+        df = pa.concat_tables(reversed(frames)).to_pandas()
+        df['date'] = pd.to_datetime(df['date'])
+        df = df.sort_values('date', kind='mergesort')
+        return df.tail(n_bars).reset_index(drop=True)
+
+    def get_bars(self, symbol: str, limit: int = 60, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Most recent ``limit`` bars for ``symbol`` sorted by date ascending.
+
+        Args:
+            symbol: Ticker (upper case)
+            limit: Number of bars
+            columns: Optional column subset
+
+        Returns:
+            DataFrame (empty if the symbol is not in the file)
+        """
+        with self._lock:
+            self._ensure_index()
+
+            if limit <= self.tail_bars:
+                tail = self._tails.get(symbol)
+                if tail is None:
+                    tail = self._read_tail(symbol, self.tail_bars)
+                    self._tails[symbol] = tail
+                    while len(self._tails) > self.max_cached_symbols:
+                        self._tails.popitem(last=False)
+                else:
+                    self._tails.move_to_end(symbol)
+                df = tail.tail(limit).reset_index(drop=True)
+            else:
+                df = self._read_tail(symbol, limit)
+
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        return df.copy()
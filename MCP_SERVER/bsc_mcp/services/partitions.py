@@ -0,0 +1,131 @@
+"""
+Symbol Partitions
+=================
+
+Per-ticker views over a dataset sorted once by (symbol, date).
+
+The DataLoader sorts the technical datasets when it loads them and keeps a
+``SymbolPartitions`` next to the cached frame. A ticker's rows are then one
+contiguous slice (``iloc[start:end]``) found with a dict lookup, instead of a
+boolean filter over the whole frame followed by a sort on every request.
+
+Usage:
+    parts = loader.get_partitions("technical_basic")
+    history = parts.get("FPT", limit=30)        # last 30 rows, date ascending
+    latest = parts.latest_row("FPT")            # Series or None
+    snapshot = parts.latest()                   # latest row of every symbol
+    recent = parts.latest(20)                   # last 20 rows of every symbol
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def sort_by_symbol_date(df: pd.DataFrame, symbol_col: str = 'symbol', date_col: str = 'date') -> pd.DataFrame:
+    """Stable sort by (symbol, date) with a fresh RangeIndex."""
+    keys = [c for c in (symbol_col, date_col) if c in df.columns]
+    if not keys or df.empty:
+        return df
+    return df.sort_values(keys, kind='mergesort').reset_index(drop=True)
+
+
+class SymbolPartitions:
+    """
+    Symbol → row range index over a frame sorted by (symbol, date).
+
+    Args:
+        frame: DataFrame already sorted by (symbol, date) with a RangeIndex
+        symbol_col: Symbol column name
+    """
+
+    def __init__(self, frame: pd.DataFrame, symbol_col: str = 'symbol'):
+        self.frame = frame
+        self.symbol_col = symbol_col
+        self._bounds: Dict[str, Tuple[int, int]] = {}
+        self._starts = np.empty(0, dtype=np.int64)
+        self._ends = np.empty(0, dtype=np.int64)
+        self._latest: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+        if frame.empty or symbol_col not in frame.columns:
+            return
+
+        symbols = frame[symbol_col].to_numpy()
+        # Sorted input: a new partition starts wherever the symbol changes
+        change = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+        starts = np.concatenate(([0], change))
+        ends = np.concatenate((change, [len(symbols)]))
+        self._starts, self._ends = starts.astype(np.int64), ends.astype(np.int64)
+        self._bounds = {
+            symbols[start]: (int(start), int(end))
+            for start, end in zip(starts, ends)
+        }
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._bounds
+
+    def symbols(self) -> List[str]:
+        """Symbols in sort order."""
+        return list(self._bounds)
+
+    def bounds(self, symbol: str) -> Optional[Tuple[int, int]]:
+        """(start, end) row positions of a symbol, or None."""
+        return self._bounds.get(symbol)
+
+    def get(self, symbol: str, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Rows of one symbol, date ascending.
+
+        Args:
+            symbol: Ticker
+            limit: Keep only the most recent ``limit`` rows (<= 0 keeps none)
+
+        Returns:
+            DataFrame slice (empty if the symbol is unknown); copy before mutating
+        """
+        bounds = self._bounds.get(symbol)
+        if bounds is None:
+            return self.frame.iloc[0:0]
+        start, end = bounds
+        if limit is not None:
+            start = max(start, end - max(limit, 0))
+        return self.frame.iloc[start:end]
+
+    def latest_row(self, symbol: str) -> Optional[pd.Series]:
+        """Most recent row of a symbol, or None."""
+        bounds = self._bounds.get(symbol)
+        if bounds is None:
+            return None
+        return self.frame.iloc[bounds[1] - 1]
+
+    def latest(self, n: int = 1) -> pd.DataFrame:
+        """
+        Latest ``n`` rows per symbol, in (symbol, date) order.
+
+        Market-wide "most recent" queries only need these rows: the top ``n``
+        rows by date across all symbols are always among them. The one-row
+        snapshot is materialized once; other ``n`` are gathered per call.
+
+        Args:
+            n: Rows per symbol (n <= 0 returns no rows)
+
+        Returns:
+            DataFrame with a fresh RangeIndex (shared when n == 1, do not mutate)
+        """
+        if n == 1:
+            with self._lock:
+                if self._latest is None:
+                    self._latest = self.frame.iloc[self._ends - 1].reset_index(drop=True)
+                return self._latest
+        return self.frame.iloc[self._tail_positions(n)].reset_index(drop=True)
+
+    def _tail_positions(self, n: int) -> np.ndarray:
+        """Row positions of the last ``n`` rows of every partition."""
+        starts = np.maximum(self._starts, self._ends - max(n, 0))
+        lengths = self._ends - starts
+        # Per-partition aranges without a Python loop
+        offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return np.arange(lengths.sum()) - offsets + np.repeat(starts, lengths)
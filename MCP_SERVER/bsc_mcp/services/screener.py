@@ -0,0 +1,140 @@
+"""
+Screener Snapshot
+=================
+
+One row per ticker with the latest fundamentals and the latest valuation
+multiples, used by ``bsc_screen_fundamentals``.
+
+The snapshot is built once per DataLoader cache generation
+(``DataLoader.get_screener_snapshot``); a screen is then a set of vectorized
+boolean masks over a few thousand rows instead of a per-ticker filter/sort
+over every fundamentals frame.
+
+Columns:
+--------
+- symbol, entity_type (category), sector (category), year, quarter
+- every numeric metric of the entity's fundamentals file (float64; metrics a
+  given entity type does not report are NaN)
+- pe_ratio, pb_ratio: latest value from the historical valuation files
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Latest valuation multiples joined onto the snapshot
+VALUATION_COLUMNS = ('pe_ratio', 'pb_ratio')
+
+_KEY_COLUMNS = ('symbol', 'entity_type', 'sector', 'year', 'quarter')
+
+
+def latest_per_symbol(df: pd.DataFrame, order_by: Iterable[str]) -> pd.DataFrame:
+    """Last row per symbol after a stable sort on ``order_by``."""
+    order_by = [c for c in order_by if c in df.columns]
+    if order_by:
+        df = df.sort_values(order_by, kind='mergesort')
+    return df.drop_duplicates('symbol', keep='last')
+
+
+def build_snapshot(
+    fundamentals: Iterable[Tuple[str, pd.DataFrame]],
+    valuations: Optional[Dict[str, pd.DataFrame]] = None
+) -> pd.DataFrame:
+    """
+    Build the latest-snapshot table.
+
+    Args:
+        fundamentals: (entity_type, fundamentals frame) pairs in priority order;
+                      a ticker present in several frames keeps the first type
+        valuations: {ratio column: historical frame with symbol, date, ratio}
+
+    Returns:
+        DataFrame indexed 0..n-1, one row per ticker, sorted by symbol
+    """
+    frames = []
+    seen = pd.Index([])
+    for entity_type, df in fundamentals:
+        if df is None or df.empty or 'symbol' not in df.columns:
+            continue
+        latest = latest_per_symbol(df, ['year', 'quarter'])
+        latest = latest[~latest['symbol'].isin(seen)]
+        seen = seen.append(pd.Index(latest['symbol']))
+
+        numeric = latest.select_dtypes(include=[np.number, 'bool']).drop(
+            columns=[c for c in ('year', 'quarter') if c in latest.columns]
+        ).astype('float64')
+        part = pd.DataFrame({
+            'symbol': latest['symbol'].to_numpy(),
+            'entity_type': entity_type,
+            'sector': latest['sector'].to_numpy() if 'sector' in latest.columns else None,
+            'year': latest['year'].to_numpy() if 'year' in latest.columns else np.nan,
+            'quarter': latest['quarter'].to_numpy() if 'quarter' in latest.columns else np.nan,
+        })
+        part = pd.concat([part, numeric.reset_index(drop=True)], axis=1)
+        frames.append(part)
+
+    if not frames:
+        return pd.DataFrame(columns=list(_KEY_COLUMNS) + list(VALUATION_COLUMNS))
+
+    snapshot = pd.concat(frames, ignore_index=True, sort=False)
+
+    for column in VALUATION_COLUMNS:
+        source = (valuations or {}).get(column)
+        if source is None or source.empty or column not in source.columns:
+            snapshot[column] = np.nan
+            continue
+        latest = latest_per_symbol(source[['symbol', 'date', column]], ['date'])
+        values = pd.to_numeric(latest.set_index('symbol')[column], errors='coerce')
+        snapshot[column] = snapshot['symbol'].map(values).astype('float64')
+
+    snapshot['entity_type'] = snapshot['entity_type'].astype('category')
+    snapshot['sector'] = snapshot['sector'].astype('category')
+    return snapshot.sort_values('symbol', kind='mergesort').reset_index(drop=True)
+
+
+def screen_snapshot(
+    snapshot: pd.DataFrame,
+    entity_type: Optional[str] = None,
+    sector: Optional[str] = None,
+    min_filters: Optional[Dict[str, float]] = None,
+    max_filters: Optional[Dict[str, float]] = None,
+    limit: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Vectorized screen over the snapshot.
+
+    Rows with a missing value for a filtered metric are excluded.
+
+    Args:
+        snapshot: Output of build_snapshot
+        entity_type: Keep only this entity type
+        sector: Keep only this sector
+        min_filters: {metric: minimum} (inclusive)
+        max_filters: {metric: maximum} (inclusive)
+        limit: Maximum rows to return
+
+    Returns:
+        Matching rows (snapshot order)
+
+    Raises:
+        KeyError: If a filter names a column the snapshot does not have
+    """
+    mask = np.ones(len(snapshot), dtype=bool)
+    if entity_type:
+        mask &= (snapshot['entity_type'] == entity_type.upper()).to_numpy()
+    if sector:
+        mask &= (snapshot['sector'] == sector).to_numpy()
+
+    for bounds, compare in ((min_filters, np.greater_equal), (max_filters, np.less_equal)):
+        for metric, bound in (bounds or {}).items():
+            if bound is None:
+                continue
+            if metric not in snapshot.columns:
+                raise KeyError(f"Unknown screening metric: {metric}")
+            values = snapshot[metric].to_numpy(dtype='float64', na_value=np.nan)
+            with np.errstate(invalid='ignore'):
+                mask &= compare(values, bound)
+
+    result = snapshot[mask]
+    return result.head(limit) if limit is not None else result
@@ -11,12 +11,18 @@ Tools:
 3. bsc_list_sectors - List all sectors
 4. bsc_search_tickers - Search tickers by keyword
 5. bsc_get_peers - Get peer companies in same sector
+6. bsc_get_cache_stats - Data cache hit/miss and memory counters
+
+Tools 1-5 read the ticker index, which loads the fundamentals and technical
+frames on a cold cache, so they run on the worker pool. The index is warmed
+at server startup; bsc_get_cache_stats only reads counters and stays inline.
 """
 
 from typing import Optional
 from mcp.server.fastmcp import FastMCP
 
 from bsc_mcp.services.data_loader import get_data_loader
+from bsc_mcp.utils.concurrency import run_in_worker
 from bsc_mcp.utils.errors import handle_tool_error, TickerNotFoundError
 from bsc_mcp.utils.formatters import format_dataframe_markdown
 import pandas as pd
@@ -26,6 +32,7 @@ def register(mcp: FastMCP):
     """Register all discovery tools with the MCP server."""
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_list_tickers(
         entity_type: Optional[str] = None,
         sector: Optional[str] = None,
@@ -50,45 +57,22 @@ def register(mcp: FastMCP):
         try:
             loader = get_data_loader()
 
-            # Get tickers from technical data (most comprehensive)
-            tech_df = loader.get_technical_basic()
-            tickers = tech_df['symbol'].unique().tolist()
+            # Tickers from technical data (most comprehensive), metadata from the index
+            index = loader.get_ticker_index()
+            etype_filter = entity_type.upper() if entity_type else None
 
-            # Build ticker info
             results = []
-            for ticker in sorted(tickers):
-                etype = loader.get_ticker_entity_type(ticker)
-
-                # Apply entity_type filter
-                if entity_type and etype != entity_type.upper():
+            for ticker in loader.get_available_tickers():
+                info = index[ticker]
+                if etype_filter and info['entity_type'] != etype_filter:
                     continue
-
-                # Get sector from fundamental data
-                ticker_sector = None
-                try:
-                    if etype == 'BANK':
-                        df = loader.get_bank_fundamentals()
-                    elif etype == 'INSURANCE':
-                        df = loader.get_insurance_fundamentals()
-                    elif etype == 'SECURITY':
-                        df = loader.get_security_fundamentals()
-                    else:
-                        df = loader.get_company_fundamentals()
-
-                    ticker_data = df[df['symbol'] == ticker]
-                    if not ticker_data.empty and 'sector' in ticker_data.columns:
-                        ticker_sector = ticker_data.iloc[0].get('sector')
-                except Exception:
-                    pass
-
-                # Apply sector filter
-                if sector and ticker_sector != sector:
+                if sector and info['sector'] != sector:
                     continue
 
                 results.append({
                     'Ticker': ticker,
-                    'Type': etype or 'N/A',
-                    'Sector': ticker_sector or 'N/A'
+                    'Type': info['entity_type'] or 'N/A',
+                    'Sector': info['sector'] or 'N/A'
                 })
 
                 if len(results) >= limit:
@@ -112,6 +96,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_list_tickers")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_ticker_info(ticker: str) -> str:
         """
         Get detailed information about a specific ticker.
@@ -137,41 +122,11 @@ def register(mcp: FastMCP):
                 suggestions = [t for t in all_tickers if t.startswith(ticker[:2])][:5]
                 raise TickerNotFoundError(ticker, suggestions)
 
-            # Get entity type
-            entity_type = loader.get_ticker_entity_type(ticker) or "UNKNOWN"
-
-            # Get sector and other info
-            sector = None
-            exchange = None
-            latest_date = None
-
-            try:
-                if entity_type == 'BANK':
-                    df = loader.get_bank_fundamentals()
-                elif entity_type == 'INSURANCE':
-                    df = loader.get_insurance_fundamentals()
-                elif entity_type == 'SECURITY':
-                    df = loader.get_security_fundamentals()
-                else:
-                    df = loader.get_company_fundamentals()
-
-                ticker_data = df[df['symbol'] == ticker]
-                if not ticker_data.empty:
-                    if 'sector' in ticker_data.columns:
-                        sector = ticker_data.iloc[-1].get('sector')
-                    if 'exchange' in ticker_data.columns:
-                        exchange = ticker_data.iloc[-1].get('exchange')
-            except Exception:
-                pass
-
-            # Get latest technical data date
-            try:
-                tech_df = loader.get_technical_basic()
-                ticker_tech = tech_df[tech_df['symbol'] == ticker]
-                if not ticker_tech.empty and 'date' in ticker_tech.columns:
-                    latest_date = ticker_tech['date'].max()
-            except Exception:
-                pass
+            info = loader.get_ticker_info(ticker)
+            entity_type = info['entity_type'] or "UNKNOWN"
+            sector = info['sector']
+            exchange = info['exchange']
+            latest_date = info['last_date']
 
             # Check BSC forecast coverage
             has_bsc = False
@@ -214,6 +169,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_ticker_info")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_list_sectors(entity_type: Optional[str] = None) -> str:
         """
         List all industry sectors with ticker counts.
@@ -288,6 +244,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_list_sectors")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_search_tickers(query: str, limit: int = 20) -> str:
         """
         Search for tickers by keyword or name pattern.
@@ -309,29 +266,14 @@ def register(mcp: FastMCP):
             query_lower = query.lower().strip()
 
             # Get all tickers
+            index = loader.get_ticker_index()
             all_tickers = loader.get_available_tickers()
 
             results = []
             for ticker in all_tickers:
-                entity_type = loader.get_ticker_entity_type(ticker)
-
-                # Get sector
-                sector = None
-                try:
-                    if entity_type == 'BANK':
-                        df = loader.get_bank_fundamentals()
-                    elif entity_type == 'INSURANCE':
-                        df = loader.get_insurance_fundamentals()
-                    elif entity_type == 'SECURITY':
-                        df = loader.get_security_fundamentals()
-                    else:
-                        df = loader.get_company_fundamentals()
-
-                    ticker_data = df[df['symbol'] == ticker]
-                    if not ticker_data.empty and 'sector' in ticker_data.columns:
-                        sector = ticker_data.iloc[0].get('sector', '')
-                except Exception:
-                    sector = ''
+                info = index[ticker]
+                entity_type = info['entity_type']
+                sector = info['sector']
 
                 # Check for matches
                 match_type = None
@@ -371,6 +313,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_search_tickers")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_peers(
         ticker: str,
         limit: int = 10,
@@ -402,34 +345,21 @@ def register(mcp: FastMCP):
                 raise TickerNotFoundError(ticker, suggestions)
 
             # Get entity type and sector
-            entity_type = loader.get_ticker_entity_type(ticker)
-
-            # Get sector
-            sector = None
-            try:
-                if entity_type == 'BANK':
-                    df = loader.get_bank_fundamentals()
-                elif entity_type == 'INSURANCE':
-                    df = loader.get_insurance_fundamentals()
-                elif entity_type == 'SECURITY':
-                    df = loader.get_security_fundamentals()
-                else:
-                    df = loader.get_company_fundamentals()
-
-                ticker_data = df[df['symbol'] == ticker]
-                if not ticker_data.empty and 'sector' in ticker_data.columns:
-                    sector = ticker_data.iloc[0].get('sector')
-            except Exception:
-                pass
+            index = loader.get_ticker_index()
+            entity_type = index[ticker]['entity_type']
+            sector = index[ticker]['sector']
 
             if not sector:
                 return f"Cannot find sector for {ticker}. Unable to determine peers."
 
             # Find peers in same sector
-            peers = []
-            sector_df = df[df['sector'] == sector]
+            sector_tickers = sorted(
+                t for t, info in index.items()
+                if info['sector'] == sector and info['entity_type'] == entity_type
+            )
 
-            for peer in sector_df['symbol'].unique():
+            peers = []
+            for peer in sector_tickers:
                 if exclude_self and peer == ticker:
                     continue
 
@@ -448,7 +378,7 @@ def register(mcp: FastMCP):
             response = f"""## Peers for {ticker}
 
 **Sector:** {sector}
-**Total Peers:** {len(sector_df['symbol'].unique()) - (1 if exclude_self else 0)}
+**Total Peers:** {len(sector_tickers) - (1 if exclude_self else 0)}
 **Showing:** {len(peers)}
 
 {format_dataframe_markdown(df_peers)}
@@ -463,3 +393,42 @@ def register(mcp: FastMCP):
             return str(e)
         except Exception as e:
             return handle_tool_error(e, "bsc_get_peers")
+
+    @mcp.tool()
+    def bsc_get_cache_stats() -> str:
+        """
+        Show the server's data cache counters (hits, misses, memory, load time).
+
+        Returns:
+            Markdown summary and per-dataset memory usage
+
+        Examples:
+            - bsc_get_cache_stats() - Check cache hit rate and memory usage
+        """
+        try:
+            stats = get_data_loader().get_cache_stats()
+
+            response = f"""## Data Cache Statistics
+
+| Counter | Value |
+|---------|-------|
+| **Hits** | {stats['hits']:,} |
+| **Misses (loads)** | {stats['misses']:,} |
+| **Hit Rate** | {stats['hit_rate']:.1%} |
+| **Evictions** | {stats['evictions']:,} |
+| **Load Time** | {stats['load_seconds']:.2f}s |
+| **Bytes Loaded** | {stats['bytes_loaded'] / 1e6:,.1f} MB |
+| **Resident** | {stats['bytes'] / 1e6:,.1f} / {stats['max_bytes'] / 1e6:,.0f} MB ({stats['entries']} datasets) |
+"""
+            if stats['datasets']:
+                df = pd.DataFrame(
+                    sorted(stats['datasets'].items(), key=lambda item: -item[1]),
+                    columns=['Dataset', 'Bytes']
+                )
+                df['MB'] = (df.pop('Bytes') / 1e6).round(1)
+                response += "\n" + format_dataframe_markdown(df, title="Resident Datasets")
+
+            return response
+
+        except Exception as e:
+            return handle_tool_error(e, "bsc_get_cache_stats")
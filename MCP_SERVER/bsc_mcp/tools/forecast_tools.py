@@ -16,6 +16,7 @@ from mcp.server.fastmcp import FastMCP
 import pandas as pd
 
 from bsc_mcp.services.data_loader import get_data_loader
+from bsc_mcp.utils.concurrency import run_in_worker
 from bsc_mcp.utils.errors import handle_tool_error, TickerNotFoundError
 from bsc_mcp.utils.formatters import (
     format_dataframe_markdown,
@@ -30,6 +31,7 @@ def register(mcp: FastMCP):
     """Register all forecast tools with the MCP server."""
 
     @mcp.tool()
+    @run_in_worker()  # entity lookup reads the ticker index
     def bsc_get_bsc_forecast(ticker: str) -> str:
         """
         Get BSC analyst forecast for a specific ticker.
@@ -13,12 +13,14 @@ Tools:
 5. bsc_screen_fundamentals - Screen stocks by criteria
 """
 
-from typing import Optional, List
+from typing import Dict, Optional, List
 from mcp.server.fastmcp import FastMCP
 import pandas as pd
 
 from bsc_mcp.services.data_loader import get_data_loader
+from bsc_mcp.services.screener import screen_snapshot
 from bsc_mcp.utils.errors import handle_tool_error, TickerNotFoundError
+from bsc_mcp.utils.concurrency import run_in_worker
 from bsc_mcp.utils.formatters import (
     format_dataframe_markdown,
     format_number,
@@ -32,6 +34,7 @@ def register(mcp: FastMCP):
     """Register all fundamental tools with the MCP server."""
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_company_financials(
         ticker: str,
         period: str = "Quarterly",
@@ -133,6 +136,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_company_financials")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_bank_financials(
         ticker: str,
         period: str = "Quarterly",
@@ -217,6 +221,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_bank_financials")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_latest_fundamentals(ticker: str) -> str:
         """
         Get the most recent fundamental data for a ticker.
@@ -311,6 +316,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_latest_fundamentals")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_compare_fundamentals(
         tickers: str,
         metrics: Optional[str] = None
@@ -407,17 +413,23 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_compare_fundamentals")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_screen_fundamentals(
         roe_min: Optional[float] = None,
         roe_max: Optional[float] = None,
         pe_max: Optional[float] = None,
         entity_type: Optional[str] = None,
         sector: Optional[str] = None,
-        limit: int = 20
+        limit: int = 20,
+        min_filters: Optional[Dict[str, float]] = None,
+        max_filters: Optional[Dict[str, float]] = None
     ) -> str:
         """
         Screen stocks by fundamental criteria.
 
+        Screens run on the latest-snapshot table (latest quarter fundamentals
+        + latest PE/PB per ticker); tickers missing a filtered metric are excluded.
+
         Args:
             roe_min: Minimum ROE (e.g., 15 for 15%)
             roe_max: Maximum ROE
@@ -425,6 +437,8 @@ def register(mcp: FastMCP):
             entity_type: Filter by "BANK", "COMPANY", "INSURANCE", "SECURITY"
             sector: Filter by sector name
             limit: Maximum results (default: 20)
+            min_filters: Minimum bounds on any metric, e.g. {"roa": 1.5, "pb_ratio": 0.5}
+            max_filters: Maximum bounds on any metric, e.g. {"npl_ratio": 2}
 
         Returns:
             Markdown table of stocks matching criteria
@@ -433,80 +447,51 @@ def register(mcp: FastMCP):
             - bsc_screen_fundamentals(roe_min=20) - Stocks with ROE > 20%
             - bsc_screen_fundamentals(roe_min=15, entity_type="BANK") - Banks with ROE > 15%
             - bsc_screen_fundamentals(pe_max=10, roe_min=15) - Value + quality stocks
+            - bsc_screen_fundamentals(max_filters={"pb_ratio": 1}) - Trading below book
         """
         try:
             loader = get_data_loader()
+            snapshot = loader.get_screener_snapshot()
+
+            mins = dict(min_filters or {})
+            maxs = dict(max_filters or {})
+            if roe_min is not None:
+                mins['roe'] = roe_min
+            if roe_max is not None:
+                maxs['roe'] = roe_max
+            if pe_max is not None:
+                maxs['pe_ratio'] = pe_max
+
+            try:
+                matches = screen_snapshot(
+                    snapshot,
+                    entity_type=entity_type,
+                    sector=sector,
+                    min_filters=mins,
+                    max_filters=maxs,
+                    limit=limit
+                )
+            except KeyError as e:
+                return f"{e.args[0]}. Use metric column names from bsc_get_latest_fundamentals."
 
-            results = []
-
-            # Determine which data sources to search
-            entity_types_to_check = []
-            if entity_type:
-                entity_types_to_check = [entity_type.upper()]
-            else:
-                entity_types_to_check = ['COMPANY', 'BANK', 'INSURANCE', 'SECURITY']
-
-            for etype in entity_types_to_check:
-                try:
-                    if etype == 'BANK':
-                        df = loader.get_bank_fundamentals()
-                    elif etype == 'INSURANCE':
-                        df = loader.get_insurance_fundamentals()
-                    elif etype == 'SECURITY':
-                        df = loader.get_security_fundamentals()
-                    else:
-                        df = loader.get_company_fundamentals()
-                except FileNotFoundError:
-                    continue
+            extra_metrics = [
+                m for m in dict.fromkeys(list(mins) + list(maxs))
+                if m not in ('roe', 'roa', 'pe_ratio')
+            ]
 
-                # Get latest data for each ticker
-                for ticker in df['symbol'].unique():
-                    ticker_df = df[df['symbol'] == ticker].sort_values(
-                        ['year', 'quarter'], ascending=[False, False]
-                    )
-
-                    if ticker_df.empty:
-                        continue
-
-                    latest = ticker_df.iloc[0]
-
-                    # Apply filters
-                    if sector and latest.get('sector') != sector:
-                        continue
-
-                    roe = latest.get('roe')
-                    if roe_min is not None and (pd.isna(roe) or roe < roe_min):
-                        continue
-                    if roe_max is not None and (pd.isna(roe) or roe > roe_max):
-                        continue
-
-                    # Get PE if needed
-                    pe = None
-                    if pe_max is not None:
-                        try:
-                            pe_df = loader.get_pe_historical()
-                            pe_ticker = pe_df[pe_df['symbol'] == ticker]
-                            if not pe_ticker.empty:
-                                pe = pe_ticker.sort_values('date', ascending=False).iloc[0]['pe_ratio']
-                                if pd.isna(pe) or pe > pe_max:
-                                    continue
-                        except Exception:
-                            pass
-
-                    results.append({
-                        'Ticker': ticker,
-                        'Type': etype,
-                        'Sector': latest.get('sector', 'N/A'),
-                        'ROE': format_percent(roe),
-                        'ROA': format_percent(latest.get('roa')),
-                        'PE': format_number(pe) if pe else 'N/A'
-                    })
-
-                    if len(results) >= limit:
-                        break
-
-                if len(results) >= limit:
-                    break
+            results = []
+            for row in matches.to_dict('records'):
+                result = {
+                    'Ticker': row['symbol'],
+                    'Type': row['entity_type'],
+                    'Sector': row['sector'] if pd.notna(row['sector']) else 'N/A',
+                    'ROE': format_percent(row.get('roe')),
+                    'ROA': format_percent(row.get('roa')),
+                    'PE': format_number(row['pe_ratio'])
+                }
+                for metric in extra_metrics:
+                    result[metric] = format_number(row.get(metric))
+                results.append(result)
 
             if not results:
                 return "No stocks found matching the specified criteria."
@@ -521,6 +506,10 @@ def register(mcp: FastMCP):
                 filters.append(f"ROE <= {roe_max}%")
             if pe_max:
                 filters.append(f"PE <= {pe_max}")
+            for metric, bound in (min_filters or {}).items():
+                filters.append(f"{metric} >= {bound}")
+            for metric, bound in (max_filters or {}).items():
+                filters.append(f"{metric} <= {bound}")
             if entity_type:
                 filters.append(f"Type = {entity_type}")
             if sector:
@@ -17,6 +17,7 @@ import pandas as pd
 
 from bsc_mcp.services.data_loader import get_data_loader
 from bsc_mcp.utils.errors import handle_tool_error
+from bsc_mcp.utils.concurrency import run_in_worker
 from bsc_mcp.utils.formatters import format_dataframe_markdown, format_number, format_percent
 
 
@@ -24,6 +25,7 @@ def register(mcp: FastMCP):
     """Register all sector tools with the MCP server."""
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_sector_scores(
         sector: Optional[str] = None,
         signal: Optional[str] = None
@@ -107,6 +109,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_sector_scores")
 
     @mcp.tool()
+    @run_in_worker(timeout=120)
     def bsc_get_sector_history(
         sector: str,
         limit: int = 30
@@ -182,6 +185,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_sector_history")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_compare_sectors(
         sectors: Optional[str] = None,
         metrics: Optional[str] = None
@@ -20,6 +20,7 @@ import pandas as pd
 
 from bsc_mcp.services.data_loader import get_data_loader
 from bsc_mcp.utils.errors import handle_tool_error, TickerNotFoundError
+from bsc_mcp.utils.concurrency import run_in_worker
 from bsc_mcp.utils.formatters import (
     format_dataframe_markdown,
     format_number,
@@ -33,6 +34,7 @@ def register(mcp: FastMCP):
     """Register all technical tools with the MCP server."""
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_technical_indicators(
         ticker: str,
         limit: int = 30,
@@ -61,22 +63,22 @@ def register(mcp: FastMCP):
             - bsc_get_technical_indicators("VNM", limit=10, indicators="rsi,macd")
         """
         try:
+            if limit < 1:
+                return f"Invalid limit '{limit}'. Use a positive number of days"
+
             loader = get_data_loader()
             ticker = ticker.upper().strip()
 
-            # Load technical data
-            df = loader.get_technical_basic()
-
-            # Filter by ticker
-            ticker_df = df[df['symbol'] == ticker].copy()
+            # Last `limit` rows of the ticker (pre-sorted partition slice)
+            ticker_df = loader.get_partitions("technical_basic").get(ticker, limit=limit)
 
             if ticker_df.empty:
                 all_tickers = loader.get_available_tickers()
                 suggestions = [t for t in all_tickers if t.startswith(ticker[:2])][:5]
                 raise TickerNotFoundError(ticker, suggestions)
 
-            # Sort by date and limit
-            ticker_df = ticker_df.sort_values('date', ascending=False).head(limit)
+            # Most recent first
+            ticker_df = ticker_df.iloc[::-1]
 
             # Select columns based on requested indicators
             base_cols = ['date', 'open', 'high', 'low', 'close', 'volume']
@@ -125,6 +127,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_technical_indicators")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_latest_technicals(ticker: str) -> str:
         """
         Get a snapshot of the latest technical indicators for a ticker.
@@ -144,18 +147,14 @@ def register(mcp: FastMCP):
             loader = get_data_loader()
             ticker = ticker.upper().strip()
 
-            # Load technical data
-            df = loader.get_technical_basic()
+            # Latest row for ticker (pre-sorted partition)
+            latest = loader.get_partitions("technical_basic").latest_row(ticker)
 
-            # Get latest for ticker
-            ticker_df = df[df['symbol'] == ticker].sort_values('date', ascending=False)
-
-            if ticker_df.empty:
+            if latest is None:
                 all_tickers = loader.get_available_tickers()
                 suggestions = [t for t in all_tickers if t.startswith(ticker[:2])][:5]
                 raise TickerNotFoundError(ticker, suggestions)
 
-            latest = ticker_df.iloc[0]
             date_str = pd.to_datetime(latest['date']).strftime('%Y-%m-%d')
 
             # Calculate signals
@@ -237,6 +236,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_latest_technicals")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_technical_alerts(
         ticker: Optional[str] = None,
         alert_type: str = "all",
@@ -269,22 +269,26 @@ def register(mcp: FastMCP):
             all_alerts = []
 
             # Load relevant alert files
-            alert_loaders = {
-                'breakout': ('breakout_alerts', loader.get_breakout_alerts),
-                'ma_crossover': ('ma_crossover_alerts', loader.get_ma_crossover_alerts),
-                'volume_spike': ('volume_spike_alerts', loader.get_volume_spike_alerts),
+            alert_datasets = {
+                'breakout': 'breakout_alerts',
+                'ma_crossover': 'ma_crossover_alerts',
+                'volume_spike': 'volume_spike_alerts',
             }
 
-            for atype, (name, loader_func) in alert_loaders.items():
+            for atype, name in alert_datasets.items():
                 if alert_type != 'all' and alert_type != atype:
                     continue
 
                 try:
-                    df = loader_func()
+                    parts = loader.get_partitions(name)
 
-                    # Filter by ticker if provided
+                    # Ticker rows are one slice of the pre-sorted frame; market-wide,
+                    # the `limit` most recent alerts are within each symbol's last
+                    # `limit` rows, so the full history is never concatenated
                     if ticker:
-                        df = df[df['symbol'] == ticker.upper()]
+                        df = parts.get(ticker.upper())
+                    else:
+                        df = parts.latest(limit)
 
                     # Add alert type column
                     df = df.copy()
@@ -330,6 +334,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_technical_alerts")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_market_breadth(date: Optional[str] = None) -> str:
         """
         Get market breadth indicators (Advance/Decline, McClellan, etc.).
@@ -398,6 +403,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_market_breadth")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_candlestick_patterns(
         ticker: Optional[str] = None,
         pattern: Optional[str] = None,
@@ -437,14 +443,15 @@ def register(mcp: FastMCP):
             loader = get_data_loader()
 
             # Load pattern alerts
-            df = loader.get_pattern_alerts()
+            parts = loader.get_partitions("pattern_alerts")
+            df = parts.frame
 
             if df.empty:
                 return "No candlestick pattern data available."
 
-            # Filter by ticker
+            # Filter by ticker (pre-sorted partition slice)
             if ticker:
-                df = df[df['symbol'] == ticker.upper()]
+                df = parts.get(ticker.upper())
                 if df.empty:
                     return f"No patterns found for ticker: {ticker.upper()}"
 
@@ -502,6 +509,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_candlestick_patterns")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_ohlcv_raw(
         ticker: str,
         limit: int = 60,
@@ -20,6 +20,7 @@ import numpy as np
 
 from bsc_mcp.services.data_loader import get_data_loader
 from bsc_mcp.utils.errors import handle_tool_error, TickerNotFoundError
+from bsc_mcp.utils.concurrency import run_in_worker
 from bsc_mcp.utils.formatters import (
     format_dataframe_markdown,
     format_number,
@@ -32,6 +33,7 @@ def register(mcp: FastMCP):
     """Register all valuation tools with the MCP server."""
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_ticker_valuation(
         ticker: str,
         metric: str = "PE",
@@ -108,6 +110,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_ticker_valuation")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_valuation_stats(
         ticker: str,
         metric: str = "PE",
@@ -225,6 +228,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_valuation_stats")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_sector_valuation(
         sector: Optional[str] = None,
         metric: str = "PE"
@@ -287,6 +291,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_get_sector_valuation")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_compare_valuations(
         tickers: str,
         metric: str = "PE"
@@ -367,6 +372,7 @@ def register(mcp: FastMCP):
             return handle_tool_error(e, "bsc_compare_valuations")
 
     @mcp.tool()
+    @run_in_worker()
     def bsc_get_vnindex_valuation(limit: int = 60) -> str:
         """
         Get VN-Index valuation (PE/PB) with historical bands.
@@ -17,6 +17,7 @@ from bsc_mcp.utils.errors import (
     DataNotFoundError,
     handle_tool_error,
 )
+from bsc_mcp.utils.concurrency import run_in_worker
 
 __all__ = [
     "format_number",
@@ -27,4 +28,5 @@ __all__ = [
     "TickerNotFoundError",
     "DataNotFoundError",
     "handle_tool_error",
+    "run_in_worker",
 ]
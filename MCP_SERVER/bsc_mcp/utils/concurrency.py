@@ -0,0 +1,102 @@
+"""
+Tool Concurrency
+================
+
+Runs data-heavy tools off the event loop.
+
+FastMCP calls synchronous tools directly on its event loop, so one slow
+parquet scan blocks every other client. ``run_in_worker`` turns a sync tool
+into an async one that executes on a bounded thread pool:
+
+- At most ``TOOL_WORKERS`` heavy tools run at once; the rest queue
+- Each call has a timeout (``TOOL_TIMEOUT`` or a per-tool override)
+- Queued calls are dropped when the client cancels or the timeout fires;
+  a call already running finishes in its thread and its result is discarded
+
+Tools that may build the ticker index or load a frame on a cold cache run
+on the pool too; only pure in-memory lookups (e.g. cache counters) and small
+single-file reads stay plain sync tools. ``warm_up`` builds the shared
+indexes on the pool at startup so the first calls find them ready.
+
+Usage:
+    @mcp.tool()
+    @run_in_worker(timeout=120)
+    def bsc_get_sector_history(sector: str, limit: int = 30) -> str:
+        ...
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from bsc_mcp.config import get_config
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for heavy tools (created on first use)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_config().TOOL_WORKERS,
+                thread_name_prefix="bsc-tool"
+            )
+    return _executor
+
+
+def warm_up(*builders: Callable[[], object]) -> List[Future]:
+    """
+    Run index/snapshot builders on the worker pool without waiting.
+
+    Failures (e.g. a missing data file) are logged; the tools build the same
+    index lazily on their first call.
+
+    Returns:
+        The submitted futures
+    """
+    def run(builder: Callable[[], object]):
+        try:
+            builder()
+        except Exception as e:
+            logger.warning(f"Warm-up of {getattr(builder, '__name__', builder)} failed: {e}")
+
+    return [get_tool_executor().submit(run, builder) for builder in builders]
+
+
+def run_in_worker(timeout: Optional[float] = None) -> Callable:
+    """
+    Decorator: run a sync tool on the worker pool with a timeout.
+
+    The wrapper keeps the tool's name, docstring and signature, so FastMCP
+    registers the same parameters.
+
+    Args:
+        timeout: Seconds before the call is abandoned (default: Config.TOOL_TIMEOUT)
+    """
+    def decorator(func: Callable[..., str]) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> str:
+            limit = timeout if timeout is not None else get_config().TOOL_TIMEOUT
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                get_tool_executor(),
+                functools.partial(func, *args, **kwargs)
+            )
+            try:
+                return await asyncio.wait_for(future, timeout=limit)
+            except asyncio.TimeoutError:
+                logger.warning(f"{func.__name__} timed out after {limit:.0f}s")
+                return (
+                    f"**Request timed out** after {limit:.0f}s in `{func.__name__}`.\n\n"
+                    f"Try a narrower query (fewer tickers, a shorter period or a smaller `limit`)."
+                )
+        return wrapper
+    return decorator
@@ -17,6 +17,9 @@ WEBAPP_ROOT = PROJECT_ROOT / "WEBAPP"
 # Raw data paths
 RAW_DATA = DATA_ROOT / "raw"
 RAW_OHLCV = RAW_DATA / "ohlcv"
+# OHLCV_mktcap.parquet is written sorted by (symbol, date) in row groups of this
+# size so readers can fetch one symbol's recent bars from 1-2 row groups
+OHLCV_ROW_GROUP_SIZE = 50_000
 RAW_FUNDAMENTAL = RAW_DATA / "fundamental" / "csv"
 RAW_COMMODITY = RAW_DATA / "commodity"
 RAW_MACRO = RAW_DATA / "macro"
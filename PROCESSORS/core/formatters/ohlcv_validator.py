@@ -12,8 +12,9 @@ Date: 2025-12-07
 
 from pathlib import Path
 import json
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from dataclasses import dataclass, field
 
 
@@ -26,27 +27,129 @@ class ValidationIssue:
     rule: str
     message: str
     severity: str = "WARNING"  # WARNING, ERROR, CRITICAL
+    date: Optional[Any] = None
+
+
+# Columnar issue table: one row per issue, offending values in their own
+# dtype. 'message' is only set for issues added one by one (add_issue);
+# other messages are rendered from ISSUE_MESSAGES when issues are materialized.
+ISSUE_COLUMNS = [
+    'rule', 'field', 'severity', 'row_index', 'symbol', 'date',
+    'value', 'low', 'high', 'expected', 'message'
+]
+
+ISSUE_MESSAGES = {
+    'high_low_consistency': lambda r: f"High ({r['high']}) < Low ({r['low']})",
+    'close_range': lambda r: f"Close ({r['value']}) not in range [{r['low']}, {r['high']}]",
+    'open_range': lambda r: f"Open ({r['value']}) not in range [{r['low']}, {r['high']}]",
+    'positive_volume': lambda r: f"Volume is negative: {r['value']}",
+    'positive_price': lambda r: f"{r['field'].title()} price is <= 0: {r['value']}",
+    'pct_consistency': lambda r: f"Price change % mismatch: {r['value']:.2f}% vs expected {r['expected']:.2f}%",
+    'turnover_consistency': lambda r: f"Turnover mismatch: {r['value']:.0f} vs expected {r['expected']:.0f}",
+}
+
+
+def _missing(value) -> bool:
+    return value is None or (np.isscalar(value) and pd.isna(value))
 
 
 @dataclass
 class ValidationResult:
-    """Result of validation"""
+    """
+    Result of validation
+
+    Issues are kept as columnar batches (one per rule check). ``issue_table``
+    concatenates them, ``counts()``/``sample()`` summarize them batch by batch,
+    and ``issues`` materializes ValidationIssue objects on first access.
+    """
     is_valid: bool
     total_records: int
     errors: int = 0
     warnings: int = 0
     critical: int = 0
-    issues: List[ValidationIssue] = field(default_factory=list)
+    _parts: List[pd.DataFrame] = field(default_factory=list, repr=False)
+    _issues: Optional[List[ValidationIssue]] = field(default=None, repr=False)
+
+    def add_issues(self, issues: pd.DataFrame):
+        """Add a batch of issues (a frame with a subset of ISSUE_COLUMNS)"""
+        if issues.empty:
+            return
+        self._parts.append(issues)
+        self._issues = None
+        counts = issues['severity'].value_counts()
+        self.errors += int(counts.get("ERROR", 0))
+        self.warnings += int(counts.get("WARNING", 0))
+        self.critical += int(counts.get("CRITICAL", 0))
 
     def add_issue(self, issue: ValidationIssue):
         """Add an issue to the result"""
-        self.issues.append(issue)
-        if issue.severity == "ERROR":
-            self.errors += 1
-        elif issue.severity == "WARNING":
-            self.warnings += 1
-        elif issue.severity == "CRITICAL":
-            self.critical += 1
+        row = {
+            'rule': issue.rule, 'field': issue.field, 'severity': issue.severity,
+            'row_index': issue.row_index, 'symbol': issue.symbol, 'date': issue.date,
+            'message': issue.message,
+        }
+        self.add_issues(pd.DataFrame([{k: v for k, v in row.items() if v is not None}]))
+
+    @property
+    def issue_table(self) -> pd.DataFrame:
+        """All issues, one row each, in the order they were found"""
+        if not self._parts:
+            return pd.DataFrame({col: pd.Series(dtype=object) for col in ISSUE_COLUMNS})
+        return pd.concat(self._parts, ignore_index=True).reindex(columns=ISSUE_COLUMNS)
+
+    @property
+    def issues(self) -> List[ValidationIssue]:
+        """All issues as ValidationIssue objects (built on first access)"""
+        if self._issues is None:
+            self._issues = [issue for part in self._parts for issue in self.materialize(part)]
+        return self._issues
+
+    @staticmethod
+    def materialize(table: pd.DataFrame) -> List[ValidationIssue]:
+        """ValidationIssue objects for rows of an issue table"""
+        issues = []
+        for row in table.to_dict('records'):
+            message = row.get('message')
+            if _missing(message):
+                message = ISSUE_MESSAGES[row['rule']](row)
+            optional = {col: None if _missing(row.get(col)) else row[col] for col in ('row_index', 'symbol', 'date')}
+            issues.append(ValidationIssue(
+                field=row['field'],
+                rule=row['rule'],
+                message=message,
+                severity=row['severity'],
+                **optional,
+            ))
+        return issues
+
+    def head(self, n: int) -> List[ValidationIssue]:
+        """First ``n`` issues, materializing only those"""
+        issues = []
+        for part in self._parts:
+            if len(issues) >= n:
+                break
+            issues.extend(self.materialize(part.head(n - len(issues))))
+        return issues
+
+    def counts(self) -> pd.DataFrame:
+        """Issue counts per (rule, field, severity)"""
+        keys = ['rule', 'field', 'severity']
+        if not self._parts:
+            return pd.DataFrame(columns=keys + ['count'])
+        sizes = pd.concat([part.groupby(keys, sort=False).size() for part in self._parts])
+        return sizes.groupby(level=keys, sort=False).sum().reset_index(name='count')
+
+    def sample(self, per_rule: int = 5) -> List[ValidationIssue]:
+        """First ``per_rule`` issues of every (rule, field), as objects"""
+        seen: Dict[tuple, int] = {}
+        issues = []
+        for part in self._parts:
+            for key, group in part.groupby(['rule', 'field'], sort=False):
+                take = per_rule - seen.get(key, 0)
+                if take > 0:
+                    issues.extend(self.materialize(group.head(take)))
+                    seen[key] = seen.get(key, 0) + min(take, len(group))
+        return issues
 
     def summary(self) -> str:
         """Get summary string"""
@@ -67,8 +170,11 @@ class OHLCVValidator:
         result = validator.validate_ohlcv_data(df)
 
         if not result.is_valid:
-            for issue in result.issues[:10]:  # Show first 10 issues
+            for issue in result.sample(per_rule=3):  # A few issues per rule
                 print(f"{issue.severity}: {issue.message}")
+
+            print(result.counts())             # Issue counts per rule
+            bad = result.issue_table           # Columnar: rule, symbol, date, values...
     """
 
     def __init__(self, schema_path: Optional[str] = None):
@@ -83,6 +189,8 @@ class OHLCVValidator:
             root = Path(__file__).resolve().parents[3]
             schema_path = root / "config" / "schemas" / "data" / "ohlcv_data_schema.json"
 
+        schema_path = Path(schema_path)
+
         # Try to load schema, use defaults if not found
         if schema_path.exists():
             try:
@@ -137,117 +245,91 @@ class OHLCVValidator:
                     severity="CRITICAL"
                 ))
 
+    @staticmethod
+    def _issue_frame(df: pd.DataFrame, mask: pd.Series, rule: str, field: str, severity: str,
+                     **values: pd.Series) -> pd.DataFrame:
+        """
+        Issue rows for the rows of ``df`` selected by ``mask``
+
+        Args:
+            df: Validated DataFrame (symbol/date are taken from it when present)
+            mask: Boolean Series aligned with df
+            rule, field, severity: Same for every issue
+            **values: value/low/high/expected Series aligned with df
+        """
+        mask = mask.to_numpy(dtype=bool, na_value=False)
+        rows = df.index[mask]
+        issues = pd.DataFrame({'rule': rule, 'field': field, 'severity': severity}, index=range(len(rows)))
+        issues['row_index'] = rows
+        for col in ('symbol', 'date'):
+            if col in df.columns:
+                issues[col] = df[col].to_numpy()[mask]
+        for col, series in values.items():
+            issues[col] = series.to_numpy()[mask]
+        return issues
+
     def _validate_data_quality(self, df: pd.DataFrame, result: ValidationResult, strict: bool):
         """Validate data quality rules"""
+        soft = "ERROR" if strict else "WARNING"
 
         # Rule 1: High >= Low
-        invalid_high_low = df[df['high'] < df['low']]
-        for idx, row in invalid_high_low.iterrows():
-            result.add_issue(ValidationIssue(
-                row_index=idx,
-                symbol=row.get('symbol'),
-                field='high/low',
-                rule='high_low_consistency',
-                message=f"High ({row['high']}) < Low ({row['low']})",
-                severity="ERROR"
-            ))
+        result.add_issues(self._issue_frame(
+            df, df['high'] < df['low'], 'high_low_consistency', 'high/low', "ERROR",
+            low=df['low'], high=df['high']
+        ))
 
         # Rule 2: Close between Low and High
-        invalid_close = df[(df['close'] < df['low']) | (df['close'] > df['high'])]
-        for idx, row in invalid_close.iterrows():
-            result.add_issue(ValidationIssue(
-                row_index=idx,
-                symbol=row.get('symbol'),
-                field='close',
-                rule='close_range',
-                message=f"Close ({row['close']}) not in range [{row['low']}, {row['high']}]",
-                severity="ERROR"
-            ))
+        result.add_issues(self._issue_frame(
+            df, (df['close'] < df['low']) | (df['close'] > df['high']), 'close_range', 'close', "ERROR",
+            value=df['close'], low=df['low'], high=df['high']
+        ))
 
         # Rule 3: Open between Low and High
-        invalid_open = df[(df['open'] < df['low']) | (df['open'] > df['high'])]
-        for idx, row in invalid_open.iterrows():
-            severity = "ERROR" if strict else "WARNING"
-            result.add_issue(ValidationIssue(
-                row_index=idx,
-                symbol=row.get('symbol'),
-                field='open',
-                rule='open_range',
-                message=f"Open ({row['open']}) not in range [{row['low']}, {row['high']}]",
-                severity=severity
-            ))
+        result.add_issues(self._issue_frame(
+            df, (df['open'] < df['low']) | (df['open'] > df['high']), 'open_range', 'open', soft,
+            value=df['open'], low=df['low'], high=df['high']
+        ))
 
         # Rule 4: Volume should be positive
-        invalid_volume = df[df['volume'] < 0]
-        for idx, row in invalid_volume.iterrows():
-            result.add_issue(ValidationIssue(
-                row_index=idx,
-                symbol=row.get('symbol'),
-                field='volume',
-                rule='positive_volume',
-                message=f"Volume is negative: {row['volume']}",
-                severity="ERROR"
-            ))
+        result.add_issues(self._issue_frame(
+            df, df['volume'] < 0, 'positive_volume', 'volume', "ERROR", value=df['volume']
+        ))
 
         # Rule 5: Prices should be positive
         for price_col in ['open', 'high', 'low', 'close']:
             if price_col in df.columns:
-                negative_prices = df[df[price_col] <= 0]
-                for idx, row in negative_prices.iterrows():
-                    result.add_issue(ValidationIssue(
-                        row_index=idx,
-                        symbol=row.get('symbol'),
-                        field=price_col,
-                        rule='positive_price',
-                        message=f"{price_col.title()} price is <= 0: {row[price_col]}",
-                        severity="ERROR"
-                    ))
+                result.add_issues(self._issue_frame(
+                    df, df[price_col] <= 0, 'positive_price', price_col, "ERROR", value=df[price_col]
+                ))
 
     def _validate_business_rules(self, df: pd.DataFrame, result: ValidationResult, strict: bool):
         """Validate business logic rules"""
+        soft = "ERROR" if strict else "WARNING"
 
         # Rule: Price change % consistency (if price_change_pct exists)
         if 'price_change_pct' in df.columns and 'price_change' in df.columns and 'close' in df.columns:
-            # Calculate expected percentage
+            # Issues are reported in (symbol, date) order
             df_sorted = df.sort_values(['symbol', 'date'])
-            df_sorted['prev_close'] = df_sorted.groupby('symbol')['close'].shift(1)
-
-            # Where we have prev_close, check consistency
-            has_prev = df_sorted[df_sorted['prev_close'].notna()].copy()
-            if len(has_prev) > 0:
-                has_prev['expected_pct'] = (has_prev['price_change'] / has_prev['prev_close']) * 100
-                has_prev['pct_diff'] = abs(has_prev['price_change_pct'] - has_prev['expected_pct'])
-
-                # Allow 0.1% tolerance
-                inconsistent = has_prev[has_prev['pct_diff'] > 0.1]
-                for idx, row in inconsistent.iterrows():
-                    severity = "ERROR" if strict else "WARNING"
-                    result.add_issue(ValidationIssue(
-                        row_index=idx,
-                        symbol=row.get('symbol'),
-                        field='price_change_pct',
-                        rule='pct_consistency',
-                        message=f"Price change % mismatch: {row['price_change_pct']:.2f}% vs expected {row['expected_pct']:.2f}%",
-                        severity=severity
-                    ))
+            prev_close = df_sorted.groupby('symbol')['close'].shift(1)
+            expected_pct = (df_sorted['price_change'] / prev_close) * 100
+            pct_diff = (df_sorted['price_change_pct'] - expected_pct).abs()
+
+            # Allow 0.1% tolerance (rows without prev_close compare as NaN)
+            result.add_issues(self._issue_frame(
+                df_sorted, prev_close.notna() & (pct_diff > 0.1), 'pct_consistency', 'price_change_pct', soft,
+                value=df_sorted['price_change_pct'], expected=expected_pct
+            ))
 
         # Rule: Turnover consistency (if exists)
         if 'turnover' in df.columns:
-            df['expected_turnover'] = df['close'] * df['volume']
-            df['turnover_diff_pct'] = abs((df['turnover'] - df['expected_turnover']) / df['expected_turnover']) * 100
+            expected_turnover = df['close'] * df['volume']
+            turnover_diff_pct = ((df['turnover'] - expected_turnover) / expected_turnover).abs() * 100
 
             # Allow 1% tolerance
-            inconsistent = df[df['turnover_diff_pct'] > 1.0]
-            for idx, row in inconsistent.iterrows():
-                severity = "ERROR" if strict else "WARNING"
-                result.add_issue(ValidationIssue(
-                    row_index=idx,
-                    symbol=row.get('symbol'),
-                    field='turnover',
-                    rule='turnover_consistency',
-                    message=f"Turnover mismatch: {row['turnover']:.0f} vs expected {row['expected_turnover']:.0f}",
-                    severity=severity
-                ))
+            result.add_issues(self._issue_frame(
+                df, turnover_diff_pct > 1.0, 'turnover_consistency', 'turnover', soft,
+                value=df['turnover'], expected=expected_turnover
+            ))
 
     def generate_report(self, result: ValidationResult, max_issues: int = 50) -> str:
         """
@@ -272,13 +354,22 @@ class OHLCVValidator:
         lines.append(f"Critical:         {result.critical}")
         lines.append("")
 
-        if result.issues:
-            lines.append(f"Issues Found (showing first {min(max_issues, len(result.issues))}):")
+        total = result.errors + result.warnings + result.critical
+        if total:
+            lines.append("Issues by Rule:")
+            lines.append("-" * 70)
+            lines.append(f"{'Rule':<25} {'Field':<15} {'Severity':<10} {'Count':>8}")
+            lines.append("-" * 70)
+            for row in result.counts().itertuples(index=False):
+                lines.append(f"{row.rule:<25} {row.field:<15} {row.severity:<10} {row.count:>8}")
+            lines.append("")
+
+            lines.append(f"Issues Found (showing first {min(max_issues, total)}):")
             lines.append("-" * 70)
             lines.append(f"{'Severity':<10} {'Symbol':<8} {'Field':<15} {'Message':<35}")
             lines.append("-" * 70)
 
-            for issue in result.issues[:max_issues]:
+            for issue in result.head(max_issues):
                 symbol = issue.symbol or "N/A"
                 lines.append(f"{issue.severity:<10} {symbol:<8} {issue.field:<15} {issue.message[:35]}")
 
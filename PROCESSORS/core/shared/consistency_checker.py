@@ -19,8 +19,13 @@ logger = logging.getLogger(__name__)
 class ConsistencyChecker:
     """Checker for data consistency across different sources and time periods.
     Kiểm tra tính nhất quán dữ liệu qua các nguồn và khoảng thời gian khác nhau.
+    
+    Checks run over every symbol; counts are exact, detail lists
+    (inconsistencies, gaps) keep the first MAX_DETAILS entries.
     """
     
+    MAX_DETAILS = 1000
+    
     def __init__(self, data_warehouse_path: str = None):
         """Initialize ConsistencyChecker.
         Khởi tạo ConsistencyChecker.
@@ -172,9 +177,7 @@ class ConsistencyChecker:
             
             # Check price consistency for common symbols
             if len(common_symbols) > 0:
-                price_consistency = self._check_price_consistency(
-                    ohlcv_df, fundamental_df, list(common_symbols)
-                )
+                price_consistency = self._check_price_consistency(ohlcv_df, fundamental_df)
                 result["statistics"]["price_consistency"] = price_consistency
                 
                 if price_consistency["inconsistent_count"] > 0:
@@ -190,14 +193,17 @@ class ConsistencyChecker:
     def _check_price_consistency(self, 
                                ohlcv_df: pd.DataFrame,
                                fundamental_df: pd.DataFrame,
-                               common_symbols: List[str]) -> Dict[str, Any]:
+                               common_symbols: Optional[List[str]] = None) -> Dict[str, Any]:
         """Check price consistency between OHLCV and fundamental data.
         Kiểm tra tính nhất quán giá giữa dữ liệu OHLCV và fundamental.
         
+        Each OHLCV bar is joined on (symbol, date) with the first fundamental
+        record reported that day; close vs BVPS is checked for every match.
+        
         Args:
             ohlcv_df: OHLCV DataFrame
             fundamental_df: Fundamental DataFrame
-            common_symbols: List of common symbols
+            common_symbols: Symbols to check (default: all symbols)
             
         Returns:
             Dictionary with price consistency results
@@ -210,44 +216,46 @@ class ConsistencyChecker:
         }
         
         try:
-            for symbol in common_symbols[:10]:  # Check first 10 symbols
-                symbol_ohlcv = ohlcv_df[ohlcv_df['symbol'] == symbol].copy()
-                symbol_fundamental = fundamental_df[fundamental_df['symbol'] == symbol].copy()
-                
-                if symbol_ohlcv.empty or symbol_fundamental.empty:
-                    continue
-                
-                # Convert dates for comparison
-                symbol_ohlcv['date'] = pd.to_datetime(symbol_ohlcv['date']).dt.date
-                symbol_fundamental['report_date'] = pd.to_datetime(symbol_fundamental['report_date']).dt.date
-                
-                # Find matching dates
-                for _, ohlcv_row in symbol_ohlcv.iterrows():
-                    matching_fundamental = symbol_fundamental[
-                        symbol_fundamental['report_date'] == ohlcv_row['date']
-                    ]
-                    
-                    if not matching_fundamental.empty:
-                        result["total_checks"] += 1
-                        
-                        # Check if prices are reasonable (within 10% difference)
-                        ohlcv_price = ohlcv_row['close']
-                        fundamental_price = matching_fundamental.iloc[0].get('bvps', 0)
-                        
-                        if fundamental_price > 0:
-                            price_diff_pct = abs(ohlcv_price - fundamental_price) / fundamental_price * 100
-                            
-                            if price_diff_pct > 1000:  # More than 1000% difference
-                                result["inconsistent_count"] += 1
-                                result["inconsistencies"].append({
-                                    "symbol": symbol,
-                                    "date": ohlcv_row['date'],
-                                    "ohlcv_price": ohlcv_price,
-                                    "fundamental_price": fundamental_price,
-                                    "difference_pct": price_diff_pct
-                                })
-                            else:
-                                result["consistent_count"] += 1
+            ohlcv = pd.DataFrame({
+                'symbol': ohlcv_df['symbol'],
+                'date': pd.to_datetime(ohlcv_df['date']).dt.normalize(),
+                'close': ohlcv_df['close'],
+            })
+            bvps = fundamental_df['bvps'] if 'bvps' in fundamental_df.columns else 0
+            fundamental = pd.DataFrame({
+                'symbol': fundamental_df['symbol'],
+                'date': pd.to_datetime(fundamental_df['report_date']).dt.normalize(),
+                'bvps': bvps,
+            }).drop_duplicates(['symbol', 'date'], keep='first')
+            
+            if common_symbols is not None:
+                ohlcv = ohlcv[ohlcv['symbol'].isin(common_symbols)]
+            
+            matched = ohlcv.merge(fundamental, on=['symbol', 'date'], how='inner')
+            result["total_checks"] = len(matched)
+            
+            # Check if prices are reasonable (only positive BVPS can be compared)
+            checked = matched[matched['bvps'] > 0]
+            price_diff_pct = (checked['close'] - checked['bvps']).abs() / checked['bvps'] * 100
+            inconsistent = price_diff_pct > 1000  # More than 1000% difference
+            
+            result["inconsistent_count"] = int(inconsistent.sum())
+            result["consistent_count"] = len(checked) - result["inconsistent_count"]
+            
+            details = checked[inconsistent].head(self.MAX_DETAILS)
+            result["inconsistencies"] = [
+                {
+                    "symbol": symbol,
+                    "date": day.date(),
+                    "ohlcv_price": close,
+                    "fundamental_price": fundamental_price,
+                    "difference_pct": diff_pct
+                }
+                for symbol, day, close, fundamental_price, diff_pct in zip(
+                    details['symbol'], details['date'], details['close'], details['bvps'],
+                    price_diff_pct[inconsistent].head(self.MAX_DETAILS)
+                )
+            ]
         
         except Exception as e:
             logger.error(f"Error checking price consistency: {e}")
@@ -306,6 +314,9 @@ class ConsistencyChecker:
         """Check quarterly data sequence.
         Kiểm tra chuỗi dữ liệu quý.
         
+        Rows are ordered by (symbol, year, quarter) and each row is compared
+        with the quarter following the previous row of the same symbol.
+        
         Args:
             df: DataFrame with quarterly data
             
@@ -319,34 +330,34 @@ class ConsistencyChecker:
         }
         
         try:
-            for symbol in df['symbol'].unique():
-                symbol_data = df[df['symbol'] == symbol].copy()
-                symbol_data = symbol_data.sort_values(['year', 'quarter'])
-                
-                result["symbols_checked"] += 1
-                
-                # Check for gaps in quarterly sequence
-                for i in range(1, len(symbol_data)):
-                    prev_row = symbol_data.iloc[i-1]
-                    curr_row = symbol_data.iloc[i]
-                    
-                    # Calculate expected next quarter
-                    expected_year = prev_row['year']
-                    expected_quarter = prev_row['quarter'] + 1
-                    
-                    if expected_quarter > 4:
-                        expected_year += 1
-                        expected_quarter = 1
-                    
-                    # Check if current row matches expected
-                    if (curr_row['year'] != expected_year or 
-                        curr_row['quarter'] != expected_quarter):
-                        result["gaps_count"] += 1
-                        result["gaps"].append({
-                            "symbol": symbol,
-                            "expected": f"{expected_year}Q{expected_quarter}",
-                            "actual": f"{curr_row['year']}Q{curr_row['quarter']}"
-                        })
+            result["symbols_checked"] = df['symbol'].nunique(dropna=False)
+            
+            # Symbols in order of first appearance, periods ascending
+            codes, symbols = pd.factorize(df['symbol'])
+            keep = codes >= 0
+            codes = codes[keep]
+            years = df['year'].to_numpy()[keep]
+            quarters = df['quarter'].to_numpy()[keep]
+            order = np.lexsort((quarters, years, codes))
+            codes, years, quarters = codes[order], years[order], quarters[order]
+            
+            # Lagged period keys: expected = quarter after the previous row
+            same_symbol = codes[1:] == codes[:-1]
+            expected_quarter = quarters[:-1] + 1
+            rollover = expected_quarter > 4
+            expected_year = years[:-1] + rollover
+            expected_quarter = np.where(rollover, 1, expected_quarter)
+            
+            is_gap = same_symbol & ((years[1:] != expected_year) | (quarters[1:] != expected_quarter))
+            gap_rows = np.flatnonzero(is_gap)
+            result["gaps_count"] = len(gap_rows)
+            
+            for i in gap_rows[:self.MAX_DETAILS]:
+                result["gaps"].append({
+                    "symbol": symbols[codes[i + 1]],
+                    "expected": f"{expected_year[i]}Q{expected_quarter[i]}",
+                    "actual": f"{years[i + 1]}Q{quarters[i + 1]}"
+                })
         
         except Exception as e:
             logger.error(f"Error checking quarterly sequence: {e}")
@@ -573,17 +584,15 @@ class ConsistencyChecker:
         }
         
         try:
-            # Check for conflicting signals
+            # Check for conflicting signals (buy vs sell on the same row)
             for i, col1 in enumerate(signal_columns):
                 for col2 in signal_columns[i+1:]:
                     if col1 in df.columns and col2 in df.columns:
-                        # Count conflicting signals
-                        conflicts = 0
-                        for idx, row in df.iterrows():
-                            if pd.notna(row[col1]) and pd.notna(row[col2]):
-                                if (row[col1] == 'buy' and row[col2] == 'sell') or \
-                                   (row[col1] == 'sell' and row[col2] == 'buy'):
-                                    conflicts += 1
+                        signal1, signal2 = df[col1], df[col2]
+                        conflicts = int((
+                            ((signal1 == 'buy') & (signal2 == 'sell')) |
+                            ((signal1 == 'sell') & (signal2 == 'buy'))
+                        ).sum())
                         
                         if conflicts > 0:
                             result["inconsistencies"] += conflicts
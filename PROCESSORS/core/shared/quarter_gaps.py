@@ -0,0 +1,261 @@
+"""
+Quarter gap engine - set-based analysis and restore of missing quarters.
+Phát hiện và khôi phục các quý bị thiếu trong financial metrics.
+
+Keys are (symbol, year, quarter). Key sets are pandas MultiIndexes, gaps are
+index differences, and a restore appends only the backup rows whose keys are
+missing from the current file.
+
+Per entity (company, bank, insurance, security):
+    input:   DATA/processed/fundamental/{entity}_full.parquet
+    current: DATA/processed/fundamental/{entity}/{entity}_financial_metrics.parquet
+    backup:  newest {entity}/*backup*.parquet, else the company backup
+             (older company backups also hold bank/security rows)
+
+Usage:
+    from PROCESSORS.core.shared.quarter_gaps import analyze_all, restore_entity
+
+    summary, details = analyze_all()        # one row per entity
+    stats = restore_entity('bank')          # backs up, restores, saves
+"""
+
+import logging
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BASE_PATH = Path(__file__).resolve().parents[3]
+FUNDAMENTAL_PATH = BASE_PATH / 'DATA' / 'processed' / 'fundamental'
+
+ENTITY_TYPES = ('company', 'bank', 'insurance', 'security')
+KEY_COLUMNS = ['symbol', 'year', 'quarter']
+
+# Quarters always kept from the current file (never restored from backup)
+PROTECTED_QUARTERS = [(2025, 3)]
+
+
+def entity_paths(entity: str, fundamental_path: Path = FUNDAMENTAL_PATH) -> Dict[str, Optional[Path]]:
+    """Input, current and backup files of an entity (backup None if not found)."""
+    entity_dir = fundamental_path / entity
+    backups = sorted(entity_dir.glob('*backup*.parquet'), reverse=True)
+    company_backup = fundamental_path / 'company' / 'company_financial_metrics_backup.parquet'
+    if backups:
+        backup = backups[0]
+    elif company_backup.exists():
+        backup = company_backup
+    else:
+        backup = None
+    return {
+        'input': fundamental_path / f'{entity}_full.parquet',
+        'current': entity_dir / f'{entity}_financial_metrics.parquet',
+        'backup': backup,
+    }
+
+
+def with_quarter_keys(df: pd.DataFrame, date_col: str = 'report_date') -> pd.DataFrame:
+    """
+    Copy of ``df`` with the date parsed, undated rows dropped and
+    year/quarter columns added.
+    """
+    df = df.copy()
+    df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+    df = df[df[date_col].notna()]
+    df['year'] = df[date_col].dt.year
+    df['quarter'] = df[date_col].dt.quarter
+    return df
+
+
+def quarter_index(df: pd.DataFrame, symbol_col: str = 'symbol', date_col: str = 'report_date') -> pd.MultiIndex:
+    """
+    Unique (symbol, year, quarter) keys of a frame.
+
+    Distinct (symbol, date) pairs are parsed once, so long-format inputs
+    with one row per metric stay cheap.
+    """
+    pairs = df[[symbol_col, date_col]].drop_duplicates()
+    dates = pd.to_datetime(pairs[date_col], errors='coerce')
+    valid = dates.notna()
+    keys = pd.DataFrame({
+        'symbol': pairs.loc[valid, symbol_col].to_numpy(),
+        'year': dates[valid].dt.year.to_numpy(),
+        'quarter': dates[valid].dt.quarter.to_numpy(),
+    })
+    return pd.MultiIndex.from_frame(keys.drop_duplicates())
+
+
+def missing_keys(source: pd.MultiIndex, target: pd.MultiIndex) -> pd.MultiIndex:
+    """Keys of ``source`` that are not in ``target`` (sorted)."""
+    return source.difference(target)
+
+
+def _is_protected(df: pd.DataFrame, protected: Iterable[Tuple[int, int]]) -> pd.Series:
+    mask = pd.Series(False, index=df.index)
+    for year, quarter in protected:
+        mask |= (df['year'] == year) & (df['quarter'] == quarter)
+    return mask
+
+
+def restore_frame(current: pd.DataFrame,
+                  backup: pd.DataFrame,
+                  symbols: Optional[Iterable[str]] = None,
+                  protected: Iterable[Tuple[int, int]] = PROTECTED_QUARTERS) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Add backup rows for (symbol, year, quarter) keys missing from current.
+
+    Args:
+        current: Current metrics (symbol, report_date, ...)
+        backup: Backup metrics, same layout
+        symbols: Only restore these symbols (e.g. the entity's input symbols)
+        protected: (year, quarter) pairs never taken from the backup
+
+    Returns:
+        (merged, restored): merged frame sorted by symbol/period with current
+        rows winning on duplicate keys, and the backup rows that were added.
+        Rows without a valid report_date are dropped from both.
+    """
+    current = with_quarter_keys(current)
+    if symbols is not None:
+        backup = backup[backup['symbol'].isin(set(symbols))]
+    backup = with_quarter_keys(backup)
+
+    # Anti-join: backup rows whose key is absent from current
+    current_index = pd.MultiIndex.from_frame(current[KEY_COLUMNS])
+    is_missing = ~pd.MultiIndex.from_frame(backup[KEY_COLUMNS]).isin(current_index)
+    restored = backup[is_missing]
+    restored = restored[~_is_protected(restored, protected)]
+
+    merged = pd.concat([current, restored], ignore_index=True)
+    merged = merged.sort_values(['symbol', 'year', 'quarter', 'report_date'])
+    merged = merged.drop_duplicates(subset=KEY_COLUMNS, keep='first')
+    return merged.drop(columns=['year', 'quarter']), restored.drop(columns=['year', 'quarter'])
+
+
+def analyze_entity(entity: str, fundamental_path: Path = FUNDAMENTAL_PATH) -> Optional[Dict]:
+    """
+    Key sets and gaps of one entity.
+
+    Returns:
+        Dict of MultiIndexes: input_quarters (FREQ_CODE 'Q'), backup_quarters
+        (entity symbols only), current_quarters, missing_from_current,
+        missing_from_input, restorable (missing from current, not protected);
+        None if the input or current file is missing.
+    """
+    paths = entity_paths(entity, fundamental_path)
+    if not paths['input'].exists() or not paths['current'].exists():
+        logger.warning(f"{entity}: input or current file not found, skipped")
+        return None
+
+    df_input = pd.read_parquet(paths['input'], columns=['SECURITY_CODE', 'REPORT_DATE', 'FREQ_CODE'])
+    symbols = set(df_input['SECURITY_CODE'].unique())
+    input_quarters = quarter_index(df_input[df_input['FREQ_CODE'] == 'Q'], 'SECURITY_CODE', 'REPORT_DATE')
+    current_quarters = quarter_index(pd.read_parquet(paths['current'], columns=['symbol', 'report_date']))
+
+    if paths['backup'] is not None:
+        df_backup = pd.read_parquet(paths['backup'], columns=['symbol', 'report_date'])
+        backup_quarters = quarter_index(df_backup[df_backup['symbol'].isin(symbols)])
+    else:
+        backup_quarters = current_quarters[:0]
+
+    missing_from_current = missing_keys(backup_quarters, current_quarters)
+    keys = missing_from_current.to_frame(index=False)
+    restorable = missing_from_current[~_is_protected(keys, PROTECTED_QUARTERS).to_numpy()]
+
+    return {
+        'backup_file': paths['backup'],
+        'input_quarters': input_quarters,
+        'backup_quarters': backup_quarters,
+        'current_quarters': current_quarters,
+        'missing_from_current': missing_from_current,
+        'missing_from_input': missing_keys(backup_quarters, input_quarters),
+        'restorable': restorable,
+    }
+
+
+def gap_breakdown(keys: pd.MultiIndex) -> Tuple[pd.Series, pd.Series]:
+    """Missing quarter counts per symbol (descending) and per year."""
+    frame = keys.to_frame(index=False)
+    by_symbol = frame.groupby('symbol').size().sort_values(ascending=False, kind='stable')
+    by_year = frame.groupby('year').size()
+    return by_symbol, by_year
+
+
+def analyze_all(entities: Iterable[str] = ENTITY_TYPES,
+                fundamental_path: Path = FUNDAMENTAL_PATH) -> Tuple[pd.DataFrame, Dict[str, Dict]]:
+    """
+    Analyze every entity in one pass.
+
+    Returns:
+        (summary, details): summary has one row per analyzed entity with the
+        key counts; details maps entity → analyze_entity() result
+    """
+    rows: List[Dict] = []
+    details: Dict[str, Dict] = {}
+    for entity in entities:
+        result = analyze_entity(entity, fundamental_path)
+        if result is None:
+            continue
+        details[entity] = result
+        rows.append({
+            'entity': entity,
+            'backup_file': result['backup_file'].name if result['backup_file'] else None,
+            **{name: len(result[name]) for name in (
+                'input_quarters', 'backup_quarters', 'current_quarters',
+                'missing_from_current', 'missing_from_input', 'restorable'
+            )},
+        })
+    return pd.DataFrame(rows), details
+
+
+def restore_entity(entity: str, fundamental_path: Path = FUNDAMENTAL_PATH,
+                   dry_run: bool = False) -> Optional[Dict]:
+    """
+    Restore missing quarters of one entity from its backup.
+
+    The current file is copied to {entity}_financial_metrics_before_restore_{timestamp}.parquet
+    before it is overwritten. Nothing is written if no quarter is missing or
+    with ``dry_run``.
+
+    Returns:
+        Dict with rows_before, rows_after, restored_rows, restored_quarters,
+        saved_copy; None if a file is missing
+    """
+    paths = entity_paths(entity, fundamental_path)
+    for name in ('input', 'current'):
+        if not paths[name].exists():
+            logger.error(f"{entity}: {name} file not found: {paths[name]}")
+            return None
+    if paths['backup'] is None:
+        logger.error(f"{entity}: no backup file found")
+        return None
+
+    df_input = pd.read_parquet(paths['input'], columns=['SECURITY_CODE'])
+    df_current = pd.read_parquet(paths['current'])
+    df_backup = pd.read_parquet(paths['backup'])
+
+    merged, restored = restore_frame(df_current, df_backup, symbols=df_input['SECURITY_CODE'].unique())
+    stats = {
+        'entity': entity,
+        'backup_file': paths['backup'],
+        'rows_before': len(df_current),
+        'rows_after': len(merged),
+        'restored_rows': len(restored),
+        'restored_quarters': len(quarter_index(restored)),
+        'saved_copy': None,
+    }
+    logger.info(f"{entity}: {stats['restored_rows']:,} rows to restore from {paths['backup'].name}")
+
+    if restored.empty or dry_run:
+        return stats
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    saved_copy = paths['current'].with_name(f'{entity}_financial_metrics_before_restore_{timestamp}.parquet')
+    shutil.copy2(paths['current'], saved_copy)
+    merged.to_parquet(paths['current'], index=False)
+    stats['saved_copy'] = saved_copy
+    logger.info(f"{entity}: saved {paths['current']} (previous file: {saved_copy.name})")
+    return stats
@@ -16,18 +16,33 @@ Usage:
     info = mapper.get_complete_info("ACB")
     # Returns: entity, sector, metrics, calculator, all definitions
 
+    # Many tickers at once (screening, AI queries)
+    infos = mapper.get_complete_info_batch(["ACB", "VCB", "FPT"])
+    table = mapper.resolve_tickers(df["symbol"].unique())
+    mask = mapper.has_metric(df["symbol"], "BIS_22A")
+
+Per-entity metric tables and the metric code → entity index are built
+once, so batch calls cost dict hits instead of registry walks per ticker.
+
 Author: Claude Code
 Date: 2025-12-05
 """
 
 from pathlib import Path
 import json
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
 from config.registries import SectorRegistry, MetricRegistry
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Entity types in lookup priority order
+ENTITY_TYPES = ["COMPANY", "BANK", "INSURANCE", "SECURITY"]
+
 
 class UnifiedTickerMapper:
     """
@@ -68,6 +83,11 @@ class UnifiedTickerMapper:
             "INSURANCE": "InsuranceFinancialCalculator"
         }
 
+        # Entity type → metric tables (built on first use)
+        self._entity_tables: Dict[str, Dict] = {}
+        # Metric code → entity types defining it, in ENTITY_TYPES order
+        self._metric_entities = self._build_metric_index()
+
         logger.info("UnifiedTickerMapper initialized")
         logger.info(f"  Sector registry: {self.sector_registry.get_statistics()['total_tickers']} tickers")
         logger.info(f"  Metric registry: {sum(self.metric_registry.get_metric_count().values())} metrics")
@@ -107,20 +127,90 @@ class UnifiedTickerMapper:
         if not ticker_info:
             raise ValueError(f"Ticker {ticker} not found in sector registry")
 
-        entity_type = ticker_info["entity_type"]
-        sector = ticker_info["sector"]
+        return self._build_complete_info(ticker, ticker_info)
+
+    def get_complete_info_batch(self, tickers: Iterable[str], skip_missing: bool = False) -> Dict[str, Dict]:
+        """
+        Get complete information for many tickers in one call
+
+        Metric dicts come from the cached per-entity tables, so each ticker
+        costs a few dict lookups and copies instead of a registry walk.
+
+        Args:
+            tickers: Stock tickers (duplicates are resolved once)
+            skip_missing: Leave unknown tickers out instead of raising
+
+        Returns:
+            Dictionary mapping ticker → get_complete_info() result, in input order
+
+        Raises:
+            ValueError: If a ticker is not in the sector registry and
+                skip_missing is False
+
+        Example:
+            >>> infos = mapper.get_complete_info_batch(["ACB", "VCB", "FPT"])
+            >>> infos["FPT"]["calculator_class"]
+            'CompanyFinancialCalculator'
+        """
+        ticker_mapping = self.sector_registry.registry["ticker_mapping"]
+        unique_tickers = list(dict.fromkeys(tickers))
 
-        # Get available metrics for this entity type
-        available_metrics = self._get_available_metrics(entity_type)
+        missing = [ticker for ticker in unique_tickers if ticker not in ticker_mapping]
+        if missing and not skip_missing:
+            raise ValueError(f"Tickers not found in sector registry: {missing}")
 
-        # Get calculated metrics that are valid for this entity
-        calculated_metrics = self._get_calculated_metrics(entity_type)
+        return {
+            ticker: self._build_complete_info(ticker, ticker_mapping[ticker])
+            for ticker in unique_tickers
+            if ticker in ticker_mapping
+        }
+
+    def resolve_tickers(self, tickers) -> pd.DataFrame:
+        """
+        Resolve metadata for many tickers as a table
+
+        Args:
+            tickers: Series, array or list of tickers
+
+        Returns:
+            DataFrame with one row per input ticker (input order):
+            ticker, found, entity_type, sector, name, exchange,
+            calculator_class, metric_count. Unknown tickers have found=False
+            and None metadata.
 
-        # Get peer tickers (same sector)
-        peer_tickers = self.sector_registry.get_peers(ticker)
+        Example:
+            >>> mapper.resolve_tickers(["ACB", "FPT", "ZZZ"])[["ticker", "entity_type"]]
+              ticker entity_type
+            0    ACB        BANK
+            1    FPT     COMPANY
+            2    ZZZ        None
+        """
+        values = np.asarray(tickers, dtype=object)
+        registry = self.sector_registry
+        entity_types = registry.map_entity_types(values)
+
+        table = pd.DataFrame({
+            "ticker": values,
+            "found": pd.notna(entity_types),
+            "entity_type": entity_types,
+            "sector": registry.map_tickers(values, "sector"),
+            "name": registry.map_tickers(values, "name"),
+            "exchange": registry.map_tickers(values, "exchange"),
+        })
+        entity_series = table["entity_type"]
+        table["calculator_class"] = entity_series.map(self.calculator_map).astype(object).where(table["found"], None)
+        metric_counts = {
+            entity_type: len(self._entity_table(entity_type)["available_metrics"])
+            for entity_type in entity_series.dropna().unique()
+        }
+        table["metric_count"] = entity_series.map(metric_counts).fillna(0).astype(int)
+        return table
 
-        # Get metric prefixes
-        metric_prefixes = self.sector_registry.get_metric_prefixes(sector)
+    def _build_complete_info(self, ticker: str, ticker_info: Dict) -> Dict:
+        """Complete info dict for a known ticker (see get_complete_info)."""
+        entity_type = ticker_info["entity_type"]
+        sector = ticker_info["sector"]
+        table = self._entity_table(entity_type)
 
         return {
             "ticker": ticker,
@@ -129,11 +219,72 @@ class UnifiedTickerMapper:
             "name": ticker_info.get("name", ""),
             "exchange": ticker_info.get("exchange", ""),
             "calculator_class": self.calculator_map.get(entity_type),
+            # Copies: callers may mutate the result without touching the cache
+            "available_metrics": dict(table["available_metrics"]),
+            "calculated_metrics": list(table["calculated_metrics"]),
+            "peer_tickers": self.sector_registry.get_peers(ticker),
+            "metric_prefixes": self.sector_registry.get_metric_prefixes(sector)
+        }
+
+    def _build_metric_index(self) -> Dict[str, List[str]]:
+        """Metric code → entity types that define it (ENTITY_TYPES order)."""
+        index: Dict[str, List[str]] = {}
+        entity_data = self.metric_registry.registry["entity_types"]
+        for entity_type in ENTITY_TYPES:
+            for category_metrics in entity_data.get(entity_type, {}).values():
+                for code in category_metrics:
+                    entities = index.setdefault(code, [])
+                    if not entities or entities[-1] != entity_type:
+                        entities.append(entity_type)
+        return index
+
+    def _entity_table(self, entity_type: str) -> Dict:
+        """
+        Cached metric tables of an entity type
+
+        Returns:
+            Dictionary with available_metrics (code → name_vi),
+            calculated_metrics (names), metric_codes (name → dependencies,
+            formula, unit) and tickers (tickers of the entity's sectors,
+            in sector order)
+        """
+        table = self._entity_tables.get(entity_type)
+        if table is not None:
+            return table
+
+        available_metrics = {}
+        entity_metrics = self.metric_registry.registry["entity_types"].get(entity_type, {})
+        for category_metrics in entity_metrics.values():
+            for code, metric_info in category_metrics.items():
+                available_metrics[code] = metric_info["name_vi"]
+
+        calc_metrics = self.metric_registry.registry.get("calculated_metrics", {})
+        calculated_metrics = [
+            metric_name
+            for metric_name, metric_info in calc_metrics.items()
+            if entity_type in metric_info.get("entity_types", [])
+        ]
+        metric_codes = {
+            metric_name: {
+                "dependencies": calc_metrics[metric_name].get("dependencies", {}).get(entity_type, []),
+                "formula": calc_metrics[metric_name].get("formula", ""),
+                "unit": calc_metrics[metric_name].get("unit", "")
+            }
+            for metric_name in calculated_metrics
+        }
+
+        tickers = []
+        for sector in self.sector_registry.get_sectors_by_entity(entity_type):
+            tickers.extend(self.sector_registry.get_tickers_by_sector(sector))
+
+        table = {
             "available_metrics": available_metrics,
             "calculated_metrics": calculated_metrics,
-            "peer_tickers": peer_tickers,
-            "metric_prefixes": metric_prefixes
+            "metric_codes": metric_codes,
+            "tickers": tickers,
         }
+        self._entity_tables[entity_type] = table
+        return table
 
     def _get_available_metrics(self, entity_type: str) -> Dict[str, str]:
         """
@@ -150,16 +301,7 @@ class UnifiedTickerMapper:
                 ...
             }
         """
-        metrics = {}
-
-        # Get all metrics for this entity type from metric registry
-        entity_metrics = self.metric_registry.registry["entity_types"].get(entity_type, {})
-
-        for category_name, category_metrics in entity_metrics.items():
-            for code, metric_info in category_metrics.items():
-                metrics[code] = metric_info["name_vi"]
-
-        return metrics
+        return dict(self._entity_table(entity_type)["available_metrics"])
 
     def _get_calculated_metrics(self, entity_type: str) -> List[str]:
         """
@@ -171,15 +313,7 @@ class UnifiedTickerMapper:
         Returns:
             List of calculated metric names: ["roe", "roa", "eps", ...]
         """
-        calculated = []
-
-        calc_metrics = self.metric_registry.registry.get("calculated_metrics", {})
-
-        for metric_name, metric_info in calc_metrics.items():
-            if entity_type in metric_info.get("entity_types", []):
-                calculated.append(metric_name)
-
-        return calculated
+        return list(self._entity_table(entity_type)["calculated_metrics"])
 
     def get_metric_definition(self, ticker: str, metric_code: str) -> Optional[Dict]:
         """
@@ -278,27 +412,45 @@ class UnifiedTickerMapper:
             >>> mapper.search_tickers_with_metric("BIS_22A", "Ngân hàng")
             ['ACB', 'VCB', 'TCB', ...]  # Banks in banking sector
         """
-        # Determine which entity type has this metric
-        entity_type = None
-        for etype in ["COMPANY", "BANK", "INSURANCE", "SECURITY"]:
-            if self.metric_registry.get_metric(metric_code, etype):
-                entity_type = etype
-                break
-
-        if not entity_type:
+        # First entity type (ENTITY_TYPES order) that has this metric
+        entity_types = self._metric_entities.get(metric_code)
+        if not entity_types:
             return []
 
-        # Get all tickers for this entity type
         if sector:
             # Filter by sector
-            tickers = self.sector_registry.get_tickers_by_sector(sector)
-        else:
-            # Get all tickers for entity type
-            tickers = []
-            for sec in self.sector_registry.get_sectors_by_entity(entity_type):
-                tickers.extend(self.sector_registry.get_tickers_by_sector(sec))
+            return self.sector_registry.get_tickers_by_sector(sector)
+
+        # All tickers for entity type
+        return list(self._entity_table(entity_types[0])["tickers"])
+
+    def has_metric(self, tickers, metric_code: str):
+        """
+        Check which tickers have a metric available, in one call
 
-        return tickers
+        A ticker has the metric if the metric is defined for the ticker's
+        entity type (the same rule as validate_metric_for_ticker).
+
+        Args:
+            tickers: Series, array or list of tickers
+            metric_code: Metric code (e.g., "BIS_22A")
+
+        Returns:
+            Boolean Series aligned to ``tickers`` (for Series input), else
+            boolean ndarray; unknown tickers are False
+
+        Example:
+            >>> mapper.has_metric(["ACB", "FPT"], "BIS_22A")
+            array([ True, False])
+        """
+        entity_types = self.sector_registry.map_entity_types(tickers)
+        wanted = self._metric_entities.get(metric_code, [])
+        values = entity_types.to_numpy() if isinstance(entity_types, pd.Series) else entity_types
+        mask = np.isin(values, np.asarray(wanted, dtype=object)) if wanted else np.zeros(len(values), dtype=bool)
+
+        if isinstance(tickers, pd.Series):
+            return pd.Series(mask, index=tickers.index, name=metric_code)
+        return mask
 
     def get_peer_comparison_info(self, ticker: str) -> Dict:
         """
@@ -333,20 +485,10 @@ class UnifiedTickerMapper:
         # Get peers
         peers = self.sector_registry.get_peers(ticker)
 
-        # Get comparison metrics (calculated metrics for this entity)
-        comparison_metrics = self._get_calculated_metrics(entity_type)
-
-        # Get metric dependencies
-        metric_codes = {}
-        calc_metrics = self.metric_registry.registry.get("calculated_metrics", {})
-        for metric_name in comparison_metrics:
-            if metric_name in calc_metrics:
-                metric_info = calc_metrics[metric_name]
-                metric_codes[metric_name] = {
-                    "dependencies": metric_info["dependencies"].get(entity_type, []),
-                    "formula": metric_info.get("formula", ""),
-                    "unit": metric_info.get("unit", "")
-                }
+        # Comparison metrics and their dependencies from the entity table
+        table = self._entity_table(entity_type)
+        comparison_metrics = list(table["calculated_metrics"])
+        metric_codes = {name: dict(info) for name, info in table["metric_codes"].items()}
 
         return {
             "ticker": ticker,
@@ -409,7 +551,7 @@ class UnifiedTickerMapper:
 
         elif "calculator" in query_lower or "calculator class" in query_lower:
             # Extract entity type
-            for entity in ["COMPANY", "BANK", "INSURANCE", "SECURITY"]:
+            for entity in ENTITY_TYPES:
                 if entity.lower() in query_lower:
                     return {
                         "query_type": "calculator_class",
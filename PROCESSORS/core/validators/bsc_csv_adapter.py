@@ -12,8 +12,8 @@ BSC CSV uses different column names:
 
 Features:
 - Column name mapping
-- Date parsing (YYYY-MM-DD → year, quarter)
-- Frequency code conversion (Q/Y → Q1/Q2/Q3/YEAR)
+- Date parsing (YYYY-MM-DD → year, quarter), once per distinct date
+- Frequency code conversion (Q/Y → Q1/Q2/Q3/YEAR), vectorized
 - Preserve original data
 
 Usage:
@@ -79,8 +79,13 @@ class BSCCSVAdapter:
         "S": "Q2",  # Semi-annual (6 months)
     }
 
+    # Report length for FREQ_CODE == "Q" by MONTH_IN_PERIOD (other values → "Q1")
+    QUARTERLY_LENGTH_MAPPING = {0: "YEAR", 3: "Q1", 6: "Q2", 9: "Q3", 12: "YEAR"}
+
     def __init__(self):
         """Initialize BSC CSV adapter"""
+        # report_date value → (year, quarter) or None, shared across adapt() calls
+        self._date_cache: Dict[object, Optional[Tuple[int, int]]] = {}
         logger.info("BSCCSVAdapter initialized")
 
     def adapt(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -109,24 +114,101 @@ class BSCCSVAdapter:
 
         # 2. Parse report_date to year, quarter
         if 'report_date' in adapted_df.columns:
-            year_quarter = adapted_df['report_date'].apply(self._parse_report_date)
-            adapted_df['year'] = year_quarter.apply(lambda x: x[0] if x else None)
-            adapted_df['quarter'] = year_quarter.apply(lambda x: x[1] if x else None)
+            adapted_df['year'], adapted_df['quarter'] = self._parse_report_dates(adapted_df['report_date'])
 
         # 3. Convert freq_code to lengthReport
         if 'freq_code' in adapted_df.columns:
-            adapted_df['lengthReport'] = adapted_df.apply(
-                lambda row: self._convert_freq_code(
-                    row.get('freq_code'),
-                    row.get('month_in_period')
-                ),
-                axis=1
+            adapted_df['lengthReport'] = self._convert_freq_codes(
+                adapted_df['freq_code'],
+                adapted_df['month_in_period'] if 'month_in_period' in adapted_df.columns else None
             )
 
         logger.info(f"Adapted {len(adapted_df)} rows from BSC CSV format")
 
         return adapted_df
 
+    def _parse_report_dates(self, dates: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """
+        Parse a report_date column to year and quarter columns.
+
+        Each distinct value is parsed once: ISO dates in one vectorized
+        pd.to_datetime call, anything else with _parse_report_date. Results
+        are cached on the adapter for later files.
+
+        Args:
+            dates: report_date column (strings or datetimes)
+
+        Returns:
+            (year, quarter) Series; int64, or float64 with NaN if any date is invalid
+        """
+        codes, uniques = pd.factorize(dates)
+        uniques = pd.Series(uniques, dtype=object)
+
+        new = uniques[~uniques.isin(list(self._date_cache))]
+        if len(new):
+            if pd.api.types.is_datetime64_any_dtype(dates):
+                parsed = pd.to_datetime(new)
+            else:
+                parsed = pd.to_datetime(new.astype(str), format='%Y-%m-%d', errors='coerce')
+            year = parsed.dt.year.to_numpy()
+            quarter = ((parsed.dt.month - 1) // 3 + 1).to_numpy()
+            for i, value in enumerate(new):
+                if pd.notna(parsed.iat[i]):
+                    self._date_cache[value] = (int(year[i]), int(quarter[i]))
+                else:
+                    self._date_cache[value] = self._parse_report_date(value)
+
+        year_quarter = [self._date_cache[value] for value in uniques]
+        valid = np.array([yq is not None for yq in year_quarter] + [False], dtype=bool)
+        year_u = np.array([yq[0] if yq else 0 for yq in year_quarter] + [0], dtype=np.int64)
+        quarter_u = np.array([yq[1] if yq else 0 for yq in year_quarter] + [0], dtype=np.int64)
+
+        # Missing values get code -1: the trailing invalid slot
+        year = year_u[codes]
+        quarter = quarter_u[codes]
+        if not valid[codes].all():
+            year = np.where(valid[codes], year, np.nan)
+            quarter = np.where(valid[codes], quarter, np.nan)
+
+        return pd.Series(year, index=dates.index), pd.Series(quarter, index=dates.index)
+
+    def _convert_freq_codes(
+        self,
+        freq_codes: pd.Series,
+        months_in_period: Optional[pd.Series]
+    ) -> pd.Series:
+        """
+        Convert freq_code/month_in_period columns to lengthReport.
+
+        Same rules as _convert_freq_code, applied with masks.
+
+        Args:
+            freq_codes: freq_code column
+            months_in_period: month_in_period column (None if absent)
+
+        Returns:
+            lengthReport Series (object, None where undetermined)
+        """
+        freq = freq_codes.astype(str).str.upper().str.strip().to_numpy()
+        freq = np.where(freq_codes.isna().to_numpy(), None, freq)
+        length = np.full(len(freq_codes), None, dtype=object)
+
+        length[freq == "Y"] = "YEAR"
+        length[freq == "M"] = "Q1"
+        length[freq == "S"] = "Q2"
+
+        quarterly = freq == "Q"
+        if months_in_period is not None and quarterly.any():
+            months = pd.to_numeric(months_in_period, errors='coerce').to_numpy(dtype=float)
+            has_months = quarterly & ~np.isnan(months)
+            months = np.trunc(np.where(has_months, months, 0))
+            conditions = [has_months & (months == m) for m in self.QUARTERLY_LENGTH_MAPPING]
+            length[has_months] = np.select(
+                conditions, list(self.QUARTERLY_LENGTH_MAPPING.values()), default="Q1"
+            )[has_months]
+
+        return pd.Series(length, index=freq_codes.index)
+
     def _parse_report_date(self, date_str: str) -> Optional[Tuple[int, int]]:
         """
         Parse report date to (year, quarter).
@@ -9,8 +9,10 @@ Features:
 - Financial ratios sanity checks
 - Range validation for metrics
 - Infinite/NaN detection
-- Business logic validation
+- Business logic validation (compiled column expressions)
 - Statistical outlier detection
+- Per-metric statistics (NaN/inf counts, min/max, quartiles, range
+  violations, outliers) from one vectorized sweep over the numeric columns
 
 Usage:
     from PROCESSORS.core.validators.output_validator import OutputValidator
@@ -22,6 +24,8 @@ Usage:
         print(f"Validation failed: {result.errors}")
         raise ValueError("Invalid calculated metrics")
 
+    print(result.metrics)   # One row per numeric metric column
+
 Author: Claude Code
 Date: 2025-12-08
 """
@@ -32,6 +36,7 @@ from pathlib import Path
 from typing import List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
 import logging
+import warnings as py_warnings
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +48,7 @@ class ValidationResult:
     errors: List[str]
     warnings: List[str]
     stats: Dict[str, any] = None
+    metrics: Optional[pd.DataFrame] = None  # Per-metric statistics (index: column)
 
     def __str__(self) -> str:
         if self.is_valid:
@@ -75,6 +81,33 @@ class ValidationResult:
         return "\n".join(msg)
 
 
+@dataclass(frozen=True)
+class BusinessRule:
+    """
+    Business logic constraint as a column expression.
+
+    ``expression`` is a boolean NumPy expression over column names that is
+    True for violating rows (NaN compares False). The rule is skipped when a
+    referenced column is missing. ``message`` is formatted with count and pct.
+    """
+    name: str
+    expression: str
+    message: str
+    severity: str = "warning"  # warning or error
+    min_pct: float = 0.0  # Report only if violations exceed this % of rows
+    entity_types: Optional[Tuple[str, ...]] = None
+
+    def __post_init__(self):
+        code = compile(self.expression, f"<rule {self.name}>", "eval")
+        object.__setattr__(self, "code", code)
+        object.__setattr__(self, "columns", tuple(code.co_names))
+
+    def count(self, columns: Dict[str, np.ndarray]) -> int:
+        """Number of violating rows"""
+        with np.errstate(invalid="ignore"):
+            return int(np.count_nonzero(eval(self.code, {"__builtins__": {}}, columns)))
+
+
 class OutputValidator:
     """
     Validates calculated financial metrics.
@@ -85,6 +118,9 @@ class OutputValidator:
     3. Financial ratios within reasonable ranges
     4. Business logic constraints
     5. Statistical outliers
+
+    Checks 1, 3 and 5 read one per-metric statistics table computed in a
+    single sweep (_metric_stats), returned as ValidationResult.metrics.
     """
 
     # Ratio validation ranges (min, max)
@@ -123,6 +159,25 @@ class OutputValidator:
         "SECURITY": ["ticker", "year", "quarter", "revenue", "net_income"],
     }
 
+    # Business logic constraints, checked in order
+    CURRENT_YEAR = 2025
+    BUSINESS_RULES = (
+        # Revenue should be >= 0 for most companies (>5% is concerning)
+        BusinessRule("negative_revenue", "revenue < 0",
+                     "{count} rows ({pct:.1f}%) have negative revenue", min_pct=5),
+        BusinessRule("non_positive_assets", "total_assets <= 0",
+                     "{count} rows have zero or negative total assets", severity="error"),
+        BusinessRule("equity_below_assets", "total_equity < -total_assets",
+                     "{count} rows have equity more negative than assets"),
+        BusinessRule("high_npl", "npl_ratio > 0.1",
+                     "{count} banks have NPL ratio > 10%", entity_types=("BANK",)),
+        BusinessRule("future_year", f"year > {CURRENT_YEAR}",
+                     f"{{count}} rows have year > {CURRENT_YEAR}"),
+    )
+
+    # Columns excluded from outlier detection
+    ID_COLUMNS = ['year', 'quarter', 'ticker']
+
     def __init__(self, strict_mode: bool = False):
         """
         Initialize output validator.
@@ -174,33 +229,32 @@ class OutputValidator:
             errors.append(f"Unknown entity type: {entity_type}")
             return ValidationResult(False, errors, warnings, stats)
 
-        # 3. Infinite values check
-        inf_errors = self._check_infinite_values(df)
-        errors.extend(inf_errors)
+        # 3. One sweep over all numeric columns
+        metrics = self._metric_stats(df, quartiles=check_outliers)
+        stats["metrics_checked"] = len(metrics)
 
-        # 4. Critical metrics NaN check
-        nan_errors = self._check_critical_nan(df, entity_type)
-        errors.extend(nan_errors)
+        # 4. Infinite values check
+        errors.extend(self._check_infinite_values(metrics))
 
-        # 5. Ratio ranges validation
-        range_errors, range_warnings = self._validate_ratio_ranges(df)
+        # 5. Critical metrics NaN check
+        errors.extend(self._check_critical_nan(df, entity_type))
+
+        # 6. Ratio ranges validation
+        range_errors, range_warnings = self._validate_ratio_ranges(metrics)
         errors.extend(range_errors)
         warnings.extend(range_warnings)
-        stats["metrics_checked"] = len(range_errors) + len(range_warnings)
 
-        # 6. Business logic validation
+        # 7. Business logic validation
         logic_errors, logic_warnings = self._validate_business_logic(df, entity_type)
         errors.extend(logic_errors)
         warnings.extend(logic_warnings)
 
-        # 7. Statistical outliers
+        # 8. Statistical outliers
         if check_outliers:
-            outlier_warnings = self._check_outliers(df)
-            warnings.extend(outlier_warnings)
+            warnings.extend(self._check_outliers(metrics))
 
-        # 8. Duplicate check
-        dup_warnings = self._check_duplicates(df)
-        warnings.extend(dup_warnings)
+        # 9. Duplicate check
+        warnings.extend(self._check_duplicates(df))
 
         # Strict mode: treat warnings as errors
         if self.strict_mode and warnings:
@@ -216,76 +270,120 @@ class OutputValidator:
             for err in errors[:3]:
                 logger.error(f"  - {err}")
 
-        return ValidationResult(is_valid, errors, warnings, stats)
+        return ValidationResult(is_valid, errors, warnings, stats, metrics)
 
-    def _check_infinite_values(self, df: pd.DataFrame) -> List[str]:
-        """Check for infinite values in numeric columns"""
-        errors = []
-
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+    def _metric_stats(self, df: pd.DataFrame, quartiles: bool = True) -> pd.DataFrame:
+        """
+        Statistics of every numeric column in one vectorized sweep.
 
-        for col in numeric_cols:
-            inf_count = np.isinf(df[col]).sum()
-            if inf_count > 0:
-                errors.append(
-                    f"Column '{col}' has {inf_count} infinite values"
-                )
+        Args:
+            df: DataFrame with calculated metrics
+            quartiles: Compute q1/q3 and IQR outliers (the costly part);
+                NaN in those columns otherwise
 
-        return errors
+        Returns:
+            DataFrame indexed by column: count (non-NaN), nan, inf, min, max,
+            q1, q3, range_min, range_max, out_of_range (RATIO_RANGES columns),
+            lower_bound, upper_bound, outliers (IQR * 3)
+        """
+        positions = np.flatnonzero(df.columns.isin(df.select_dtypes(include=[np.number]).columns))
+        numeric_cols = df.columns[positions]
+        # One column-major float copy: per-column reductions and partitions
+        # read contiguous memory
+        values = np.empty((len(df), len(positions)), dtype=np.float64, order="F")
+        for j, pos in enumerate(positions):
+            values[:, j] = df.iloc[:, pos].to_numpy(dtype=np.float64, na_value=np.nan)
+        count = len(df) - np.isnan(values).sum(axis=0)
+
+        metrics = pd.DataFrame({
+            "count": count,
+            "nan": len(df) - count,
+            "inf": np.isinf(values).sum(axis=0),
+            # fmin/fmax skip NaN; all-NaN columns give NaN
+            "min": np.fmin.reduce(values, axis=0) if len(df) else np.nan,
+            "max": np.fmax.reduce(values, axis=0) if len(df) else np.nan,
+        }, index=numeric_cols)
+        metrics = metrics.join(pd.DataFrame(self.RATIO_RANGES, index=["range_min", "range_max"]).T)
+
+        with np.errstate(invalid="ignore"):
+            # Range violations of RATIO_RANGES columns (NaN compares False, inf is out of range)
+            metrics["out_of_range"] = 0
+            ratio_pos = np.flatnonzero(metrics["range_min"].notna().to_numpy())
+            if len(ratio_pos):
+                block = values[:, ratio_pos]
+                lo = metrics["range_min"].to_numpy()[ratio_pos]
+                hi = metrics["range_max"].to_numpy()[ratio_pos]
+                metrics.iloc[ratio_pos, metrics.columns.get_loc("out_of_range")] = ((block < lo) | (block > hi)).sum(axis=0)
+
+            # IQR outliers
+            metrics["q1"] = metrics["q3"] = metrics["lower_bound"] = metrics["upper_bound"] = np.nan
+            metrics["outliers"] = 0
+            if quartiles and len(df):
+                with py_warnings.catch_warnings():
+                    py_warnings.simplefilter("ignore", RuntimeWarning)  # All-NaN columns
+                    q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+                lower = q1 - 3 * (q3 - q1)
+                upper = q3 + 3 * (q3 - q1)
+                metrics["q1"], metrics["q3"] = q1, q3
+                metrics["lower_bound"], metrics["upper_bound"] = lower, upper
+                metrics["outliers"] = ((values < lower) | (values > upper)).sum(axis=0)
+
+        metrics.index.name = "metric"
+        return metrics
+
+    def _check_infinite_values(self, metrics: pd.DataFrame) -> List[str]:
+        """Check for infinite values in numeric columns"""
+        return [
+            f"Column '{col}' has {inf_count} infinite values"
+            for col, inf_count in metrics["inf"].items()
+            if inf_count > 0
+        ]
 
     def _check_critical_nan(self, df: pd.DataFrame, entity_type: str) -> List[str]:
         """Check for NaN in critical metrics"""
         errors = []
 
-        critical_metrics = self.CRITICAL_METRICS.get(entity_type, [])
+        critical_metrics = [m for m in self.CRITICAL_METRICS.get(entity_type, []) if m in df.columns]
+        nan_counts = df[critical_metrics].isna().sum()
 
-        for metric in critical_metrics:
-            if metric in df.columns:
-                nan_count = df[metric].isna().sum()
-                if nan_count > 0:
-                    nan_pct = (nan_count / len(df)) * 100
-                    errors.append(
-                        f"Critical metric '{metric}' has {nan_count} NaN values "
-                        f"({nan_pct:.1f}%)"
-                    )
+        for metric, nan_count in nan_counts.items():
+            if nan_count > 0:
+                nan_pct = (nan_count / len(df)) * 100
+                errors.append(
+                    f"Critical metric '{metric}' has {nan_count} NaN values "
+                    f"({nan_pct:.1f}%)"
+                )
 
         return errors
 
     def _validate_ratio_ranges(
         self,
-        df: pd.DataFrame
+        metrics: pd.DataFrame
     ) -> Tuple[List[str], List[str]]:
         """Validate financial ratios are within reasonable ranges"""
         errors = []
         warnings = []
 
         for ratio_name, (min_val, max_val) in self.RATIO_RANGES.items():
-            if ratio_name in df.columns:
-                # Get non-NaN values
-                values = df[ratio_name].dropna()
-
-                if len(values) == 0:
-                    continue
-
-                # Check min/max
-                out_of_range = (values < min_val) | (values > max_val)
-                if out_of_range.any():
-                    count = out_of_range.sum()
-                    pct = (count / len(values)) * 100
-                    min_found = values.min()
-                    max_found = values.max()
-
-                    msg = (
-                        f"Ratio '{ratio_name}' has {count} values ({pct:.1f}%) "
-                        f"out of range [{min_val}, {max_val}]. "
-                        f"Found range: [{min_found:.2f}, {max_found:.2f}]"
-                    )
-
-                    # High percentage out of range = error
-                    if pct > 10:
-                        errors.append(msg)
-                    else:
-                        warnings.append(msg)
+            if ratio_name not in metrics.index:
+                continue
+            row = metrics.loc[ratio_name]
+            if row["count"] == 0 or row["out_of_range"] == 0:
+                continue
+
+            count = int(row["out_of_range"])
+            pct = (count / row["count"]) * 100
+            msg = (
+                f"Ratio '{ratio_name}' has {count} values ({pct:.1f}%) "
+                f"out of range [{min_val}, {max_val}]. "
+                f"Found range: [{row['min']:.2f}, {row['max']:.2f}]"
+            )
+
+            # High percentage out of range = error
+            if pct > 10:
+                errors.append(msg)
+            else:
+                warnings.append(msg)
 
         return errors, warnings
 
@@ -294,89 +392,48 @@ class OutputValidator:
         df: pd.DataFrame,
         entity_type: str
     ) -> Tuple[List[str], List[str]]:
-        """Validate business logic constraints"""
+        """Validate business logic constraints (BUSINESS_RULES)"""
         errors = []
         warnings = []
+        columns: Dict[str, np.ndarray] = {}
 
-        # 1. Revenue should be >= 0 for most companies
-        if 'revenue' in df.columns:
-            negative_revenue = (df['revenue'] < 0).sum()
-            if negative_revenue > 0:
-                pct = (negative_revenue / len(df)) * 100
-                if pct > 5:  # >5% is concerning
-                    warnings.append(
-                        f"{negative_revenue} rows ({pct:.1f}%) have negative revenue"
-                    )
-
-        # 2. Total assets should be > 0
-        if 'total_assets' in df.columns:
-            zero_or_neg_assets = (df['total_assets'] <= 0).sum()
-            if zero_or_neg_assets > 0:
-                errors.append(
-                    f"{zero_or_neg_assets} rows have zero or negative total assets"
-                )
-
-        # 3. Equity should not be too negative
-        if 'total_equity' in df.columns:
-            very_negative_equity = (df['total_equity'] < -df['total_assets']).sum()
-            if very_negative_equity > 0:
-                warnings.append(
-                    f"{very_negative_equity} rows have equity more negative than assets"
-                )
+        for rule in self.BUSINESS_RULES:
+            if rule.entity_types and entity_type not in rule.entity_types:
+                continue
+            if not all(col in df.columns for col in rule.columns):
+                continue
+            for col in rule.columns:
+                if col not in columns:
+                    columns[col] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
 
-        # 4. Bank-specific: NPL ratio validation
-        if entity_type == "BANK" and 'npl_ratio' in df.columns:
-            high_npl = (df['npl_ratio'] > 0.1).sum()  # >10% NPL
-            if high_npl > 0:
-                warnings.append(
-                    f"{high_npl} banks have NPL ratio > 10%"
-                )
+            count = rule.count(columns)
+            pct = (count / len(df)) * 100
+            if count == 0 or pct <= rule.min_pct:
+                continue
 
-        # 5. Year/quarter validation
-        if 'year' in df.columns:
-            current_year = 2025
-            future_years = (df['year'] > current_year).sum()
-            if future_years > 0:
-                warnings.append(
-                    f"{future_years} rows have year > {current_year}"
-                )
+            msg = rule.message.format(count=count, pct=pct)
+            (errors if rule.severity == "error" else warnings).append(msg)
 
         return errors, warnings
 
-    def _check_outliers(self, df: pd.DataFrame) -> List[str]:
+    def _check_outliers(self, metrics: pd.DataFrame) -> List[str]:
         """Check for statistical outliers using IQR method"""
         warnings = []
 
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-
-        for col in numeric_cols:
-            # Skip ID columns
-            if col in ['year', 'quarter', 'ticker']:
-                continue
-
-            values = df[col].dropna()
-            if len(values) < 10:  # Need enough data
-                continue
-
-            # IQR method
-            Q1 = values.quantile(0.25)
-            Q3 = values.quantile(0.75)
-            IQR = Q3 - Q1
-
-            if IQR == 0:  # Avoid division by zero
-                continue
+        candidates = metrics[
+            ~metrics.index.isin(self.ID_COLUMNS)   # Skip ID columns
+            & (metrics["count"] >= 10)              # Need enough data
+            & (metrics["q3"] != metrics["q1"])      # Avoid division by zero
+            & (metrics["outliers"] > 0)
+        ]
 
-            lower_bound = Q1 - 3 * IQR
-            upper_bound = Q3 + 3 * IQR
-
-            outliers = ((values < lower_bound) | (values > upper_bound)).sum()
-            if outliers > 0:
-                pct = (outliers / len(values)) * 100
-                if pct > 5:  # >5% outliers
-                    warnings.append(
-                        f"Column '{col}' has {outliers} outliers ({pct:.1f}%) "
-                        f"[IQR bounds: {lower_bound:.2f}, {upper_bound:.2f}]"
-                    )
+        for col, row in candidates.iterrows():
+            pct = (row["outliers"] / row["count"]) * 100
+            if pct > 5:  # >5% outliers
+                warnings.append(
+                    f"Column '{col}' has {int(row['outliers'])} outliers ({pct:.1f}%) "
+                    f"[IQR bounds: {row['lower_bound']:.2f}, {row['upper_bound']:.2f}]"
+                )
 
         return warnings
 
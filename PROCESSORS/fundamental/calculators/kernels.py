@@ -0,0 +1,299 @@
+"""
+Calculator Kernels
+==================
+
+Vectorized building blocks shared by the entity calculators in
+run_all_calculators.py.
+
+Functions:
+    pivot_long_to_wide: Long (one row per metric) → wide (one column per metric)
+    prior_period_values: Value of each row's prior period (YTD/QoQ/YoY base)
+    period_growth: Growth (%) vs the prior period for many columns at once
+    rolling_ttm: Trailing-4-quarter sums for many flow columns at once
+"""
+
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# ==============================================================================
+# LONG → WIDE PIVOT
+# ==============================================================================
+
+def _dense_ids(codes: List[np.ndarray], sizes: List[int]):
+    """
+    Dense id per combination of per-column codes, numbered in sorted order.
+
+    Returns:
+        (id per row, array of (n_unique, n_columns) codes in id order)
+    """
+    if float(np.prod(sizes, dtype=np.float64)) >= 2 ** 62:
+        # Too many combinations for one int64 key
+        stacked = np.column_stack(codes)
+        unique_codes, ids = np.unique(stacked, axis=0, return_inverse=True)
+        return ids.ravel(), unique_codes
+
+    # Mixed-radix key over the per-column codes; sorted key order is the
+    # lexicographic order pivot_table produces
+    key = np.zeros(len(codes[0]), dtype=np.int64)
+    for col_codes, size in zip(codes, sizes):
+        key = key * size + col_codes
+    ids, unique_keys = pd.factorize(key, sort=True)
+
+    decoded = []
+    for size in reversed(sizes):
+        unique_keys, col_codes = np.divmod(unique_keys, size)
+        decoded.append(col_codes)
+    return ids, np.column_stack(decoded[::-1])
+
+
+def pivot_long_to_wide(
+    df: pd.DataFrame,
+    index_cols: List[str],
+    metric_col: str = 'METRIC_CODE',
+    value_col: str = 'METRIC_VALUE',
+    metrics: Optional[Iterable[str]] = None
+) -> pd.DataFrame:
+    """
+    Pivot long-format fundamentals to one column per metric.
+
+    Same result as ``df.pivot_table(index=index_cols, columns=metric_col,
+    values=value_col, aggfunc='first').reset_index()``: the first non-null
+    value wins for duplicate (key, metric) pairs, rows and metric columns
+    without any value are dropped, keys and metric columns are sorted.
+
+    Instead of a groupby per cell, every row gets an integer (row, column)
+    position and the values are scattered into a preallocated 2-D array.
+
+    Args:
+        df: Long-format data
+        index_cols: Key columns of the wide frame
+        metric_col: Column holding the metric code
+        value_col: Column holding the value
+        metrics: Optional metric codes to keep (others are never pivoted)
+
+    Returns:
+        Wide DataFrame: index_cols followed by the metric columns
+    """
+    if metrics is not None:
+        df = df[df[metric_col].isin(list(metrics))]
+
+    # Integer code per key column and per metric (-1 = missing)
+    levels = []
+    codes = []
+    for col in index_cols + [metric_col]:
+        col_codes, uniques = pd.factorize(df[col], sort=True)
+        codes.append(col_codes.astype(np.int64))
+        levels.append(uniques)
+    values = df[value_col].to_numpy()
+
+    # pivot_table drops NaN keys and all-NaN cells; 'first' skips NaN values
+    keep = pd.notna(values)
+    for col_codes in codes:
+        keep &= col_codes >= 0
+    if not keep.any():
+        return pd.DataFrame(columns=index_cols)
+    if not keep.all():
+        codes = [col_codes[keep] for col_codes in codes]
+        values = values[keep]
+
+    row_ids, key_codes = _dense_ids(codes[:-1], [len(level) for level in levels[:-1]])
+    col_ids, used_metrics = pd.factorize(codes[-1], sort=True)
+    metric_names = levels[-1].take(used_metrics)
+
+    n_rows, n_cols = len(key_codes), len(metric_names)
+    cell = row_ids.astype(np.int64) * n_cols + col_ids
+
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        wide = np.full(n_rows * n_cols, np.nan, dtype=np.float64)
+    else:
+        wide = np.full(n_rows * n_cols, np.nan, dtype=object)
+    # Repeated positions keep the last assignment: scatter in reverse so the
+    # first occurrence of a duplicate (key, metric) pair wins
+    wide[cell[::-1]] = values[::-1]
+
+    keys = pd.DataFrame({
+        col: level.take(key_codes[:, i])
+        for i, (col, level) in enumerate(zip(index_cols, levels))
+    })
+    result = pd.concat(
+        [keys, pd.DataFrame(wide.reshape(n_rows, n_cols), columns=list(metric_names))],
+        axis=1
+    )
+    result.columns.name = None
+    return result
+
+
+# ==============================================================================
+# PERIOD GROWTH (YTD / QoQ / YoY)
+# ==============================================================================
+
+# YTD compares with Q4 of the previous year, QoQ with the previous quarter,
+# YoY with the same quarter of the previous year
+GROWTH_KINDS = ('ytd', 'qoq', 'yoy')
+
+
+def _period_keys(df: pd.DataFrame, symbol_col: str, year_col: str, quarter_col: str):
+    """(symbol code, quarter number) per row; quarter number = year * 4 + quarter - 1."""
+    symbol_codes, _ = pd.factorize(df[symbol_col])
+    year = pd.to_numeric(df[year_col], errors='coerce').to_numpy(dtype=np.float64)
+    quarter = pd.to_numeric(df[quarter_col], errors='coerce').to_numpy(dtype=np.float64)
+    period = year * 4 + quarter - 1
+    return symbol_codes.astype(np.int64), period
+
+
+def prior_period_values(
+    df: pd.DataFrame,
+    cols: Sequence[str],
+    kind: str = 'yoy',
+    symbol_col: str = 'SECURITY_CODE',
+    year_col: str = 'YEAR',
+    quarter_col: str = 'QUARTER'
+) -> pd.DataFrame:
+    """
+    Values of each row's prior period, aligned to ``df``.
+
+    The prior period is looked up by calendar key, not by row position:
+    a missing prior quarter gives NaN instead of an older quarter.
+
+    Args:
+        df: Wide quarterly data (any row order)
+        cols: Columns to look up
+        kind: 'ytd' (Q4 of the previous year), 'qoq' (previous quarter)
+              or 'yoy' (same quarter of the previous year)
+        symbol_col, year_col, quarter_col: Key columns
+
+    Returns:
+        DataFrame with ``cols``, same index as ``df``
+    """
+    if kind not in GROWTH_KINDS:
+        raise ValueError(f"Unknown growth kind: {kind} (expected one of {GROWTH_KINDS})")
+
+    symbol_codes, period = _period_keys(df, symbol_col, year_col, quarter_col)
+    if kind == 'ytd':
+        prior = np.floor(period / 4) * 4 - 1
+    elif kind == 'qoq':
+        prior = period - 1
+    else:
+        prior = period - 4
+
+    # One int64 key per (symbol, quarter). Prior periods are at most 4
+    # quarters back, so shifting by (first period - 4) keeps keys >= 0;
+    # rows without a period get keys that never match.
+    valid = ~np.isnan(period) & (symbol_codes >= 0)
+    if not valid.any():
+        return pd.DataFrame(np.nan, columns=list(cols), index=df.index)
+    first = np.min(period[valid]) - 4
+    span = np.max(period[valid]) - first + 1
+    key = np.where(valid, symbol_codes * span + (period - first), -1).astype(np.int64)
+    target = np.where(valid, symbol_codes * span + (prior - first), -2).astype(np.int64)
+
+    # Duplicate (symbol, quarter) rows: the last one is the reference
+    lookup = pd.Index(key)
+    if not lookup.is_unique:
+        last = ~lookup.duplicated(keep='last')
+        positions = pd.Series(np.flatnonzero(last), index=lookup[last])
+    else:
+        positions = pd.Series(np.arange(len(key)), index=lookup)
+    pos = positions.reindex(target).to_numpy(dtype=np.float64, na_value=np.nan)
+
+    found = ~np.isnan(pos)
+    values = df[list(cols)].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    prior_values = np.full(values.shape, np.nan)
+    prior_values[found] = values[pos[found].astype(np.int64)]
+    return pd.DataFrame(prior_values, columns=list(cols), index=df.index)
+
+
+def period_growth(
+    df: pd.DataFrame,
+    cols: Sequence[str],
+    kind: str = 'yoy',
+    base: str = 'abs',
+    symbol_col: str = 'SECURITY_CODE',
+    year_col: str = 'YEAR',
+    quarter_col: str = 'QUARTER'
+) -> pd.DataFrame:
+    """
+    Growth (%) of every column vs its prior period, computed in bulk.
+
+    Args:
+        df: Wide quarterly data (any row order)
+        cols: Columns to compute growth for
+        kind: 'ytd', 'qoq' or 'yoy' (see prior_period_values)
+        base: 'abs' divides by |prior| (NaN when prior is 0);
+              'signed' divides by prior as is, like pct_change (NaN when 0);
+              'positive' returns NaN unless prior > 0
+        symbol_col, year_col, quarter_col: Key columns
+
+    Returns:
+        DataFrame with ``cols`` (growth in %), same index as ``df``
+    """
+    cols = [c for c in cols if c in df.columns]
+    prior = prior_period_values(df, cols, kind, symbol_col, year_col, quarter_col).to_numpy()
+    current = df[cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+    if base == 'positive':
+        denominator = np.where(prior > 0, prior, np.nan)
+    elif base == 'abs':
+        denominator = np.where(prior != 0, np.abs(prior), np.nan)
+    elif base == 'signed':
+        denominator = np.where(prior != 0, prior, np.nan)
+    else:
+        raise ValueError(f"Unknown growth base: {base} (expected 'abs', 'signed' or 'positive')")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (current - prior) / denominator * 100
+    return pd.DataFrame(growth, columns=cols, index=df.index)
+
+
+# ==============================================================================
+# TTM (TRAILING 12 MONTHS)
+# ==============================================================================
+
+def rolling_ttm(
+    df: pd.DataFrame,
+    cols: Sequence[str],
+    window: int = 4,
+    symbol_col: str = 'SECURITY_CODE',
+    year_col: str = 'YEAR',
+    quarter_col: str = 'QUARTER'
+) -> pd.DataFrame:
+    """
+    Trailing ``window``-quarter sums of every column, aligned to ``df``.
+
+    Rows are ordered once by (symbol, year, quarter); the window sum is the
+    row plus its ``window - 1`` predecessors, added as shifted arrays for all
+    columns together. A sum is NaN when the window crosses a symbol boundary,
+    skips a quarter (gap or duplicate quarter) or contains a NaN value.
+
+    Args:
+        df: Wide quarterly data (any row order)
+        cols: Flow columns to sum
+        window: Number of consecutive quarters
+        symbol_col, year_col, quarter_col: Key columns
+
+    Returns:
+        DataFrame with ``cols`` (TTM sums), same index as ``df``
+    """
+    cols = [c for c in cols if c in df.columns]
+    symbol_codes, period = _period_keys(df, symbol_col, year_col, quarter_col)
+    order = np.lexsort((period, symbol_codes))
+
+    symbols = symbol_codes[order]
+    periods = period[order]
+    values = df[cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)[order]
+
+    total = values.copy()
+    complete = np.ones(len(order), dtype=bool)
+    complete[:window - 1] = False
+    for lag in range(1, window):
+        # Row i - lag must be the same symbol exactly ``lag`` quarters earlier
+        complete[lag:] &= (symbols[lag:] == symbols[:-lag]) & (periods[lag:] - periods[:-lag] == lag)
+        total[lag:] += values[:-lag]
+    total[~complete] = np.nan
+
+    result = np.empty_like(total)
+    result[order] = total
+    return pd.DataFrame(result, columns=cols, index=df.index)
@@ -37,9 +37,23 @@ import numpy as np
 from pathlib import Path
 import logging
 import argparse
-from typing import Optional, Dict, List, Callable
+import sys
+from typing import Optional, Dict, Iterable, List, Callable
 from abc import ABC, abstractmethod
 
+# Handle imports for both module usage and standalone script runs
+try:
+    from .kernels import pivot_long_to_wide, period_growth, rolling_ttm
+except ImportError:
+    from kernels import pivot_long_to_wide, period_growth, rolling_ttm
+
+try:
+    from ..ingest_manifest import changed_since
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from PROCESSORS.fundamental.ingest_manifest import changed_since
+from config.data_mapping.data_versions import record_written_files
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -65,8 +79,14 @@ class EntityCalculator(ABC):
         self.output_dir = DATA_PATH / entity_type
         self.output_path = self.output_dir / f"{entity_type}_financial_metrics.parquet"
 
-    def load_and_pivot(self, freq_code: str = 'Q') -> pd.DataFrame:
-        """Load long-format data and pivot to wide format."""
+    def load_and_pivot(self, freq_code: str = 'Q', metrics: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Load long-format data and pivot to wide format.
+
+        Args:
+            freq_code: Frequency to keep (Q/S/Y)
+            metrics: Metric codes to pivot (default: all codes in the file)
+        """
         logger.info(f"Loading data from {self.input_path}")
 
         if not self.input_path.exists():
@@ -93,14 +113,7 @@ class EntityCalculator(ABC):
         index_cols = ['SECURITY_CODE', 'REPORT_DATE', 'YEAR', 'QUARTER', 'FREQ_CODE']
         available_index = [c for c in index_cols if c in df.columns]
 
-        pivot = df.pivot_table(
-            index=available_index,
-            columns='METRIC_CODE',
-            values='METRIC_VALUE',
-            aggfunc='first'
-        ).reset_index()
-
-        pivot.columns.name = None
+        pivot = pivot_long_to_wide(df, available_index, metrics=metrics)
         logger.info(f"Pivoted to {len(pivot):,} rows, {len(pivot.columns)} columns")
 
         return pivot
@@ -115,6 +128,22 @@ class EntityCalculator(ABC):
         """Calculate derived metrics (ratios, margins, etc.)."""
         pass
 
+    def get_used_metric_codes(self) -> List[str]:
+        """Metric codes read by this calculator (pivoted by run())."""
+        return sorted(set(self.get_metric_mapping().values()))
+
+    def changed_since(self, watermark: int) -> pd.DataFrame:
+        """
+        Symbols/periods of this entity re-ingested after ``watermark``.
+
+        Args:
+            watermark: Last ingest version processed (see ingest_manifest.current_version)
+
+        Returns:
+            DataFrame: version, entity, SECURITY_CODE, YEAR, QUARTER
+        """
+        return changed_since(watermark, entity=self.entity_type)
+
     def safe_divide(self, numerator, denominator, multiplier: float = 1.0):
         """Safe division handling zeros and NaNs."""
         return np.where(
@@ -124,14 +153,17 @@ class EntityCalculator(ABC):
         )
 
     def calculate_ttm(self, df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
-        """Calculate TTM (trailing 12 months) for specified columns."""
+        """
+        Calculate TTM (trailing 12 months) for specified columns.
+
+        All columns are summed in one pass; TTM is NaN unless the last four
+        quarters are consecutive and complete.
+        """
         df = df.sort_values(['SECURITY_CODE', 'REPORT_DATE'])
 
-        for col in cols:
-            if col in df.columns:
-                df[f'{col}_ttm'] = df.groupby('SECURITY_CODE')[col].transform(
-                    lambda x: x.rolling(window=4, min_periods=4).sum()
-                )
+        ttm = rolling_ttm(df, cols)
+        for col in ttm.columns:
+            df[f'{col}_ttm'] = ttm[col]
         return df
 
     def run(self) -> pd.DataFrame:
@@ -140,11 +172,11 @@ class EntityCalculator(ABC):
         logger.info(f"Starting {self.entity_type.upper()} Calculator")
         logger.info(f"{'='*60}")
 
-        # Load and pivot
-        df = self.load_and_pivot()
+        # Load and pivot (only the metric codes the calculator maps)
+        mapping = self.get_metric_mapping()
+        df = self.load_and_pivot(metrics=self.get_used_metric_codes())
 
         # Rename columns using mapping
-        mapping = self.get_metric_mapping()
         for new_name, metric_code in mapping.items():
             if metric_code in df.columns:
                 df[new_name] = pd.to_numeric(df[metric_code], errors='coerce')
@@ -167,6 +199,7 @@ class EntityCalculator(ABC):
         # Save
         self.output_dir.mkdir(parents=True, exist_ok=True)
         df.to_parquet(self.output_path, index=False)
+        record_written_files([self.output_path])
 
         logger.info(f"Saved to: {self.output_path}")
         logger.info(f"Total rows: {len(df):,}")
@@ -341,11 +374,9 @@ class CompanyCalculator(EntityCalculator):
         df = df.sort_values(['SECURITY_CODE', 'REPORT_DATE'] if 'REPORT_DATE' in df.columns else ['SECURITY_CODE', 'report_date'])
 
         ttm_growth_cols = ['net_revenue_ttm', 'gross_profit_ttm', 'ebitda_ttm', 'npatmi_ttm', 'operating_cf_ttm', 'fcf_ttm']
-        for col in ttm_growth_cols:
-            if col in df.columns:
-                base_name = col.replace('_ttm', '')
-                prev_ttm = df.groupby('SECURITY_CODE')[col].shift(4)
-                df[f'{base_name}_growth_yoy'] = self.safe_divide(df[col] - prev_ttm, np.abs(prev_ttm), 100)
+        yoy = period_growth(df, ttm_growth_cols, kind='yoy', base='abs')
+        for col in yoy.columns:
+            df[f"{col.replace('_ttm', '')}_growth_yoy"] = yoy[col]
 
         # =============================================================
         # MA4 Smoothed Margin columns - Added for platform-agnostic
@@ -427,7 +458,7 @@ class BankCalculator(EntityCalculator):
     def __init__(self):
         super().__init__('bank')
 
-    def load_and_pivot(self, freq_code: str = 'Q') -> pd.DataFrame:
+    def load_and_pivot(self, freq_code: str = 'Q', metrics: Optional[Iterable[str]] = None) -> pd.DataFrame:
         """
         Override load_and_pivot to handle BNOT metrics that may have different FREQ_CODE.
         BNOT metrics (CASA, NPL, Provision) are often reported only in S/Y frequency,
@@ -481,16 +512,10 @@ class BankCalculator(EntityCalculator):
         index_cols = ['SECURITY_CODE', 'REPORT_DATE', 'YEAR', 'QUARTER']
         available_index = [c for c in index_cols if c in df_combined.columns]
 
-        pivot = df_combined.pivot_table(
-            index=available_index,
-            columns='METRIC_CODE',
-            values='METRIC_VALUE',
-            aggfunc='first'
-        ).reset_index()
+        pivot = pivot_long_to_wide(df_combined, available_index, metrics=metrics)
 
         # Add FREQ_CODE column for compatibility
         pivot['FREQ_CODE'] = 'Q'
-        pivot.columns.name = None
         logger.info(f"Pivoted to {len(pivot):,} rows, {len(pivot.columns)} columns")
 
         return pivot
@@ -731,13 +756,13 @@ class BankCalculator(EntityCalculator):
         # BVPS = Equity / Shares
         df['bvps'] = self.safe_divide(df['total_equity'], charter)
 
-        # Growth rates (YoY) - need to calculate after sorting
+        # Growth rates (YoY) - same quarter of the previous year, by calendar key
         df = df.sort_values(['SECURITY_CODE', 'report_date'] if 'report_date' in df.columns else ['SECURITY_CODE', 'REPORT_DATE'])
 
         growth_cols = ['nii', 'toi', 'ppop', 'pbt', 'npatmi']
-        for col in growth_cols:
-            if col in df.columns:
-                df[f'{col}_growth_yoy'] = df.groupby('SECURITY_CODE')[col].pct_change(periods=4) * 100
+        yoy = period_growth(df, growth_cols, kind='yoy', base='signed')
+        for col in yoy.columns:
+            df[f'{col}_growth_yoy'] = yoy[col]
 
         # Add total_loan as alias for total_credit (for growth calculation)
         # Note: total_loan column doesn't exist in raw data, use total_credit as proxy
@@ -749,35 +774,12 @@ class BankCalculator(EntityCalculator):
         bs_cols = ['total_credit', 'total_loan', 'total_assets', 'total_customer_deposit']
         df = df.sort_values(['SECURITY_CODE', 'YEAR', 'QUARTER'])
 
-        for col in bs_cols:
-            if col not in df.columns:
-                continue
+        # One keyed lookup for all columns; NaN unless the Q4 base is positive
+        available = [c for c in bs_cols if c in df.columns]
+        ytd = period_growth(df, available, kind='ytd', base='positive')
+        for col in available:
             col_name = col.replace('total_', '')
-            growth_col = f'{col_name}_growth_ytd'
-
-            # Get Q4 values for each ticker/year as reference
-            q4_values = df[df['QUARTER'] == 4].set_index(['SECURITY_CODE', 'YEAR'])[col].to_dict()
-
-            # Use vectorized approach to avoid closure issues
-            def calc_ytd_for_col(df_in, col_in, q4_vals):
-                """Calculate YTD growth vs Q4 of previous year."""
-                results = []
-                for _, row in df_in.iterrows():
-                    ticker = row['SECURITY_CODE']
-                    year = row['YEAR']
-                    prev_year = year - 1
-                    current_val = row[col_in]
-
-                    # Get Q4 value of previous year
-                    q4_val = q4_vals.get((ticker, prev_year))
-
-                    if q4_val and q4_val > 0 and pd.notna(current_val):
-                        results.append((current_val - q4_val) / q4_val * 100)
-                    else:
-                        results.append(np.nan)
-                return results
-
-            df[growth_col] = calc_ytd_for_col(df, col, q4_values)
+            df[f'{col_name}_growth_ytd'] = ytd[col]
 
         return df
 
@@ -1021,11 +1023,9 @@ class SecurityCalculator(EntityCalculator):
         df = df.sort_values(['SECURITY_CODE', 'REPORT_DATE'] if 'REPORT_DATE' in df.columns else ['SECURITY_CODE', 'report_date'])
 
         ttm_growth_cols = ['total_revenue_ttm', 'npatmi_ttm', 'pbt_ttm']
-        for col in ttm_growth_cols:
-            if col in df.columns:
-                base_name = col.replace('_ttm', '')
-                prev_ttm = df.groupby('SECURITY_CODE')[col].shift(4)
-                df[f'{base_name}_growth_yoy'] = self.safe_divide(df[col] - prev_ttm, np.abs(prev_ttm), 100)
+        yoy = period_growth(df, ttm_growth_cols, kind='yoy', base='abs')
+        for col in yoy.columns:
+            df[f"{col.replace('_ttm', '')}_growth_yoy"] = yoy[col]
 
         return df
 
@@ -9,17 +9,61 @@ Input: DATA/raw/fundamental/csv/Q3_2025/*.csv (wide format with metric codes as
 Output: DATA/processed/fundamental/{entity}_full.parquet (long format with METRIC_CODE column)
 
 Usage:
-    python3 PROCESSORS/fundamental/csv_to_full_parquet.py
+    python3 PROCESSORS/fundamental/csv_to_full_parquet.py          # incremental
+    python3 PROCESSORS/fundamental/csv_to_full_parquet.py --full   # full rebuild
+
+Streaming:
+    Each CSV is read in record batches with the Arrow CSV reader; every batch
+    is unpivoted straight into (ids, METRIC_CODE, METRIC_VALUE) arrays and
+    written as a row group, so memory is bounded by the batch size instead of
+    the melted file. Files Arrow cannot parse fall back to pandas.
+    Duplicate cells (first non-null wins) are only possible for metric
+    columns present in several files and for row keys repeated within a
+    file; only those cells are tracked (_CellDeduplicator).
+
+Incremental:
+    ingest_manifest.py records each CSV's content hash and a digest per
+    (symbol, year, quarter). Only changed CSVs are re-converted and only the
+    (YEAR, QUARTER) partitions they affect are replaced in the output; the
+    changed keys are logged so calculators can ask what changed since a
+    watermark (ingest_manifest.changed_since). Staging files and digests are
+    written from the batches being converted; a full rebuild streams each
+    CSV once for the staging files, the digests and the output.
 
 Author: Claude Code
 Date: 2025-12-16
 """
 
+import argparse
+import csv
+import os
+import sys
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 from pathlib import Path
 import logging
-from typing import Dict, List, Tuple
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# Handle imports for both module usage and standalone script runs
+try:
+    from .ingest_manifest import (
+        DIGEST_KEYS, IngestManifest, PartitionDigest, diff_digests, file_fingerprint, period_codes
+    )
+except ImportError:
+    from ingest_manifest import (
+        DIGEST_KEYS, IngestManifest, PartitionDigest, diff_digests, file_fingerprint, period_codes
+    )
+
+try:
+    from config.data_mapping.data_versions import record_written_files
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from config.data_mapping.data_versions import record_written_files
 
 # Setup logging
 logging.basicConfig(
@@ -64,6 +108,20 @@ ID_COLUMNS = [
     'ICB_L2', 'ENTITY_TYPE', 'MONTH_IN_PERIOD'
 ]
 
+# Duplicate key of the long format (first non-null value wins)
+KEY_COLUMNS = ['SECURITY_CODE', 'REPORT_DATE', 'FREQ_CODE']
+
+# Output types of the ID columns (all other ID columns are strings)
+ID_COLUMN_TYPES = {
+    'REPORT_DATE': pa.timestamp('ns'),
+    'YEAR': pa.int64(),
+    'QUARTER': pa.int64(),
+    'MONTH_IN_PERIOD': pa.int64(),
+}
+
+# CSV bytes per record batch
+CSV_BLOCK_SIZE = 16 << 20
+
 
 def load_csv_file(filepath: Path) -> pd.DataFrame:
     """Load a CSV file with proper dtype handling."""
@@ -79,6 +137,26 @@ def load_csv_file(filepath: Path) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+def read_csv_header(filepath: Path) -> List[str]:
+    """Column names from the first line of a CSV file."""
+    with open(filepath, newline='', encoding='utf-8-sig') as f:
+        return next(csv.reader(f), [])
+
+
+def split_columns(columns, metric_prefixes: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Split column names into (ID columns, metric columns).
+
+    ID columns keep the ID_COLUMNS order; metric columns are those starting
+    with one of the entity's metric prefixes, in file order.
+    """
+    columns = [c for c in columns if not str(c).startswith('Unnamed')]
+    id_cols = [c for c in ID_COLUMNS if c in columns]
+    prefixes = tuple(metric_prefixes)
+    metric_cols = [c for c in columns if c not in id_cols and str(c).startswith(prefixes)]
+    return id_cols, metric_cols
+
+
 def wide_to_long(df: pd.DataFrame, metric_prefixes: List[str]) -> pd.DataFrame:
     """
     Convert wide-format DataFrame to long-format.
@@ -93,14 +171,7 @@ def wide_to_long(df: pd.DataFrame, metric_prefixes: List[str]) -> pd.DataFrame:
     id_cols = [c for c in ID_COLUMNS if c in df.columns]
 
     # Identify metric columns (those starting with metric prefixes)
-    metric_cols = []
-    for col in df.columns:
-        if col not in id_cols:
-            # Check if it starts with any of the metric prefixes
-            for prefix in metric_prefixes:
-                if col.startswith(prefix):
-                    metric_cols.append(col)
-                    break
+    _, metric_cols = split_columns(df.columns, metric_prefixes)
 
     if not metric_cols:
         logger.warning(f"No metric columns found for prefixes: {metric_prefixes}")
@@ -201,8 +272,601 @@ def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# ==============================================================================
+# STREAMING CONVERSION
+# ==============================================================================
+
+def entity_files(config: Dict, csv_path: Path = None) -> List[Path]:
+    """Existing CSV files of an entity, in config order."""
+    csv_path = csv_path or CSV_PATH
+    files = []
+    for file_type in config['files']:
+        filepath = csv_path / f"{config['prefix']}_{file_type}.csv"
+        if filepath.exists():
+            files.append(filepath)
+        else:
+            logger.warning(f"File not found: {filepath}")
+    return files
+
+
+def output_schema(headers: List[List[str]], metric_prefixes: List[str]) -> pa.Schema:
+    """Long-format schema for the union of the files' ID columns."""
+    present = set()
+    for columns in headers:
+        present.update(split_columns(columns, metric_prefixes)[0])
+    id_cols = [c for c in ID_COLUMNS if c in present and c != 'ENTITY_TYPE']
+
+    fields = [pa.field(c, ID_COLUMN_TYPES.get(c, pa.string())) for c in id_cols]
+    fields += [
+        pa.field('METRIC_CODE', pa.string()),
+        pa.field('METRIC_VALUE', pa.float64()),
+        pa.field('ENTITY_TYPE', pa.string()),
+    ]
+    if 'REPORT_DATE' in id_cols:
+        fields += [pa.field(c, pa.int64()) for c in ('YEAR', 'QUARTER') if c not in id_cols]
+    return pa.schema(fields)
+
+
+def _key_strings(table, n_rows: int) -> pa.Array:
+    """One string per row joining the raw duplicate-key columns."""
+    parts = []
+    for col in KEY_COLUMNS:
+        if col in table.column_names:
+            parts.append(pc.fill_null(pc.cast(table.column(col), pa.string()), '\x00'))
+        else:
+            parts.append(pa.array(['\x00'] * n_rows, pa.string()))
+    return pc.binary_join_element_wise(*parts, '\x1f')
+
+
+def find_duplicate_keys(filepath: Path) -> pa.Array:
+    """
+    Row keys (SECURITY_CODE, REPORT_DATE, FREQ_CODE) that occur more than once
+    within one file. Rows with these keys can repeat any metric of the file.
+    """
+    include = [c for c in KEY_COLUMNS if c in read_csv_header(filepath)]
+    if not include:
+        return pa.array([], pa.string())
+    # Same parser and types as the streamed batches, so the keys compare equal
+    key_parts = [_key_strings(batch, batch.num_rows) for batch in _wide_batches(filepath, include, [])]
+    if not key_parts:
+        return pa.array([], pa.string())
+    counts = pc.value_counts(pa.chunked_array(key_parts).combine_chunks())
+    return counts.field('values').filter(pc.greater(counts.field('counts'), 1))
+
+
+def _wide_batches(filepath: Path, id_cols: List[str], metric_cols: List[str]) -> Iterator[pa.RecordBatch]:
+    """Record batches of a wide CSV (metric columns as float64)."""
+    column_types = {c: ID_COLUMN_TYPES.get(c, pa.string()) for c in id_cols}
+    column_types.update({c: pa.float64() for c in metric_cols})
+    rows_read = 0
+    try:
+        reader = pa_csv.open_csv(
+            filepath,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=id_cols + metric_cols,
+                column_types=column_types
+            )
+        )
+        for batch in reader:
+            yield batch
+            rows_read += batch.num_rows
+        return
+    except pa.ArrowInvalid as e:
+        logger.warning(f"  Arrow could not parse {filepath.name} ({e}); falling back to pandas")
+
+    # Fallback: pandas parser (non-numeric values become NaN), resuming after
+    # the rows already streamed
+    df = load_csv_file(filepath).iloc[rows_read:]
+    df = df[[c for c in id_cols + metric_cols if c in df.columns]]
+    for col in metric_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    if 'REPORT_DATE' in df.columns:
+        df['REPORT_DATE'] = pd.to_datetime(df['REPORT_DATE'], errors='coerce')
+    arrays = []
+    for col in df.columns:
+        target = column_types[col]
+        values = df[col].astype('string') if target == pa.string() else df[col]
+        arrays.append(pa.array(values, type=target, from_pandas=True))
+    table = pa.Table.from_arrays(arrays, names=list(df.columns))
+    yield from table.to_batches(max_chunksize=100_000)
+
+
+class _CellDeduplicator:
+    """
+    Keeps the first non-null value per (row key, metric) across batches/files.
+
+    The statement files of an entity share their row keys but rarely their
+    metric columns, so a cell can only repeat when
+    - its metric column is in more than one file (headers are compared up
+      front), or
+    - its row key occurs more than once within its file.
+    Only those cells are tracked. The seen cells are an Arrow table of
+    (key, metric id) and each batch's candidates are filtered with an
+    anti-join, so memory grows with the tracked cells only.
+    """
+
+    def __init__(self, metric_columns: List[List[str]], duplicate_keys: List[pa.Array]):
+        self.metric_ids = {m: i for i, m in enumerate(dict.fromkeys(m for cols in metric_columns for m in cols))}
+        self.file_metric_ids = [np.array([self.metric_ids[m] for m in cols], dtype=np.int32)
+                                for cols in metric_columns]
+        self.duplicate_keys = duplicate_keys
+        file_counts = Counter(i for ids in self.file_metric_ids for i in set(ids.tolist()))
+        self.shared_metrics = sum(1 for count in file_counts.values() if count > 1)
+        self.seen: Optional[pa.Table] = None
+        self.tracked = 0
+        self.begin_file(0)
+
+    def begin_file(self, index: int):
+        """Select the file whose batches are passed to keep_mask next."""
+        self.ids = self.file_metric_ids[index] if self.file_metric_ids else np.empty(0, np.int32)
+        earlier = set().union(*map(set, self.file_metric_ids[:index])) if index else set()
+        later = set().union(*map(set, self.file_metric_ids[index + 1:]))
+        # check: may repeat an earlier file's cell; record: may be repeated later
+        self.check_cols = np.isin(self.ids, list(earlier))
+        self.record_cols = np.isin(self.ids, list(later))
+        self.file_duplicate_keys = self.duplicate_keys[index] if self.duplicate_keys else pa.array([], pa.string())
+
+    @property
+    def active(self) -> bool:
+        return bool(self.check_cols.any() or self.record_cols.any() or len(self.file_duplicate_keys))
+
+    def keep_mask(self, batch: pa.RecordBatch, rows: np.ndarray, cols: np.ndarray) -> Optional[np.ndarray]:
+        """Boolean mask over the (rows, cols) cells, or None to keep all."""
+        if not self.active:
+            return None
+        keys = _key_strings(batch, batch.num_rows)
+        check, record = self.check_cols[cols], self.record_cols[cols]
+        dup_rows = None
+        if len(self.file_duplicate_keys):
+            dup_rows = pc.is_in(keys, value_set=self.file_duplicate_keys).to_numpy(zero_copy_only=False)[rows]
+            check, record = check | dup_rows, record | dup_rows
+        candidates = np.flatnonzero(check | record)
+        if len(candidates) == 0:
+            return None
+
+        cells = pa.table({
+            'key': keys.take(pa.array(rows[candidates])),
+            'metric': pa.array(self.ids[cols[candidates]], pa.int32()),
+            'pos': pa.array(np.arange(len(candidates), dtype=np.int64)),
+        })
+        # First occurrence within the batch (only repeated row keys can repeat a cell here)
+        if dup_rows is not None and dup_rows.any():
+            first = cells.group_by(['key', 'metric'], use_threads=False).aggregate([('pos', 'min')])
+            cells = pa.table({name: first.column(column) for name, column in
+                              (('key', 'key'), ('metric', 'metric'), ('pos', 'pos_min'))})
+        # Drop cells seen before; record-only cells cannot have been seen
+        if self.seen is not None:
+            must_check = pa.array(check[candidates][cells.column('pos').to_numpy()])
+            checked = cells.filter(must_check).join(
+                self.seen, keys=['key', 'metric'], join_type='left anti', use_threads=False
+            )
+            cells = pa.concat_tables([checked, cells.filter(pc.invert(must_check))])
+        kept_pos = cells.column('pos').to_numpy()
+
+        keep = np.ones(len(rows), dtype=bool)
+        keep[candidates] = False
+        keep[candidates[kept_pos]] = True
+
+        recorded = cells.filter(pa.array(record[candidates][kept_pos])).select(['key', 'metric'])
+        if recorded.num_rows:
+            self.seen = recorded if self.seen is None else pa.concat_tables([self.seen, recorded])
+            self.tracked += recorded.num_rows
+        return keep
+
+
+def batch_cells(batch: pa.RecordBatch, metric_cols: List[str],
+                dedup: _CellDeduplicator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Non-null metric cells of one wide batch that ``dedup`` keeps.
+
+    Returns:
+        (values, rows, cols): float64 value matrix and the cell positions
+    """
+    values = np.column_stack([
+        batch.column(c).to_numpy(zero_copy_only=False) for c in metric_cols
+    ]).astype(np.float64, copy=False)
+    rows, cols = np.nonzero(~np.isnan(values))
+
+    keep = dedup.keep_mask(batch, rows, cols)
+    if keep is not None:
+        rows, cols = rows[keep], cols[keep]
+    return values, rows, cols
+
+
+def unpivot_batch(batch: pa.RecordBatch, id_cols: List[str], metric_cols: List[str],
+                  values: np.ndarray, rows: np.ndarray, cols: np.ndarray,
+                  entity_type: str, schema: pa.Schema) -> Optional[pa.Table]:
+    """
+    Long-format rows of the (rows, cols) cells of one wide batch, with the
+    output schema (see batch_cells).
+
+    Returns:
+        pa.Table, or None when there are no cells
+    """
+    if len(rows) == 0:
+        return None
+
+    take = pa.array(rows)
+    metric_codes = pa.DictionaryArray.from_arrays(
+        pa.array(cols.astype(np.int32)), pa.array(metric_cols, pa.string())
+    )
+    columns = {}
+    for field in schema:
+        name = field.name
+        if name == 'METRIC_CODE':
+            columns[name] = metric_codes.cast(pa.string())
+        elif name == 'METRIC_VALUE':
+            columns[name] = pa.array(values[rows, cols], pa.float64())
+        elif name == 'ENTITY_TYPE':
+            columns[name] = pa.array([entity_type.upper()] * len(rows), pa.string())
+        elif name in id_cols:
+            columns[name] = batch.column(name).take(take).cast(field.type)
+        elif name in ('YEAR', 'QUARTER') and 'REPORT_DATE' in id_cols:
+            dates = batch.column('REPORT_DATE').take(take)
+            derived = pc.year(dates) if name == 'YEAR' else pc.quarter(dates)
+            columns[name] = derived.cast(pa.int64())
+        else:
+            columns[name] = pa.nulls(len(rows), field.type)
+
+    # Clean ticker codes (remove leading/trailing spaces and tabs)
+    if 'SECURITY_CODE' in columns:
+        columns['SECURITY_CODE'] = pc.utf8_trim_whitespace(columns['SECURITY_CODE'])
+
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+class _AtomicParquetWriter:
+    """Parquet file written to a .tmp sibling and moved into place on commit."""
+
+    def __init__(self, path: Path, schema: pa.Schema):
+        self.path = path
+        self.schema = schema
+        self.tmp_path = path.with_suffix('.parquet.tmp')
+        self.writer = None
+
+    def write(self, table: pa.Table):
+        if self.writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.writer = pq.ParquetWriter(self.tmp_path, self.schema)
+        self.writer.write_table(table)
+
+    def commit(self) -> bool:
+        """Move the file into place. Returns False (``path`` untouched) if nothing was written."""
+        if self.writer is None:
+            return False
+        self.writer.close()
+        self.writer = None
+        os.replace(self.tmp_path, self.path)
+        return True
+
+    def abort(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+def write_long_parquet(entity_type: str, files: List[Path], headers: List[List[str]],
+                       metric_prefixes: List[str], schema: pa.Schema,
+                       output_file: Optional[Path],
+                       staging_files: Optional[List[Path]] = None) -> Dict:
+    """
+    Stream CSV files into one long-format parquet file (written atomically).
+
+    Duplicate cells across ``files`` keep the first non-null value. With
+    ``staging_files`` (one per input file), the same pass writes each file's
+    own rows (deduplicated within the file only) to its staging file and
+    digests them, so an ingest reads every CSV once. ``output_file`` may then
+    be None to write the staging files only.
+
+    Returns:
+        Stats dict: rows, tickers, metrics (of the output, else of the staging
+        files) and, with ``staging_files``, digests (see
+        ingest_manifest.PartitionDigest); empty dict if nothing was written
+    """
+    file_columns = [split_columns(header, metric_prefixes) for header in headers]
+    duplicate_keys = [find_duplicate_keys(f) for f in files]
+    # Repeated row keys are resolved per file (that is what a staging file
+    # holds); shared metric columns across files on top of that
+    no_keys = [pa.array([], pa.string())] * len(files)
+    cross_dedup = _CellDeduplicator([metric_cols for _, metric_cols in file_columns], no_keys)
+    repeated_keys = sum(len(keys) for keys in duplicate_keys)
+    if output_file is not None and (cross_dedup.shared_metrics or repeated_keys):
+        logger.info(f"  Dedup: {cross_dedup.shared_metrics} metric column(s) in several files, "
+                    f"{repeated_keys:,} repeated row key(s)")
+
+    output = _AtomicParquetWriter(output_file, schema) if output_file is not None else None
+    writers = [output] if output is not None else []
+    digests = []
+    rows_written = 0
+    tracked = 0
+    tickers, metrics = set(), set()
+    try:
+        for index, (filepath, (id_cols, metric_cols)) in enumerate(zip(files, file_columns)):
+            cross_dedup.begin_file(index)
+            staging = _AtomicParquetWriter(staging_files[index], schema) if staging_files else None
+            digest = PartitionDigest(filepath.name) if staging is not None else None
+            if staging is not None:
+                writers.append(staging)
+            if not metric_cols:
+                logger.warning(f"No metric columns found for prefixes: {metric_prefixes}")
+                if staging is not None:
+                    staging_files[index].unlink(missing_ok=True)
+                continue
+            logger.info(f"Streaming {filepath.name}: {len(metric_cols)} metric columns, {len(id_cols)} ID columns")
+
+            file_dedup = _CellDeduplicator([metric_cols], [duplicate_keys[index]])
+            file_rows = 0
+            for batch in _wide_batches(filepath, id_cols, metric_cols):
+                if batch.num_rows == 0:
+                    continue
+                values, rows, cols = batch_cells(batch, metric_cols, file_dedup)
+                table = unpivot_batch(batch, id_cols, metric_cols, values, rows, cols, entity_type, schema)
+                if table is None:
+                    continue
+                if staging is not None:
+                    staging.write(table)
+                    digest.update(table)
+                if output is not None:
+                    keep = cross_dedup.keep_mask(batch, rows, cols)
+                    if keep is not None:
+                        table = table.filter(pa.array(keep))
+                    if table.num_rows == 0:
+                        continue
+                    output.write(table)
+                file_rows += table.num_rows
+                if 'SECURITY_CODE' in table.column_names:
+                    tickers.update(pc.unique(table.column('SECURITY_CODE')).to_pylist())
+                metrics.update(pc.unique(table.column('METRIC_CODE')).to_pylist())
+
+            if staging is not None:
+                if staging.commit():
+                    digests.append(digest.result())
+                else:
+                    staging_files[index].unlink(missing_ok=True)
+            tracked += file_dedup.tracked
+            rows_written += file_rows
+            logger.info(f"  Converted to {file_rows:,} long-format rows")
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
+
+    tracked += cross_dedup.tracked
+    if output is not None and not output.commit():
+        return {}
+    if not rows_written:
+        return {}
+    if tracked:
+        logger.info(f"  {tracked:,} cells tracked for duplicates")
+
+    tickers.discard(None)
+    stats = {'rows': rows_written, 'tickers': len(tickers), 'metrics': len(metrics)}
+    if staging_files:
+        stats['digests'] = pd.concat(digests, ignore_index=True)
+    return stats
+
+
+def convert_entity_streaming(entity_type: str, config: Dict, output_file: Path,
+                             csv_path: Path = None) -> Dict[str, int]:
+    """
+    Stream all CSV files of an entity into one long-format parquet file.
+
+    Args:
+        entity_type: Entity key (bank, company, insurance, security)
+        config: ENTITY_CONFIGS entry
+        output_file: Destination parquet (written atomically)
+        csv_path: Source directory (default: CSV_PATH)
+
+    Returns:
+        Stats dict: rows, tickers, metrics (empty dict if nothing was written)
+    """
+    logger.info(f"{'='*60}")
+    logger.info(f"Processing {entity_type.upper()} (streaming)")
+    logger.info(f"{'='*60}")
+
+    files = entity_files(config, csv_path)
+    if not files:
+        logger.warning(f"No data processed for {entity_type}")
+        return {}
+
+    metric_prefixes = config['metric_prefixes']
+    headers = [read_csv_header(f) for f in files]
+    schema = output_schema(headers, metric_prefixes)
+    stats = write_long_parquet(entity_type, files, headers, metric_prefixes, schema, output_file)
+    if not stats:
+        logger.warning(f"No data processed for {entity_type}")
+    else:
+        record_written_files([output_file])
+    return stats
+
+
+# ==============================================================================
+# INCREMENTAL INGEST
+# ==============================================================================
+
+def replace_partitions(output_file: Path, staging_files: List[Path], schema: pa.Schema,
+                       partitions: Set[int]) -> int:
+    """
+    Rewrite ``output_file`` with the given (YEAR, QUARTER) partitions rebuilt
+    from the staging files.
+
+    Rows of other partitions are streamed through row group by row group;
+    the affected partitions are read from every staging file (in entity
+    file order, first non-null value wins) and appended at the end.
+
+    Args:
+        output_file: Existing long-format parquet with ``schema``
+        staging_files: Per-CSV long-format parquet files, in ENTITY_CONFIGS order
+        schema: Output schema
+        partitions: Partition codes (see ingest_manifest.period_codes)
+
+    Returns:
+        Total number of rows in the rewritten file
+    """
+    codes = pa.array(sorted(partitions), pa.int64())
+    tmp_file = output_file.with_suffix('.parquet.tmp')
+    total_rows = 0
+    try:
+        with pq.ParquetWriter(tmp_file, schema) as writer:
+            for batch in pq.ParquetFile(output_file).iter_batches():
+                table = pa.Table.from_batches([batch], schema=schema)
+                keep = pc.invert(pc.is_in(pa.array(period_codes(table)), value_set=codes))
+                table = table.filter(keep)
+                if table.num_rows:
+                    writer.write_table(table)
+                    total_rows += table.num_rows
+
+            parts = []
+            for staging_file in staging_files:
+                for batch in pq.ParquetFile(staging_file).iter_batches():
+                    table = pa.Table.from_batches([batch], schema=schema)
+                    table = table.filter(pc.is_in(pa.array(period_codes(table)), value_set=codes))
+                    if table.num_rows:
+                        parts.append(table)
+
+            if parts:
+                rebuilt = pa.concat_tables(parts).to_pandas()
+                keys = [c for c in KEY_COLUMNS + ['METRIC_CODE'] if c in rebuilt.columns]
+                rebuilt = rebuilt.drop_duplicates(subset=keys, keep='first')
+                table = pa.Table.from_pandas(rebuilt, schema=schema, preserve_index=False)
+                writer.write_table(table)
+                total_rows += table.num_rows
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+    os.replace(tmp_file, output_file)
+    return total_rows
+
+
+def ingest_entity(entity_type: str, config: Dict, output_file: Path, manifest: IngestManifest,
+                  csv_path: Path = None, full: bool = False) -> Dict[str, int]:
+    """
+    Incrementally ingest the CSV files of an entity.
+
+    Only files whose content hash changed are re-converted into a per-file
+    staging parquet and digested in the same pass (a full rebuild writes
+    ``output_file`` from that pass too). Their (symbol, year, quarter)
+    digests are compared with the previous run; the (YEAR, QUARTER)
+    partitions with a difference are replaced in ``output_file`` and the
+    changed keys are logged under a new manifest version. A full rebuild runs on the first ingest, when ``full``
+    is set or when the output schema changed.
+
+    Args:
+        entity_type: Entity key (bank, company, insurance, security)
+        config: ENTITY_CONFIGS entry
+        output_file: Long-format parquet ({entity}_full.parquet)
+        manifest: Ingest manifest (saved by this function)
+        csv_path: Source directory (default: CSV_PATH)
+        full: Force a full rebuild
+
+    Returns:
+        Stats dict: rows, files (re-converted), partitions (replaced),
+        changes (changed keys), version; empty dict if there is no input
+    """
+    logger.info(f"{'='*60}")
+    logger.info(f"Ingesting {entity_type.upper()}")
+    logger.info(f"{'='*60}")
+
+    files = entity_files(config, csv_path)
+    if not files:
+        logger.warning(f"No data processed for {entity_type}")
+        return {}
+
+    metric_prefixes = config['metric_prefixes']
+    headers = [read_csv_header(f) for f in files]
+    schema = output_schema(headers, metric_prefixes)
+    state = manifest.entity(entity_type)
+    staging = {f.name: manifest.staging_file(entity_type, f) for f in files}
+
+    if not full:
+        if not set(DIGEST_KEYS) <= set(schema.names):
+            logger.info(f"  No {DIGEST_KEYS} in schema: full rebuild")
+            full = True
+        elif state['schema'] != schema.to_string() or not output_file.exists():
+            logger.info("  New or changed output schema: full rebuild")
+            full = True
+        elif pq.read_schema(output_file) != schema:
+            logger.info("  Output file schema differs from manifest: full rebuild")
+            full = True
+
+    fingerprints = {f.name: file_fingerprint(f, state['files'].get(f.name)) for f in files}
+    changed = [
+        f for f in files
+        if full
+        or not staging[f.name].exists()
+        or state['files'].get(f.name, {}).get('hash') != fingerprints[f.name]['hash']
+    ]
+    removed = [name for name in state['files'] if name not in fingerprints]
+
+    old_digests = manifest.load_digests(entity_type)
+    digests = old_digests[~old_digests['file'].isin([f.name for f in changed] + removed)]
+    for name in removed:
+        manifest.staging_file(entity_type, Path(name)).unlink(missing_ok=True)
+
+    new_parts = [digests]
+    for filepath in changed:
+        logger.info(f"  Changed: {filepath.name}")
+    # One pass over the changed CSVs: staging files and their digests, plus
+    # the whole deduplicated output on a full rebuild (changed = all files)
+    stats = {}
+    if changed:
+        stats = write_long_parquet(
+            entity_type, changed, [h for f, h in zip(files, headers) if f in changed],
+            metric_prefixes, schema, output_file if full else None,
+            staging_files=[staging[f.name] for f in changed]
+        )
+    if stats:
+        new_parts.append(stats['digests'])
+    digests = pd.concat(new_parts, ignore_index=True)
+    changes = diff_digests(old_digests, digests)
+
+    if full:
+        if not stats:
+            logger.warning(f"No data processed for {entity_type}")
+            return {}
+        total_rows = stats['rows']
+        partitions = set(changes['YEAR'] * 4 + changes['QUARTER'] - 1)
+    elif len(changes):
+        staging_files = [staging[f.name] for f in files if staging[f.name].exists()]
+        partitions = set(changes['YEAR'] * 4 + changes['QUARTER'] - 1)
+        logger.info(f"  Replacing {len(partitions)} partition(s) in {output_file.name}")
+        total_rows = replace_partitions(output_file, staging_files, schema, partitions)
+    else:
+        partitions = set()
+        total_rows = pq.ParquetFile(output_file).metadata.num_rows
+
+    manifest.save_digests(entity_type, digests)
+    if len(changes):
+        manifest.record_changes(entity_type, changes)
+    for name in removed:
+        state['files'].pop(name)
+    for filepath in files:
+        previous = state['files'].get(filepath.name, {})
+        version = manifest.version if filepath in changed and len(changes) else previous.get('version', manifest.version)
+        state['files'][filepath.name] = dict(fingerprints[filepath.name], version=version)
+    state['schema'] = schema.to_string()
+    manifest.save()
+    if full or len(changes):
+        record_written_files([output_file])
+
+    logger.info(f"  Re-converted {len(changed)}/{len(files)} file(s), {len(changes):,} changed key(s)")
+    return {
+        'rows': total_rows,
+        'files': len(changed),
+        'partitions': len(partitions),
+        'changes': len(changes),
+        'version': manifest.version,
+    }
+
+
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description='Convert fundamental CSVs to long-format parquet')
+    parser.add_argument('--full', action='store_true', help='Rebuild every entity from all CSV files')
+    args = parser.parse_args()
+
     logger.info("="*60)
     logger.info("CSV to Full Parquet Converter")
     logger.info("="*60)
@@ -212,38 +876,33 @@ def main():
         return
 
     OUTPUT_PATH.mkdir(parents=True, exist_ok=True)
+    manifest = IngestManifest()
 
     total_rows = 0
     results = {}
 
     for entity_type, config in ENTITY_CONFIGS.items():
-        df = process_entity(entity_type, config)
+        output_file = OUTPUT_PATH / f"{entity_type}_full.parquet"
+        stats = ingest_entity(entity_type, config, output_file, manifest, full=args.full)
 
-        if df.empty:
+        if not stats:
             continue
 
-        # Add derived columns
-        df = add_derived_columns(df)
-
-        # Save to parquet
-        output_file = OUTPUT_PATH / f"{entity_type}_full.parquet"
-        df.to_parquet(output_file, index=False)
-
         logger.info(f"Saved: {output_file}")
-        logger.info(f"  Rows: {len(df):,}")
-        logger.info(f"  Tickers: {df['SECURITY_CODE'].nunique()}")
-        logger.info(f"  Metrics: {df['METRIC_CODE'].nunique()}")
+        logger.info(f"  Rows: {stats['rows']:,}")
+        logger.info(f"  Files re-converted: {stats['files']}")
+        logger.info(f"  Partitions replaced: {stats['partitions']}")
 
-        total_rows += len(df)
-        results[entity_type] = len(df)
+        total_rows += stats['rows']
+        results[entity_type] = stats
 
     # Summary
     logger.info("")
     logger.info("="*60)
-    logger.info("SUMMARY")
+    logger.info(f"SUMMARY (ingest version {manifest.version})")
     logger.info("="*60)
-    for entity, rows in results.items():
-        logger.info(f"  {entity.upper()}: {rows:,} rows")
+    for entity, stats in results.items():
+        logger.info(f"  {entity.upper()}: {stats['rows']:,} rows, {stats['changes']:,} changed symbol-periods")
     logger.info(f"  TOTAL: {total_rows:,} rows")
     logger.info("="*60)
 
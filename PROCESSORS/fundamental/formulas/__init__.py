@@ -10,6 +10,8 @@ Structure:
 - insurance_formulas.py: Insurance-specific formulas
 - security_formulas.py: Security-specific formulas
 - utils.py: Utility functions (safe_divide, to_percentage)
+- _vector_formulas.py: Vectorized (NumPy) versions of the registered formulas
+- compiler.py: Compiles registered formulas into a column-wise evaluation plan
 
 Usage:
     from PROCESSORS.fundamental.formulas import (
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Vectorized Financial Formulas
+
+Column-wise NumPy versions of the scalar formulas in _base_formulas.py,
+company_formulas.py and bank_formulas.py, used by the formula compiler
+(compiler.py) to evaluate a whole entity frame at once.
+
+Conventions (same results as the scalar formulas, with NaN for None):
+- Inputs and outputs are float64 arrays of equal length
+- Division by zero or NaN gives NaN (bulk safe division)
+- Formulas that round their scalar result round to 2 decimals here too
+"""
+
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def vector_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise division; NaN where the denominator is 0 or NaN."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=(denominator != 0) & ~np.isnan(denominator))
+    return out
+
+
+def _ratio(percent: bool = False, decimals: Optional[int] = None) -> Callable[..., np.ndarray]:
+    """Kernel for numerator / denominator (× 100 when ``percent``)."""
+    def kernel(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        result = vector_divide(numerator, denominator)
+        if percent:
+            result = result * 100
+        return np.round(result, decimals) if decimals is not None else result
+    return kernel
+
+
+def _growth(current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """((current - previous) / previous) × 100, rounded to 2 decimals."""
+    return np.round(vector_divide(current - previous, previous) * 100, 2)
+
+
+# =============================================================================
+# MULTI-INPUT FORMULAS
+# =============================================================================
+
+def quick_ratio(current_assets: np.ndarray, inventory: np.ndarray, current_liabilities: np.ndarray) -> np.ndarray:
+    """(Current Assets - Inventory) / Current Liabilities"""
+    return vector_divide(current_assets - inventory, current_liabilities)
+
+
+def days_outstanding(balance: np.ndarray, flow: np.ndarray, days: int = 365) -> np.ndarray:
+    """(Average balance / flow) × days (DSO, DIO)"""
+    return vector_divide(balance, flow) * days
+
+
+def ttm_sum(q1: np.ndarray, q2: np.ndarray, q3: np.ndarray, q4: np.ndarray) -> np.ndarray:
+    """Sum of the available quarters; NaN when all four are missing."""
+    stacked = np.vstack([q1, q2, q3, q4])
+    return np.where(np.isnan(stacked).all(axis=0), np.nan, np.nansum(stacked, axis=0))
+
+
+def free_cash_flow(operating_cash_flow: np.ndarray, capital_expenditure: np.ndarray) -> np.ndarray:
+    """Operating Cash Flow - Capital Expenditure"""
+    return operating_cash_flow - capital_expenditure
+
+
+def bank_car(loan_loss_allowance: np.ndarray, total_loans: np.ndarray, risk_weighted_assets: np.ndarray) -> np.ndarray:
+    """Risk-Weighted Assets / (Loan Loss Allowance + Total Loans); NaN when loans are 0"""
+    valid = (total_loans != 0) & ~np.isnan(total_loans)
+    result = vector_divide(risk_weighted_assets, loan_loss_allowance + total_loans)
+    return np.round(np.where(valid, result, np.nan), 2)
+
+
+# =============================================================================
+# REGISTRY NAME → KERNEL
+# =============================================================================
+
+VECTOR_FORMULAS: Dict[str, Callable[..., np.ndarray]] = {
+    # Profitability (%)
+    'calculate_roe': _ratio(percent=True),
+    'calculate_roa': _ratio(percent=True),
+    'calculate_roic': _ratio(percent=True),
+    'calculate_gross_margin': _ratio(percent=True),
+    'calculate_operating_margin': _ratio(percent=True),
+    'calculate_net_margin': _ratio(percent=True),
+    'calculate_ebit_margin': _ratio(percent=True),
+    'calculate_ebitda_margin': _ratio(percent=True),
+
+    # Liquidity / leverage / efficiency (ratio)
+    'calculate_current_ratio': _ratio(),
+    'calculate_quick_ratio': quick_ratio,
+    'calculate_cash_ratio': _ratio(),
+    'calculate_debt_to_equity': _ratio(),
+    'calculate_debt_to_assets': _ratio(),
+    'calculate_equity_multiplier': _ratio(),
+    'calculate_interest_coverage': _ratio(),
+    'calculate_asset_turnover': _ratio(),
+    'calculate_inventory_turnover': _ratio(),
+    'calculate_receivables_turnover': _ratio(),
+    'calculate_days_sales_outstanding': days_outstanding,
+    'calculate_days_inventory_outstanding': days_outstanding,
+
+    # Per share / valuation
+    'calculate_eps': _ratio(),
+    'calculate_book_value_per_share': _ratio(),
+    'calculate_ev_ebitda': _ratio(),
+
+    # Growth / TTM
+    'calculate_yoy_growth': _growth,
+    'calculate_qoq_growth': _growth,
+    'calculate_ttm_sum': ttm_sum,
+
+    # Company
+    'calculate_revenue_growth': _growth,
+    'calculate_profit_growth': _growth,
+    'calculate_free_cash_flow': free_cash_flow,
+
+    # Bank
+    'calculate_nim': _ratio(percent=True, decimals=2),
+    'calculate_cir': _ratio(percent=True, decimals=2),
+    'calculate_plr': _ratio(percent=True, decimals=2),
+    'calculate_car': bank_car,
+    'calculate_npl_ratio': _ratio(percent=True, decimals=2),
+    'calculate_efficiency_ratio': _ratio(decimals=2),
+}
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Formula Compiler
+================
+
+Compiles registered formulas into a dependency-ordered plan of column-wise
+NumPy operations and evaluates a whole entity frame in one pass.
+
+Each ``FormulaSpec`` names an output column, a formula and its inputs.
+Inputs are frame columns or the outputs of other specs, so intermediates
+(e.g. a TTM net income used by ROE, ROA and EPS) are computed once and
+shared. Formulas come from ``FormulaRegistry``: the vectorized kernel
+(_vector_formulas.py) is used when one is registered; otherwise the scalar
+formula is applied element-wise as a fallback.
+
+Window operations over (symbol, year, quarter) are built in:
+    ttm        Trailing 4-quarter sum (NaN across missing quarters)
+    prior_qoq  Value of the previous quarter
+    prior_yoy  Value of the same quarter of the previous year
+    prior_ytd  Value of Q4 of the previous year
+
+Usage:
+    from PROCESSORS.fundamental.formulas.compiler import FormulaSpec, compile_formulas
+
+    plan = compile_formulas([
+        FormulaSpec('npatmi_ttm', 'ttm', ('npatmi',)),
+        FormulaSpec('roe', 'calculate_roe', ('npatmi_ttm', 'total_equity')),
+        FormulaSpec('roa', 'calculate_roa', ('npatmi_ttm', 'total_assets')),
+        FormulaSpec('npatmi_ttm_prev', 'prior_yoy', ('npatmi_ttm',)),
+        FormulaSpec('npatmi_ttm_growth', 'calculate_yoy_growth', ('npatmi_ttm', 'npatmi_ttm_prev')),
+    ], entity_type='COMPANY')
+    ratios = plan.evaluate(df)   # DataFrame of outputs, same index as df
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from PROCESSORS.fundamental.calculators.kernels import prior_period_values, rolling_ttm
+
+from .registry import FormulaRegistry, formula_registry
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ('SECURITY_CODE', 'YEAR', 'QUARTER')
+
+
+# =============================================================================
+# WINDOW OPERATIONS
+# =============================================================================
+
+def _window_op(kind: str) -> Callable[[pd.DataFrame, np.ndarray], np.ndarray]:
+    """Window operation over one column given the (symbol, year, quarter) keys."""
+    def op(keys: pd.DataFrame, values: np.ndarray) -> np.ndarray:
+        frame = keys.assign(_value=values)
+        symbol_col, year_col, quarter_col = keys.columns
+        if kind == 'ttm':
+            result = rolling_ttm(frame, ['_value'], 4, symbol_col, year_col, quarter_col)
+        else:
+            result = prior_period_values(frame, ['_value'], kind, symbol_col, year_col, quarter_col)
+        return result['_value'].to_numpy()
+    return op
+
+
+WINDOW_OPS: Dict[str, Callable[[pd.DataFrame, np.ndarray], np.ndarray]] = {
+    'ttm': _window_op('ttm'),
+    'prior_qoq': _window_op('qoq'),
+    'prior_yoy': _window_op('yoy'),
+    'prior_ytd': _window_op('ytd'),
+}
+
+
+def _elementwise(formula: Callable) -> Callable[..., np.ndarray]:
+    """Fallback: apply a scalar formula element-wise (NaN ↔ None)."""
+    def scalar(*values):
+        try:
+            result = formula(*[None if np.isnan(v) else float(v) for v in values])
+        except (TypeError, ZeroDivisionError):
+            # Scalar formulas that do not guard None/zero inputs
+            return np.nan
+        return np.nan if result is None else result
+
+    def kernel(*arrays: np.ndarray) -> np.ndarray:
+        return np.array([scalar(*row) for row in zip(*arrays)], dtype=np.float64)
+    return kernel
+
+
+# =============================================================================
+# SPEC / PLAN
+# =============================================================================
+
+@dataclass(frozen=True)
+class FormulaSpec:
+    """
+    One output column of a formula plan.
+
+    Attributes:
+        output: Output column name
+        formula: Registered formula name (e.g. "calculate_roe") or a window
+                 operation ("ttm", "prior_qoq", "prior_yoy", "prior_ytd")
+        inputs: Frame columns or outputs of other specs, in argument order
+    """
+    output: str
+    formula: str
+    inputs: Tuple[str, ...]
+
+
+@dataclass
+class _Node:
+    spec: FormulaSpec
+    kernel: Callable
+    window: bool
+
+
+class FormulaPlan:
+    """
+    Compiled, dependency-ordered formula plan.
+
+    Attributes:
+        order: Output names in evaluation order
+        required_columns: Frame columns the plan reads
+    """
+
+    def __init__(self, nodes: List[_Node], key_columns: Sequence[str]):
+        self._nodes = nodes
+        self.key_columns = list(key_columns)
+        self.order = [node.spec.output for node in nodes]
+        outputs = set(self.order)
+        self.required_columns = sorted({
+            name for node in nodes for name in node.spec.inputs if name not in outputs
+        })
+        self.uses_windows = any(node.window for node in nodes)
+
+    def evaluate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Evaluate every formula over ``df``.
+
+        Args:
+            df: Wide entity frame (one row per symbol/period)
+
+        Returns:
+            DataFrame with one float64 column per output, same index as ``df``
+
+        Raises:
+            KeyError: If ``df`` lacks a required input or key column
+        """
+        missing = [c for c in self.required_columns if c not in df.columns]
+        if self.uses_windows:
+            missing += [c for c in self.key_columns if c not in df.columns]
+        if missing:
+            raise KeyError(f"Missing columns for formula plan: {missing}")
+
+        arrays: Dict[str, np.ndarray] = {
+            col: pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            for col in self.required_columns
+        }
+        keys = df[self.key_columns] if self.uses_windows else None
+
+        # Identical (formula, inputs) pairs are computed once
+        computed: Dict[Tuple[str, Tuple[str, ...]], np.ndarray] = {}
+        outputs: Dict[str, np.ndarray] = {}
+        for node in self._nodes:
+            spec = node.spec
+            signature = (spec.formula, tuple(spec.inputs))
+            if signature not in computed:
+                args = [arrays[name] for name in spec.inputs]
+                with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                    result = node.kernel(keys, *args) if node.window else node.kernel(*args)
+                computed[signature] = np.asarray(result, dtype=np.float64)
+            arrays[spec.output] = computed[signature]
+            outputs[spec.output] = computed[signature]
+
+        return pd.DataFrame(outputs, index=df.index)
+
+
+def compile_formulas(
+    specs: Sequence[FormulaSpec],
+    entity_type: Optional[str] = None,
+    registry: Optional[FormulaRegistry] = None,
+    key_columns: Sequence[str] = KEY_COLUMNS
+) -> FormulaPlan:
+    """
+    Resolve formulas and order specs by their dependencies.
+
+    Args:
+        specs: Formula specs (any order)
+        entity_type: Entity context for registry lookups (COMPANY, BANK, ...)
+        registry: Formula registry (default: the module singleton)
+        key_columns: (symbol, year, quarter) columns for window operations
+
+    Returns:
+        FormulaPlan
+
+    Raises:
+        ValueError: Duplicate outputs, unknown formulas or a dependency cycle
+    """
+    registry = registry or formula_registry
+    by_output: Dict[str, FormulaSpec] = {}
+    for spec in specs:
+        if spec.output in by_output:
+            raise ValueError(f"Duplicate formula output: {spec.output}")
+        by_output[spec.output] = spec
+
+    # Kahn's algorithm; ties keep the order the specs were given in
+    dependents: Dict[str, List[str]] = {name: [] for name in by_output}
+    pending = {}
+    for spec in specs:
+        deps = {name for name in spec.inputs if name in by_output}
+        if spec.output in deps:
+            raise ValueError(f"Formula {spec.output} depends on itself")
+        pending[spec.output] = len(deps)
+        for dep in deps:
+            dependents[dep].append(spec.output)
+
+    ready = [spec.output for spec in specs if pending[spec.output] == 0]
+    ordered: List[str] = []
+    while ready:
+        name = ready.pop(0)
+        ordered.append(name)
+        for dependent in dependents[name]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+
+    if len(ordered) != len(by_output):
+        cycle = sorted(set(by_output) - set(ordered))
+        raise ValueError(f"Formula dependency cycle between: {cycle}")
+
+    nodes = []
+    for name in ordered:
+        spec = by_output[name]
+        if spec.formula in WINDOW_OPS:
+            if len(spec.inputs) != 1:
+                raise ValueError(f"Window operation {spec.formula} takes one input ({spec.output})")
+            nodes.append(_Node(spec, WINDOW_OPS[spec.formula], window=True))
+            continue
+
+        formula = registry.get_formula(spec.formula, entity_type)
+        if formula is None:
+            raise ValueError(f"Unknown formula: {spec.formula} ({spec.output})")
+        kernel = registry.get_vectorized(spec.formula)
+        if kernel is None:
+            logger.warning(f"No vectorized kernel for {spec.formula}; applying it element-wise")
+            kernel = _elementwise(formula)
+        nodes.append(_Node(spec, kernel, window=False))
+
+    return FormulaPlan(nodes, key_columns)
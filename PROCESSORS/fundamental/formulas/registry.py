@@ -26,6 +26,8 @@ from ._base_formulas import (
     calculate_ttm_sum
 )
 
+from ._vector_formulas import VECTOR_FORMULAS
+
 # Import entity specific formulas
 # Note: These imports might be circular if not careful, but registry is usually imported by calculators
 from .company_formulas import CompanyFormulas
@@ -46,11 +48,14 @@ class FormulaRegistry:
         "INSURANCE": {},
         "SECURITY": {}
     }
+    # Column-wise NumPy kernels by formula name (used by compiler.py)
+    _vector_registry: Dict[str, Callable] = {}
     
     def __init__(self):
         """Khởi tạo và đăng ký các công thức mặc định."""
         self._register_base_formulas()
         self._register_entity_formulas()
+        self._register_vector_formulas()
         
     def _register_base_formulas(self):
         """Đăng ký các công thức chung cho tất cả các loại thực thể."""
@@ -87,6 +92,11 @@ class FormulaRegistry:
         self.register_formula("calculate_npl_ratio", BankFormulas.calculate_npl_ratio, ["BANK"])
         self.register_formula("calculate_efficiency_ratio", BankFormulas.calculate_efficiency_ratio, ["BANK"])
 
+    def _register_vector_formulas(self):
+        """Đăng ký các phiên bản vector hóa (NumPy) của các công thức."""
+        for name, kernel in VECTOR_FORMULAS.items():
+            self.register_vectorized(name, kernel)
+
     def register_formula(self, name: str, formula: Callable, entity_types: List[str]):
         """
         Đăng ký một công thức mới vào registry.
@@ -126,6 +136,20 @@ class FormulaRegistry:
         # Fallback to general registry
         return self._registry.get(name)
 
+    def register_vectorized(self, name: str, kernel: Callable):
+        """
+        Đăng ký phiên bản vector hóa của một công thức.
+
+        Args:
+            name: Tên công thức đã đăng ký (vd. "calculate_roe")
+            kernel: Hàm nhận và trả về mảng NumPy float64 (NaN thay cho None)
+        """
+        self._vector_registry[name] = kernel
+
+    def get_vectorized(self, name: str) -> Optional[Callable]:
+        """Lấy phiên bản vector hóa của công thức, hoặc None nếu chưa có."""
+        return self._vector_registry.get(name)
+
     def list_formulas(self, entity_type: Optional[str] = None) -> List[str]:
         """Liệt kê các tên công thức có sẵn."""
         if entity_type and entity_type in self._entity_registry:
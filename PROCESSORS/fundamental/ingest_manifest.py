@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Fundamental Ingestion Manifest
+==============================
+
+Records what csv_to_full_parquet.py has ingested, so a run re-converts only
+the CSV files whose content changed and replaces only the affected
+(YEAR, QUARTER) partitions of {entity}_full.parquet.
+
+Layout (DATA/processed/fundamental/_ingest/):
+    manifest.json                       Watermark + source file fingerprints
+    staging/{entity}/{csv_stem}.parquet Long rows converted from one CSV file
+    {entity}_digests.parquet            Digest per (file, symbol, year, quarter)
+    changes.parquet                     (version, entity, symbol, year, quarter) log
+
+manifest.json:
+    {
+      "version": 7,                        # watermark, bumped when output changes
+      "updated_at": "2026-01-05T16:02:11",
+      "entities": {
+        "company": {
+          "schema": "SECURITY_CODE: string ...",  # output schema; full rebuild if it changes
+          "files": {
+            "COMPANY_INCOME.csv": {"hash": "9f2c...", "size": 1203344,
+                                   "mtime_ns": 1736067731000000000, "version": 7}
+          }
+        }
+      }
+    }
+
+Consumers keep the last version they processed and ask for what changed:
+    from PROCESSORS.fundamental.ingest_manifest import changed_since, current_version
+
+    changes = changed_since(watermark, entity='bank')   # SECURITY_CODE, YEAR, QUARTER, version
+    watermark = current_version()
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+INGEST_PATH = PROJECT_ROOT / "DATA" / "processed" / "fundamental" / "_ingest"
+
+MANIFEST_NAME = "manifest.json"
+CHANGES_NAME = "changes.parquet"
+
+# Granularity of change tracking; (YEAR, QUARTER) is the output partition
+DIGEST_KEYS = ['SECURITY_CODE', 'YEAR', 'QUARTER']
+CHANGE_COLUMNS = ['version', 'entity', 'SECURITY_CODE', 'YEAR', 'QUARTER']
+
+# YEAR/QUARTER of rows without a REPORT_DATE
+NULL_PERIOD = -1
+
+
+def file_fingerprint(path: Path, previous: Optional[Dict] = None) -> Dict:
+    """
+    Content fingerprint of a source file.
+
+    The file is only re-hashed when its (mtime, size) moved since ``previous``.
+
+    Returns:
+        Dict with hash, size, mtime_ns
+    """
+    stat = path.stat()
+    if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+        return {"hash": previous["hash"], "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return {"hash": digest.hexdigest(), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def period_codes(table) -> np.ndarray:
+    """Partition code YEAR * 4 + QUARTER - 1 per row (NULL_PERIOD parts for missing values)."""
+    year = pc.fill_null(table.column('YEAR'), NULL_PERIOD).to_numpy(zero_copy_only=False)
+    quarter = pc.fill_null(table.column('QUARTER'), NULL_PERIOD).to_numpy(zero_copy_only=False)
+    return year.astype(np.int64) * 4 + quarter.astype(np.int64) - 1
+
+
+class PartitionDigest:
+    """
+    Order-independent digest of long rows per (symbol, year, quarter),
+    accumulated batch by batch.
+
+    The converter feeds each staging table as it writes it, so the digests
+    come out of the conversion pass; partition_digests() reads a staging
+    file back for the same result.
+    """
+
+    COLUMNS = ['file'] + DIGEST_KEYS + ['digest', 'rows']
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.parts: List[pd.DataFrame] = []
+
+    def update(self, batch) -> None:
+        """Add the rows of a pa.Table / pa.RecordBatch with the output schema."""
+        df = batch.to_pandas()
+        row_hash = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        keys = df[DIGEST_KEYS].copy()
+        keys['YEAR'] = keys['YEAR'].fillna(NULL_PERIOD).astype(np.int64)
+        keys['QUARTER'] = keys['QUARTER'].fillna(NULL_PERIOD).astype(np.int64)
+        # Two 32-bit halves summed as int64: no overflow below 2**31 rows
+        keys['lo'] = (row_hash & 0xFFFFFFFF).astype(np.int64)
+        keys['hi'] = (row_hash >> 32).astype(np.int64)
+        keys['rows'] = 1
+        self.parts.append(keys.groupby(DIGEST_KEYS, dropna=False, sort=False)[['lo', 'hi', 'rows']].sum())
+
+    def result(self) -> pd.DataFrame:
+        """
+        Returns:
+            DataFrame: file, SECURITY_CODE, YEAR, QUARTER, digest, rows
+        """
+        if not self.parts:
+            return pd.DataFrame(columns=self.COLUMNS)
+        totals = pd.concat(self.parts).groupby(level=list(range(len(DIGEST_KEYS))), dropna=False).sum().reset_index()
+        lo = totals['lo'].to_numpy() & 0xFFFFFFFF
+        hi = totals['hi'].to_numpy() & 0xFFFFFFFF
+        totals['digest'] = (hi << 32) | lo
+        totals['file'] = self.file_name
+        return totals[self.COLUMNS]
+
+
+def partition_digests(parquet_file: Path, file_name: str, batch_size: int = 1_000_000) -> pd.DataFrame:
+    """
+    PartitionDigest of the rows of one staging file, read batch by batch.
+
+    Returns:
+        DataFrame: file, SECURITY_CODE, YEAR, QUARTER, digest, rows
+    """
+    digest = PartitionDigest(file_name)
+    for batch in pq.ParquetFile(parquet_file).iter_batches(batch_size=batch_size):
+        digest.update(batch)
+    return digest.result()
+
+
+def diff_digests(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    (symbol, year, quarter) keys whose rows differ between two digest tables
+    (added, removed or changed in any file).
+    """
+    on = ['file'] + DIGEST_KEYS
+    merged = old[on + ['digest', 'rows']].merge(
+        new[on + ['digest', 'rows']], on=on, how='outer', suffixes=('_old', '_new'), indicator=True
+    )
+    changed = (
+        (merged['_merge'] != 'both')
+        | (merged['digest_old'] != merged['digest_new'])
+        | (merged['rows_old'] != merged['rows_new'])
+    )
+    keys = merged.loc[changed, DIGEST_KEYS].drop_duplicates()
+    return keys.sort_values(DIGEST_KEYS).reset_index(drop=True)
+
+
+class IngestManifest:
+    """
+    Manifest, staging files, digests and change log of the fundamental ingest.
+
+    Attributes:
+        root: _ingest directory
+        version: Current watermark (0 before the first ingest)
+    """
+
+    def __init__(self, root: Path = INGEST_PATH):
+        self.root = Path(root)
+        self.path = self.root / MANIFEST_NAME
+        self.data = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cannot read ingest manifest {self.path}: {e}. Rebuilding.")
+            data = {}
+        data.setdefault("version", 0)
+        data.setdefault("entities", {})
+        return data
+
+    @property
+    def version(self) -> int:
+        return int(self.data["version"])
+
+    def entity(self, entity_type: str) -> Dict:
+        """Manifest section of an entity (created empty on first use)."""
+        return self.data["entities"].setdefault(entity_type, {"schema": None, "files": {}})
+
+    def staging_file(self, entity_type: str, csv_file: Path) -> Path:
+        return self.root / "staging" / entity_type / f"{Path(csv_file).stem}.parquet"
+
+    def digests_file(self, entity_type: str) -> Path:
+        return self.root / f"{entity_type}_digests.parquet"
+
+    def load_digests(self, entity_type: str) -> pd.DataFrame:
+        """Saved digests of an entity (empty if missing or unreadable)."""
+        path = self.digests_file(entity_type)
+        if path.exists():
+            try:
+                return pd.read_parquet(path)
+            except Exception as e:
+                logger.warning(f"Error reading digests {path}: {e}")
+        return pd.DataFrame(columns=['file'] + DIGEST_KEYS + ['digest', 'rows'])
+
+    def save_digests(self, entity_type: str, digests: pd.DataFrame):
+        path = self.digests_file(entity_type)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.parquet.tmp')
+        digests.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def record_changes(self, entity_type: str, changes: pd.DataFrame) -> int:
+        """
+        Bump the watermark and append the changed (symbol, year, quarter) keys.
+
+        Returns:
+            The new version
+        """
+        version = self.version + 1
+        log = changes[DIGEST_KEYS].assign(version=version, entity=entity_type)[CHANGE_COLUMNS]
+        path = self.root / CHANGES_NAME
+        if path.exists():
+            log = pd.concat([pd.read_parquet(path), log], ignore_index=True)
+        tmp_path = path.with_suffix('.parquet.tmp')
+        log.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        self.data["version"] = version
+        return version
+
+    def save(self):
+        """Write the manifest atomically."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.data["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        tmp_path = self.path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+# ==============================================================================
+# CONSUMER API
+# ==============================================================================
+
+def current_version(root: Path = INGEST_PATH) -> int:
+    """Current ingest watermark (0 before the first ingest)."""
+    return IngestManifest(root).version
+
+
+def changed_since(watermark: int, entity: Optional[str] = None,
+                  root: Path = INGEST_PATH) -> pd.DataFrame:
+    """
+    Symbols/periods re-ingested after ``watermark``.
+
+    Args:
+        watermark: Last version the caller processed (0 = everything)
+        entity: Entity type (company, bank, insurance, security) or None for all
+        root: _ingest directory
+
+    Returns:
+        DataFrame: version, entity, SECURITY_CODE, YEAR, QUARTER (one row per
+        key and version; YEAR/QUARTER are NULL_PERIOD for rows without a date)
+    """
+    path = Path(root) / CHANGES_NAME
+    if not path.exists():
+        return pd.DataFrame(columns=CHANGE_COLUMNS)
+    filters: List = [('version', '>', int(watermark))]
+    if entity is not None:
+        filters.append(('entity', '==', entity))
+    return pd.read_parquet(path, filters=filters).reset_index(drop=True)
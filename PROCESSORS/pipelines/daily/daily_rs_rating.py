@@ -159,4 +159,9 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    from config.data_mapping.data_versions import record_data_versions
+    try:
+        main()
+    finally:
+        # Readers (web cache, MCP) invalidate only the datasets that changed
+        record_data_versions()
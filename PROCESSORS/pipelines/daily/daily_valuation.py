@@ -1,5 +1,6 @@
 
 import sys
+import argparse
 from pathlib import Path
 import pandas as pd
 import logging
@@ -16,25 +17,32 @@ from PROCESSORS.valuation.calculators.historical_pb_calculator import Historical
 from PROCESSORS.valuation.calculators.historical_ev_ebitda_calculator import HistoricalEVEBITDACalculator
 from PROCESSORS.valuation.calculators.historical_ps_calculator import HistoricalPSCalculator
 from PROCESSORS.valuation.calculators.vnindex_valuation_calculator import VNIndexValuationCalculator
+from PROCESSORS.valuation.calculators.valuation_distribution_calculator import ValuationDistributionCalculator
+from PROCESSORS.valuation.calculators.incremental_state import (
+    ValuationStateStore, load_new_bars, append_parquet_rows
+)
 # Note: Sector valuation is now handled by PROCESSORS/sector/run_sector_analysis.py --ta-only
 
 # Logging settings
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - DAILY_UPDATE - %(levelname)s - %(message)s')
 logger = logging.getLogger('DAILY_UPDATE')
 
+# Start of history for a new file or a symbol that needs a full recompute
+FULL_HISTORY_START = datetime(2018, 1, 1)
+
 def get_next_date(parquet_path):
     """
     Check existing parquet file for the latest date.
     Returns: (next_start_date, is_new_file)
     """
     if not parquet_path.exists():
-        return datetime(2018, 1, 1), True
+        return FULL_HISTORY_START, True
     
     try:
         # Read only the 'date' column to be fast
         df = pd.read_parquet(parquet_path, columns=['date'])
         if df.empty:
-            return datetime(2018, 1, 1), True
+            return FULL_HISTORY_START, True
             
         max_date = pd.to_datetime(df['date']).max()
         return max_date + timedelta(days=1), False
@@ -42,10 +50,93 @@ def get_next_date(parquet_path):
         logger.warning(f"Error reading date from {parquet_path}: {e}. Starting from scratch.")
         return datetime(2015, 1, 1), True
 
-def update_calculator(calc_class, output_name, calc_method_name, scope_logic=None):
+def get_symbol_universe(calc, calc_class):
+    """Symbols a calculator covers (EV/EBITDA is Company only)."""
+    symbols = list(calc.symbol_entity_types.keys())
+    if 'EVEBITDA' in str(calc_class):
+        symbols = [s for s in symbols if calc.symbol_entity_types.get(s, 'COMPANY') == 'COMPANY']
+    return symbols
+
+def get_state_entities(calc_class):
+    """Fundamental files whose new reports invalidate a calculator's state."""
+    if 'EVEBITDA' in str(calc_class):
+        return ['company']
+    return None
+
+def update_calculator_incremental(calc_class, output_name, calc_method_name):
+    """
+    Incremental update for symbol-based calculators.
+
+    Uses the per-symbol fundamental state (latest TTM earnings/equity/revenue/EBITDA)
+    and only the OHLCV bars after the output watermark. Symbols with a newer
+    quarterly report than their state are fully recomputed and their rows replaced.
+
+    Returns:
+        True if handled incrementally, False if a full update is required
+        (no output file or no state yet).
+    """
+    calc = calc_class()
+    output_path = calc.output_path / output_name
+    store = ValuationStateStore(calc, output_name, get_state_entities(calc_class))
+
+    start_date, is_new_file = get_next_date(output_path)
+    state = None if is_new_file else store.load()
+    if state is None:
+        return False
+
+    end_date = datetime.now()
+    stale = store.find_stale_symbols(state, store.latest_report_dates())
+
+    if start_date > end_date and not stale:
+        logger.info(f"✅ {output_name} is up to date (Latest: {start_date - timedelta(days=1)}). Skipping.")
+        return True
+
+    parts = []
+    if stale:
+        # New quarterly report landed: full history for these symbols only
+        logger.info(f"🔁 {len(stale)} symbols have new quarterly reports, recomputing their full history...")
+        calc.load_data()
+        universe = get_symbol_universe(calc, calc_class)
+        stale_universe = [s for s in universe if s in stale]
+        if stale_universe:
+            method = getattr(calc, calc_method_name)
+            parts.append(method(stale_universe, FULL_HISTORY_START, end_date))
+        refreshed = store.build(sorted(stale), universe=universe)
+        state = pd.concat([state[~state['symbol'].isin(stale)], refreshed], ignore_index=True)
+
+    fresh_state = state[~state['symbol'].isin(stale)]
+    if start_date <= end_date:
+        logger.info(f"🔄 Updating {output_name} incrementally from {start_date.date()} to {end_date.date()}...")
+        bars = load_new_bars(calc.ohlcv_path, start_date, end_date, fresh_state['symbol'].tolist())
+        parts.append(store.compute_incremental(fresh_state, bars))
+
+    parts = [p for p in parts if p is not None and not p.empty]
+    new_data = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+    if new_data.empty and not stale:
+        logger.warning(f"⚠️ No new data found for {output_name} in range.")
+    else:
+        total = append_parquet_rows(output_path, new_data, drop_symbols=stale)
+        logger.info(f"📝 Appended {len(new_data)} rows to {output_path}. Total: {total}")
+
+    store.save(state)
+    return True
+
+def update_calculator(calc_class, output_name, calc_method_name, scope_logic=None, full_refresh=False):
     """
     Generic update function for symbol-based calculators.
+
+    Symbol-based calculators use the incremental path unless ``full_refresh`` is set
+    or no state exists yet; scope-based calculators (VNINDEX/SECTOR) always use
+    the range recompute below.
     """
+    if scope_logic is None and not full_refresh:
+        try:
+            if update_calculator_incremental(calc_class, output_name, calc_method_name):
+                return
+        except Exception as e:
+            logger.warning(f"⚠️ Incremental update failed for {output_name}: {e}. Falling back to full update.")
+
     try:
         # Initialize
         calc = calc_class()
@@ -77,16 +168,16 @@ def update_calculator(calc_class, output_name, calc_method_name, scope_logic=Non
         
         else:
             # Symbol-based calculators
-            symbols = list(calc.symbol_entity_types.keys())
-            
-            # Filter for EV/EBITDA (Company only)
-            if 'EVEBITDA' in str(calc_class):
-                symbols = [s for s in symbols if calc.symbol_entity_types.get(s, 'COMPANY') == 'COMPANY']
+            symbols = get_symbol_universe(calc, calc_class)
             
             # Call method dynamically
             method = getattr(calc, calc_method_name)
             new_data = method(symbols, start_date, end_date)
 
+            # Seed the incremental state so the next run only processes new bars
+            store = ValuationStateStore(calc, output_name, get_state_entities(calc_class))
+            store.save(store.build(symbols, universe=symbols))
+
         # Save Result
         if new_data is not None and not new_data.empty:
             if is_new_file:
@@ -119,6 +210,20 @@ def update_calculator(calc_class, output_name, calc_method_name, scope_logic=Non
         import traceback
         traceback.print_exc()
 
+def update_distribution_stats():
+    """Rebuild per-ticker valuation distribution stats read by the sector dashboards."""
+    try:
+        calc = ValuationDistributionCalculator()
+        result = calc.calculate_all()
+        if result.empty:
+            logger.warning("⚠️ No valuation distribution stats computed.")
+            return
+        calc.save_results(result)
+    except Exception as e:
+        logger.error(f"❌ Failed to update valuation distribution stats: {e}")
+        import traceback
+        traceback.print_exc()
+
 def print_summary():
     """Print summary of all valuation data files."""
     data_path = PROJECT_ROOT / "DATA" / "processed" / "valuation"
@@ -132,14 +237,18 @@ def print_summary():
         ("P/S", data_path / "ps" / "historical" / "historical_ps.parquet"),
         ("EV/EBITDA", data_path / "ev_ebitda" / "historical" / "historical_ev_ebitda.parquet"),
         ("VNINDEX", data_path / "vnindex" / "vnindex_valuation_refined.parquet"),
+        ("DISTRIBUTION", data_path / "distribution" / "valuation_distribution.parquet"),
     ]
 
     for name, path in files_to_check:
         if path.exists():
             try:
                 df = pd.read_parquet(path)
-                latest = pd.to_datetime(df['date']).max()
                 symbols = df['symbol'].nunique() if 'symbol' in df.columns else '-'
+                if 'date' not in df.columns:
+                    logger.info(f"  {name:12} | {len(df):>10,} rows | {symbols:>5} tickers")
+                    continue
+                latest = pd.to_datetime(df['date']).max()
                 logger.info(f"  {name:12} | {len(df):>10,} rows | {symbols:>5} tickers | Latest: {latest.strftime('%Y-%m-%d')}")
             except Exception as e:
                 logger.warning(f"  {name:12} | Error reading: {e}")
@@ -148,33 +257,37 @@ def print_summary():
 
     logger.info("=" * 70)
 
-def run_daily_update():
+def run_daily_update(full_refresh=False):
     start_time = datetime.now()
     logger.info("🚀 STARTING DAILY VALUATION UPDATE script")
     logger.info(f"   Time: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-    logger.info("   Updating: Individual stock PE/PB/P/S/EV_EBITDA + VNINDEX valuation")
+    logger.info("   Updating: Individual stock PE/PB/P/S/EV_EBITDA + VNINDEX valuation + distribution stats")
     logger.info("")
 
     # 1. Historical PE
-    logger.info("\n--- 1/5 Historical PE ---")
-    update_calculator(HistoricalPECalculator, 'historical_pe.parquet', 'calculate_multiple_symbols_pe_timeseries')
+    logger.info("\n--- 1/6 Historical PE ---")
+    update_calculator(HistoricalPECalculator, 'historical_pe.parquet', 'calculate_multiple_symbols_pe_timeseries', full_refresh=full_refresh)
 
     # 2. Historical PB
-    logger.info("\n--- 2/5 Historical PB ---")
-    update_calculator(HistoricalPBCalculator, 'historical_pb.parquet', 'calculate_multiple_symbols_pb_timeseries')
+    logger.info("\n--- 2/6 Historical PB ---")
+    update_calculator(HistoricalPBCalculator, 'historical_pb.parquet', 'calculate_multiple_symbols_pb_timeseries', full_refresh=full_refresh)
 
     # 3. Historical P/S
-    logger.info("\n--- 3/5 Historical P/S ---")
-    update_calculator(HistoricalPSCalculator, 'historical_ps.parquet', 'calculate_ps_timeseries')
+    logger.info("\n--- 3/6 Historical P/S ---")
+    update_calculator(HistoricalPSCalculator, 'historical_ps.parquet', 'calculate_ps_timeseries', full_refresh=full_refresh)
 
     # 4. Historical EV/EBITDA
-    logger.info("\n--- 4/5 Historical EV/EBITDA ---")
-    update_calculator(HistoricalEVEBITDACalculator, 'historical_ev_ebitda.parquet', 'calculate_multiple_symbols_ev_ebitda_timeseries')
+    logger.info("\n--- 4/6 Historical EV/EBITDA ---")
+    update_calculator(HistoricalEVEBITDACalculator, 'historical_ev_ebitda.parquet', 'calculate_multiple_symbols_ev_ebitda_timeseries', full_refresh=full_refresh)
 
     # 5. VNINDEX Valuation
-    logger.info("\n--- 5/5 VNINDEX Valuation ---")
+    logger.info("\n--- 5/6 VNINDEX Valuation ---")
     update_calculator(VNIndexValuationCalculator, 'vnindex_valuation_refined.parquet', 'process_all_scopes', scope_logic='VNINDEX')
 
+    # 6. Distribution stats for sector dashboards (depends on 1-4)
+    logger.info("\n--- 6/6 Valuation Distribution Stats ---")
+    update_distribution_stats()
+
     # Print summary
     print_summary()
 
@@ -183,4 +296,14 @@ def run_daily_update():
     logger.info("ℹ️  For sector valuation (PE/PB/PS/EV_EBITDA), run: python3 PROCESSORS/sector/run_sector_analysis.py --ta-only")
 
 if __name__ == "__main__":
-    run_daily_update()
+    parser = argparse.ArgumentParser(description='Daily Valuation Update')
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="Ignore incremental state and recompute from the output watermark with full data loads")
+    args = parser.parse_args()
+
+    from config.data_mapping.data_versions import record_data_versions
+    try:
+        run_daily_update(full_refresh=args.full_refresh)
+    finally:
+        # Readers (web cache, MCP) invalidate only the datasets that changed
+        record_data_versions()
@@ -15,6 +15,8 @@ from typing import Dict, List, Optional, Any
 import pandas as pd
 from datetime import datetime
 
+from config.data_mapping.data_versions import record_written_files
+
 logger = logging.getLogger(__name__)
 
 
@@ -187,6 +189,7 @@ class BaseAggregator:
         """
         output_path = self.sector_output_path / filename
         df.to_parquet(output_path, index=index)
+        record_written_files([output_path])
 
         logger.info(f"Saved {len(df)} rows to {output_path}")
         return output_path
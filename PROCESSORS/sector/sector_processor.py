@@ -39,6 +39,7 @@ import pandas as pd
 from datetime import datetime, timedelta
 
 # Import registries
+from config.data_mapping.data_versions import record_written_files
 from config.registries import MetricRegistry, SectorRegistry
 
 # Import calculators/aggregators
@@ -424,6 +425,7 @@ class SectorProcessor:
                 output_files['combined_scores'] = combined_path
                 logger.info(f"  ✅ Saved: sector_combined_scores.parquet")
 
+            record_written_files(output_files.values())
             return output_files
 
         except Exception as e:
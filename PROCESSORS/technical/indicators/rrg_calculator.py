@@ -150,14 +150,7 @@ class RRGCalculator:
         # Map symbols to sectors
         df = df.copy()
 
-        def get_sector_safe(symbol):
-            try:
-                info = sector_reg.get_ticker(symbol)
-                return info.get('sector', 'Unknown') if info else 'Unknown'
-            except Exception:
-                return 'Unknown'
-
-        df['sector'] = df['symbol'].apply(get_sector_safe)
+        df['sector'] = sector_reg.map_tickers(df['symbol'], 'sector', default='Unknown')
 
         # Filter out unknown
         df = df[df['sector'] != 'Unknown']
@@ -46,7 +46,7 @@ if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
 # Import from existing updater
-from PROCESSORS.core.config.paths import PROJECT_ROOT, RAW_OHLCV
+from PROCESSORS.core.config.paths import PROJECT_ROOT, RAW_OHLCV, OHLCV_ROW_GROUP_SIZE
 from PROCESSORS.technical.ohlcv.ohlcv_daily_updater import OHLCVDailyUpdater
 
 # Setup logging
@@ -372,7 +372,7 @@ class OHLCVAdjustmentDetector:
         """Save updated data to parquet."""
         self.existing_df['date'] = pd.to_datetime(self.existing_df['date']).dt.date
         self.existing_df = self.existing_df.sort_values(['symbol', 'date']).reset_index(drop=True)
-        self.existing_df.to_parquet(self.parquet_path, index=False)
+        self.existing_df.to_parquet(self.parquet_path, index=False, row_group_size=OHLCV_ROW_GROUP_SIZE)
         logger.info(f"Saved {len(self.existing_df)} records to {self.parquet_path}")
 
     def _cascade_refresh_technical(self, n_sessions: int = 500):
@@ -475,17 +475,18 @@ class OHLCVAdjustmentDetector:
 
     def _create_cache_invalidation_marker(self):
         """
-        Create cache invalidation marker for BSC MCP.
+        Record the rewritten datasets in the data version manifest.
 
-        BSC MCP DataLoader checks for this marker and clears its cache
-        when detected, ensuring fresh data is loaded after OHLCV refresh.
+        BSC MCP DataLoader and the web app cache compare content hashes in
+        DATA/.data_versions.json and reload only the datasets that changed.
         """
-        marker_path = Path("DATA/.cache_invalidated")
         try:
-            marker_path.touch()
-            logger.info("  ✅ Cache invalidation marker created for BSC MCP")
+            from config.data_mapping.data_versions import record_data_versions
+
+            changed = record_data_versions()
+            logger.info(f"  ✅ Data version manifest updated ({len(changed)} dataset(s) changed)")
         except Exception as e:
-            logger.warning(f"  ⚠️ Could not create cache marker: {e}")
+            logger.warning(f"  ⚠️ Could not update data version manifest: {e}")
 
     def run(
         self,
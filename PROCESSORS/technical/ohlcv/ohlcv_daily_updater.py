@@ -21,7 +21,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[3]
 sys.path.insert(0, str(PROJECT_ROOT))
 
 # Import path configuration
-from PROCESSORS.core.config.paths import RAW_OHLCV
+from PROCESSORS.core.config.paths import RAW_OHLCV, OHLCV_ROW_GROUP_SIZE
 
 # Import DateFormatter
 from PROCESSORS.core.shared.date_formatter import DateFormatter
@@ -330,8 +330,8 @@ class OHLCVDailyUpdater:
             # Sort theo symbol và date
             df = df.sort_values(['symbol', 'date']).reset_index(drop=True)
             
-            # Lưu file
-            df.to_parquet(self.output_path, index=False)
+            # Lưu file (row group nhỏ để đọc theo symbol)
+            df.to_parquet(self.output_path, index=False, row_group_size=OHLCV_ROW_GROUP_SIZE)
             logger.info(f"Saved {len(df)} records to {self.output_path}")
             
         except Exception as e:
@@ -23,6 +23,8 @@ except ImportError:
         sys.path.append(str(PROJECT_ROOT))
     from PROCESSORS.core.shared.date_formatter import DateFormatter
 
+from config.data_mapping.data_versions import record_written_files
+
 # Import standardized formulas and mapper
 from PROCESSORS.valuation.formulas.valuation_formulas import calculate_ev_ebitda, calculate_enterprise_value, safe_divide
 from PROCESSORS.valuation.formulas.metric_mapper import MetricRegistryLoader
@@ -45,6 +47,9 @@ class HistoricalEVEBITDACalculator:
     
     METADATA_PATH = PROJECT_ROOT / 'config' / 'metadata' / 'ticker_details.json' # Updated to JSON
 
+    # Cột fundamental giữ lại trong state của chế độ cập nhật tăng dần
+    STATE_COLUMNS = ['ebitda_ttm', 'total_debt', 'cash', 'minority_interest']
+
     def __init__(self):
         self.base_path = PROJECT_ROOT
         self.ohlcv_path = self.base_path / 'DATA' / 'raw' / 'ohlcv' / 'OHLCV_mktcap.parquet'
@@ -250,36 +255,56 @@ class HistoricalEVEBITDACalculator:
             return pd.DataFrame()
         
         # 2. Prepare Financial Data (TTM for EBITDA, Latest for Debt/Cash)
-        if self.raw_financials_df is None or self.raw_financials_df.empty:
+        fin_subset = self.build_fundamental_table(symbols)
+        if fin_subset.empty:
             return pd.DataFrame()
         
-        fin_subset = self.raw_financials_df[self.raw_financials_df['symbol'].isin(symbols)].copy()
-        fin_subset = fin_subset.sort_values(['symbol', 'REPORT_DATE'])
-        
-        # Calculate TTM for EBITDA
-        fin_subset['ebitda_ttm'] = fin_subset.groupby('symbol')['ebitda'].transform(
-            lambda x: x.rolling(window=4, min_periods=4).sum()
-        )
-        
-        # Rename for merge
-        fin_subset = fin_subset.rename(columns={'REPORT_DATE': 'report_date'})
-        
         # 3. Merge Market Data with Financial Data
         # merge_asof requires strict sorting by the 'on' key (date/report_date)
         market_subset = market_subset.sort_values('date')
-        fin_subset = fin_subset.sort_values('report_date')
         
         # We need mapping columns: ebitda_ttm, total_debt, cash, minority_interest
         merged_data = pd.merge_asof(
             market_subset,
-            fin_subset[['symbol', 'report_date', 'ebitda_ttm', 'total_debt', 'cash', 'minority_interest']],
+            fin_subset[['symbol', 'report_date'] + self.STATE_COLUMNS],
             left_on='date',
             right_on='report_date',
             by='symbol',
             direction='backward'
         )
+
+        result_df = self.compute_valuation_metrics(merged_data)
+        
+        logger.info(f"✅ Calculated EV/EBITDA for {result_df['symbol'].nunique()} symbols")
+        return result_df
+
+    def build_fundamental_table(self, symbols: List[str]) -> pd.DataFrame:
+        """
+        Chuẩn bị bảng tài chính theo kỳ báo cáo (vế phải của merge_asof):
+        EBITDA TTM, Nợ vay, Tiền mặt, Lợi ích cổ đông thiểu số.
+        """
+        if self.raw_financials_df is None or self.raw_financials_df.empty:
+            return pd.DataFrame()
+        
+        fin_subset = self.raw_financials_df[self.raw_financials_df['symbol'].isin(symbols)].copy()
+        fin_subset = fin_subset.sort_values(['symbol', 'REPORT_DATE'])
+        
+        # Calculate TTM for EBITDA
+        fin_subset['ebitda_ttm'] = fin_subset.groupby('symbol')['ebitda'].transform(
+            lambda x: x.rolling(window=4, min_periods=4).sum()
+        )
         
-        # 4. Compute Checks and Metrics
+        # Rename for merge
+        fin_subset = fin_subset.rename(columns={'REPORT_DATE': 'report_date'})
+        return fin_subset.sort_values('report_date')
+
+    def compute_valuation_metrics(self, merged_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Tính EV và EV/EBITDA từ dữ liệu giá đã ghép với bảng tài chính.
+
+        Dùng chung cho cả chế độ tính lại toàn bộ và chế độ cập nhật tăng dần
+        (daily_valuation), nên chỉ phụ thuộc vào các cột đã ghép sẵn.
+        """
         # EV = Market Cap + Debt + Minority Interest - Cash
         merged_data['ev'] = (merged_data['market_cap'] + 
                              merged_data['total_debt'] + 
@@ -303,10 +328,7 @@ class HistoricalEVEBITDACalculator:
                        'ebitda_ttm_billion_vnd', 'ev_ebitda', 'sector']
         
         result_df = merged_data[result_cols].copy()
-        result_df = result_df.rename(columns={'close': 'close_price'})
-        
-        logger.info(f"✅ Calculated EV/EBITDA for {result_df['symbol'].nunique()} symbols")
-        return result_df
+        return result_df.rename(columns={'close': 'close_price'})
     
     def save_results(self, df: pd.DataFrame, filename: str = None):
         """Lưu kết quả tính toán vào file định dạng Parquet"""
@@ -321,6 +343,7 @@ class HistoricalEVEBITDACalculator:
 
         output_file = self.output_path / filename
         df.to_parquet(output_file, index=False)
+        record_written_files([output_file])
         logger.info(f"💾 Saved {len(df):,} records to {output_file}")
 
 def main():
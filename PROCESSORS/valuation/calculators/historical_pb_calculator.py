@@ -24,6 +24,8 @@ except ImportError:
         sys.path.append(str(PROJECT_ROOT))
     from PROCESSORS.core.shared.date_formatter import DateFormatter
 
+from config.data_mapping.data_versions import record_written_files
+
 # Import standardized formulas and mapper
 from PROCESSORS.valuation.formulas.valuation_formulas import calculate_pb_ratio, safe_divide
 from PROCESSORS.valuation.formulas.metric_mapper import MetricRegistryLoader
@@ -46,6 +48,9 @@ class HistoricalPBCalculator:
     
     METADATA_PATH = PROJECT_ROOT / 'config' / 'metadata' / 'ticker_details.json' # Updated to JSON
 
+    # Cột fundamental giữ lại trong state của chế độ cập nhật tăng dần
+    STATE_COLUMNS = ['parent_equity_raw', 'total_equity_raw']
+
     def __init__(self):
         # Dùng PROJECT_ROOT làm gốc: data_warehouse & calculated_results nằm ở root
         self.base_path = PROJECT_ROOT
@@ -285,30 +290,50 @@ class HistoricalPBCalculator:
             return pd.DataFrame()
 
         # 2. Prepare Equity Data
-        if self.raw_equity_df is None or self.raw_equity_df.empty:
+        equity_subset = self.build_fundamental_table(symbols)
+        if equity_subset.empty:
             return pd.DataFrame()
 
-        equity_subset = self.raw_equity_df[self.raw_equity_df['symbol'].isin(symbols)].copy()
-        equity_subset = equity_subset.rename(columns={'REPORT_DATE': 'report_date'})
-        equity_subset = equity_subset.sort_values('report_date')
-
         # 3. Merge Market Data with Equity Data
         # merge_asof requires strict sorting by the 'on' key
         market_subset = market_subset.sort_values('date')
-        equity_subset = equity_subset.sort_values('report_date')
 
         merged_data = pd.merge_asof(
             market_subset,
-            equity_subset[['symbol', 'report_date', 'parent_equity_raw', 'total_equity_raw']],
+            equity_subset[['symbol', 'report_date'] + self.STATE_COLUMNS],
             left_on='date',
             right_on='report_date',
             by='symbol',
             direction='backward'
         )
 
-        # 4. Compute Metrics
-        # shares_outstanding calculated in preprocess
+        result_df = self.compute_valuation_metrics(merged_data)
+        
+        logger.info(f"✅ Calculated PB for {result_df['symbol'].nunique()} symbols")
+        return result_df
+
+    def build_fundamental_table(self, symbols: List[str]) -> pd.DataFrame:
+        """
+        Chuẩn bị bảng Vốn chủ sở hữu theo kỳ báo cáo (vế phải của merge_asof).
 
+        Returns:
+            pd.DataFrame: (symbol, report_date, parent_equity_raw, total_equity_raw),
+                sắp xếp theo report_date.
+        """
+        if self.raw_equity_df is None or self.raw_equity_df.empty:
+            return pd.DataFrame()
+
+        equity_subset = self.raw_equity_df[self.raw_equity_df['symbol'].isin(symbols)].copy()
+        equity_subset = equity_subset.rename(columns={'REPORT_DATE': 'report_date'})
+        return equity_subset.sort_values('report_date')
+
+    def compute_valuation_metrics(self, merged_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Tính BPS và P/B từ dữ liệu giá đã ghép với Vốn chủ sở hữu.
+
+        Dùng chung cho cả chế độ tính lại toàn bộ và chế độ cập nhật tăng dần
+        (daily_valuation), nên chỉ phụ thuộc vào các cột đã ghép sẵn.
+        """
         # Calculate BPS using Parent Equity (Total Equity - Minority Interest)
         # BPS = Parent Equity (Raw VND) / Shares Outstanding
         merged_data['bps'] = merged_data['parent_equity_raw'] / merged_data['shares_outstanding']
@@ -330,10 +355,7 @@ class HistoricalPBCalculator:
                        'shares_outstanding', 'bps', 'pb_ratio', 'sector']
         
         result_df = merged_data[result_cols].copy()
-        result_df = result_df.rename(columns={'close': 'close_price'})
-        
-        logger.info(f"✅ Calculated PB for {result_df['symbol'].nunique()} symbols")
-        return result_df
+        return result_df.rename(columns={'close': 'close_price'})
     
     def save_results(self, df: pd.DataFrame, filename: str = None):
         """Lưu kết quả tính toán vào file định dạng Parquet"""
@@ -351,6 +373,7 @@ class HistoricalPBCalculator:
         
         output_file = self.output_path / filename
         df.to_parquet(output_file, index=False)
+        record_written_files([output_file])
         logger.info(f"Saved {len(df)} records to {output_file}")
 
 def main():
@@ -24,6 +24,8 @@ except ImportError:
         sys.path.append(str(PROJECT_ROOT))
     from PROCESSORS.core.shared.date_formatter import DateFormatter
 
+from config.data_mapping.data_versions import record_written_files
+
 # Import standardized formulas and mapper
 from PROCESSORS.valuation.formulas.valuation_formulas import calculate_pe_ratio, safe_divide
 from PROCESSORS.valuation.formulas.metric_mapper import MetricRegistryLoader
@@ -49,6 +51,9 @@ class HistoricalPECalculator:
     FUNDAMENTAL_PATH = PROJECT_ROOT / 'DATA' / 'processed' / 'fundamental'
     OHLCV_PATH = PROJECT_ROOT / 'DATA' / 'raw' / 'ohlcv' / 'OHLCV_mktcap.parquet'
 
+    # Cột fundamental giữ lại trong state của chế độ cập nhật tăng dần
+    STATE_COLUMNS = ['ttm_earnings_raw']
+
     def __init__(self):
         self.base_path = PROJECT_ROOT
         
@@ -256,6 +261,35 @@ class HistoricalPECalculator:
             return pd.DataFrame()
 
         # 2. Prepare TTM Earnings
+        valid_ttm = self.build_fundamental_table(symbols)
+        if valid_ttm.empty:
+            return pd.DataFrame()
+
+        # 3. Merge Market Data with TTM Data
+        # merge_asof: match 'date' with 'report_date' backward
+        market_subset = market_subset.sort_values('date')
+
+        merged_data = pd.merge_asof(
+            market_subset,
+            valid_ttm[['symbol', 'report_date'] + self.STATE_COLUMNS],
+            left_on='date',
+            right_on='report_date',
+            by='symbol',
+            direction='backward'
+        )
+
+        result_df = self.compute_valuation_metrics(merged_data)
+
+        logger.info(f"✅ Calculated PE for {result_df['symbol'].nunique()} symbols")
+        return result_df
+
+    def build_fundamental_table(self, symbols: List[str]) -> pd.DataFrame:
+        """
+        Chuẩn bị bảng TTM Earnings theo kỳ báo cáo (vế phải của merge_asof).
+
+        Returns:
+            pd.DataFrame: (symbol, report_date, ttm_earnings_raw), sắp xếp theo report_date.
+        """
         if self.raw_earnings_df is None or self.raw_earnings_df.empty:
             return pd.DataFrame()
 
@@ -272,32 +306,16 @@ class HistoricalPECalculator:
         
         valid_ttm = earnings_subset.dropna(subset=['ttm_earnings_raw']).copy()
         valid_ttm = valid_ttm.rename(columns={'REPORT_DATE': 'report_date'}) # symbol already correct
-        valid_ttm = valid_ttm.sort_values('report_date')
-        
-        # 3. Merge Market Data with TTM Data
-        # merge_asof: match 'date' with 'report_date' backward
-        market_subset = market_subset.sort_values('date')
-        valid_ttm = valid_ttm.sort_values('report_date')
-        
-        merged_data = pd.merge_asof(
-            market_subset,
-            valid_ttm[['symbol', 'report_date', 'ttm_earnings_raw']],
-            left_on='date',
-            right_on='report_date',
-            by='symbol',
-            direction='backward'
-        )
-        
-        # 4. Compute Metrics
-        # shares_outstanding calculated in preprocess
-        
+        return valid_ttm.sort_values('report_date')
+
+    def compute_valuation_metrics(self, merged_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Tính EPS và P/E từ dữ liệu giá đã ghép với TTM Earnings.
+
+        Dùng chung cho cả chế độ tính lại toàn bộ và chế độ cập nhật tăng dần
+        (daily_valuation), nên chỉ phụ thuộc vào các cột đã ghép sẵn.
+        """
         # Calculate EPS: TTM Earnings (Raw VND) / Shares
-        # ttm_earnings_raw is in Raw units (VND), usually fundamental data values are raw full numbers?
-        # WAIT: fundamental METRIC_VALUE is often in normal units (VND), not Billions.
-        # But commonly in VN data it might be. Assuming raw VND based on 'calculate_pe_ratio' docstring taking raw prices.
-        
-        # Let's check magnitude safe_divide handles None
-        # Using vectorization
         merged_data['eps'] = merged_data['ttm_earnings_raw'] / merged_data['shares_outstanding']
         
         # Calculate PE using formula concept (Price / EPS)
@@ -317,10 +335,7 @@ class HistoricalPECalculator:
                        'shares_outstanding', 'eps', 'pe_ratio', 'sector']
         
         result_df = merged_data[result_cols].copy()
-        result_df = result_df.rename(columns={'close': 'close_price'})
-        
-        logger.info(f"✅ Calculated PE for {result_df['symbol'].nunique()} symbols")
-        return result_df
+        return result_df.rename(columns={'close': 'close_price'})
 
     def save_results(self, df: pd.DataFrame, filename: str = None):
         """Lưu kết quả tính toán vào file định dạng Parquet"""
@@ -338,6 +353,7 @@ class HistoricalPECalculator:
         
         output_file = self.output_path / filename
         df.to_parquet(output_file, index=False)
+        record_written_files([output_file])
         logger.info(f"Saved {len(df)} records to {output_file}")
 
 
@@ -29,6 +29,8 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from typing import Dict, List, Optional
 
+from config.data_mapping.data_versions import record_written_files
+
 warnings.filterwarnings('ignore')
 
 logging.basicConfig(
@@ -59,6 +61,9 @@ class HistoricalPSCalculator:
         'SECURITY': 'SIS_1'     # Doanh thu hoạt động môi giới
     }
 
+    # Fundamental columns carried in the incremental-update state
+    STATE_COLUMNS = ['ttm_revenue']
+
     def __init__(self):
         self.base_path = PROJECT_ROOT
         self.output_path = self.base_path / 'DATA' / 'processed' / 'valuation' / 'ps' / 'historical'
@@ -231,6 +236,35 @@ class HistoricalPSCalculator:
             return pd.DataFrame()
 
         # 2. Prepare TTM Revenue
+        valid_ttm = self.build_fundamental_table(symbols)
+        if valid_ttm.empty:
+            logger.warning("No valid TTM revenue data")
+            return pd.DataFrame()
+
+        # 3. Merge Market Data with TTM Revenue
+        market_subset = market_subset.sort_values('date')
+
+        merged_data = pd.merge_asof(
+            market_subset,
+            valid_ttm[['symbol', 'report_date'] + self.STATE_COLUMNS],
+            left_on='date',
+            right_on='report_date',
+            by='symbol',
+            direction='backward'
+        )
+
+        result_df = self.compute_valuation_metrics(merged_data)
+
+        logger.info(f"✅ Calculated P/S for {result_df['symbol'].nunique()} symbols")
+        return result_df
+
+    def build_fundamental_table(self, symbols: List[str]) -> pd.DataFrame:
+        """
+        Build the per-report TTM revenue table (right side of merge_asof).
+
+        Returns:
+            DataFrame with columns: symbol, report_date, ttm_revenue (sorted by report_date)
+        """
         if self.raw_revenue_df is None or self.raw_revenue_df.empty:
             logger.warning("No revenue data available")
             return pd.DataFrame()
@@ -245,25 +279,15 @@ class HistoricalPSCalculator:
 
         valid_ttm = revenue_subset.dropna(subset=['ttm_revenue']).copy()
         valid_ttm = valid_ttm.rename(columns={'REPORT_DATE': 'report_date'})
-        valid_ttm = valid_ttm.sort_values('report_date')
+        return valid_ttm.sort_values('report_date')
 
-        if valid_ttm.empty:
-            logger.warning("No valid TTM revenue data")
-            return pd.DataFrame()
-
-        # 3. Merge Market Data with TTM Revenue
-        market_subset = market_subset.sort_values('date')
-
-        merged_data = pd.merge_asof(
-            market_subset,
-            valid_ttm[['symbol', 'report_date', 'ttm_revenue']],
-            left_on='date',
-            right_on='report_date',
-            by='symbol',
-            direction='backward'
-        )
+    def compute_valuation_metrics(self, merged_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute P/S from market data already joined with TTM revenue.
 
-        # 4. Compute P/S Ratio
+        Shared by the full recompute and the incremental daily update, so it
+        only relies on the joined columns.
+        """
         # P/S = Market Cap / TTM Revenue
         merged_data['ps_ratio'] = np.where(
             (merged_data['ttm_revenue'] > 0) & (merged_data['market_cap'] > 0),
@@ -280,10 +304,7 @@ class HistoricalPSCalculator:
                        'ttm_revenue_billion_vnd', 'ps_ratio', 'sector']
 
         result_df = merged_data[result_cols].copy()
-        result_df = result_df.rename(columns={'close': 'close_price'})
-
-        logger.info(f"✅ Calculated P/S for {result_df['symbol'].nunique()} symbols")
-        return result_df
+        return result_df.rename(columns={'close': 'close_price'})
 
     def save_results(self, df: pd.DataFrame, filename: str = None):
         """Save results to parquet file"""
@@ -298,6 +319,7 @@ class HistoricalPSCalculator:
 
         output_file = self.output_path / filename
         df.to_parquet(output_file, index=False)
+        record_written_files([output_file])
         logger.info(f"💾 Saved {len(df):,} records to {output_file}")
 
     def run_full_backfill(self, start_year: int = 2018):
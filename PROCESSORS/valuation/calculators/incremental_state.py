@@ -0,0 +1,243 @@
+"""
+Incremental Valuation State - Trạng thái rút gọn cho cập nhật định giá hàng ngày
+
+Each symbol calculator (PE/PB/PS/EV_EBITDA) joins daily bars with the latest
+quarterly fundamentals via merge_asof. Between two quarterly reports the
+fundamental side never changes, so a daily run only needs:
+
+1. The last fundamental row per symbol (TTM earnings / equity / revenue /
+   EBITDA + debt/cash) -> stored in a compact state parquet.
+2. The new OHLCV bars after the output watermark (shares are derived from
+   market_cap / close on the bar itself).
+
+A symbol is fully recomputed only when a newer quarterly report appears in the
+fundamental files than the one recorded in its state.
+"""
+
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Set
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from config.data_mapping.data_versions import record_written_files
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+FUNDAMENTAL_PATH = PROJECT_ROOT / 'DATA' / 'processed' / 'fundamental'
+FUNDAMENTAL_ENTITIES = ['company', 'bank', 'insurance', 'security']
+
+
+def load_latest_report_dates(entities: Optional[List[str]] = None) -> pd.Series:
+    """
+    Latest quarterly REPORT_DATE per symbol, reading only the key columns.
+
+    Returns:
+        Series indexed by symbol with the max REPORT_DATE.
+    """
+    frames = []
+    for entity in entities or FUNDAMENTAL_ENTITIES:
+        file_path = FUNDAMENTAL_PATH / f'{entity}_full.parquet'
+        if not file_path.exists():
+            continue
+        available = set(pq.read_schema(file_path).names)
+        symbol_col = 'SECURITY_CODE' if 'SECURITY_CODE' in available else 'symbol'
+        columns = [c for c in (symbol_col, 'REPORT_DATE', 'FREQ_CODE') if c in available]
+        df = pd.read_parquet(file_path, columns=columns)
+        if 'FREQ_CODE' in df.columns:
+            df = df[df['FREQ_CODE'] == 'Q']
+        df = df.rename(columns={symbol_col: 'symbol'})
+        df['REPORT_DATE'] = pd.to_datetime(df['REPORT_DATE'])
+        frames.append(df.groupby('symbol')['REPORT_DATE'].max())
+
+    if not frames:
+        return pd.Series(dtype='datetime64[ns]')
+    return pd.concat(frames).groupby(level=0).max()
+
+
+def load_new_bars(ohlcv_path: Path, start_date: datetime, end_date: datetime,
+                  symbols: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read only OHLCV bars in [start_date, end_date] with the columns valuation needs.
+
+    Uses parquet predicate pushdown so the cost depends on the new range, not on
+    the full market history.
+    """
+    columns = ['symbol', 'date', 'close', 'market_cap']
+    try:
+        bars = pd.read_parquet(
+            ohlcv_path,
+            columns=columns,
+            filters=[('date', '>=', pd.Timestamp(start_date)), ('date', '<=', pd.Timestamp(end_date))]
+        )
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, TypeError):
+        # Date stored as string: fall back to projecting columns and filtering in pandas
+        bars = pd.read_parquet(ohlcv_path, columns=columns)
+
+    bars['date'] = pd.to_datetime(bars['date'])
+    bars = bars[(bars['date'] >= start_date) & (bars['date'] <= end_date)]
+    if symbols is not None:
+        bars = bars[bars['symbol'].isin(symbols)]
+
+    bars = bars.copy()
+    bars['shares_outstanding'] = np.where(
+        bars['close'] > 0,
+        bars['market_cap'] / bars['close'],
+        np.nan
+    )
+    return bars.sort_values(['symbol', 'date']).reset_index(drop=True)
+
+
+def append_parquet_rows(output_path: Path, new_data: pd.DataFrame,
+                        drop_symbols: Optional[Set[str]] = None) -> int:
+    """
+    Append rows to an existing parquet file row group by row group.
+
+    Existing rows are streamed through in batches (optionally dropping the
+    symbols being recomputed), the new rows are written as trailing row groups,
+    and the file is swapped in atomically. No full-frame sort or dedupe.
+
+    Returns:
+        Total number of rows in the rewritten file.
+    """
+    source = pq.ParquetFile(output_path)
+    schema = source.schema_arrow
+    new_table = _conform_to_schema(new_data, schema)
+
+    tmp_path = output_path.with_suffix('.parquet.tmp')
+    total_rows = 0
+    with pq.ParquetWriter(tmp_path, schema) as writer:
+        for batch in source.iter_batches():
+            table = pa.Table.from_batches([batch], schema=schema)
+            if drop_symbols and 'symbol' in schema.names:
+                keep = pc.invert(pc.is_in(table['symbol'], value_set=pa.array(sorted(drop_symbols))))
+                table = table.filter(keep)
+            if table.num_rows:
+                writer.write_table(table)
+                total_rows += table.num_rows
+        if new_table.num_rows:
+            writer.write_table(new_table)
+            total_rows += new_table.num_rows
+
+    os.replace(tmp_path, output_path)
+    record_written_files([output_path])
+    return total_rows
+
+
+def _conform_to_schema(df: pd.DataFrame, schema: pa.Schema) -> pa.Table:
+    """Build an Arrow table for ``df`` matching an existing file schema (column order + types)."""
+    arrays = []
+    for field in schema:
+        if field.name in df.columns:
+            arrays.append(pa.array(df[field.name], from_pandas=True).cast(field.type, safe=False))
+        else:
+            # e.g. a pandas index column persisted by an earlier to_parquet()
+            arrays.append(pa.nulls(len(df), type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+class ValuationStateStore:
+    """
+    Per-symbol fundamental state for one symbol-based valuation calculator.
+
+    State columns: symbol, sector, in_universe, report_date, latest_report_date
+    and the calculator's ``STATE_COLUMNS`` (e.g. ttm_earnings_raw for PE).
+    ``latest_report_date`` is the newest quarterly report seen in the
+    fundamental files when the state was built; a newer one means the
+    symbol's valuation must be recomputed.
+    """
+
+    def __init__(self, calc, output_name: str, entities: Optional[List[str]] = None):
+        self.calc = calc
+        self.entities = entities or FUNDAMENTAL_ENTITIES
+        self.state_path = calc.output_path / '_state' / output_name.replace('.parquet', '_state.parquet')
+
+    def load(self) -> Optional[pd.DataFrame]:
+        """Load the saved state, or None if it does not exist / is unreadable."""
+        if not self.state_path.exists():
+            return None
+        try:
+            return pd.read_parquet(self.state_path)
+        except Exception as e:
+            logger.warning(f"Error reading valuation state {self.state_path}: {e}. Rebuilding.")
+            return None
+
+    def build(self, symbols: List[str], universe: List[str]) -> pd.DataFrame:
+        """
+        Build state from a calculator whose ``load_data()`` has already run.
+
+        Every symbol gets a row, even without fundamentals; ``in_universe``
+        marks the symbols the full run covers, so the incremental run emits
+        exactly the same symbols while the others are just remembered as seen.
+        """
+        fundamentals = self.calc.build_fundamental_table(symbols)
+        state = pd.DataFrame({'symbol': pd.Series(symbols, dtype=object).drop_duplicates()})
+
+        if not fundamentals.empty:
+            # Exactly the row merge_asof would pick for any date after the last report
+            last_rows = (fundamentals.sort_values(['symbol', 'report_date'])
+                         .drop_duplicates('symbol', keep='last')[['symbol', 'report_date'] + self.calc.STATE_COLUMNS])
+            state = state.merge(last_rows, on='symbol', how='left')
+        else:
+            state['report_date'] = pd.NaT
+            for col in self.calc.STATE_COLUMNS:
+                state[col] = np.nan
+
+        latest_reports = (self.calc.fundamental_data
+                          .groupby('symbol')['REPORT_DATE'].max()
+                          if self.calc.fundamental_data is not None else pd.Series(dtype='datetime64[ns]'))
+        state['latest_report_date'] = state['symbol'].map(latest_reports)
+        state['sector'] = state['symbol'].map(self.calc.symbol_entity_types).fillna('COMPANY')
+        state['in_universe'] = state['symbol'].isin(universe)
+        return state
+
+    def save(self, state: pd.DataFrame):
+        """Write state atomically next to the calculator output."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.parquet.tmp')
+        state.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.state_path)
+
+    def latest_report_dates(self) -> pd.Series:
+        """Latest quarterly report per symbol for the entities this calculator covers."""
+        return load_latest_report_dates(self.entities)
+
+    @staticmethod
+    def find_stale_symbols(state: pd.DataFrame, latest_reports: pd.Series) -> Set[str]:
+        """
+        Symbols that need a full recompute: a newer quarterly report than the
+        one in state, or fundamentals for a symbol the state does not know yet.
+        """
+        known = state.set_index('symbol')['latest_report_date']
+        current = latest_reports.reindex(known.index)
+        newer = current.notna() & (known.isna() | (current > known))
+        stale = set(known.index[newer.values])
+        stale |= set(latest_reports.index.difference(known.index))
+        return stale
+
+    def compute_incremental(self, state: pd.DataFrame, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Valuation rows for new bars using the stored fundamental state only.
+
+        Equivalent to the calculator's merge_asof path as long as no newer
+        report exists (guaranteed by ``find_stale_symbols``).
+        """
+        state = state[state['in_universe']]
+        bars = bars[bars['symbol'].isin(state['symbol'])]
+        if bars.empty:
+            return pd.DataFrame()
+
+        self.calc.symbol_entity_types = dict(zip(state['symbol'], state['sector']))
+        merged = bars.merge(
+            state[['symbol', 'report_date'] + self.calc.STATE_COLUMNS],
+            on='symbol',
+            how='left'
+        )
+        return self.calc.compute_valuation_metrics(merged)
@@ -10,6 +10,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[3]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
+from config.data_mapping.data_versions import record_written_files
 from PROCESSORS.valuation.calculators.historical_pe_calculator import HistoricalPECalculator
 from PROCESSORS.valuation.calculators.historical_pb_calculator import HistoricalPBCalculator
 from PROCESSORS.valuation.calculators.historical_ev_ebitda_calculator import HistoricalEVEBITDACalculator
@@ -38,6 +39,7 @@ def run_full_backfill():
         # Save
         output_pe = pe_calc.output_path / 'historical_pe.parquet'
         df_pe.to_parquet(output_pe)
+        record_written_files([output_pe])
         logger.info(f"✅ Saved PE data to {output_pe} ({len(df_pe)} rows)")
     except Exception as e:
         logger.error(f"❌ Failed PE Backfill: {e}")
@@ -53,6 +55,7 @@ def run_full_backfill():
         # Save
         output_pb = pb_calc.output_path / 'historical_pb.parquet'
         df_pb.to_parquet(output_pb)
+        record_written_files([output_pb])
         logger.info(f"✅ Saved PB data to {output_pb} ({len(df_pb)} rows)")
     except Exception as e:
         logger.error(f"❌ Failed PB Backfill: {e}")
@@ -70,6 +73,7 @@ def run_full_backfill():
         # Save
         output_ev = ev_calc.output_path / 'historical_ev_ebitda.parquet'
         df_ev.to_parquet(output_ev)
+        record_written_files([output_ev])
         logger.info(f"✅ Saved EV/EBITDA data to {output_ev} ({len(df_ev)} rows)")
     except Exception as e:
         logger.error(f"❌ Failed EV/EBITDA Backfill: {e}")
@@ -91,6 +95,7 @@ def run_full_backfill():
         output_vn = vn_calc.output_path / 'vnindex_valuation_refined.parquet'
         if not output_vn.parent.exists(): output_vn.parent.mkdir(parents=True, exist_ok=True)
         df_vn.to_parquet(output_vn)
+        record_written_files([output_vn])
         logger.info(f"✅ Saved VNINDEX data to {output_vn} ({len(df_vn)} rows)")
         
     except Exception as e:
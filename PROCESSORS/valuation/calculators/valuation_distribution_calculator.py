@@ -0,0 +1,247 @@
+"""
+Valuation Distribution Calculator
+=================================
+Precomputes per-ticker valuation distribution stats (p5/p25/median/p75/p95,
+current value, current percentile, status) for every metric (PE/PB/PS/EV_EBITDA)
+and start-year bucket, so the sector dashboards only read rows.
+
+Two methods are materialized, matching ValuationService:
+    - 'entity':   get_sector_candle_data (entity sector: BANK/COMPANY/...)
+    - 'industry': get_industry_candle_data (industry sector via SectorRegistry,
+                  OUTLIER_LIMITS rules, high-variance tickers dropped,
+                  spiky current value replaced by the latest sane value)
+
+All statistics are computed with groupby over the whole universe instead of a
+per-ticker loop.
+
+Output: DATA/processed/valuation/distribution/valuation_distribution.parquet
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+import logging
+import sys
+
+# PROJECT_ROOT
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+# Single source of truth for outlier limits (shared with the web app)
+from WEBAPP.core.valuation_config import OUTLIER_LIMITS
+from config.data_mapping.data_versions import record_written_files
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = [0.05, 0.25, 0.50, 0.75, 0.95]
+QUANTILE_COLUMNS = ['p5', 'p25', 'median', 'p75', 'p95']
+
+OUTPUT_COLUMNS = [
+    'method', 'metric', 'start_year', 'symbol', 'sector', 'current',
+    'min', 'p5', 'p25', 'median', 'p75', 'p95', 'max',
+    'percentile', 'status', 'n_points'
+]
+
+
+def percentile_to_status(percentile: pd.Series) -> np.ndarray:
+    """Map percentile (0..100) to the status labels used by ValuationService."""
+    return np.select(
+        [percentile <= 10, percentile <= 25, percentile <= 75, percentile <= 90],
+        ["Very Cheap", "Cheap", "Fair", "Expensive"],
+        default="Very Expensive"
+    )
+
+
+def _prepare(df: pd.DataFrame, value_col: str) -> pd.DataFrame:
+    """Non-NaN values sorted by (symbol, date) with group size and median broadcast."""
+    data = df[['symbol', 'date', 'sector', value_col]].dropna(subset=[value_col])
+    data = data.rename(columns={value_col: 'value'}).sort_values(['symbol', 'date'], kind='mergesort')
+    grouped = data.groupby('symbol', sort=False)['value']
+    data['n_raw'] = grouped.transform('size')
+    data = data[data['n_raw'] >= 20].copy()
+    data['group_median'] = data.groupby('symbol', sort=False)['value'].transform('median')
+    return data
+
+
+def _select_clean(data: pd.DataFrame, strict_mask: pd.Series, loose_mask: pd.Series) -> pd.DataFrame:
+    """
+    Apply the outlier filter per ticker: strict mask, or the loose mask when the
+    strict one keeps fewer than 20 points. Tickers left with < 10 points are dropped.
+    """
+    strict_count = strict_mask.groupby(data['symbol'], sort=False).transform('sum')
+    mask = np.where(strict_count < 20, loose_mask, strict_mask)
+    data = data.assign(clean=mask)
+    clean_count = data.groupby('symbol', sort=False)['clean'].transform('sum')
+    return data[clean_count >= 10]
+
+
+def _summarize(data: pd.DataFrame, current: pd.Series) -> pd.DataFrame:
+    """Quantiles, min/max, percentile of ``current`` and status per ticker (clean points only)."""
+    clean = data[data['clean']]
+    grouped = clean.groupby('symbol', sort=False)['value']
+
+    stats = grouped.quantile(QUANTILES).unstack()
+    stats.columns = QUANTILE_COLUMNS
+    stats['min'] = grouped.min()
+    stats['max'] = grouped.max()
+    stats['n_points'] = grouped.size()
+    stats['current'] = current.reindex(stats.index)
+    stats['sector'] = data.groupby('symbol', sort=False)['sector'].last().reindex(stats.index)
+
+    below = (clean['value'].values <= clean['symbol'].map(stats['current']).values)
+    stats['percentile'] = pd.Series(below, index=clean.index).groupby(clean['symbol']).sum() \
+        .reindex(stats.index) / stats['n_points'] * 100
+    stats['status'] = percentile_to_status(stats['percentile'])
+    return stats.reset_index()
+
+
+def compute_entity_distribution(df: pd.DataFrame, metric: str, value_col: str) -> pd.DataFrame:
+    """Vectorized equivalent of ValuationService.get_sector_candle_data (all tickers)."""
+    data = _prepare(df, value_col)
+    if data.empty:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    median = data['group_median']
+    if metric == 'PE':
+        upper = np.where(median > 0, np.minimum(100, median * 5), 100)
+    else:
+        upper = np.where(median > 0, median * 4, 10)
+
+    positive = data['value'] > 0
+    data = _select_clean(data, positive & (data['value'] <= upper), positive)
+    if data.empty:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    current = data.groupby('symbol', sort=False)['value'].last()
+    return _summarize(data, current)
+
+
+def compute_industry_distribution(df: pd.DataFrame, metric: str, value_col: str) -> pd.DataFrame:
+    """Vectorized equivalent of ValuationService.get_industry_candle_data (all tickers)."""
+    rules = OUTLIER_LIMITS.get(metric, OUTLIER_LIMITS['PE'])
+    max_val, min_val, mult_limit = rules['max'], rules['min'], rules['multiplier']
+
+    data = _prepare(df, value_col)
+    if data.empty:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    median = data['group_median']
+    upper = np.where(median > 0, np.minimum(max_val, median * mult_limit), max_val)
+    above_min = data['value'] > min_val
+    data = _select_clean(data, above_min & (data['value'] <= upper), above_min)
+    if data.empty:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    # Skip tickers whose clean data variance is too extreme
+    clean_grouped = data[data['clean']].groupby('symbol', sort=False)['value']
+    cv = clean_grouped.std() / clean_grouped.mean()
+    data = data[data['symbol'].isin(cv.index[~(cv > 2.0)])]
+    if data.empty:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    # Replace a spiky current value with the latest sane value
+    clean_grouped = data[data['clean']].groupby('symbol', sort=False)['value']
+    p95 = data['symbol'].map(clean_grouped.quantile(0.95))
+    p5 = data['symbol'].map(clean_grouped.quantile(0.05))
+
+    raw_current = data.groupby('symbol', sort=False)['value'].last()
+    p95_last = p95.groupby(data['symbol'], sort=False).last()
+    p5_last = p5.groupby(data['symbol'], sort=False).last()
+    spiky = (raw_current > p95_last * 1.5) | (raw_current < p5_last * 0.5) | (raw_current > max_val)
+
+    sane = data['value'].where((data['value'] <= p95 * 1.2) & (data['value'] <= max_val))
+    latest_sane = sane.groupby(data['symbol'], sort=False).last()
+    current = raw_current.where(~spiky | latest_sane.isna(), latest_sane)
+
+    return _summarize(data, current)
+
+
+class ValuationDistributionCalculator:
+    """Builds the valuation distribution table from the historical valuation files."""
+
+    METRIC_SOURCES = {
+        'PE': ('pe/historical/historical_pe.parquet', 'pe_ratio'),
+        'PB': ('pb/historical/historical_pb.parquet', 'pb_ratio'),
+        'PS': ('ps/historical/historical_ps.parquet', 'ps_ratio'),
+        'EV_EBITDA': ('ev_ebitda/historical/historical_ev_ebitda.parquet', 'ev_ebitda'),
+    }
+
+    # First start-year bucket (dashboards default to 2018)
+    FIRST_START_YEAR = 2018
+
+    def __init__(self):
+        self.base_path = PROJECT_ROOT
+        self.valuation_path = self.base_path / 'DATA' / 'processed' / 'valuation'
+        self.output_path = self.valuation_path / 'distribution'
+
+    def get_start_years(self, df: pd.DataFrame) -> list:
+        """Start-year buckets from FIRST_START_YEAR up to the latest data year."""
+        last_year = int(df['date'].max().year)
+        return list(range(self.FIRST_START_YEAR, last_year + 1))
+
+    def calculate_metric(self, metric: str) -> pd.DataFrame:
+        """Distribution rows for one metric, every start-year bucket and both methods."""
+        relative_path, value_col = self.METRIC_SOURCES[metric]
+        file_path = self.valuation_path / relative_path
+        if not file_path.exists():
+            logger.warning(f"   ⚠️ {metric}: file not found {file_path}")
+            return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+        df = pd.read_parquet(file_path, columns=['symbol', 'date', 'sector', value_col])
+        df['date'] = pd.to_datetime(df['date'])
+        if df.empty:
+            return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+        frames = []
+        for start_year in self.get_start_years(df):
+            subset = df[df['date'] >= pd.Timestamp(f"{start_year}-01-01")]
+            for method, func in (('entity', compute_entity_distribution),
+                                 ('industry', compute_industry_distribution)):
+                stats = func(subset, metric, value_col)
+                if stats.empty:
+                    continue
+                stats['method'] = method
+                stats['metric'] = metric
+                stats['start_year'] = start_year
+                frames.append(stats)
+
+        if not frames:
+            return pd.DataFrame(columns=OUTPUT_COLUMNS)
+        return pd.concat(frames, ignore_index=True)[OUTPUT_COLUMNS]
+
+    def calculate_all(self) -> pd.DataFrame:
+        """Distribution rows for every metric."""
+        frames = []
+        for metric in self.METRIC_SOURCES:
+            result = self.calculate_metric(metric)
+            logger.info(f"   {metric}: {len(result):,} distribution rows")
+            if not result.empty:
+                frames.append(result)
+        if not frames:
+            return pd.DataFrame(columns=OUTPUT_COLUMNS)
+        result = pd.concat(frames, ignore_index=True)
+        for col in ('method', 'metric', 'sector', 'status'):
+            result[col] = result[col].astype('category')
+        return result
+
+    def save_results(self, df: pd.DataFrame, filename: str = 'valuation_distribution.parquet'):
+        self.output_path.mkdir(parents=True, exist_ok=True)
+        path = self.output_path / filename
+        df.to_parquet(path, index=False)
+        record_written_files([path])
+        logger.info(f"💾 Saved {len(df):,} distribution rows to {path}")
+        return path
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    calculator = ValuationDistributionCalculator()
+    result = calculator.calculate_all()
+    if not result.empty:
+        calculator.save_results(result)
+
+
+if __name__ == "__main__":
+    main()
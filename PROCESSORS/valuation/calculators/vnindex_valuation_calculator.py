@@ -34,6 +34,7 @@ except ImportError:
 from PROCESSORS.valuation.formulas.metric_mapper import MetricRegistryLoader
 
 # Import SectorRegistry for sector processing
+from config.data_mapping.data_versions import record_written_files
 from config.registries import SectorRegistry
 
 warnings.filterwarnings('ignore')
@@ -523,6 +524,7 @@ class VNIndexValuationCalculator:
         self.output_path.mkdir(parents=True, exist_ok=True)
         path = self.output_path / filename
         df.to_parquet(path, index=False)
+        record_written_files([path])
         logger.info(f"Saved to {path}")
 
 def main():
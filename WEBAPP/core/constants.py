@@ -13,6 +13,9 @@ CACHE_TTL_WARM = 300      # Frequently updated (news, intraday prices)
 CACHE_TTL_COLD = 3600     # Infrequently updated (fundamentals, forecasts)
 CACHE_TTL_STATIC = 86400  # Static data (symbols, sectors, metadata)
 
+# Memory budget for the process-wide parquet cache (WEBAPP/core/data_cache.py)
+DATA_CACHE_MAX_MB = 2048
+
 # Outlier thresholds (default)
 OUTLIERS_DEFAULT = {
     'pe_ratio': 100.0,
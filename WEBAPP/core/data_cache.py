@@ -0,0 +1,221 @@
+"""
+Shared Data Cache - Cache dữ liệu dùng chung toàn process (bilingual / song ngữ)
+================================================================================
+
+One read-only cache of parquet files shared by every Streamlit session.
+
+- Files are held once as Arrow tables; pandas frames are built from them
+  once per file version (zero-copy where Arrow allows) and handed out as
+  shallow copies, so N sessions do not mean N copies of the same parquet.
+- Entries are keyed by (path, columns) and validated against the data version
+  manifest (DATA/.data_versions.json, see config/data_mapping/data_versions.py):
+  only datasets whose content hash changed are reloaded, no TTL and no
+  per-file stat. Files the manifest does not track fall back to their mtime.
+- LRU eviction keeps the total size under a memory budget
+  (``DATA_CACHE_MAX_MB``, env ``WEBAPP_DATA_CACHE_MB`` overrides).
+- ``stats()`` exposes hits / misses / reloads / evictions for monitoring.
+
+VN: Frame trả về dùng chung bộ nhớ với cache - chỉ đọc. Gán cột mới
+(``df['x'] = ...``) thì an toàn; sửa tại chỗ (``df.loc[...] = ...``) phải
+``.copy()`` trước.
+
+Usage:
+    from WEBAPP.core.data_cache import read_cached_parquet
+
+    df = read_cached_parquet(path)                       # whole file
+    df = read_cached_parquet(path, columns=['symbol'])   # projected columns
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from WEBAPP.core.constants import DATA_CACHE_MAX_MB
+from config.data_mapping.data_versions import DataVersionWatcher
+
+# Import streamlit for cache_resource (optional, only if available)
+try:
+    import streamlit as st
+    HAS_STREAMLIT = True
+except ImportError:
+    HAS_STREAMLIT = False
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, Optional[Tuple[str, ...]]]
+
+
+@dataclass
+class _CacheEntry:
+    version: str
+    table: pa.Table
+    frame: Optional[pd.DataFrame] = None
+    nbytes: int = 0
+
+
+class SharedDataCache:
+    """
+    Process-wide LRU cache of parquet files (Arrow tables + pandas views).
+
+    Thread-safe: Streamlit serves sessions on separate threads.
+    """
+
+    def __init__(self, max_bytes: int, watcher: Optional[DataVersionWatcher] = None):
+        self.max_bytes = max_bytes
+        self.watcher = watcher or DataVersionWatcher()
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_table(self, path: Path, columns: Optional[Sequence[str]] = None) -> pa.Table:
+        """Arrow table for ``path`` (optionally projected), loaded at most once per file version."""
+        return self._get_entry(path, columns).table
+
+    def read_parquet(self, path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        DataFrame for ``path`` backed by the shared cache.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        key, entry = self._get_entry(path, columns, with_key=True)
+        frame = entry.frame
+        if frame is None:
+            frame = entry.table.to_pandas(split_blocks=True)
+            with self._lock:
+                # Account for columns pandas had to materialize (e.g. strings)
+                if self._entries.get(key) is entry and entry.frame is None:
+                    entry.frame = frame
+                    extra = int(frame.memory_usage(index=True, deep=False).sum())
+                    entry.nbytes += extra
+                    self._bytes += extra
+                    self._evict_locked(keep=key)
+        return frame.copy(deep=False)
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Drop every entry (or only the entries of ``path``)."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            resolved = str(Path(path).resolve())
+            for key in [k for k in self._entries if k[0] == resolved]:
+                self._bytes -= self._entries.pop(key).nbytes
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and memory usage."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'reloads': self.reloads,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _get_entry(self, path: Path, columns: Optional[Sequence[str]], with_key: bool = False):
+        path = Path(path)
+        version = self._current_version(path)
+
+        key: CacheKey = (str(path.resolve()), tuple(columns) if columns is not None else None)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return (key, entry) if with_key else entry
+            if entry is not None:
+                self.reloads += 1
+            self.misses += 1
+
+        # Read outside the lock; concurrent misses on the same file may both read
+        table = pq.read_table(path, columns=list(columns) if columns is not None else None)
+        entry = _CacheEntry(version=version, table=table, nbytes=table.nbytes)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            self._evict_locked(keep=key)
+
+        logger.debug(f"SharedDataCache: loaded {path.name} ({entry.nbytes / 1e6:.1f} MB)")
+        return (key, entry) if with_key else entry
+
+    def _current_version(self, path: Path) -> str:
+        """Manifest content hash when tracked, else the file mtime."""
+        rel = self.watcher.relative_key(path)
+        token = self.watcher.get_token(rel) if rel else None
+        if token is not None:
+            return token
+        try:
+            return f"mtime:{path.stat().st_mtime_ns}"
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Data file not found: {path}")
+
+    def _evict_locked(self, keep: CacheKey) -> None:
+        """Evict least recently used entries until under budget (never ``keep``)."""
+        for key in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._bytes -= self._entries.pop(key).nbytes
+            self.evictions += 1
+
+
+def _create_data_cache() -> SharedDataCache:
+    max_mb = int(os.environ.get('WEBAPP_DATA_CACHE_MB', DATA_CACHE_MAX_MB))
+    return SharedDataCache(max_bytes=max_mb * 1024 * 1024)
+
+
+if HAS_STREAMLIT:
+    @st.cache_resource(show_spinner=False)
+    def get_data_cache() -> SharedDataCache:
+        """Process-wide SharedDataCache (one per Streamlit server)."""
+        return _create_data_cache()
+else:
+    _DATA_CACHE: Optional[SharedDataCache] = None
+    _DATA_CACHE_LOCK = threading.Lock()
+
+    def get_data_cache() -> SharedDataCache:
+        """Process-wide SharedDataCache."""
+        global _DATA_CACHE
+        with _DATA_CACHE_LOCK:
+            if _DATA_CACHE is None:
+                _DATA_CACHE = _create_data_cache()
+        return _DATA_CACHE
+
+
+def read_cached_parquet(path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Read a parquet file through the shared data cache."""
+    return get_data_cache().read_parquet(path, columns=columns)
@@ -0,0 +1,242 @@
+"""
+Data Catalog - Shared read-only DuckDB catalog (bilingual / song ngữ)
+=====================================================================
+
+One DuckDB database per process that exposes every processed dataset from
+config/data_mapping/configs/data_sources.yaml as a view named after its data
+source (e.g. ``technical_basic``, ``pe_historical``, ``bank_metrics``).
+
+- Views wrap ``read_parquet`` so each query sees the current file (no stale copy)
+  and DuckDB pushes symbol/date/column filters down to the parquet row groups.
+- Each thread gets its own cursor on the shared database (Streamlit runs
+  sessions on separate threads; a DuckDB connection is not thread-safe).
+- Values are always bound as parameters; identifiers are validated against
+  the view's columns.
+
+VN: Catalog DuckDB dùng chung cho toàn process, đăng ký mỗi dataset thành một
+view. Service gọi ``query()`` với bộ lọc symbol/ngày/cột thay vì đọc cả file
+parquet vào pandas.
+
+Usage:
+    from WEBAPP.core.data_catalog import get_catalog
+
+    catalog = get_catalog()
+    df = catalog.query("technical_basic", symbols=["VNM"], start_date="2024-01-01")
+    df = catalog.query("pe_historical", columns=["symbol", "date", "pe_ratio"], symbols=["FPT"], latest=250)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import duckdb
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a SQL identifier (view or column name)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    """Quote a SQL string literal (only used for file paths in view DDL)."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+class DataCatalog:
+    """
+    Process-wide read-only DuckDB catalog over DATA/processed.
+
+    Singleton: ``DataCatalog()`` always returns the same instance.
+    """
+
+    _instance: Optional["DataCatalog"] = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._initialize()
+                cls._instance = instance
+        return cls._instance
+
+    def _initialize(self) -> None:
+        self._conn = duckdb.connect(database=':memory:')
+        self._local = threading.local()
+        self._ddl_lock = threading.Lock()
+        self._views: Dict[str, Path] = {}
+        self._columns: Dict[str, List[str]] = {}
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> List[str]:
+        """
+        (Re)register a view for every data source whose parquet file exists.
+
+        Returns:
+            Names of registered views.
+        """
+        from config.data_mapping import get_registry
+
+        registry = get_registry()
+        with self._ddl_lock:
+            for name in registry.list_data_sources():
+                path = PROJECT_ROOT / registry.get_path(name)
+                if path.suffix != '.parquet' or not path.exists():
+                    continue
+                try:
+                    self._register(name, path)
+                except duckdb.Error as e:
+                    logger.warning(f"DataCatalog: cannot register {name} ({path}): {e}")
+        return sorted(self._views)
+
+    def register_parquet(self, name: str, path: Path) -> None:
+        """Register (or replace) a view over a parquet file outside the registry."""
+        with self._ddl_lock:
+            self._register(name, Path(path))
+
+    def _register(self, name: str, path: Path) -> None:
+        self._conn.execute(
+            f"CREATE OR REPLACE VIEW {_quote_identifier(name)} AS "
+            f"SELECT * FROM read_parquet({_quote_literal(str(path))})"
+        )
+        self._views[name] = path
+        self._columns[name] = [
+            row[0] for row in self._conn.execute(f"DESCRIBE {_quote_identifier(name)}").fetchall()
+        ]
+
+    def has_view(self, name: str) -> bool:
+        """True if ``name`` is registered (refreshes once if its file appeared since startup)."""
+        if name not in self._views:
+            self.refresh()
+        return name in self._views
+
+    def list_views(self) -> List[str]:
+        return sorted(self._views)
+
+    def get_columns(self, name: str) -> List[str]:
+        return list(self._columns.get(name, []))
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """Thread-local cursor on the shared database."""
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None:
+            cursor = self._conn.cursor()
+            self._local.cursor = cursor
+        return cursor
+
+    def execute(self, sql: str, params: Optional[Sequence] = None) -> pd.DataFrame:
+        """Run a parameterized query on the calling thread's cursor."""
+        return self.cursor().execute(sql, list(params or [])).fetchdf()
+
+    def query(
+        self,
+        name: str,
+        columns: Optional[Sequence[str]] = None,
+        symbols: Optional[Sequence[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        filters: Optional[Dict[str, object]] = None,
+        latest: Optional[int] = None,
+        order_by: Optional[Sequence[str]] = None,
+        symbol_col: str = 'symbol',
+        date_col: str = 'date',
+    ) -> pd.DataFrame:
+        """
+        Select rows from a registered dataset with filters pushed down to DuckDB.
+
+        Args:
+            name: Data source / view name (see data_sources.yaml)
+            columns: Columns to return (default: all)
+            symbols: Keep only these symbols
+            start_date / end_date: Inclusive date bounds (YYYY-MM-DD)
+            filters: Extra equality filters {column: value}; list values become IN (...)
+            latest: Keep only the most recent N rows per query (by ``date_col``)
+            order_by: Output ordering (default: symbol, date when present)
+
+        Returns:
+            DataFrame (empty if the view is not registered)
+
+        Raises:
+            KeyError: If a column is not in the dataset
+        """
+        if not self.has_view(name):
+            return pd.DataFrame()
+
+        available = self._columns[name]
+        wanted = list(columns) if columns else available
+        for col in wanted:
+            if col not in available:
+                raise KeyError(f"Column '{col}' not in dataset '{name}'")
+
+        where: List[str] = []
+        params: List[object] = []
+
+        if symbols is not None:
+            symbols = list(symbols)
+            if not symbols:
+                return pd.DataFrame(columns=wanted)
+            where.append(f"{_quote_identifier(symbol_col)} IN ({', '.join('?' * len(symbols))})")
+            params.extend(symbols)
+        if start_date is not None:
+            where.append(f"{_quote_identifier(date_col)} >= ?")
+            params.append(str(pd.Timestamp(start_date).date()))
+        if end_date is not None:
+            where.append(f"{_quote_identifier(date_col)} <= ?")
+            params.append(str(pd.Timestamp(end_date).date()))
+        for col, value in (filters or {}).items():
+            if col not in available:
+                raise KeyError(f"Column '{col}' not in dataset '{name}'")
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                where.append(f"{_quote_identifier(col)} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+            else:
+                where.append(f"{_quote_identifier(col)} = ?")
+                params.append(value)
+
+        select_cols = ', '.join(_quote_identifier(c) for c in wanted)
+        where_clause = (" WHERE " + " AND ".join(where)) if where else ""
+
+        if order_by is None:
+            order_by = [c for c in (symbol_col, date_col) if c in wanted]
+        for col in order_by:
+            if col not in wanted:
+                raise KeyError(f"order_by column '{col}' not selected from '{name}'")
+        order_clause = (" ORDER BY " + ', '.join(_quote_identifier(c) for c in order_by)) if order_by else ""
+
+        if latest:
+            if date_col not in available:
+                raise KeyError(f"Column '{date_col}' not in dataset '{name}'")
+            # Newest N rows first (LIMIT pushes a top-N), then back to normal order
+            inner = (
+                f"SELECT {select_cols}, {_quote_identifier(date_col)} AS __sort_date "
+                f"FROM {_quote_identifier(name)}{where_clause} "
+                f"ORDER BY __sort_date DESC LIMIT ?"
+            )
+            params.append(int(latest))
+            sql = f"SELECT {select_cols} FROM ({inner}){order_clause}"
+        else:
+            sql = f"SELECT {select_cols} FROM {_quote_identifier(name)}{where_clause}{order_clause}"
+
+        return self.execute(sql, params)
+
+
+def get_catalog() -> DataCatalog:
+    """Return the process-wide DataCatalog."""
+    return DataCatalog()
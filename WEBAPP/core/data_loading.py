@@ -5,6 +5,7 @@ mặc định. Domain có thể kế thừa/ghi đè ở thư mục `domains/`.
 
 Updated: 2025-12-17 - Added get_all_symbols() using SymbolLoader
 Updated: 2026-01-04 - Added caching with TTL constants
+Updated: 2026-10-18 - Shared DuckDB catalog cursor, parameterized parquet paths
 """
 
 from __future__ import annotations
@@ -16,14 +17,16 @@ from WEBAPP.core.constants import OUTLIERS_DEFAULT, CACHE_TTL_COLD, CACHE_TTL_ST
 from WEBAPP.core.utils import clip_outliers
 from WEBAPP.core.formatters import format_valuation_df, format_value
 from WEBAPP.core.symbol_loader import SymbolLoader
+from WEBAPP.core.data_catalog import get_catalog
 
 
 def get_connection() -> duckdb.DuckDBPyConnection:
-    """Return a DuckDB connection (no persistence).
+    """Return the calling thread's cursor on the shared DuckDB catalog.
 
-    VN: Trả về kết nối DuckDB, dùng để đọc Parquet nhanh.
+    VN: Trả về cursor DuckDB dùng chung (mỗi thread một cursor), có sẵn các
+    view dataset trong DATA/processed.
     """
-    return duckdb.connect()
+    return get_catalog().cursor()
 
 
 def get_all_symbols(entity_type: Optional[str] = None) -> List[str]:
@@ -52,7 +55,7 @@ def load_symbol_list(path: str) -> List[str]:
         path: absolute path đến parquet symbols nguồn.
     """
     conn = get_connection()
-    df = conn.execute(f"SELECT DISTINCT symbol FROM read_parquet('{path}') ORDER BY symbol").fetchdf()
+    df = conn.execute("SELECT DISTINCT symbol FROM read_parquet(?) ORDER BY symbol", [str(path)]).fetchdf()
     return df['symbol'].tolist()
 
 
@@ -65,31 +68,31 @@ def load_valuation_generic(symbol: str, start_date: str,
     """
     conn = get_connection()
     pe = conn.execute(
-        f"""
+        """
         SELECT symbol, date, close_price, ttm_earning_billion_vnd, shares_outstanding,
                eps, pe_ratio, sector
-        FROM read_parquet('{pe_path}')
+        FROM read_parquet(?)
         WHERE symbol = ? AND TRY_CAST(date AS DATE) >= ? AND TRY_CAST(date AS DATE) >= '1900-01-01'
         ORDER BY TRY_CAST(date AS DATE)
-        """ , [symbol, start_date]).fetchdf()
+        """ , [str(pe_path), symbol, start_date]).fetchdf()
 
     pb = conn.execute(
-        f"""
+        """
         SELECT symbol, date, close_price, equity_billion_vnd, shares_outstanding,
                bps, pb_ratio, sector
-        FROM read_parquet('{pb_path}')
+        FROM read_parquet(?)
         WHERE symbol = ? AND TRY_CAST(date AS DATE) >= ? AND TRY_CAST(date AS DATE) >= '1900-01-01'
         ORDER BY TRY_CAST(date AS DATE)
-        """ , [symbol, start_date]).fetchdf()
+        """ , [str(pb_path), symbol, start_date]).fetchdf()
 
     ev = conn.execute(
-        f"""
+        """
         SELECT symbol, date, close_price, market_cap, total_debt_long, total_debt_short,
                total_debt, cash_equivalent, ev, ebitda_ttm, ebitda_vnd, ev_ebitda_ratio
-        FROM read_parquet('{ev_path}')
+        FROM read_parquet(?)
         WHERE symbol = ? AND TRY_CAST(date AS DATE) >= ? AND TRY_CAST(date AS DATE) >= '1900-01-01'
         ORDER BY TRY_CAST(date AS DATE)
-        """ , [symbol, start_date]).fetchdf()
+        """ , [str(ev_path), symbol, start_date]).fetchdf()
 
     # Outlier filters (mặc định)
     if not pe.empty:
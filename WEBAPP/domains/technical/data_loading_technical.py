@@ -14,6 +14,7 @@ import pandas as pd
 from WEBAPP.core.formatters import format_value, format_df_column
 from WEBAPP.core.utils import get_data_path
 from WEBAPP.core.symbol_loader import SymbolLoader
+from WEBAPP.core.data_catalog import get_catalog
 
 # Import streamlit for caching (optional, only if available)
 try:
@@ -42,7 +43,8 @@ MA_SCREENING_PATH = get_data_path("DATA/processed/technical/ma_screening_latest.
 
 
 def get_connection() -> duckdb.DuckDBPyConnection:
-    return duckdb.connect()
+    """Thread-local cursor on the shared DuckDB catalog."""
+    return get_catalog().cursor()
 
 
 def get_technical_symbols() -> List[str]:
@@ -57,14 +59,14 @@ def get_technical_symbols() -> List[str]:
         print(f"Error loading symbols from SymbolLoader: {e}")
         # Fallback to parquet if SymbolLoader fails
         conn = get_connection()
-        df = conn.execute(f"SELECT DISTINCT symbol FROM read_parquet('{str(OHLCV_BASIC)}') ORDER BY symbol").fetchdf()
+        df = conn.execute("SELECT DISTINCT symbol FROM read_parquet(?) ORDER BY symbol", [str(OHLCV_BASIC)]).fetchdf()
         return df['symbol'].tolist()
 
 
 def load_rsi(symbol: str) -> pd.DataFrame:
     conn = get_connection()
     df = conn.execute(
-        f"SELECT * FROM read_parquet('{str(RSI_PATH)}') WHERE symbol = ? AND TRY_CAST(date AS DATE) >= '1900-01-01' ORDER BY TRY_CAST(date AS DATE)", [symbol]
+        "SELECT * FROM read_parquet(?) WHERE symbol = ? AND TRY_CAST(date AS DATE) >= '1900-01-01' ORDER BY TRY_CAST(date AS DATE)", [str(RSI_PATH), symbol]
     ).fetchdf()
     if not df.empty:
         df['date'] = pd.to_datetime(df['date'])
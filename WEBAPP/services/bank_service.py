@@ -21,6 +21,7 @@ from pathlib import Path
 from typing import Optional, Dict, List
 
 from .base_service import BaseService
+from WEBAPP.core.data_cache import read_cached_parquet
 
 
 class BankService(BaseService):
@@ -82,7 +83,7 @@ class BankService(BaseService):
         if period == "Yearly":
             yearly_path = self.data_root / "processed" / "fundamental" / "bank" / "bank_financial_metrics_yearly.parquet"
             if yearly_path.exists():
-                df = pd.read_parquet(yearly_path)
+                df = read_cached_parquet(yearly_path)
             else:
                 return pd.DataFrame()
         else:
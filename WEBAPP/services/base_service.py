@@ -23,10 +23,12 @@ Version: 1.0.0
 
 import pandas as pd
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 from abc import ABC
 import logging
 
+from WEBAPP.core.data_cache import read_cached_parquet
+
 logger = logging.getLogger(__name__)
 
 
@@ -166,7 +168,7 @@ class BaseService(ABC):
             )
 
         # Load data
-        df = pd.read_parquet(path, columns=columns)
+        df = read_cached_parquet(path, columns=columns)
 
         # Validate empty DataFrame
         if df.empty:
@@ -180,6 +182,82 @@ class BaseService(ABC):
 
         return df
 
+    def query_data(
+        self,
+        source_name: Optional[str] = None,
+        columns: Optional[list[str]] = None,
+        symbols: Optional[Sequence[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        latest: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Load filtered rows of a data source (pushdown via the shared DuckDB catalog).
+
+        Only the requested symbols/dates/columns are read from parquet. With a
+        ``data_root`` override (tests) or when the source is not in the catalog,
+        the same filters are applied in pandas on the resolved file.
+
+        Args:
+            source_name: Registry data source (default: DATA_SOURCE)
+            columns: Columns to return (default: all)
+            symbols: Keep only these symbols
+            start_date / end_date: Inclusive date bounds (YYYY-MM-DD)
+            latest: Keep only the most recent N rows
+
+        Returns:
+            DataFrame sorted by (symbol, date) with 'date' as datetime
+
+        Raises:
+            FileNotFoundError: If data file doesn't exist
+        """
+        source_name = source_name or self.DATA_SOURCE
+
+        if not self._data_root:
+            from WEBAPP.core.data_catalog import get_catalog
+            catalog = get_catalog()
+            if catalog.has_view(source_name):
+                df = catalog.query(
+                    source_name, columns=columns, symbols=symbols,
+                    start_date=start_date, end_date=end_date, latest=latest
+                )
+                if 'date' in df.columns:
+                    df['date'] = pd.to_datetime(df['date'])
+                return df
+
+        path = self._resolve_source_path(source_name)
+        if not path.exists():
+            raise FileNotFoundError(
+                f"Data file not found: {path}\n"
+                f"Service: {self.__class__.__name__}\n"
+                f"Data Source: {source_name}"
+            )
+
+        df = read_cached_parquet(path, columns=columns)
+        if symbols is not None:
+            df = df[df['symbol'].isin(list(symbols))]
+        if 'date' in df.columns:
+            df = df.copy()
+            df['date'] = pd.to_datetime(df['date'])
+            if start_date:
+                df = df[df['date'] >= start_date]
+            if end_date:
+                df = df[df['date'] <= end_date]
+            if latest:
+                df = df.nlargest(latest, 'date') if len(df) > latest else df
+            sort_cols = [c for c in ('symbol', 'date') if c in df.columns]
+            df = df.sort_values(sort_cols, kind='mergesort')
+        return df.reset_index(drop=True)
+
+    def _resolve_source_path(self, source_name: str) -> Path:
+        """Resolve a registry data source to a file path (honours data_root override)."""
+        if source_name == self.DATA_SOURCE:
+            return self.get_data_path()
+        relative = self.registry.get_path(source_name)
+        if self._data_root:
+            return self._data_root / str(relative).replace("DATA/", "")
+        return self.project_root / relative
+
     def _validate_schema(self, df: pd.DataFrame) -> None:
         """
         Validate DataFrame has expected columns.
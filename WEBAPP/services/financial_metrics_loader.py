@@ -10,13 +10,13 @@ Updated: 2025-12-17 - Use SymbolLoader instead of SectorRegistry for symbol list
 
 import logging
 import pandas as pd
-import duckdb
 import streamlit as st
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
 # Project imports - Use SymbolLoader for symbol lists
 from WEBAPP.core.symbol_loader import SymbolLoader
+from WEBAPP.core.data_catalog import get_catalog
 from config.registries.sector_lookup import SectorRegistry
 from config.registries.metric_lookup import MetricRegistry
 from WEBAPP.core.data_paths import (
@@ -45,7 +45,7 @@ class FinancialMetricsLoader:
         self.symbol_loader = SymbolLoader()  # For symbol lists
         self.sector_registry = SectorRegistry()  # For ticker info lookup only
         self.metric_registry = MetricRegistry()
-        self._duckdb_conn = duckdb.connect() # Persist connection if needed, or create per request
+        self.catalog = get_catalog()  # Shared DuckDB catalog (thread-local cursors)
         
     def get_entity_type(self, symbol: str) -> str:
         """
@@ -79,7 +79,7 @@ class FinancialMetricsLoader:
                 logger.error(f"Data path not found for entity type {entity_type}: {data_path}")
                 return pd.DataFrame()
 
-            conn = duckdb.connect()
+            conn = _self.catalog.cursor()
             
             # Efficient DuckDB query
             query = """
@@ -24,6 +24,7 @@ from pathlib import Path
 from typing import Optional, Dict, List
 
 from .base_service import BaseService
+from WEBAPP.core.data_cache import read_cached_parquet
 
 
 class ForecastService(BaseService):
@@ -66,7 +67,7 @@ class ForecastService(BaseService):
         if not file_path.exists():
             return pd.DataFrame()
 
-        df = pd.read_parquet(file_path)
+        df = read_cached_parquet(file_path)
 
         # Sort by upside_pct descending (best opportunities first)
         if 'upside_pct' in df.columns:
@@ -86,7 +87,7 @@ class ForecastService(BaseService):
         if not file_path.exists():
             return pd.DataFrame()
 
-        df = pd.read_parquet(file_path)
+        df = read_cached_parquet(file_path)
 
         # Sort by PE FWD 2025 ascending (lowest PE first)
         if 'pe_fwd_2025' in df.columns:
@@ -106,7 +107,7 @@ class ForecastService(BaseService):
         if not file_path.exists():
             return pd.DataFrame()
 
-        return pd.read_parquet(file_path)
+        return read_cached_parquet(file_path)
 
     def get_summary_stats(self) -> Dict:
         """
@@ -258,7 +259,7 @@ class ForecastService(BaseService):
         bsc_symbols = individual_df['symbol'].tolist()
 
         # Load PE historical, filter to BSC symbols, get latest
-        pe_hist = pd.read_parquet(pe_ttm_path)
+        pe_hist = read_cached_parquet(pe_ttm_path)
         pe_bsc = pe_hist[pe_hist['symbol'].isin(bsc_symbols)]
         latest_date = pe_bsc['date'].max()
         pe_latest = pe_bsc[pe_bsc['date'] == latest_date][['symbol', 'pe_ratio', 'ttm_earning_billion_vnd']].copy()
@@ -269,7 +270,7 @@ class ForecastService(BaseService):
 
         # Load PB TTM if available
         if pb_ttm_path.exists():
-            pb_hist = pd.read_parquet(pb_ttm_path)
+            pb_hist = read_cached_parquet(pb_ttm_path)
             pb_bsc = pb_hist[pb_hist['symbol'].isin(bsc_symbols)]
             pb_latest = pb_bsc[pb_bsc['date'] == latest_date][['symbol', 'pb_ratio', 'equity_billion_vnd']].copy()
             pb_latest = pb_latest.rename(columns={'pb_ratio': 'pb_ttm', 'equity_billion_vnd': 'book_value'})
@@ -464,7 +465,7 @@ class ForecastService(BaseService):
         if not file_path.exists():
             return pd.DataFrame()
 
-        df = pd.read_parquet(file_path)
+        df = read_cached_parquet(file_path)
 
         # Normalize column names
         if 'ticker' in df.columns:
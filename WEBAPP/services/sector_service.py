@@ -21,6 +21,7 @@ from pathlib import Path
 from typing import Optional, List, Dict
 
 from .base_service import BaseService
+from WEBAPP.core.data_cache import read_cached_parquet
 
 
 class SectorService(BaseService):
@@ -81,7 +82,7 @@ class SectorService(BaseService):
         sector_file = self._get_path("sector_valuation")
 
         if sector_file.exists():
-            sector_df = pd.read_parquet(sector_file)
+            sector_df = read_cached_parquet(sector_file)
 
             # Add SECTOR: prefix to sector_code for dashboard compatibility
             if 'sector_code' in sector_df.columns:
@@ -108,7 +109,7 @@ class SectorService(BaseService):
             vnindex_file = self._get_path("vnindex_valuation")
 
             if vnindex_file.exists():
-                vnindex_df = pd.read_parquet(vnindex_file)
+                vnindex_df = read_cached_parquet(vnindex_file)
 
                 if 'date' in vnindex_df.columns:
                     vnindex_df['date'] = pd.to_datetime(vnindex_df['date'])
@@ -151,7 +152,7 @@ class SectorService(BaseService):
         sector_file = self._get_path("sector_valuation")
 
         if sector_file.exists():
-            df = pd.read_parquet(sector_file, columns=['sector_code'])
+            df = read_cached_parquet(sector_file, columns=['sector_code'])
             return sorted(df['sector_code'].unique().tolist())
 
         # Fallback: get from vnindex valuation data
@@ -160,7 +161,7 @@ class SectorService(BaseService):
         if not parquet_file.exists():
             return []
 
-        df = pd.read_parquet(parquet_file, columns=['scope'])
+        df = read_cached_parquet(parquet_file, columns=['scope'])
         scopes = df['scope'].unique().tolist()
 
         # Remove VNINDEX from sectors list
@@ -310,7 +311,7 @@ class SectorService(BaseService):
             if not vnindex_file.exists():
                 return pd.DataFrame()
 
-            df = pd.read_parquet(vnindex_file)
+            df = read_cached_parquet(vnindex_file)
 
             if 'scope' in df.columns:
                 df = df[df['scope'] == sector].copy()
@@ -328,7 +329,7 @@ class SectorService(BaseService):
         sector_file = self._get_path("sector_valuation")
 
         if sector_file.exists():
-            df = pd.read_parquet(sector_file)
+            df = read_cached_parquet(sector_file)
 
             # Filter by sector (handle both with and without SECTOR: prefix)
             if 'sector_code' in df.columns:
@@ -22,6 +22,7 @@ from pathlib import Path
 from typing import Optional, List
 
 from .base_service import BaseService
+from WEBAPP.core.data_cache import read_cached_parquet
 
 
 class TechnicalService(BaseService):
@@ -71,36 +72,19 @@ class TechnicalService(BaseService):
         Returns:
             DataFrame with technical indicators sorted by date
         """
-        parquet_file = self._get_path("technical_basic")
-
-        if not parquet_file.exists():
-            raise FileNotFoundError(
-                f"Technical data file not found: {parquet_file}\n"
-                f"Please run the technical calculator first."
-            )
-
-        df = pd.read_parquet(parquet_file)
-        df = df[df['symbol'] == ticker].copy()
+        # Symbol/date filters and the top-N are pushed down to parquet
+        df = self.query_data(
+            "technical_basic",
+            symbols=[ticker],
+            start_date=start_date,
+            end_date=end_date,
+            latest=limit
+        )
 
         if df.empty:
             return pd.DataFrame()
 
-        # Convert date column
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'])
-
-            # Apply date filters
-            if start_date:
-                df = df[df['date'] >= start_date]
-            if end_date:
-                df = df[df['date'] <= end_date]
-
-            df = df.sort_values('date')
-
-        if limit:
-            df = df.tail(limit)
-
-        return df
+        return df.sort_values('date') if 'date' in df.columns else df
 
     def get_latest_indicators(self, ticker: str) -> dict:
         """Get latest technical indicators for a ticker."""
@@ -132,7 +116,7 @@ class TechnicalService(BaseService):
             parquet_file = self._get_path("technical_basic")
             if not parquet_file.exists():
                 return []
-            df = pd.read_parquet(parquet_file, columns=['symbol'])
+            df = read_cached_parquet(parquet_file, columns=['symbol'])
             return sorted(df['symbol'].unique().tolist())
 
     def get_market_breadth(self) -> pd.DataFrame:
@@ -142,7 +126,7 @@ class TechnicalService(BaseService):
         if not breadth_path.exists():
             return pd.DataFrame()
 
-        return pd.read_parquet(breadth_path)
+        return read_cached_parquet(breadth_path)
 
     def get_sector_breadth(self, sector: Optional[str] = None) -> pd.DataFrame:
         """Get sector breadth data."""
@@ -151,7 +135,7 @@ class TechnicalService(BaseService):
         if not breadth_path.exists():
             return pd.DataFrame()
 
-        df = pd.read_parquet(breadth_path)
+        df = read_cached_parquet(breadth_path)
 
         if sector and 'sector' in df.columns:
             df = df[df['sector'] == sector]
@@ -165,7 +149,7 @@ class TechnicalService(BaseService):
         if not regime_path.exists():
             return pd.DataFrame()
 
-        return pd.read_parquet(regime_path)
+        return read_cached_parquet(regime_path)
 
     def get_money_flow(self, scope: str = "sector") -> pd.DataFrame:
         """
@@ -183,7 +167,7 @@ class TechnicalService(BaseService):
         if not flow_path.exists():
             return pd.DataFrame()
 
-        return pd.read_parquet(flow_path)
+        return read_cached_parquet(flow_path)
 
     def get_rs_rating(self, ticker: Optional[str] = None) -> pd.DataFrame:
         """
@@ -200,7 +184,7 @@ class TechnicalService(BaseService):
         if not rs_path.exists():
             return pd.DataFrame()
 
-        df = pd.read_parquet(rs_path)
+        df = read_cached_parquet(rs_path)
 
         if ticker and 'symbol' in df.columns:
             df = df[df['symbol'] == ticker]
@@ -214,7 +198,7 @@ class TechnicalService(BaseService):
         if not vnindex_path.exists():
             return pd.DataFrame()
 
-        return pd.read_parquet(vnindex_path)
+        return read_cached_parquet(vnindex_path)
 
     # =========================================================================
     # Technical Dashboard Methods (Tab 1-4)
@@ -233,7 +217,7 @@ class TechnicalService(BaseService):
         if not state_path.exists():
             return pd.DataFrame()
 
-        return pd.read_parquet(state_path)
+        return read_cached_parquet(state_path)
 
     def get_sector_ranking(self) -> pd.DataFrame:
         """
@@ -248,7 +232,7 @@ class TechnicalService(BaseService):
         if not ranking_path.exists():
             return pd.DataFrame()
 
-        return pd.read_parquet(ranking_path)
+        return read_cached_parquet(ranking_path)
 
     def get_sector_rrg(self) -> pd.DataFrame:
         """
@@ -263,7 +247,7 @@ class TechnicalService(BaseService):
         if not rrg_path.exists():
             return pd.DataFrame()
 
-        return pd.read_parquet(rrg_path)
+        return read_cached_parquet(rrg_path)
 
     def get_rs_rating_history(self, days: int = 30) -> pd.DataFrame:
         """
@@ -280,7 +264,7 @@ class TechnicalService(BaseService):
         if not history_path.exists():
             return pd.DataFrame()
 
-        df = pd.read_parquet(history_path)
+        df = read_cached_parquet(history_path)
 
         if 'date' in df.columns:
             df['date'] = pd.to_datetime(df['date'])
@@ -301,7 +285,7 @@ class TechnicalService(BaseService):
         if not buy_path.exists():
             return pd.DataFrame()
 
-        return pd.read_parquet(buy_path)
+        return read_cached_parquet(buy_path)
 
     def get_sell_list(self) -> pd.DataFrame:
         """
@@ -316,7 +300,7 @@ class TechnicalService(BaseService):
         if not sell_path.exists():
             return pd.DataFrame()
 
-        return pd.read_parquet(sell_path)
+        return read_cached_parquet(sell_path)
 
     def get_alerts(self, alert_type: Optional[str] = None, latest_only: bool = True) -> pd.DataFrame:
         """
@@ -340,4 +324,4 @@ class TechnicalService(BaseService):
         if not alerts_path.exists():
             return pd.DataFrame()
 
-        return pd.read_parquet(alerts_path)
+        return read_cached_parquet(alerts_path)
@@ -23,6 +23,7 @@ from pathlib import Path
 from typing import Optional, List, Dict
 
 from .base_service import BaseService
+from WEBAPP.core.data_cache import read_cached_parquet
 
 # Import SectorRegistry for industry sector mapping
 try:
@@ -77,6 +78,7 @@ class ValuationService(BaseService):
         self._pb_df = None
         self._ev_ebitda_df = None
         self._ps_df = None
+        self._distribution_df = None
 
     def _get_path(self, source_name: str) -> Path:
         """Get path for a data source via registry."""
@@ -94,54 +96,121 @@ class ValuationService(BaseService):
                 "ps_historical": "processed/valuation/ps/historical/historical_ps.parquet",
                 "ev_ebitda_historical": "processed/valuation/ev_ebitda/historical/historical_ev_ebitda.parquet",
                 "vnindex_valuation": "processed/valuation/vnindex/vnindex_valuation_refined.parquet",
+                "valuation_distribution": "processed/valuation/distribution/valuation_distribution.parquet",
             }
             if source_name in fallback_paths:
                 return self.data_root / fallback_paths[source_name]
             return self.data_root / "processed" / "valuation" / f"{source_name}.parquet"
 
+    def _load_cached_frame(self, source_name: str, parse_dates: bool = True) -> pd.DataFrame:
+        """
+        Read a valuation file through the process-wide data cache.
+
+        The ``_pe_df``/``_pb_df``/... attributes stay as explicit overrides
+        (e.g. injected frames in tests); normally every instance shares the
+        cached frame and a pipeline rewrite is picked up via the file mtime.
+        """
+        file_path = self._get_path(source_name)
+        if not file_path.exists():
+            return pd.DataFrame()
+        df = read_cached_parquet(file_path)
+        if parse_dates and 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
+            df['date'] = pd.to_datetime(df['date'])
+        return df
+
     def _load_pe_data(self) -> pd.DataFrame:
-        """Load PE historical data (cached)."""
-        if self._pe_df is None:
-            pe_file = self._get_path("pe_historical")
-            if pe_file.exists():
-                self._pe_df = pd.read_parquet(pe_file)
-                self._pe_df['date'] = pd.to_datetime(self._pe_df['date'])
-            else:
-                self._pe_df = pd.DataFrame()
-        return self._pe_df
+        """Load PE historical data (shared process cache)."""
+        if self._pe_df is not None:
+            return self._pe_df
+        return self._load_cached_frame("pe_historical")
 
     def _load_pb_data(self) -> pd.DataFrame:
-        """Load PB historical data (cached)."""
-        if self._pb_df is None:
-            pb_file = self._get_path("pb_historical")
-            if pb_file.exists():
-                self._pb_df = pd.read_parquet(pb_file)
-                self._pb_df['date'] = pd.to_datetime(self._pb_df['date'])
-            else:
-                self._pb_df = pd.DataFrame()
-        return self._pb_df
+        """Load PB historical data (shared process cache)."""
+        if self._pb_df is not None:
+            return self._pb_df
+        return self._load_cached_frame("pb_historical")
 
     def _load_ev_ebitda_data(self) -> pd.DataFrame:
-        """Load EV/EBITDA historical data (cached)."""
-        if self._ev_ebitda_df is None:
-            ev_file = self._get_path("ev_ebitda_historical")
-            if ev_file.exists():
-                self._ev_ebitda_df = pd.read_parquet(ev_file)
-                self._ev_ebitda_df['date'] = pd.to_datetime(self._ev_ebitda_df['date'])
-            else:
-                self._ev_ebitda_df = pd.DataFrame()
-        return self._ev_ebitda_df
+        """Load EV/EBITDA historical data (shared process cache)."""
+        if self._ev_ebitda_df is not None:
+            return self._ev_ebitda_df
+        return self._load_cached_frame("ev_ebitda_historical")
 
     def _load_ps_data(self) -> pd.DataFrame:
-        """Load P/S (Price-to-Sales) historical data (cached)."""
-        if self._ps_df is None:
-            ps_file = self._get_path("ps_historical")
-            if ps_file.exists():
-                self._ps_df = pd.read_parquet(ps_file)
-                self._ps_df['date'] = pd.to_datetime(self._ps_df['date'])
-            else:
-                self._ps_df = pd.DataFrame()
-        return self._ps_df
+        """Load P/S (Price-to-Sales) historical data (shared process cache)."""
+        if self._ps_df is not None:
+            return self._ps_df
+        return self._load_cached_frame("ps_historical")
+
+    def _load_ticker_rows(
+        self,
+        source_name: str,
+        cache_attr: str,
+        loader,
+        ticker: str,
+        start_date: pd.Timestamp,
+        limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Rows of one ticker from a historical valuation file.
+
+        Reads through the DuckDB catalog (symbol/date pushdown) unless a frame
+        was injected on the instance or a data_root override is set.
+        """
+        if getattr(self, cache_attr) is None and not self._data_root:
+            try:
+                df = self.query_data(source_name, symbols=[ticker], start_date=str(start_date.date()), latest=limit)
+                return df.sort_values('date') if not df.empty else pd.DataFrame()
+            except FileNotFoundError:
+                return pd.DataFrame()
+
+        df = loader()
+        if df.empty or 'symbol' not in df.columns:
+            return pd.DataFrame()
+        result = df[(df['symbol'] == ticker) & (df['date'] >= start_date)].sort_values('date')
+        return result.tail(limit) if limit else result
+
+    def _load_distribution_data(self) -> pd.DataFrame:
+        """Load precomputed per-ticker distribution stats (built by daily_valuation)."""
+        if self._distribution_df is not None:
+            return self._distribution_df
+        return self._load_cached_frame("valuation_distribution", parse_dates=False)
+
+    def _get_precomputed_candles(
+        self,
+        method: str,
+        metric: str,
+        start_year: int,
+        columns: List[str],
+        sector: Optional[str] = None,
+        tickers: Optional[List[str]] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Read candle stats rows from the precomputed distribution table.
+
+        Returns:
+            List of dicts sorted by percentile, or None if the table has no rows
+            for this (method, metric, start_year) bucket (caller computes live).
+        """
+        dist_df = self._load_distribution_data()
+        if dist_df.empty:
+            return None
+
+        bucket = dist_df[
+            (dist_df['method'] == method) &
+            (dist_df['metric'] == metric) &
+            (dist_df['start_year'] == start_year)
+        ]
+        if bucket.empty:
+            return None
+
+        if sector is not None:
+            bucket = bucket[bucket['sector'] == sector]
+        if tickers is not None:
+            bucket = bucket[bucket['symbol'].isin(tickers)]
+
+        bucket = bucket.sort_values('percentile', kind='mergesort')
+        return bucket[columns].astype(object).to_dict('records')
 
     def get_all_tickers(self, sector: Optional[str] = None) -> List[str]:
         """Get list of all tickers with valuation data."""
@@ -182,49 +251,12 @@ class ValuationService(BaseService):
         """
         start_date = pd.Timestamp(f"{start_year}-01-01")
 
-        # Load PE data
-        pe_df = self._load_pe_data()
-        pe_ticker = pd.DataFrame()
-        if not pe_df.empty and 'symbol' in pe_df.columns:
-            pe_ticker = pe_df[
-                (pe_df['symbol'] == ticker) &
-                (pe_df['date'] >= start_date)
-            ].sort_values('date')
-            if limit:
-                pe_ticker = pe_ticker.tail(limit)
-
-        # Load PB data
-        pb_df = self._load_pb_data()
-        pb_ticker = pd.DataFrame()
-        if not pb_df.empty and 'symbol' in pb_df.columns:
-            pb_ticker = pb_df[
-                (pb_df['symbol'] == ticker) &
-                (pb_df['date'] >= start_date)
-            ].sort_values('date')
-            if limit:
-                pb_ticker = pb_ticker.tail(limit)
-
-        # Load EV/EBITDA data
-        ev_df = self._load_ev_ebitda_data()
-        ev_ticker = pd.DataFrame()
-        if not ev_df.empty and 'symbol' in ev_df.columns:
-            ev_ticker = ev_df[
-                (ev_df['symbol'] == ticker) &
-                (ev_df['date'] >= start_date)
-            ].sort_values('date')
-            if limit:
-                ev_ticker = ev_ticker.tail(limit)
-
-        # Load P/S data
-        ps_df = self._load_ps_data()
-        ps_ticker = pd.DataFrame()
-        if not ps_df.empty and 'symbol' in ps_df.columns:
-            ps_ticker = ps_df[
-                (ps_df['symbol'] == ticker) &
-                (ps_df['date'] >= start_date)
-            ].sort_values('date')
-            if limit:
-                ps_ticker = ps_ticker.tail(limit)
+        pe_ticker = self._load_ticker_rows("pe_historical", "_pe_df", self._load_pe_data, ticker, start_date, limit)
+        pb_ticker = self._load_ticker_rows("pb_historical", "_pb_df", self._load_pb_data, ticker, start_date, limit)
+        ev_ticker = self._load_ticker_rows(
+            "ev_ebitda_historical", "_ev_ebitda_df", self._load_ev_ebitda_data, ticker, start_date, limit
+        )
+        ps_ticker = self._load_ticker_rows("ps_historical", "_ps_df", self._load_ps_data, ticker, start_date, limit)
 
         return {
             'pe': pe_ticker,
@@ -386,7 +418,7 @@ class ValuationService(BaseService):
                 f"Please run the valuation calculator first."
             )
 
-        df = pd.read_parquet(parquet_file)
+        df = read_cached_parquet(parquet_file)
 
         # Filter by scope - try with SECTOR: prefix first for sector names
         if 'scope' in df.columns:
@@ -430,7 +462,7 @@ class ValuationService(BaseService):
         if not parquet_file.exists():
             return []
 
-        df = pd.read_parquet(parquet_file, columns=['scope'])
+        df = read_cached_parquet(parquet_file, columns=['scope'])
         scopes = df['scope'].unique().tolist()
 
         # Clean up sector names for display
@@ -463,7 +495,7 @@ class ValuationService(BaseService):
         if not parquet_file.exists():
             return pd.DataFrame()
 
-        df = pd.read_parquet(parquet_file)
+        df = read_cached_parquet(parquet_file)
 
         if 'date' in df.columns:
             df['date'] = pd.to_datetime(df['date'])
@@ -527,24 +559,32 @@ class ValuationService(BaseService):
         'PE': {
             'value_col': 'pe_ratio',
             'data_loader': '_load_pe_data',
+            'data_source': 'pe_historical',
+            'cache_attr': '_pe_df',
             'display_name': 'P/E Ratio',
             'format': '{:.1f}x'
         },
         'PB': {
             'value_col': 'pb_ratio',
             'data_loader': '_load_pb_data',
+            'data_source': 'pb_historical',
+            'cache_attr': '_pb_df',
             'display_name': 'P/B Ratio',
             'format': '{:.2f}x'
         },
         'PS': {
             'value_col': 'ps_ratio',
             'data_loader': '_load_ps_data',
+            'data_source': 'ps_historical',
+            'cache_attr': '_ps_df',
             'display_name': 'P/S Ratio',
             'format': '{:.2f}x'
         },
         'EV_EBITDA': {
             'value_col': 'ev_ebitda',
             'data_loader': '_load_ev_ebitda_data',
+            'data_source': 'ev_ebitda_historical',
+            'cache_attr': '_ev_ebitda_df',
             'display_name': 'EV/EBITDA',
             'format': '{:.1f}x'
         }
@@ -578,17 +618,21 @@ class ValuationService(BaseService):
 
         config = self.METRIC_CONFIG[metric]
         loader_method = getattr(self, config['data_loader'])
+        start_date = pd.Timestamp(f"{start_year}-01-01")
+
+        if ticker:
+            return self._load_ticker_rows(
+                config['data_source'], config['cache_attr'], loader_method, ticker, start_date
+            )
+
         df = loader_method()
 
         if df.empty:
             return pd.DataFrame()
 
-        start_date = pd.Timestamp(f"{start_year}-01-01")
         df = df[df['date'] >= start_date].copy()
 
-        if ticker:
-            df = df[df['symbol'] == ticker]
-        elif sector:
+        if sector:
             df = df[df['sector'] == sector]
 
         return df.sort_values('date')
@@ -678,6 +722,14 @@ class ValuationService(BaseService):
         Returns:
             List of dicts with distribution stats per ticker
         """
+        precomputed = self._get_precomputed_candles(
+            'entity', metric, start_year,
+            ['symbol', 'current', 'p5', 'p25', 'median', 'p75', 'p95', 'percentile', 'status'],
+            sector=sector
+        )
+        if precomputed is not None:
+            return precomputed
+
         df = self.get_metric_data(metric, sector=sector, start_year=start_year)
 
         if df.empty:
@@ -789,6 +841,14 @@ class ValuationService(BaseService):
         if metric not in self.METRIC_CONFIG:
             return []
 
+        precomputed = self._get_precomputed_candles(
+            'industry', metric, start_year,
+            ['symbol', 'current', 'min', 'p25', 'median', 'p75', 'max', 'percentile', 'status'],
+            tickers=tickers
+        )
+        if precomputed is not None:
+            return precomputed
+
         config = self.METRIC_CONFIG[metric]
         loader_method = getattr(self, config['data_loader'])
         df = loader_method()
@@ -902,20 +962,23 @@ class ValuationService(BaseService):
 
         config = self.METRIC_CONFIG[metric]
         loader_method = getattr(self, config['data_loader'])
+        start_date = pd.Timestamp(f"{start_year}-01-01")
+
+        if ticker:
+            return self._load_ticker_rows(
+                config['data_source'], config['cache_attr'], loader_method, ticker, start_date
+            )
+
         df = loader_method()
 
         if df.empty:
             return pd.DataFrame()
 
-        start_date = pd.Timestamp(f"{start_year}-01-01")
         df = df[df['date'] >= start_date].copy()
         df = df[df['symbol'].isin(tickers)]
 
         # Add industry info
         if SECTOR_REGISTRY is not None:
-            df['industry'] = df['symbol'].apply(
-                lambda x: SECTOR_REGISTRY.get_ticker(x).get('sector', 'Unknown')
-                if SECTOR_REGISTRY.get_ticker(x) else 'Unknown'
-            )
+            df['industry'] = SECTOR_REGISTRY.map_tickers(df['symbol'], 'sector', default='Unknown')
 
         return df.sort_values(['symbol', 'date'])
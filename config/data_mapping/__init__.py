@@ -47,6 +47,12 @@ from .resolver import (
     PathResolver,
     DependencyResolver,
 )
+from .data_versions import (
+    DataVersionWatcher,
+    load_manifest,
+    record_data_versions,
+    record_written_files,
+)
 from .validator import (
     SchemaValidator,
     HealthChecker,
@@ -77,4 +83,9 @@ __all__ = [
     'HealthChecker',
     'ValidationResult',
     'HealthStatus',
+    # Data version manifest
+    'DataVersionWatcher',
+    'load_manifest',
+    'record_data_versions',
+    'record_written_files',
 ]
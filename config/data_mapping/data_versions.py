@@ -0,0 +1,333 @@
+"""
+Data Version Manifest
+=====================
+
+``DATA/.data_versions.json`` records, for every pipeline output, a content
+fingerprint so readers (web app cache, MCP DataLoader) can invalidate exactly
+the datasets that changed, without TTLs and without stat-ing every file:
+
+    {
+      "version": 42,                       # bumped on every change
+      "updated_at": "2026-01-05T16:02:11",
+      "datasets": {
+        "processed/technical/basic_data.parquet": {
+          "hash": "9f2c...",               # blake2b of the file content
+          "rows": 1203344,
+          "size": 84533120,
+          "mtime_ns": 1736067731000000000,
+          "updated_at": "2026-01-05T16:02:11"
+        }
+      }
+    }
+
+Keys are paths relative to the DATA directory. Files are hashed in full: a
+parquet footer alone does not change when a value inside a row group changes
+(same sizes, statistics untouched), e.g. an adjusted OHLCV rewrite.
+
+Writers call ``record_written_files()`` right after saving an output (the daily
+scripts additionally call ``record_data_versions()`` on exit). Only files whose
+(mtime, size) moved are re-hashed, and the manifest is replaced atomically.
+The read-modify-write runs under an exclusive lock on ``.data_versions.lock``,
+so pipelines finishing together don't drop each other's version bumps.
+Readers use ``DataVersionWatcher`` which re-reads the manifest only when the
+manifest file itself changed.
+
+Usage:
+    from config.data_mapping.data_versions import record_data_versions, DataVersionWatcher
+
+    df.to_parquet(output_path)
+    record_written_files([output_path])            # after writing an output
+    record_data_versions()                          # rescan after a pipeline step
+
+    watcher = DataVersionWatcher(data_root)
+    token = watcher.get_token("processed/technical/basic_data.parquet")
+"""
+
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".data_versions.json"
+LOCK_NAME = ".data_versions.lock"
+
+# Directories (relative to DATA) scanned when no explicit paths are given
+TRACKED_DIRS = ("processed", "raw/ohlcv")
+TRACKED_SUFFIXES = (".parquet",)
+
+DEFAULT_DATA_ROOT = Path(__file__).resolve().parents[2] / "DATA"
+
+
+def fingerprint_file(path: Path) -> Dict:
+    """
+    Content fingerprint of one data file.
+
+    The whole file is hashed (blake2b runs at about 1 GB/s, and only files
+    whose mtime or size moved are fingerprinted at all).
+
+    Returns:
+        Dict with hash, rows (parquet only, else None), size, mtime_ns
+    """
+    stat = path.stat()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(stat.st_size).encode())
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    rows = _parquet_num_rows(path) if path.suffix == ".parquet" else None
+
+    return {
+        "hash": digest.hexdigest(),
+        "rows": rows,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _parquet_num_rows(path: Path) -> Optional[int]:
+    try:
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    except Exception:
+        return None
+
+
+def load_manifest(data_root: Path = DEFAULT_DATA_ROOT) -> Dict:
+    """Read the manifest (empty manifest if missing or unreadable)."""
+    manifest_path = Path(data_root) / MANIFEST_NAME
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest.setdefault("datasets", {})
+        manifest.setdefault("version", 0)
+        return manifest
+    except FileNotFoundError:
+        return {"version": 0, "datasets": {}}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Cannot read data version manifest {manifest_path}: {e}")
+        return {"version": 0, "datasets": {}}
+
+
+@contextmanager
+def _manifest_lock(data_root: Path):
+    """Exclusive inter-process lock around a manifest update (blocks until free)."""
+    lock_path = Path(data_root) / LOCK_NAME
+    with open(lock_path, "a+b") as lock_file:
+        if os.name == "nt":
+            import msvcrt
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10s; keep waiting
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _iter_tracked_files(data_root: Path) -> Iterable[Path]:
+    for rel_dir in TRACKED_DIRS:
+        base = data_root / rel_dir
+        if not base.exists():
+            continue
+        for path in base.rglob("*"):
+            if path.suffix in TRACKED_SUFFIXES and path.is_file():
+                yield path
+
+
+def record_data_versions(
+    paths: Optional[Iterable[Path]] = None,
+    data_root: Path = DEFAULT_DATA_ROOT
+) -> Dict[str, Dict]:
+    """
+    Update the manifest for changed data files.
+
+    Args:
+        paths: Files written by the step (default: scan TRACKED_DIRS; entries
+               of deleted files are dropped only in scan mode)
+        data_root: DATA directory
+
+    Returns:
+        {relative_path: entry} for the datasets whose content changed
+    """
+    data_root = Path(data_root).resolve()
+    scan_mode = paths is None
+    candidates = list(_iter_tracked_files(data_root)) if scan_mode else [Path(p) for p in paths]
+
+    # Load, update and replace under one lock: another writer's bump made
+    # between our read and our write would otherwise be lost
+    with _manifest_lock(data_root):
+        return _update_manifest(data_root, candidates, scan_mode)
+
+
+def _update_manifest(data_root: Path, candidates, scan_mode: bool) -> Dict[str, Dict]:
+    manifest = load_manifest(data_root)
+    datasets = manifest["datasets"]
+
+    now = datetime.now().isoformat(timespec="seconds")
+    changed: Dict[str, Dict] = {}
+    seen = set()
+    dirty = False
+
+    for path in candidates:
+        path = path.resolve()
+        try:
+            rel = path.relative_to(data_root).as_posix()
+        except ValueError:
+            logger.warning(f"Data version manifest: {path} is outside {data_root}, skipped")
+            continue
+        if not path.exists():
+            if datasets.pop(rel, None) is not None:
+                changed[rel] = {}
+            continue
+        seen.add(rel)
+
+        previous = datasets.get(rel)
+        stat = path.stat()
+        if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+            continue
+
+        entry = fingerprint_file(path)
+        if previous and previous.get("hash") == entry["hash"]:
+            # Rewritten with identical content: keep readers' caches valid
+            previous.update(mtime_ns=entry["mtime_ns"], size=entry["size"])
+            dirty = True
+            continue
+
+        entry["updated_at"] = now
+        datasets[rel] = entry
+        changed[rel] = entry
+
+    if scan_mode:
+        for rel in [r for r in datasets if r not in seen]:
+            datasets.pop(rel)
+            changed[rel] = {}
+
+    if changed:
+        manifest["version"] = int(manifest.get("version", 0)) + 1
+        manifest["updated_at"] = now
+    if changed or dirty:
+        _write_manifest(data_root, manifest)
+
+    if changed:
+        logger.info(f"Data version manifest v{manifest['version']}: {len(changed)} dataset(s) changed")
+    return changed
+
+
+def record_written_files(
+    paths: Iterable[Path],
+    data_root: Path = DEFAULT_DATA_ROOT
+) -> Dict[str, Dict]:
+    """
+    Record files a writer just saved; never raises.
+
+    Files outside ``data_root`` (e.g. test or scratch outputs) are ignored,
+    and manifest errors are logged: a failed bookkeeping step must not fail
+    the pipeline that produced the data.
+
+    Returns:
+        {relative_path: entry} for the datasets whose content changed
+    """
+    data_root = Path(data_root).resolve()
+    inside = []
+    for path in paths:
+        path = Path(path).resolve()
+        if data_root in path.parents:
+            inside.append(path)
+    if not inside:
+        return {}
+    try:
+        return record_data_versions(inside, data_root)
+    except Exception as e:
+        logger.warning(f"Could not record data versions for {[str(p) for p in inside]}: {e}")
+        return {}
+
+
+def _write_manifest(data_root: Path, manifest: Dict) -> None:
+    """Write the manifest atomically (tmp file + rename)."""
+    manifest_path = data_root / MANIFEST_NAME
+    tmp_path = manifest_path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+class DataVersionWatcher:
+    """
+    Cheap reader-side view of the manifest.
+
+    ``get_token(rel_path)`` returns the dataset's content hash, re-reading the
+    manifest only when the manifest file's mtime changed (one stat per call).
+    Returns None for datasets not tracked by the manifest, so callers can fall
+    back to their own freshness check.
+    """
+
+    def __init__(self, data_root: Path = DEFAULT_DATA_ROOT):
+        self.data_root = Path(data_root).resolve()
+        self.manifest_path = self.data_root / MANIFEST_NAME
+        self._manifest_mtime_ns: Optional[int] = None
+        self._datasets: Dict[str, Dict] = {}
+        self.version = 0
+
+    def refresh(self) -> bool:
+        """Reload the manifest if it changed. Returns True when reloaded."""
+        try:
+            mtime_ns = self.manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        if mtime_ns == self._manifest_mtime_ns:
+            return False
+        manifest = load_manifest(self.data_root)
+        self._datasets = manifest["datasets"]
+        self.version = manifest["version"]
+        self._manifest_mtime_ns = mtime_ns
+        return True
+
+    def relative_key(self, path: Path) -> Optional[str]:
+        """Manifest key of an absolute path (None if outside DATA)."""
+        try:
+            return Path(path).resolve().relative_to(self.data_root).as_posix()
+        except ValueError:
+            return None
+
+    def get_token(self, rel_path: str) -> Optional[str]:
+        """Content hash of a dataset, or None if untracked."""
+        self.refresh()
+        entry = self._datasets.get(rel_path)
+        return entry.get("hash") if entry else None
+
+
+def main():
+    """CLI: rescan DATA and update the manifest."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Update DATA/.data_versions.json")
+    parser.add_argument("paths", nargs="*", help="Files to record (default: scan DATA)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    changed = record_data_versions(paths=args.paths or None)
+    for rel in sorted(changed):
+        print(f"  {'removed' if not changed[rel] else 'updated'}: {rel}")
+
+
+if __name__ == "__main__":
+    main()
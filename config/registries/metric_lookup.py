@@ -11,6 +11,14 @@ Features:
 - Get calculated metric formulas
 - Validate metric dependencies
 
+Indexes (built once, cached as a pickle snapshot):
+- code → definition and (entity, code) → definition maps
+- Inverted index of diacritic-folded name tokens per language
+  ("Lợi nhuận" → ["loi", "nhuan"]), used by search() for prefix and
+  multi-word queries and to narrow search_by_name() candidates
+- The snapshot (.cache/registries/) is keyed by the source files' path,
+  size and mtime, so edits to the JSON files rebuild it automatically
+
 Usage:
     from PROCESSORS.core.registries.metric_lookup import MetricRegistry
 
@@ -24,6 +32,9 @@ Usage:
     results = registry.search_by_name("lợi nhuận")
     # [{'code': 'CIS_20', ...}, {'code': 'CIS_62', ...}]
 
+    # Token search (case/diacritic-insensitive, word prefixes)
+    results = registry.search("loi nhuan sau thue", entity_type="COMPANY")
+
     # Get calculated metric formula
     roe_formula = registry.get_calculated_metric_formula("roe")
     # {'formula': '(net_profit / total_equity) * 100', ...}
@@ -32,9 +43,15 @@ Author: Claude Code
 Date: 2025-12-05
 """
 
+import bisect
 import json
+import os
+import pickle
+import re
+import unicodedata
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -47,11 +64,39 @@ def find_project_root() -> Path:
         if current.name in ['Vietnam_dashboard', 'stock_dashboard']:
             return current
         current = current.parent
-    return Path(__file__).resolve().parents[3]  # From registries/ -> core/ -> PROCESSORS/ -> project root
+    return Path(__file__).resolve().parents[2]  # From registries/ -> config/ -> project root
 
 
 PROJECT_ROOT = find_project_root()
 
+# Pickle snapshot of the loaded registry + indexes (bump when the layout changes)
+SNAPSHOT_VERSION = 1
+DEFAULT_CACHE_DIR = PROJECT_ROOT / ".cache" / "registries"
+
+# Languages with a name index (name_vi, name_en)
+INDEXED_LANGS = ("vi", "en")
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def fold_text(text: str) -> str:
+    """Lowercase and strip Vietnamese diacritics ("Lợi nhuận" → "loi nhuan")."""
+    decomposed = unicodedata.normalize("NFD", str(text).lower())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return stripped.replace("đ", "d")
+
+
+def tokenize(text: str) -> List[str]:
+    """Diacritic-folded word tokens of a name or query."""
+    return _TOKEN_RE.findall(fold_text(text))
+
+
+def _file_key(path: Optional[Path]) -> Optional[Tuple[str, int, int]]:
+    if path is None or not path.exists():
+        return None
+    stat = path.stat()
+    return (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
 
 class MetricRegistry:
     """
@@ -63,9 +108,13 @@ class MetricRegistry:
     - Metric dependencies and validation
     """
 
-    def __init__(self, registry_path: Optional[str] = None):
+    def __init__(self, registry_path: Optional[str] = None, cache_dir: Optional[Path] = None):
         """
         Initialize metric registry. Loads both raw and formula registries.
+
+        Args:
+            registry_path: Combined registry JSON (default: config/metadata)
+            cache_dir: Snapshot directory (default: .cache/registries)
         """
         if registry_path:
              # Legacy support or specific path override (assumes combined file)
@@ -92,10 +141,30 @@ class MetricRegistry:
                 else:
                      raise FileNotFoundError(f"Metric registry not found at {self.raw_registry_path}")
 
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        source_key = (
+            SNAPSHOT_VERSION,
+            _file_key(self.raw_registry_path),
+            _file_key(self.formula_registry_path),
+        )
+        if not self._load_snapshot(source_key):
+            self._load_json()
+            self._build_indexes()
+            self._save_snapshot(source_key)
+        self._prefix_cache: Dict[Tuple[str, str], Set[int]] = {}
+
+        logger.info(f"Loaded metric registry v{self.registry.get('version', 'unknown')}")
+        logger.info(f"  Calculated metrics: {len(self.formulas)}")
+
+    # ------------------------------------------------------------------
+    # Loading / indexes
+    # ------------------------------------------------------------------
+
+    def _load_json(self):
+        """Parse the raw (and formula) registry JSON files."""
         with open(self.raw_registry_path, 'r', encoding='utf-8') as f:
             self.registry = json.load(f)
 
-        # 2. Load Formula Registry (if distinct)
         self.formulas = {}
         if self.formula_registry_path and self.formula_registry_path.exists():
             with open(self.formula_registry_path, 'r', encoding='utf-8') as f:
@@ -106,8 +175,117 @@ class MetricRegistry:
             # If using combined file, formulas are inside 'calculated_metrics' key
             self.formulas = self.registry.get("calculated_metrics", {})
 
-        logger.info(f"Loaded metric registry v{self.registry.get('version', 'unknown')}")
-        logger.info(f"  Calculated metrics: {len(self.formulas)}")
+    def _build_indexes(self):
+        """
+        Flatten the registry into lookup maps and name indexes.
+
+        Metrics are numbered in registry order (entity → category → code);
+        each entity occupies one contiguous position range, so entity filters
+        are range checks on posting lists.
+        """
+        self._metrics: List[Dict] = []
+        self._entity_spans: Dict[str, Tuple[int, int]] = {}
+        self._by_code: Dict[str, Dict] = {}
+        self._by_entity_code: Dict[Tuple[str, str], Dict] = {}
+
+        for entity_name, entity_data in self.registry["entity_types"].items():
+            start = len(self._metrics)
+            for category_name, metrics in entity_data.items():
+                for code, metric in metrics.items():
+                    self._metrics.append(metric)
+                    # First occurrence wins, as in the nested-loop lookup
+                    self._by_code.setdefault(code, metric)
+                    self._by_entity_code.setdefault((entity_name, code), metric)
+            self._entity_spans[entity_name] = (start, len(self._metrics))
+
+        self._names_lower: Dict[str, List[str]] = {}
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._tokens: Dict[str, List[str]] = {}
+        for lang in INDEXED_LANGS:
+            names = [str(m.get(f"name_{lang}", "") or "").lower() for m in self._metrics]
+            postings: Dict[str, List[int]] = {}
+            for position, name in enumerate(names):
+                for token in set(tokenize(name)):
+                    postings.setdefault(token, []).append(position)
+            self._names_lower[lang] = names
+            self._postings[lang] = postings
+            self._tokens[lang] = sorted(postings)
+
+    def _snapshot_path(self) -> Path:
+        return self.cache_dir / f"{self.raw_registry_path.stem}.pkl"
+
+    def _load_snapshot(self, source_key) -> bool:
+        """Restore registry + indexes from the snapshot if it matches the sources."""
+        path = self._snapshot_path()
+        try:
+            with open(path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable registry snapshot {path}: {e}")
+            return False
+        if snapshot.get("source_key") != source_key:
+            return False
+        self.__dict__.update(snapshot["state"])
+        return True
+
+    def _save_snapshot(self, source_key):
+        """Write the snapshot atomically; failures only cost the next load."""
+        state_keys = (
+            "registry", "formulas", "_metrics", "_entity_spans", "_by_code",
+            "_by_entity_code", "_names_lower", "_postings", "_tokens",
+        )
+        snapshot = {
+            "source_key": source_key,
+            "state": {key: self.__dict__[key] for key in state_keys},
+        }
+        path = self._snapshot_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not write registry snapshot {path}: {e}")
+
+    def _prefix_positions(self, lang: str, prefix: str) -> Set[int]:
+        """Positions of metrics with a name token starting with ``prefix``."""
+        key = (lang, prefix)
+        cached = self._prefix_cache.get(key)
+        if cached is None:
+            tokens = self._tokens[lang]
+            postings = self._postings[lang]
+            cached = set()
+            i = bisect.bisect_left(tokens, prefix)
+            while i < len(tokens) and tokens[i].startswith(prefix):
+                cached.update(postings[tokens[i]])
+                i += 1
+            self._prefix_cache[key] = cached
+        return cached
+
+    def _match_tokens(self, lang: str, tokens: List[str]) -> Set[int]:
+        """Positions whose name has, for every token, a word starting with it."""
+        positions = None
+        for token in sorted(set(tokens), key=len, reverse=True):
+            matches = self._prefix_positions(lang, token)
+            positions = set(matches) if positions is None else positions & matches
+            if not positions:
+                break
+        return positions or set()
+
+    def _entity_range(self, entity_type: Optional[str]) -> Tuple[int, int]:
+        if entity_type is None:
+            return 0, len(self._metrics)
+        # Unknown entity types raise KeyError, as the dict lookup always did
+        if entity_type not in self._entity_spans:
+            raise KeyError(entity_type)
+        return self._entity_spans[entity_type]
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
 
     def get_metric(self, code: str, entity_type: Optional[str] = None) -> Optional[Dict]:
         """
@@ -133,23 +311,12 @@ class MetricRegistry:
             return None
 
         if entity_type:
-            # Search in specific entity type
-            entity_data = self.registry["entity_types"].get(entity_type)
-            if not entity_data:
+            if entity_type not in self._entity_spans:
                 logger.warning(f"Unknown entity_type: {entity_type}")
                 return None
+            return self._by_entity_code.get((entity_type, code))
 
-            for category_name, metrics in entity_data.items():
-                if code in metrics:
-                    return metrics[code]
-        else:
-            # Search all entity types
-            for entity_name, entity_data in self.registry["entity_types"].items():
-                for category_name, metrics in entity_data.items():
-                    if code in metrics:
-                        return metrics[code]
-
-        return None
+        return self._by_code.get(code)
 
     def search_by_name(self, keyword: str, lang: str = "vi", entity_type: Optional[str] = None) -> List[Dict]:
         """
@@ -171,25 +338,63 @@ class MetricRegistry:
             CIS_20: Lợi nhuận gộp...
             CIS_62: Lợi nhuận sau thuế...
         """
-        results = []
-        name_field = f"name_{lang}"
         keyword_lower = keyword.lower()
-
-        # Determine which entities to search
-        if entity_type:
-            entities_to_search = {entity_type: self.registry["entity_types"][entity_type]}
+        start, stop = self._entity_range(entity_type)
+
+        if lang not in self._names_lower:
+            # No index for this language: plain scan
+            name_field = f"name_{lang}"
+            return [
+                metric for metric in self._metrics[start:stop]
+                if keyword_lower in str(metric.get(name_field, "")).lower()
+            ]
+
+        names = self._names_lower[lang]
+        tokens = tokenize(keyword_lower)
+        if len(tokens) > 1:
+            # Every word after the first starts a word of a matching name
+            # (the first one may start mid-word), so the index narrows the
+            # candidates; the substring check keeps the exact semantics.
+            candidates = sorted(p for p in self._match_tokens(lang, tokens[1:]) if start <= p < stop)
         else:
-            entities_to_search = self.registry["entity_types"]
+            candidates = range(start, stop)
 
-        # Search through metrics
-        for entity_name, entity_data in entities_to_search.items():
-            for category_name, metrics in entity_data.items():
-                for code, metric in metrics.items():
-                    metric_name = metric.get(name_field, "").lower()
-                    if keyword_lower in metric_name:
-                        results.append(metric)
+        return [self._metrics[p] for p in candidates if keyword_lower in names[p]]
+
+    def search(self, query: str, entity_type: Optional[str] = None, lang: Optional[str] = None,
+               limit: Optional[int] = None) -> List[Dict]:
+        """
+        Token search over metric names, ignoring case and diacritics
+
+        Every query word must be the prefix of a word in the name, in any
+        order ("loi nhuan sau" matches "Lợi nhuận sau thuế").
+
+        Args:
+            query: Search words (Vietnamese with or without diacritics, or English)
+            entity_type: Filter by entity type (optional)
+            lang: 'vi' or 'en' (default: both)
+            limit: Maximum number of results
+
+        Returns:
+            Matching metric definitions in registry order
 
-        return results
+        Example:
+            >>> registry = MetricRegistry()
+            >>> [m['code'] for m in registry.search("loi nhuan sau thue", "COMPANY")][:2]
+            ['CIS_60', 'CIS_62']
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        start, stop = self._entity_range(entity_type)
+
+        positions: Set[int] = set()
+        for lang_code in ([lang] if lang else INDEXED_LANGS):
+            positions |= self._match_tokens(lang_code, tokens)
+        ordered = sorted(p for p in positions if start <= p < stop)
+        if limit is not None:
+            ordered = ordered[:limit]
+        return [self._metrics[p] for p in ordered]
 
     def get_calculated_metric_formula(self, metric_name: str) -> Optional[Dict]:
         """
@@ -379,9 +584,10 @@ class MetricRegistry:
 
 
 # Convenience function for quick access
+@lru_cache(maxsize=None)
 def get_registry(registry_path: Optional[str] = None) -> MetricRegistry:
     """
-    Get global metric registry instance
+    Get global metric registry instance (one per registry path)
 
     Args:
         registry_path: Path to registry JSON (default: auto-detect)
@@ -12,6 +12,10 @@ Features:
 - Get calculator class for ticker
 - Get peers (same sector tickers)
 - Search sectors
+- Map a whole Series/array of tickers to sectors / entity types
+
+Reverse indexes (entity → tickers, ticker → peers, EN → VN sector names)
+are built once at load, so lookups inside per-ticker loops are dict hits.
 
 Usage:
     from PROCESSORS.core.registries.sector_lookup import SectorRegistry
@@ -26,15 +30,22 @@ Usage:
     peers = registry.get_peers("VCB")
     # ['ACB', 'TPB', 'MBB', ...]
 
+    # Vectorized mapping
+    df['sector'] = registry.map_tickers(df['symbol'], 'sector', default='Unknown')
+    df['entity_type'] = registry.map_entity_types(df['symbol'])
+
 Author: Claude Code
 Date: 2025-12-05
 """
 
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 import logging
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -85,10 +96,52 @@ class SectorRegistry:
         with open(registry_path, 'r', encoding='utf-8') as f:
             self.registry = json.load(f)
 
+        self._build_indexes()
+
         logger.info(f"Loaded sector registry v{self.registry['version']}")
         logger.info(f"  Total tickers: {self.registry['metadata']['total_tickers']}")
         logger.info(f"  Total sectors: {self.registry['metadata']['total_sectors']}")
 
+    def _build_indexes(self):
+        """Materialize the reverse lookups served by the getters below."""
+        sectors = self.registry["sectors"]
+        ticker_mapping = self.registry["ticker_mapping"]
+
+        # Entity type → sorted unique tickers of its sectors
+        self._entity_tickers: Dict[str, List[str]] = {}
+        for entity_type, entity_info in self.registry["entity_types"].items():
+            tickers = set()
+            for sector_name in entity_info.get("sectors", []):
+                tickers.update((sectors.get(sector_name) or {}).get("tickers", []))
+            self._entity_tickers[entity_type] = sorted(tickers)
+
+        # Ticker → same-sector tickers (excluding itself)
+        self._peers: Dict[str, List[str]] = {}
+        for ticker, info in ticker_mapping.items():
+            sector_tickers = (sectors.get(info.get("sector")) or {}).get("tickers", [])
+            self._peers[ticker] = [t for t in sector_tickers if t != ticker]
+
+        # English → Vietnamese sector name (first match, like the former scan)
+        self._sector_vn_by_en: Dict[str, str] = {}
+        for sector_vn, info in sectors.items():
+            if info.get("sector_en") is not None:
+                self._sector_vn_by_en.setdefault(info["sector_en"], sector_vn)
+
+        self._sector_names_lower = [(name.lower(), name) for name in sectors]
+        self._field_maps: Dict[str, Dict[str, Any]] = {}
+
+    def _ticker_field_map(self, field: str) -> Dict[str, Any]:
+        """Ticker → value of one ticker_mapping field (built on first use)."""
+        lookup = self._field_maps.get(field)
+        if lookup is None:
+            lookup = {
+                ticker: info[field]
+                for ticker, info in self.registry["ticker_mapping"].items()
+                if field in info
+            }
+            self._field_maps[field] = lookup
+        return lookup
+
     def get_ticker(self, ticker: str) -> Optional[Dict]:
         """
         Get complete information for a ticker
@@ -172,11 +225,7 @@ class SectorRegistry:
             >>> registry = SectorRegistry()
             >>> bank_tickers = registry.get_tickers_by_entity_type("BANK")
         """
-        sectors = self.get_sectors_by_entity(entity_type)
-        all_tickers = []
-        for sector in sectors:
-            all_tickers.extend(self.get_tickers_by_sector(sector))
-        return sorted(list(set(all_tickers)))
+        return list(self._entity_tickers.get(entity_type, []))
 
     def get_tickers_by_sector(self, sector_name: str) -> List[str]:
         """
@@ -306,17 +355,11 @@ class SectorRegistry:
             >>> print(peers[:5])
             ['ACB', 'MBB', 'TCB', 'VPB', ...]  # Other banks
         """
-        ticker_info = self.get_ticker(ticker)
-        if not ticker_info:
+        if ticker not in self._peers:
             return []
-
-        sector = ticker_info["sector"]
-        all_tickers = self.get_tickers_by_sector(sector)
-
-        if exclude_self and ticker in all_tickers:
-            all_tickers = [t for t in all_tickers if t != ticker]
-
-        return all_tickers
+        if exclude_self:
+            return list(self._peers[ticker])
+        return self.get_tickers_by_sector(self.registry["ticker_mapping"][ticker]["sector"])
 
     def search_sectors(self, keyword: str) -> List[Dict]:
         """
@@ -335,17 +378,13 @@ class SectorRegistry:
             ...     print(f"{sector['name']}: {sector['count']} tickers")
             Xây dựng và Vật liệu: 76 tickers
         """
-        results = []
         keyword_lower = keyword.lower()
-
-        for sector_name, sector_info in self.registry["sectors"].items():
-            if keyword_lower in sector_name.lower():
-                results.append({
-                    "name": sector_name,
-                    **sector_info
-                })
-
-        return results
+        sectors = self.registry["sectors"]
+        return [
+            {"name": sector_name, **sectors[sector_name]}
+            for name_lower, sector_name in self._sector_names_lower
+            if keyword_lower in name_lower
+        ]
 
     def get_all_sectors(self, language: str = "vi") -> List[str]:
         """
@@ -398,10 +437,7 @@ class SectorRegistry:
         Returns:
             Vietnamese sector name, or original if not found
         """
-        for sector_vn, info in self.registry["sectors"].items():
-            if info.get('sector_en') == sector_en:
-                return sector_vn
-        return sector_en
+        return self._sector_vn_by_en.get(sector_en, sector_en)
 
     def get_all_entity_types(self) -> List[str]:
         """
@@ -448,14 +484,54 @@ class SectorRegistry:
         Returns:
             Dict mapping ticker -> industry_code (e.g., {'VCB': 'BANK', 'FPT': 'IT'})
         """
-        result = {}
-        ticker_mapping = self.registry.get("ticker_mapping", {})
-        for ticker, info in ticker_mapping.items():
-            industry_code = info.get("industry_code")
-            if industry_code:
-                result[ticker] = industry_code
+        return {
+            ticker: industry_code
+            for ticker, industry_code in self._ticker_field_map("industry_code").items()
+            if industry_code
+        }
+
+    def map_tickers(self, tickers, field: str = "sector", default: Any = None):
+        """
+        Map many tickers to one ticker_mapping field in a single call
+
+        Each distinct ticker is looked up once (factorize + take), so a
+        column of millions of daily rows costs one dict hit per symbol.
+
+        Args:
+            tickers: Series, array or list of tickers
+            field: ticker_mapping field (sector, entity_type, industry_code, sector_en, exchange)
+            default: Value for unknown tickers / tickers without the field
+
+        Returns:
+            Series aligned to ``tickers`` (for Series input), else object ndarray
+
+        Example:
+            >>> registry = SectorRegistry()
+            >>> df['sector'] = registry.map_tickers(df['symbol'], 'sector', default='Unknown')
+        """
+        lookup = self._ticker_field_map(field)
+        is_series = isinstance(tickers, pd.Series)
+        values = tickers.to_numpy() if is_series else np.asarray(tickers, dtype=object)
+
+        codes, uniques = pd.factorize(values)
+        # Trailing default: code -1 (missing ticker) picks the last element
+        mapped = np.empty(len(uniques) + 1, dtype=object)
+        mapped[:-1] = [lookup.get(ticker, default) for ticker in uniques]
+        mapped[-1] = default
+        result = mapped[codes]
+
+        if is_series:
+            return pd.Series(result, index=tickers.index, name=field)
         return result
 
+    def map_sector_codes(self, tickers, default: Any = None):
+        """Industry code (e.g. 'BANK', 'IT') for many tickers; see map_tickers."""
+        return self.map_tickers(tickers, "industry_code", default)
+
+    def map_entity_types(self, tickers, default: Any = None):
+        """Entity type (COMPANY, BANK, ...) for many tickers; see map_tickers."""
+        return self.map_tickers(tickers, "entity_type", default)
+
     def __repr__(self) -> str:
         """String representation"""
         stats = self.get_statistics()
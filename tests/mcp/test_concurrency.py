@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test Suite for heavy tool execution (run_in_worker)
+===================================================
+
+Tests for:
+- Wrapped tools keep their signature and run off the event loop
+- Timeouts return an error message instead of blocking
+- warm_up builds indexes on the pool at startup
+"""
+
+import asyncio
+import inspect
+import sys
+import time
+from pathlib import Path
+
+# Add MCP server root to path
+mcp_root = Path(__file__).resolve().parents[2] / "MCP_SERVER"
+sys.path.insert(0, str(mcp_root))
+
+from bsc_mcp.utils.concurrency import run_in_worker
+
+
+@run_in_worker()
+def slow_tool(ticker: str, limit: int = 30) -> str:
+    """Slow blocking tool."""
+    time.sleep(0.2)
+    return f"{ticker}:{limit}"
+
+
+@run_in_worker(timeout=0.05)
+def stuck_tool() -> str:
+    """Tool that exceeds its timeout."""
+    time.sleep(0.3)
+    return "done"
+
+
+def test_wrapped_tool_concurrency():
+    """Test 1: Signature kept; blocking calls overlap instead of serializing"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Worker pool execution")
+    print("=" * 60)
+
+    assert inspect.iscoroutinefunction(slow_tool)
+    assert list(inspect.signature(slow_tool).parameters) == ['ticker', 'limit']
+    assert slow_tool.__doc__ == "Slow blocking tool."
+
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(slow_tool("VCB"), slow_tool("FPT", limit=5))
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(run())
+    assert results == ["VCB:30", "FPT:5"]
+    assert elapsed < 0.35
+    print(f"✓ Two 0.2s calls finished in {elapsed:.2f}s")
+
+
+def test_wrapped_tool_timeout():
+    """Test 2: Timeout returns a message"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Timeout")
+    print("=" * 60)
+
+    result = asyncio.run(stuck_tool())
+    assert "timed out" in result
+    print("✓ Timeout reported")
+
+
+def test_warm_up_runs_on_pool():
+    """Test 3: Warm-up builders run on worker threads; failures are logged"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Warm-up")
+    print("=" * 60)
+
+    import threading
+    from bsc_mcp.utils.concurrency import warm_up
+
+    threads = []
+
+    def build_index():
+        threads.append(threading.current_thread().name)
+
+    def missing_data():
+        raise FileNotFoundError("no fundamentals")
+
+    futures = warm_up(build_index, missing_data)
+    assert [f.result(timeout=5) for f in futures] == [None, None]
+    assert threads and threads[0].startswith("bsc-tool")
+    print("✓ Builders ran on the pool without raising")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the MCP DataLoader cache
+=======================================
+
+Tests for:
+- LRU eviction under the memory ceiling, hit/miss counters
+- Single-flight loading for concurrent misses
+- Per-dataset TTL overrides
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add MCP server root to path
+mcp_root = Path(__file__).resolve().parents[2] / "MCP_SERVER"
+sys.path.insert(0, str(mcp_root))
+
+from bsc_mcp.config import Config
+from bsc_mcp.services import data_loader as data_loader_module
+from bsc_mcp.services.data_loader import DataLoader
+
+
+def _make_loader(tmp_path, monkeypatch, max_mb: int = 2048) -> DataLoader:
+    monkeypatch.setenv("DATA_ROOT", str(tmp_path))
+    monkeypatch.setenv("CACHE_MAX_MB", str(max_mb))
+    for name in ("a", "b", "c"):
+        pd.DataFrame({'x': np.arange(100_000, dtype='float64')}).to_parquet(tmp_path / f"{name}.parquet")
+    return DataLoader(Config())
+
+
+def test_lru_eviction_and_counters(tmp_path, monkeypatch):
+    """Test 1: Least recently used dataset is evicted at the ceiling"""
+    print("\n" + "=" * 60)
+    print("TEST 1: LRU eviction")
+    print("=" * 60)
+
+    loader = _make_loader(tmp_path, monkeypatch, max_mb=2)  # ~0.8 MB per frame
+    loader._load_cached("a", "a.parquet")
+    loader._load_cached("b", "b.parquet")
+    loader._load_cached("a", "a.parquet")  # a is now most recent
+    loader._load_cached("c", "c.parquet")  # evicts b
+
+    stats = loader.get_cache_stats()
+    assert set(stats['datasets']) == {"a", "c"}
+    assert stats['hits'] == 1
+    assert stats['misses'] == 3
+    assert stats['evictions'] == 1
+    assert stats['bytes'] <= stats['max_bytes']
+    print("✓ LRU eviction correct")
+
+
+def test_single_flight_loading(tmp_path, monkeypatch):
+    """Test 2: Concurrent misses read the file once"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Single-flight loading")
+    print("=" * 60)
+
+    loader = _make_loader(tmp_path, monkeypatch)
+    reads = []
+    real_read = pd.read_parquet
+
+    def slow_read(path, *args, **kwargs):
+        reads.append(path)
+        threading.Event().wait(0.05)
+        return real_read(path, *args, **kwargs)
+
+    monkeypatch.setattr(data_loader_module.pd, "read_parquet", slow_read)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(loader._load_cached("a", "a.parquet")))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(reads) == 1
+    assert all(df is results[0] for df in results)
+    print("✓ One read for 8 concurrent callers")
+
+
+def test_per_dataset_ttl(tmp_path, monkeypatch):
+    """Test 3: TTL overrides apply per cache key"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Per-dataset TTL")
+    print("=" * 60)
+
+    loader = _make_loader(tmp_path, monkeypatch)
+    assert loader.config.get_cache_ttl("combined_alerts") == 60
+    assert loader.config.get_cache_ttl("bank_fundamentals") == 3600
+    assert loader.config.get_cache_ttl("unknown") == loader.config.CACHE_TTL
+
+    loader._load_cached("combined_alerts", "a.parquet")
+    loader._cache_timestamps["combined_alerts"] -= 120
+    assert not loader._is_cache_valid("combined_alerts", "a.parquet")
+
+    loader._load_cached("bank_fundamentals", "b.parquet")
+    loader._cache_timestamps["bank_fundamentals"] -= 120
+    assert loader._is_cache_valid("bank_fundamentals", "b.parquet")
+    print("✓ TTL overrides applied")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test Suite for OHLCVSymbolReader (MCP raw OHLCV tool)
+=====================================================
+
+Tests for:
+- Symbol-indexed reads match the full-scan "last N bars" result
+- Unsorted files fall back to the symbol-column index
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add MCP server root to path
+mcp_root = Path(__file__).resolve().parents[2] / "MCP_SERVER"
+sys.path.insert(0, str(mcp_root))
+
+from bsc_mcp.services.ohlcv_reader import OHLCVSymbolReader
+
+
+def _make_ohlcv() -> pd.DataFrame:
+    dates = pd.bdate_range("2023-01-02", periods=120)
+    frames = []
+    for i, symbol in enumerate(["AAA", "BBB", "CCC", "DDD", "EEE"]):
+        n = 20 + i * 25
+        frames.append(pd.DataFrame({
+            'symbol': symbol,
+            'date': dates[-n:].date,
+            'open': range(n),
+            'high': range(n),
+            'low': range(n),
+            'close': [float(x) for x in range(n)],
+            'volume': 1000,
+        }))
+    return pd.concat(frames).sort_values(['symbol', 'date']).reset_index(drop=True)
+
+
+def _full_scan(path: Path, symbol: str, limit: int) -> pd.DataFrame:
+    df = pd.read_parquet(path)
+    df['date'] = pd.to_datetime(df['date'])
+    df = df[df['symbol'] == symbol].sort_values('date').tail(limit)
+    return df.reset_index(drop=True)
+
+
+def test_symbol_index_matches_full_scan(tmp_path):
+    """Test 1: Row-group statistics index returns the same bars as a full scan"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Symbol index vs full scan")
+    print("=" * 60)
+
+    path = tmp_path / "OHLCV_mktcap.parquet"
+    _make_ohlcv().to_parquet(path, index=False, row_group_size=17)
+    reader = OHLCVSymbolReader(path, tail_bars=30)
+
+    for symbol in ["AAA", "BBB", "CCC", "DDD", "EEE"]:
+        for limit in (1, 30, 60, 500):
+            expected = _full_scan(path, symbol, limit)
+            result = reader.get_bars(symbol, limit=limit)
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    assert reader._statistics_index
+    assert reader.get_bars("ZZZ", limit=10).empty
+    print("✓ Symbol-indexed reads match")
+
+
+def test_unsorted_file_falls_back(tmp_path):
+    """Test 2: Unsorted row groups use the symbol-column index"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Unsorted file fallback")
+    print("=" * 60)
+
+    path = tmp_path / "OHLCV_mktcap.parquet"
+    _make_ohlcv().sample(frac=1, random_state=7).to_parquet(path, index=False, row_group_size=17)
+    reader = OHLCVSymbolReader(path, tail_bars=30)
+
+    expected = _full_scan(path, "DDD", 60)
+    result = reader.get_bars("DDD", limit=60)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert not reader._statistics_index
+    print("✓ Fallback index matches")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test Suite for SymbolPartitions (technical MCP tools)
+=====================================================
+
+Tests for:
+- Per-ticker slices match filter + sort on the unsorted frame; limit <= 0
+- Latest row per symbol; latest n rows cover the market-wide top n by date
+- DataLoader keeps technical datasets pre-sorted with partitions
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add MCP server root to path
+mcp_root = Path(__file__).resolve().parents[2] / "MCP_SERVER"
+sys.path.insert(0, str(mcp_root))
+
+from bsc_mcp.config import Config
+from bsc_mcp.services.data_loader import DataLoader
+from bsc_mcp.services.partitions import SymbolPartitions, sort_by_symbol_date
+
+
+def _make_technical() -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    dates = pd.bdate_range("2024-01-01", periods=40)
+    frames = [
+        pd.DataFrame({'symbol': symbol, 'date': dates[: 10 + i * 10], 'close': rng.random(10 + i * 10)})
+        for i, symbol in enumerate(["VCB", "FPT", "HPG"])
+    ]
+    return pd.concat(frames).sample(frac=1, random_state=5).reset_index(drop=True)
+
+
+def test_partition_slices():
+    """Test 1: Slices equal filter + sort"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Partition slices")
+    print("=" * 60)
+
+    raw = _make_technical()
+    parts = SymbolPartitions(sort_by_symbol_date(raw))
+
+    assert parts.symbols() == ["FPT", "HPG", "VCB"]
+    for symbol in ["FPT", "HPG", "VCB"]:
+        expected = raw[raw['symbol'] == symbol].sort_values('date').tail(7).reset_index(drop=True)
+        pd.testing.assert_frame_equal(parts.get(symbol, limit=7).reset_index(drop=True), expected)
+        assert parts.latest_row(symbol)['date'] == expected['date'].iloc[-1]
+
+    assert parts.get("XXX").empty
+    # Non-positive limits keep no rows instead of an inverted slice
+    assert parts.get("FPT", limit=0).empty
+    assert parts.get("FPT", limit=-3).empty
+    assert len(parts.get("FPT", limit=10_000)) == len(raw[raw['symbol'] == "FPT"])
+    assert parts.latest_row("XXX") is None
+
+    latest = parts.latest()
+    assert list(latest['symbol']) == ["FPT", "HPG", "VCB"]
+    assert list(latest['date']) == [raw[raw['symbol'] == s]['date'].max() for s in ["FPT", "HPG", "VCB"]]
+    print("✓ Slices and latest rows correct")
+
+
+def test_loader_partitions(tmp_path, monkeypatch):
+    """Test 2: DataLoader sorts technical data at load and reuses the partitions"""
+    print("\n" + "=" * 60)
+    print("TEST 2: DataLoader partitions")
+    print("=" * 60)
+
+    monkeypatch.setenv("DATA_ROOT", str(tmp_path))
+    config = Config()
+    path = tmp_path / config.TECHNICAL_BASIC_PATH
+    path.parent.mkdir(parents=True)
+    _make_technical().to_parquet(path, index=False)
+
+    loader = DataLoader(config)
+    parts = loader.get_partitions("technical_basic")
+    assert parts.frame is loader.get_technical_basic()
+    assert loader.get_partitions("technical_basic") is parts
+    assert parts.frame['symbol'].is_monotonic_increasing
+    assert loader.get_ticker_index()['HPG']['first_date'] == pd.Timestamp("2024-01-01")
+    print("✓ Partitions cached with the frame")
+
+
+def test_latest_n_covers_market_top():
+    """Test 3: Top n by date from latest(n) equals top n over the full frame"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Market-wide latest rows")
+    print("=" * 60)
+
+    raw = _make_technical()
+    parts = SymbolPartitions(sort_by_symbol_date(raw))
+
+    recent = parts.latest(5)
+    assert len(recent) == 15
+    assert recent.groupby('symbol').size().eq(5).all()
+    assert parts.latest(0).empty
+
+    key = ['date', 'symbol']
+    expected = raw.sort_values(key, ascending=False).head(8).reset_index(drop=True)
+    got = parts.latest(8).sort_values(key, ascending=False).head(8).reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, expected)
+    assert parts.latest() is parts.latest(1)
+    print("✓ latest(n) matches the full-frame top n")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the screener snapshot (bsc_screen_fundamentals)
+==============================================================
+
+Tests for:
+- One row per ticker with the latest quarter and latest PE/PB
+- Vectorized min/max screens (missing metrics excluded)
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add MCP server root to path
+mcp_root = Path(__file__).resolve().parents[2] / "MCP_SERVER"
+sys.path.insert(0, str(mcp_root))
+
+from bsc_mcp.services.screener import build_snapshot, screen_snapshot
+
+
+def _snapshot() -> pd.DataFrame:
+    bank = pd.DataFrame({
+        'symbol': ['VCB', 'VCB', 'ACB'],
+        'sector': ['Ngân hàng'] * 3,
+        'year': [2024, 2024, 2024],
+        'quarter': [2, 1, 2],
+        'roe': [20.0, 18.0, 22.0],
+        'npl_ratio': [1.1, 1.2, 1.4],
+    })
+    company = pd.DataFrame({
+        'symbol': ['FPT', 'FPT', 'VNM', 'VCB'],
+        'sector': ['Công nghệ', 'Công nghệ', 'Thực phẩm', 'Ngân hàng'],
+        'year': [2023, 2024, 2024, 2024],
+        'quarter': [4, 1, 1, 1],
+        'roe': [25.0, 27.0, 30.0, 99.0],
+        'roa': [12.0, 13.0, 18.0, 1.0],
+    })
+    pe = pd.DataFrame({
+        'symbol': ['VCB', 'VCB', 'FPT'],
+        'date': pd.to_datetime(['2024-06-01', '2024-06-02', '2024-06-02']),
+        'pe_ratio': [15.0, 14.0, 22.0],
+    })
+    return build_snapshot([('BANK', bank), ('COMPANY', company)], {'pe_ratio': pe})
+
+
+def test_build_snapshot_latest_rows():
+    """Test 1: Latest quarter per ticker, first entity type wins"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Snapshot contents")
+    print("=" * 60)
+
+    snapshot = _snapshot().set_index('symbol')
+
+    assert list(snapshot.index) == ['ACB', 'FPT', 'VCB', 'VNM']
+    assert snapshot.loc['VCB', 'entity_type'] == 'BANK'
+    assert snapshot.loc['VCB', 'roe'] == 20.0
+    assert snapshot.loc['VCB', 'pe_ratio'] == 14.0
+    assert snapshot.loc['FPT', 'roe'] == 27.0
+    assert pd.isna(snapshot.loc['VNM', 'pe_ratio'])
+    assert pd.isna(snapshot.loc['FPT', 'npl_ratio'])
+    assert pd.isna(snapshot.loc['VCB', 'pb_ratio'])
+    assert snapshot['sector'].dtype == 'category'
+    print("✓ Snapshot rows correct")
+
+
+def test_screen_snapshot_masks():
+    """Test 2: Min/max filters on arbitrary metrics"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Vectorized screens")
+    print("=" * 60)
+
+    snapshot = _snapshot()
+
+    result = screen_snapshot(snapshot, min_filters={'roe': 21})
+    assert list(result['symbol']) == ['ACB', 'FPT', 'VNM']
+
+    result = screen_snapshot(snapshot, min_filters={'roe': 21}, max_filters={'pe_ratio': 25})
+    assert list(result['symbol']) == ['FPT']
+
+    result = screen_snapshot(snapshot, entity_type='bank', max_filters={'npl_ratio': 1.3})
+    assert list(result['symbol']) == ['VCB']
+
+    assert len(screen_snapshot(snapshot, limit=2)) == 2
+
+    with pytest.raises(KeyError):
+        screen_snapshot(snapshot, min_filters={'not_a_metric': 1})
+    print("✓ Screens correct")
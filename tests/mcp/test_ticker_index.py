@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the MCP DataLoader ticker index
+==============================================
+
+Tests for:
+- Entity type / sector / exchange / data dates in one index
+- Index is reused within a cache generation and rebuilt after a reload
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add MCP server root to path
+mcp_root = Path(__file__).resolve().parents[2] / "MCP_SERVER"
+sys.path.insert(0, str(mcp_root))
+
+from bsc_mcp.config import Config
+from bsc_mcp.services.data_loader import DataLoader
+
+
+def _write(data_root: Path, relative_path: str, df: pd.DataFrame):
+    path = data_root / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(path, index=False)
+
+
+def _make_loader(tmp_path, monkeypatch) -> DataLoader:
+    monkeypatch.setenv("DATA_ROOT", str(tmp_path))
+    config = Config()
+    _write(tmp_path, config.BANK_FUNDAMENTALS_PATH, pd.DataFrame({
+        'symbol': ['VCB', 'VCB', 'ACB'],
+        'sector': ['Ngân hàng'] * 3,
+        'exchange': ['HOSE', 'HOSE', 'HOSE'],
+    }))
+    _write(tmp_path, config.COMPANY_FUNDAMENTALS_PATH, pd.DataFrame({
+        'symbol': ['VNM', 'FPT', 'FPT'],
+        'sector': ['Thực phẩm', 'Công nghệ', 'Công nghệ'],
+        'exchange': ['HOSE', 'HNX', 'HOSE'],
+    }))
+    _write(tmp_path, config.TECHNICAL_BASIC_PATH, pd.DataFrame({
+        'symbol': ['VCB', 'VCB', 'FPT', 'HPG'],
+        'date': pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-03', '2024-01-03']),
+        'close': [90.0, 91.0, 120.0, 25.0],
+    }))
+    return DataLoader(config)
+
+
+def test_ticker_index_contents(tmp_path, monkeypatch):
+    """Test 1: One index answers entity type, sector, exchange and dates"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Ticker index contents")
+    print("=" * 60)
+
+    loader = _make_loader(tmp_path, monkeypatch)
+    index = loader.get_ticker_index()
+
+    assert index['VCB']['entity_type'] == 'BANK'
+    assert index['VCB']['first_date'] == pd.Timestamp('2024-01-02')
+    assert index['VCB']['last_date'] == pd.Timestamp('2024-01-03')
+    assert index['FPT']['exchange'] == 'HOSE'  # latest fundamentals row
+    assert index['VNM']['has_technical'] is False
+    assert index['HPG']['entity_type'] is None
+
+    assert loader.get_ticker_entity_type('acb') == 'BANK'
+    assert loader.get_ticker_entity_type('XXX') is None
+    assert loader.get_available_tickers() == ['FPT', 'HPG', 'VCB']
+    print("✓ Index contents correct")
+
+
+def test_ticker_index_generation(tmp_path, monkeypatch):
+    """Test 2: Index is reused until a source dataset is reloaded"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Ticker index generation")
+    print("=" * 60)
+
+    loader = _make_loader(tmp_path, monkeypatch)
+    first = loader.get_ticker_index()
+    assert loader.get_ticker_index() is first
+
+    loader.clear_cache()
+    rebuilt = loader.get_ticker_index()
+    assert rebuilt is not first
+    assert rebuilt == first
+    print("✓ Index rebuilt only after cache change")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test Suite for BSCCSVAdapter
+============================
+
+Tests for:
+- Vectorized report_date → year/quarter (ISO, other formats, invalid, missing)
+- Vectorized FREQ_CODE/MONTH_IN_PERIOD → lengthReport
+- Date cache reuse across files
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+from PROCESSORS.core.validators.bsc_csv_adapter import BSCCSVAdapter
+
+
+def _bsc_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'SECURITY_CODE': ['ACB', 'ACB', 'VCB', 'VCB', 'FPT', 'FPT', 'HPG', 'HPG'],
+        'REPORT_DATE': ['2024-03-31', '2024-06-30', '2024/09/30', '2024-12-31 00:00:00',
+                        None, 'not a date', '2024-06-30', '2023-12-31'],
+        'FREQ_CODE': ['Q', 'Q', ' q', 'Y', 'M', 'S', 'Q', None],
+        'MONTH_IN_PERIOD': [3, 6, 9.0, 12, np.nan, 6, 5, 12],
+        'CBS_270': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
+    })
+
+
+def test_report_dates():
+    """Test 1: Year/quarter per row, NaN for missing or invalid dates"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Report Dates")
+    print("=" * 60)
+
+    adapted = BSCCSVAdapter().adapt(_bsc_frame())
+    assert adapted['ticker'].tolist() == ['ACB', 'ACB', 'VCB', 'VCB', 'FPT', 'FPT', 'HPG', 'HPG']
+    assert adapted['year'].tolist()[:4] == [2024.0, 2024.0, 2024.0, 2024.0]
+    assert adapted['quarter'].tolist()[:4] == [1.0, 2.0, 3.0, 4.0]
+    assert adapted['year'].isna().tolist() == [False] * 4 + [True, True] + [False] * 2
+    assert adapted['quarter'].tolist()[6:] == [2.0, 4.0]
+
+    # All dates valid: integer columns
+    valid = BSCCSVAdapter().adapt(_bsc_frame().iloc[[0, 1, 6, 7]])
+    assert valid['year'].dtype == np.int64
+    assert valid['quarter'].tolist() == [1, 2, 2, 4]
+
+    # Datetime column (e.g. read from parquet)
+    dated = _bsc_frame().iloc[[0, 7]].assign(REPORT_DATE=lambda d: pd.to_datetime(d['REPORT_DATE']))
+    assert BSCCSVAdapter().adapt(dated)[['year', 'quarter']].values.tolist() == [[2024, 1], [2023, 4]]
+    print("✓ Dates parsed once per distinct value")
+
+
+def test_length_report():
+    """Test 2: lengthReport from FREQ_CODE and MONTH_IN_PERIOD"""
+    print("\n" + "=" * 60)
+    print("TEST 2: lengthReport")
+    print("=" * 60)
+
+    adapter = BSCCSVAdapter()
+    df = _bsc_frame()
+    adapted = adapter.adapt(df)
+    assert adapted['lengthReport'].tolist() == ['Q1', 'Q2', 'Q3', 'YEAR', 'Q1', 'Q2', 'Q1', None]
+
+    expected = [adapter._convert_freq_code(f, m) for f, m in zip(df['FREQ_CODE'], df['MONTH_IN_PERIOD'])]
+    assert adapted['lengthReport'].tolist() == expected
+
+    # No MONTH_IN_PERIOD column: quarterly rows stay undetermined
+    without_months = adapter.adapt(df.drop(columns='MONTH_IN_PERIOD'))
+    assert without_months['lengthReport'].tolist() == [None, None, None, 'YEAR', 'Q1', 'Q2', None, None]
+    print("✓ lengthReport matches the per-row conversion")
+
+
+def test_date_cache():
+    """Test 3: Cached dates are reused by later adapt() calls"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Date Cache")
+    print("=" * 60)
+
+    adapter = BSCCSVAdapter()
+    first = adapter.adapt(_bsc_frame())
+    assert adapter._date_cache['2024-06-30'] == (2024, 2)
+    assert adapter._date_cache['not a date'] is None
+
+    second = adapter.adapt(_bsc_frame())
+    pd.testing.assert_frame_equal(first, second)
+    print("✓ Cache reused across files")
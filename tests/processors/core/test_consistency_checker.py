@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test Suite for ConsistencyChecker
+=================================
+
+Tests for:
+- Price/BVPS check joins every symbol on (symbol, date)
+- Quarter gaps from lagged period keys
+- Conflicting buy/sell signals
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+from PROCESSORS.core.shared.consistency_checker import ConsistencyChecker
+
+
+def test_price_consistency_all_symbols(tmp_path):
+    """Test 1: Every common symbol is checked, first fundamental record per day wins"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Price Consistency")
+    print("=" * 60)
+
+    symbols = [f'S{i:02d}' for i in range(15)]
+    ohlcv = pd.DataFrame({
+        'symbol': symbols,
+        'date': pd.Timestamp('2024-03-29 15:00'),
+        'close': 100.0,
+    })
+    fundamental = pd.DataFrame({
+        'symbol': symbols + ['S14', 'ZZZ'],
+        'report_date': pd.to_datetime(['2024-03-29'] * 17),
+        'bvps': [50.0] * 13 + [np.nan, 5.0, 50.0, 50.0],
+    })
+
+    checker = ConsistencyChecker(data_warehouse_path=tmp_path)
+    result = checker._check_price_consistency(ohlcv, fundamental)
+    assert result['total_checks'] == 15
+    assert result['consistent_count'] == 13
+    # S13 has no BVPS; S14 uses its first record (5.0 → 1900% difference)
+    assert result['inconsistent_count'] == 1
+    detail = result['inconsistencies'][0]
+    assert (detail['symbol'], detail['date'], detail['difference_pct']) == ('S14', pd.Timestamp('2024-03-29').date(), 1900.0)
+
+    report = checker.check_ohlcv_fundamental_consistency(ohlcv, fundamental)
+    assert report['statistics']['common_symbols'] == 15
+    assert report['statistics']['price_consistency']['total_checks'] == 15
+    assert not report['is_consistent']
+    print("✓ All symbols joined on (symbol, date)")
+
+
+def test_quarterly_sequence(tmp_path):
+    """Test 2: Gaps, duplicates and year rollover per symbol"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Quarterly Sequence")
+    print("=" * 60)
+
+    df = pd.DataFrame({
+        'symbol': ['VCB', 'VCB', 'VCB', 'ACB', 'ACB', 'ACB', 'FPT'],
+        'year': [2023, 2024, 2023, 2024, 2024, 2024, 2024],
+        'quarter': [4, 1, 2, 1, 3, 3, 2],
+    })
+    result = ConsistencyChecker(data_warehouse_path=tmp_path)._check_quarterly_sequence(df)
+    assert result['symbols_checked'] == 3
+    assert result['gaps_count'] == 3
+    assert result['gaps'] == [
+        {'symbol': 'VCB', 'expected': '2023Q3', 'actual': '2023Q4'},
+        {'symbol': 'ACB', 'expected': '2024Q2', 'actual': '2024Q3'},
+        {'symbol': 'ACB', 'expected': '2024Q4', 'actual': '2024Q3'},
+    ]
+    print("✓ Gaps found from lagged period keys")
+
+
+def test_signal_consistency(tmp_path):
+    """Test 3: Buy/sell conflicts counted per column pair"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Signal Consistency")
+    print("=" * 60)
+
+    df = pd.DataFrame({
+        'trend_signal': ['buy', 'sell', 'buy', None, 'hold'],
+        'macd_signal': ['sell', 'buy', 'buy', 'sell', 'sell'],
+        'ma_signal': ['sell', None, 'buy', 'buy', 'buy'],
+    })
+    checker = ConsistencyChecker(data_warehouse_path=tmp_path)
+    result = checker._check_signal_consistency(df, list(df.columns))
+    assert result['details'] == [
+        {'signal1': 'trend_signal', 'signal2': 'macd_signal', 'conflicts': 2},
+        {'signal1': 'trend_signal', 'signal2': 'ma_signal', 'conflicts': 1},
+        {'signal1': 'macd_signal', 'signal2': 'ma_signal', 'conflicts': 2},
+    ]
+    assert result['inconsistencies'] == 5
+    assert checker.check_technical_consistency(df)['issues'] == ["Signal inconsistencies: 5"]
+    print("✓ Conflicts counted with masks")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test Suite for MetricRegistry Indexes
+=====================================
+
+Tests for:
+- Flat code / (entity, code) lookups match the nested registry walk
+- search_by_name keeps case-insensitive substring semantics
+- search(): diacritic-folded, prefix and multi-word queries
+- Pickle snapshot reuse and invalidation
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+from config.registries.metric_lookup import MetricRegistry, fold_text, tokenize
+
+
+def _metric(code, entity, name_vi, name_en=''):
+    return {'code': code, 'name_vi': name_vi, 'name_en': name_en, 'entity_type': entity}
+
+
+REGISTRY = {
+    'version': 'test',
+    'entity_types': {
+        'COMPANY': {
+            'INCOME': {
+                'CIS_10': _metric('CIS_10', 'COMPANY', '3. Doanh thu thuần', 'Net revenue'),
+                'CIS_60': _metric('CIS_60', 'COMPANY', '18. Lợi nhuận sau thuế thu nhập doanh nghiệp', 'Net profit'),
+                'CIS_20': _metric('CIS_20', 'COMPANY', '5. Lợi nhuận gộp', 'Gross profit'),
+            },
+            'BALANCE_SHEET': {
+                'CBS_270': _metric('CBS_270', 'COMPANY', 'TỔNG CỘNG TÀI SẢN', 'Total assets'),
+                'SHARED_1': _metric('SHARED_1', 'COMPANY', 'Đầu tư tài chính', 'Investments'),
+            },
+        },
+        'BANK': {
+            'INCOME': {
+                'BIS_22A': _metric('BIS_22A', 'BANK', 'Lợi nhuận thuần từ hoạt động kinh doanh', 'Operating profit'),
+                'SHARED_1': _metric('SHARED_1', 'BANK', 'Chứng khoán đầu tư', 'Investment securities'),
+            },
+        },
+    },
+    'calculated_metrics': {'roe': {'formula': '(net_profit / total_equity) * 100'}},
+}
+
+
+@pytest.fixture
+def registry_file(tmp_path):
+    path = tmp_path / 'metric_registry.json'
+    path.write_text(json.dumps(REGISTRY, ensure_ascii=False), encoding='utf-8')
+    return path
+
+
+def _reference_search(keyword, lang='vi', entity_type=None):
+    """Nested scan with the original substring semantics."""
+    entities = {entity_type: REGISTRY['entity_types'][entity_type]} if entity_type else REGISTRY['entity_types']
+    return [
+        metric['code']
+        for entity_data in entities.values()
+        for metrics in entity_data.values()
+        for metric in metrics.values()
+        if keyword.lower() in metric.get(f'name_{lang}', '').lower()
+    ]
+
+
+def test_code_lookups(registry_file, tmp_path):
+    """Test 1: Flat maps return the first definition like the nested walk"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Code Lookups")
+    print("=" * 60)
+
+    registry = MetricRegistry(str(registry_file), cache_dir=tmp_path / 'cache')
+    assert registry.get_metric('CIS_60')['name_en'] == 'Net profit'
+    assert registry.get_metric('BIS_22A', 'BANK')['code'] == 'BIS_22A'
+    assert registry.get_metric('BIS_22A', 'COMPANY') is None
+    # Code present in two entities: first entity wins without a filter
+    assert registry.get_metric('SHARED_1')['entity_type'] == 'COMPANY'
+    assert registry.get_metric('SHARED_1', 'BANK')['entity_type'] == 'BANK'
+    assert registry.get_metric('CIS_60', 'UNKNOWN') is None
+    assert registry.get_metric(None) is None
+    assert registry.get_calculated_metric_formula('roe')['formula'].startswith('(net_profit')
+    print("✓ Code lookups match")
+
+
+def test_search_by_name_substring(registry_file, tmp_path):
+    """Test 2: search_by_name returns exactly the substring matches, in order"""
+    print("\n" + "=" * 60)
+    print("TEST 2: search_by_name")
+    print("=" * 60)
+
+    registry = MetricRegistry(str(registry_file), cache_dir=tmp_path / 'cache')
+    keywords = ['lợi nhuận', 'LỢI NHUẬN SAU', 'nhuận thuần', 'uận sa', 'đầu tư', 'tài', '', ' ', 'profit', 'xyz abc']
+    for keyword in keywords:
+        for lang in ('vi', 'en'):
+            for entity_type in (None, 'COMPANY', 'BANK'):
+                result = [m['code'] for m in registry.search_by_name(keyword, lang, entity_type)]
+                assert result == _reference_search(keyword, lang, entity_type), (keyword, lang, entity_type)
+    with pytest.raises(KeyError):
+        registry.search_by_name('lợi', entity_type='UNKNOWN')
+    print("✓ Substring semantics preserved")
+
+
+def test_token_search(registry_file, tmp_path):
+    """Test 3: Diacritic-folded prefix and multi-word search"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Token Search")
+    print("=" * 60)
+
+    assert fold_text('Lợi Nhuận ĐẦU TƯ') == 'loi nhuan dau tu'
+    assert tokenize('18. Lợi nhuận (sau thuế)') == ['18', 'loi', 'nhuan', 'sau', 'thue']
+
+    registry = MetricRegistry(str(registry_file), cache_dir=tmp_path / 'cache')
+    codes = lambda results: [m['code'] for m in results]
+    assert codes(registry.search('loi nhuan')) == ['CIS_60', 'CIS_20', 'BIS_22A']
+    assert codes(registry.search('thue sau loi')) == ['CIS_60']
+    assert codes(registry.search('LOI NHU', entity_type='BANK')) == ['BIS_22A']
+    assert codes(registry.search('tong tai san')) == ['CBS_270']
+    assert codes(registry.search('profit', lang='en')) == ['CIS_60', 'CIS_20', 'BIS_22A']
+    assert codes(registry.search('dau tu')) == ['SHARED_1', 'SHARED_1']
+    assert codes(registry.search('loi', limit=1)) == ['CIS_60']
+    assert registry.search('nhuan xyz') == []
+    assert registry.search('  ') == []
+    print("✓ Token search handles folding, prefixes and word order")
+
+
+def test_snapshot_reuse_and_invalidation(registry_file, tmp_path):
+    """Test 4: Snapshot is reused, and rebuilt when the JSON changes"""
+    print("\n" + "=" * 60)
+    print("TEST 4: Snapshot")
+    print("=" * 60)
+
+    cache_dir = tmp_path / 'cache'
+    MetricRegistry(str(registry_file), cache_dir=cache_dir)
+    snapshot = cache_dir / 'metric_registry.pkl'
+    assert snapshot.exists()
+
+    warm = MetricRegistry(str(registry_file), cache_dir=cache_dir)
+    assert warm.get_metric('CIS_10')['name_vi'] == '3. Doanh thu thuần'
+
+    changed = json.loads(json.dumps(REGISTRY))
+    changed['entity_types']['COMPANY']['INCOME']['CIS_10']['name_vi'] = 'Doanh thu mới'
+    registry_file.write_text(json.dumps(changed, ensure_ascii=False), encoding='utf-8')
+    stat = registry_file.stat()
+    os.utime(registry_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    rebuilt = MetricRegistry(str(registry_file), cache_dir=cache_dir)
+    assert rebuilt.get_metric('CIS_10')['name_vi'] == 'Doanh thu mới'
+    assert [m['code'] for m in rebuilt.search('doanh thu moi')] == ['CIS_10']
+
+    # Corrupt snapshot: rebuilt from JSON
+    snapshot.write_bytes(b'not a pickle')
+    assert MetricRegistry(str(registry_file), cache_dir=cache_dir).get_metric('CIS_10') is not None
+    print("✓ Snapshot reused and invalidated")
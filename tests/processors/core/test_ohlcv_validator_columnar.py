@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Columnar OHLCV Validation
+=======================================
+
+Tests for:
+- Issue table columns (rule, severity, symbol, date, offending values)
+- Materialized issues keep the original messages and order
+- Per-rule counts, capped samples and the report
+- The input DataFrame is not modified
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+from PROCESSORS.core.formatters.ohlcv_validator import OHLCVValidator, ValidationIssue, ValidationResult
+
+
+def _sample_data() -> pd.DataFrame:
+    df = pd.DataFrame({
+        'symbol': ['VCB', 'VCB', 'ACB', 'ACB', 'FPT'],
+        'date': pd.to_datetime(['2025-12-01', '2025-12-02', '2025-12-01', '2025-12-02', '2025-12-01']),
+        'open': [95000, 96000, 25000, 26000, 0],
+        'high': [97000, 94000, 26000, 27000, 1000],
+        'low': [94000, 95500, 24500, 25500, 900],
+        'close': [96500, 96800, 25800, 28000, 950],
+        'volume': [1000000, 1200000, 500000, -5, 100],
+    }, index=[10, 11, 12, 13, 14])
+    df['turnover'] = df['close'] * df['volume']
+    df.loc[12, 'turnover'] = 1.0
+    return df
+
+
+def test_issue_table():
+    """Test 1: One row per issue with rule, severity, symbol, date and values"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Issue Table")
+    print("=" * 60)
+
+    df = _sample_data()
+    before = df.copy()
+    result = OHLCVValidator().validate_ohlcv_data(df)
+    table = result.issue_table
+
+    pd.testing.assert_frame_equal(df, before)
+    assert list(table['rule']) == [
+        'high_low_consistency', 'close_range', 'close_range', 'open_range', 'open_range',
+        'positive_volume', 'positive_price', 'turnover_consistency'
+    ]
+    assert list(table['row_index']) == [11, 11, 13, 11, 14, 13, 14, 12]
+    assert table.loc[0, 'date'] == pd.Timestamp('2025-12-02')
+    assert (table.loc[1, 'value'], table.loc[1, 'low'], table.loc[1, 'high']) == (96800, 95500, 94000)
+    assert table.loc[7, 'expected'] == 25800 * 500000
+    assert (result.errors, result.warnings, result.critical) == (5, 3, 0)
+    assert not result.is_valid
+
+    strict = OHLCVValidator().validate_ohlcv_data(df, strict=True)
+    assert (strict.errors, strict.warnings) == (8, 0)
+    print("✓ Issue table built without per-row objects")
+
+
+def test_materialized_issues():
+    """Test 2: ValidationIssue objects on demand, with the original messages"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Materialized Issues")
+    print("=" * 60)
+
+    result = OHLCVValidator().validate_ohlcv_data(_sample_data())
+    messages = [issue.message for issue in result.issues]
+    assert messages[:3] == [
+        "High (94000) < Low (95500)",
+        "Close (96800) not in range [95500, 94000]",
+        "Close (28000) not in range [25500, 27000]",
+    ]
+    assert "Volume is negative: -5" in messages
+    assert "Open price is <= 0: 0" in messages
+    assert messages[-1] == f"Turnover mismatch: 1 vs expected {25800 * 500000}"
+    assert result.issues[0] == ValidationIssue(
+        row_index=11, symbol='VCB', field='high/low', rule='high_low_consistency',
+        message="High (94000) < Low (95500)", severity='ERROR', date=pd.Timestamp('2025-12-02')
+    )
+    assert result.head(2) == result.issues[:2]
+
+    # Price change % issues come in (symbol, date) order
+    df = _sample_data().drop(columns='turnover')
+    df['price_change'] = df.groupby('symbol')['close'].diff().fillna(0)
+    df['price_change_pct'] = 5.0
+    issues = OHLCVValidator().validate_ohlcv_data(df).issue_table.query("rule == 'pct_consistency'")
+    assert list(issues['symbol']) == ['ACB', 'VCB']
+    print("✓ Messages match the row-by-row validator")
+
+
+def test_counts_sample_and_report():
+    """Test 3: Counts by rule, capped samples, report and missing columns"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Counts / Sample / Report")
+    print("=" * 60)
+
+    validator = OHLCVValidator()
+    result = validator.validate_ohlcv_data(_sample_data())
+    counts = result.counts().set_index(['rule', 'field'])['count']
+    assert counts[('close_range', 'close')] == 2
+    assert counts[('positive_price', 'open')] == 1
+    assert counts.sum() == len(result.issue_table)
+
+    sample = result.sample(per_rule=1)
+    assert [issue.rule for issue in sample].count('close_range') == 1
+    assert len(sample) == len(counts)
+
+    report = validator.generate_report(result, max_issues=3)
+    assert "Issues by Rule:" in report
+    assert "Issues Found (showing first 3):" in report
+
+    # Missing columns are reported as one-off CRITICAL issues
+    partial = validator.validate_ohlcv_data(_sample_data().drop(columns=['symbol', 'turnover']))
+    assert partial.critical == 1
+    missing = partial.issues[-1]
+    assert (missing.rule, missing.field, missing.symbol, missing.date) == ('required_fields', 'symbol', None, None)
+
+    empty = ValidationResult(is_valid=True, total_records=0)
+    assert empty.issues == [] and empty.issue_table.empty and empty.counts().empty
+    print("✓ Summaries computed from the issue table")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test Suite for OutputValidator
+==============================
+
+Tests for:
+- Per-metric statistics sweep (NaN/inf counts, min/max, quartiles, range violations)
+- Error/warning messages for infinite values, ranges, outliers and duplicates
+- Business rules as compiled column expressions
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+from PROCESSORS.core.validators.output_validator import BusinessRule, OutputValidator
+
+
+def _metrics_frame(n: int = 40) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'ticker': [f'T{i % 20}' for i in range(n)],
+        'year': 2020 + np.arange(n) // 20,
+        'quarter': 1 + np.arange(n) % 4,
+        'revenue': rng.uniform(100, 200, n),
+        'net_income': rng.uniform(1, 20, n),
+        'total_assets': rng.uniform(500, 900, n),
+        'total_equity': rng.uniform(100, 300, n),
+        'roe': rng.uniform(0.05, 0.2, n),
+    })
+    df.loc[0, 'roe'] = 3.0          # Out of range
+    df.loc[1, 'roe'] = np.nan
+    df.loc[2, 'net_income'] = np.inf
+    df.loc[3, 'total_assets'] = 0.0
+    df.loc[4, 'total_equity'] = -1000.0
+    return df
+
+
+def test_metric_stats():
+    """Test 1: One statistics row per numeric column"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Metric Statistics")
+    print("=" * 60)
+
+    df = _metrics_frame()
+    result = OutputValidator().validate_metrics(df, "COMPANY")
+    metrics = result.metrics
+    print(metrics[['count', 'nan', 'inf', 'min', 'max', 'out_of_range']])
+
+    assert list(metrics.index) == ['year', 'quarter', 'revenue', 'net_income', 'total_assets', 'total_equity', 'roe']
+    assert result.stats['metrics_checked'] == 7
+    assert metrics.loc['roe', 'count'] == 39 and metrics.loc['roe', 'nan'] == 1
+    assert metrics.loc['roe', 'out_of_range'] == 1
+    assert metrics.loc['roe', 'max'] == 3.0
+    assert metrics.loc['net_income', 'inf'] == 1
+    assert np.isnan(metrics.loc['revenue', 'range_min'])
+
+    values = df['revenue']
+    assert np.isclose(metrics.loc['revenue', 'q1'], values.quantile(0.25))
+    assert np.isclose(metrics.loc['revenue', 'q3'], values.quantile(0.75))
+    assert metrics.loc['revenue', 'min'] == values.min()
+    print("✓ Statistics match per-column pandas results")
+
+
+def test_messages():
+    """Test 2: Errors and warnings built from the statistics table"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Messages")
+    print("=" * 60)
+
+    df = _metrics_frame()
+    df = pd.concat([df, df.iloc[[5]]], ignore_index=True)  # Duplicate key
+    result = OutputValidator().validate_metrics(df, "COMPANY")
+
+    assert result.errors == [
+        "Column 'net_income' has 1 infinite values",
+        "1 rows have zero or negative total assets",
+    ]
+    assert result.warnings == [
+        "Ratio 'roe' has 1 values (2.5%) out of range [-2.0, 2.0]. Found range: [0.05, 3.00]",
+        "1 rows have equity more negative than assets",
+        "Found 2 duplicate rows (ticker, year, quarter)",
+    ]
+    assert not result.is_valid
+
+    no_outliers = OutputValidator().validate_metrics(df, "COMPANY", check_outliers=False)
+    assert no_outliers.metrics['q1'].isna().all()
+
+    strict = OutputValidator(strict_mode=True).validate_metrics(df, "COMPANY")
+    assert len(strict.errors) == 5 and strict.warnings == []
+
+    # Outliers: >5% of values beyond 3 * IQR
+    skewed = _metrics_frame()
+    skewed.loc[:4, 'revenue'] = 1e6
+    outliers = OutputValidator().validate_metrics(skewed, "COMPANY").warnings
+    assert any(w.startswith("Column 'revenue' has 5 outliers (12.5%)") for w in outliers)
+    print("✓ Messages unchanged")
+
+
+def test_business_rules():
+    """Test 3: Compiled column expressions, entity filters and thresholds"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Business Rules")
+    print("=" * 60)
+
+    rule = BusinessRule("wide", "(a > b) & (b < 0)", "{count} rows")
+    assert rule.columns == ('a', 'b')
+    columns = {'a': np.array([1.0, 2.0, np.nan]), 'b': np.array([-1.0, 5.0, -1.0])}
+    assert rule.count(columns) == 1
+
+    df = _metrics_frame().assign(npl_ratio=0.2)
+    df.loc[:2, 'revenue'] = -1.0   # 3/40 = 7.5% > 5%
+    df.loc[0, 'year'] = 2030
+    validator = OutputValidator()
+    _, company_warnings = validator._validate_business_logic(df, "COMPANY")
+    _, bank_warnings = validator._validate_business_logic(df, "BANK")
+    assert "3 rows (7.5%) have negative revenue" in company_warnings
+    assert "1 rows have year > 2025" in company_warnings
+    assert "40 banks have NPL ratio > 10%" in bank_warnings
+    assert not any('NPL' in w for w in company_warnings)
+
+    # Missing referenced column: rule skipped
+    errors, warnings = validator._validate_business_logic(df.drop(columns='total_assets'), "COMPANY")
+    assert errors == [] and not any('equity' in w for w in warnings)
+    print("✓ Business rules evaluated as column expressions")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Quarter Gap Engine
+=================================
+
+Tests for:
+- (symbol, year, quarter) key sets and anti-join differences
+- restore_frame matches the row-by-row restore (current wins, Q3/2025 protected)
+- analyze_all / restore_entity over all entity types in one pass
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+from PROCESSORS.core.shared.quarter_gaps import (
+    analyze_all, entity_paths, quarter_index, restore_entity, restore_frame
+)
+
+
+def _metrics(symbols, dates, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame([(s, d) for s in symbols for d in dates], columns=['symbol', 'report_date'])
+    df['roe'] = rng.normal(size=len(df))
+    return df
+
+
+def _legacy_restore(current: pd.DataFrame, backup: pd.DataFrame, symbols) -> pd.DataFrame:
+    """Previous iterrows-based restore (restore_missing_quarters.py)."""
+    backup = backup[backup['symbol'].isin(symbols)].copy()
+    frames = []
+    for df in (current.copy(), backup):
+        df['report_date'] = pd.to_datetime(df['report_date'], errors='coerce')
+        df = df[df['report_date'].notna()].copy()
+        df['year'] = df['report_date'].dt.year
+        df['quarter'] = df['report_date'].dt.quarter
+        frames.append(df)
+    current, backup = frames
+    current_keys = {(r['symbol'], r['year'], r['quarter']) for _, r in current.iterrows()}
+    missing = pd.DataFrame([r for _, r in backup.iterrows()
+                            if (r['symbol'], r['year'], r['quarter']) not in current_keys])
+    missing = missing[~((missing['year'] == 2025) & (missing['quarter'] == 3))]
+    merged = pd.concat([current, missing], ignore_index=True)
+    merged = merged.sort_values(['symbol', 'year', 'quarter', 'report_date'])
+    merged = merged.drop_duplicates(subset=['symbol', 'year', 'quarter'], keep='first')
+    return merged.drop(columns=['year', 'quarter'])
+
+
+DATES = pd.date_range('2023-03-31', '2025-09-30', freq='QE')
+
+
+def test_restore_frame_matches_row_by_row():
+    """Test 1: Vectorized restore equals the previous row-by-row restore"""
+    print("\n" + "=" * 60)
+    print("TEST 1: restore_frame")
+    print("=" * 60)
+
+    backup = _metrics(['ACB', 'VCB', 'FPT'], DATES, seed=1)
+    current = _metrics(['ACB', 'VCB'], DATES[:-1:2], seed=2)
+    # Undated row is dropped
+    current = pd.concat([current, pd.DataFrame({'symbol': ['ACB'], 'report_date': [pd.NaT], 'roe': [1.0]})],
+                        ignore_index=True)
+
+    merged, restored = restore_frame(current, backup, symbols=['ACB', 'VCB'])
+    expected = _legacy_restore(current, backup, {'ACB', 'VCB'})
+    pd.testing.assert_frame_equal(merged.reset_index(drop=True), expected.reset_index(drop=True))
+
+    # Odd quarters restored for both symbols except Q3/2025; FPT filtered out
+    assert len(restored) == 2 * len(DATES[1::2])
+    assert not (restored['report_date'] == pd.Timestamp('2025-09-30')).any()
+    assert set(restored['symbol']) == {'ACB', 'VCB'}
+
+    keys = quarter_index(merged)
+    assert len(keys) == len(merged)
+    print("✓ Same result as the row-by-row restore")
+
+
+def _write_layout(root: Path):
+    """company/bank/security inputs, current files and backups under root."""
+    for entity, symbols in (('company', ['FPT', 'HPG']), ('bank', ['ACB', 'VCB']), ('security', ['SSI'])):
+        (root / entity).mkdir(parents=True)
+        pd.DataFrame({
+            'SECURITY_CODE': np.repeat(symbols, len(DATES)),
+            'REPORT_DATE': np.tile(DATES.strftime('%Y-%m-%d'), len(symbols)),
+            'FREQ_CODE': 'Q',
+        }).to_parquet(root / f'{entity}_full.parquet')
+        _metrics(symbols, DATES[2:], seed=3).to_parquet(root / entity / f'{entity}_financial_metrics.parquet')
+    # Company backup holds company + security rows; bank has its own backup
+    _metrics(['FPT', 'HPG', 'SSI'], DATES, seed=4).to_parquet(
+        root / 'company' / 'company_financial_metrics_backup.parquet')
+    _metrics(['ACB', 'VCB', 'XXX'], DATES[1:], seed=5).to_parquet(
+        root / 'bank' / 'bank_financial_metrics_backup_20251201.parquet')
+
+
+def test_analyze_and_restore_all_entities(tmp_path):
+    """Test 2: Per-entity summary and restore across entity types"""
+    print("\n" + "=" * 60)
+    print("TEST 2: All Entities")
+    print("=" * 60)
+
+    _write_layout(tmp_path)
+    assert entity_paths('security', tmp_path)['backup'].name == 'company_financial_metrics_backup.parquet'
+    assert entity_paths('bank', tmp_path)['backup'].name == 'bank_financial_metrics_backup_20251201.parquet'
+
+    summary, details = analyze_all(fundamental_path=tmp_path)
+    print(summary.to_string(index=False))
+    summary = summary.set_index('entity')
+    assert list(summary.index) == ['company', 'bank', 'security']  # insurance has no files
+    assert summary.loc['company', 'missing_from_current'] == 4
+    assert summary.loc['bank', 'missing_from_current'] == 2
+    assert summary.loc['security', 'missing_from_current'] == 2
+    assert summary.loc['bank', 'missing_from_input'] == 0  # XXX is not a bank symbol
+    assert ('VCB', 2023, 2) in details['bank']['missing_from_current']
+
+    stats = restore_entity('bank', fundamental_path=tmp_path, dry_run=True)
+    assert stats['restored_rows'] == 2 and stats['saved_copy'] is None
+
+    stats = restore_entity('company', fundamental_path=tmp_path)
+    assert stats['restored_quarters'] == 4
+    assert stats['saved_copy'].exists()
+    restored = pd.read_parquet(tmp_path / 'company' / 'company_financial_metrics.parquet')
+    assert len(restored) == 2 * len(DATES)
+
+    again = analyze_all(['company'], fundamental_path=tmp_path)[0]
+    assert again.loc[0, 'missing_from_current'] == 0
+    print("✓ Gaps analyzed and restored per entity")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test Suite for SectorRegistry Reverse Indexes
+=============================================
+
+Tests for:
+- Entity → tickers, ticker → peers, EN → VN sector names
+- search_sectors / get_all_ticker_sectors
+- Vectorized ticker mapping (Series, arrays, unknown tickers)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+from config.registries.sector_lookup import SectorRegistry
+
+
+def _ticker(entity, sector, sector_en, code):
+    return {'entity_type': entity, 'sector': sector, 'sector_en': sector_en, 'industry_code': code, 'exchange': 'HOSE'}
+
+
+REGISTRY = {
+    'version': 'test',
+    'metadata': {'total_tickers': 6, 'total_sectors': 3, 'total_entity_types': 2},
+    'entity_types': {
+        'BANK': {'calculator_class': 'BankFinancialCalculator', 'sectors': ['Ngân hàng']},
+        'COMPANY': {'calculator_class': 'CompanyFinancialCalculator', 'sectors': ['Xây dựng và Vật liệu', 'Công nghệ', 'Không có']},
+    },
+    'sectors': {
+        'Ngân hàng': {'entity_type': 'BANK', 'sector_en': 'Banking', 'tickers': ['ACB', 'VCB', 'TCB']},
+        'Xây dựng và Vật liệu': {'entity_type': 'COMPANY', 'sector_en': 'Construction', 'tickers': ['HPG', 'CTD']},
+        'Công nghệ': {'entity_type': 'COMPANY', 'sector_en': 'Technology', 'tickers': ['FPT', 'CTD']},
+    },
+    'ticker_mapping': {
+        'ACB': _ticker('BANK', 'Ngân hàng', 'Banking', 'BANK'),
+        'VCB': _ticker('BANK', 'Ngân hàng', 'Banking', 'BANK'),
+        'TCB': _ticker('BANK', 'Ngân hàng', 'Banking', 'BANK'),
+        'HPG': _ticker('COMPANY', 'Xây dựng và Vật liệu', 'Construction', 'CONSTRUCTION'),
+        'CTD': _ticker('COMPANY', 'Xây dựng và Vật liệu', 'Construction', ''),
+        'FPT': _ticker('COMPANY', 'Công nghệ', 'Technology', 'IT'),
+    },
+}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    path = tmp_path / 'sector_industry_registry.json'
+    path.write_text(json.dumps(REGISTRY, ensure_ascii=False), encoding='utf-8')
+    return SectorRegistry(str(path))
+
+
+def test_reverse_indexes(registry):
+    """Test 1: Entity tickers, peers and sector-name maps"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Reverse Indexes")
+    print("=" * 60)
+
+    assert registry.get_tickers_by_entity_type('BANK') == ['ACB', 'TCB', 'VCB']
+    assert registry.get_tickers_by_entity_type('COMPANY') == ['CTD', 'FPT', 'HPG']
+    assert registry.get_tickers_by_entity_type('UNKNOWN') == []
+
+    assert registry.get_peers('VCB') == ['ACB', 'TCB']
+    assert registry.get_peers('VCB', exclude_self=False) == ['ACB', 'VCB', 'TCB']
+    assert registry.get_peers('ZZZ') == []
+    # Returned lists are copies: callers cannot corrupt the index
+    registry.get_peers('VCB').append('XXX')
+    assert registry.get_peers('VCB') == ['ACB', 'TCB']
+
+    assert registry.get_sector_vn('Technology') == 'Công nghệ'
+    assert registry.get_sector_vn('Unknown sector') == 'Unknown sector'
+    assert [s['name'] for s in registry.search_sectors('XÂY DỰNG')] == ['Xây dựng và Vật liệu']
+    assert len(registry.search_sectors('')) == 3
+    # Empty industry codes are skipped
+    assert registry.get_all_ticker_sectors() == {
+        'ACB': 'BANK', 'VCB': 'BANK', 'TCB': 'BANK', 'HPG': 'CONSTRUCTION', 'FPT': 'IT'
+    }
+    print("✓ Reverse indexes match the registry")
+
+
+def test_vectorized_mapping(registry):
+    """Test 2: Map Series/arrays of tickers in one call"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Vectorized Mapping")
+    print("=" * 60)
+
+    symbols = pd.Series(['VCB', 'FPT', 'ZZZ', 'VCB', None], index=[10, 11, 12, 13, 14], name='symbol')
+    sectors = registry.map_tickers(symbols, 'sector', default='Unknown')
+    assert isinstance(sectors, pd.Series)
+    assert list(sectors.index) == [10, 11, 12, 13, 14]
+    assert sectors.tolist() == ['Ngân hàng', 'Công nghệ', 'Unknown', 'Ngân hàng', 'Unknown']
+
+    entity_types = registry.map_entity_types(np.array(['HPG', 'ACB', 'XXX'], dtype=object))
+    assert isinstance(entity_types, np.ndarray)
+    assert entity_types.tolist() == ['COMPANY', 'BANK', None]
+
+    assert registry.map_sector_codes(['CTD', 'FPT']).tolist() == ['', 'IT']
+    assert registry.map_tickers([], 'sector').tolist() == []
+
+    expected = symbols.map(lambda t: (registry.get_ticker(t) or {}).get('sector', 'Unknown'))
+    pd.testing.assert_series_equal(sectors, expected, check_names=False)
+    print("✓ Vectorized mapping matches per-ticker lookups")
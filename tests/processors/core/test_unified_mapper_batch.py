@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Batched UnifiedTickerMapper Lookups
+==================================================
+
+Tests for:
+- get_complete_info_batch matches per-ticker get_complete_info
+- resolve_tickers metadata table (unknown tickers, input order)
+- Metric code → entity index: search_tickers_with_metric / has_metric
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+import config.registries.metric_lookup as metric_lookup
+from PROCESSORS.core.shared.unified_mapper import UnifiedTickerMapper
+
+
+def _ticker(entity, sector, name):
+    return {'entity_type': entity, 'sector': sector, 'name': name, 'exchange': 'HOSE', 'industry_code': ''}
+
+
+SECTOR_REGISTRY = {
+    'version': 'test',
+    'metadata': {'total_tickers': 5, 'total_sectors': 3, 'total_entity_types': 2},
+    'entity_types': {
+        'BANK': {'calculator_class': 'BankFinancialCalculator', 'sectors': ['Ngân hàng']},
+        'COMPANY': {'calculator_class': 'CompanyFinancialCalculator', 'sectors': ['Xây dựng', 'Công nghệ']},
+    },
+    'sectors': {
+        'Ngân hàng': {'entity_type': 'BANK', 'tickers': ['ACB', 'VCB'], 'metric_prefixes': ['BIS_', 'BBS_']},
+        'Xây dựng': {'entity_type': 'COMPANY', 'tickers': ['HPG', 'CTD'], 'metric_prefixes': ['CIS_', 'CBS_']},
+        'Công nghệ': {'entity_type': 'COMPANY', 'tickers': ['FPT', 'CTD'], 'metric_prefixes': ['CIS_', 'CBS_']},
+    },
+    'ticker_mapping': {
+        'ACB': _ticker('BANK', 'Ngân hàng', 'Á Châu'),
+        'VCB': _ticker('BANK', 'Ngân hàng', 'Vietcombank'),
+        'HPG': _ticker('COMPANY', 'Xây dựng', 'Hòa Phát'),
+        'CTD': _ticker('COMPANY', 'Xây dựng', 'Coteccons'),
+        'FPT': _ticker('COMPANY', 'Công nghệ', 'FPT'),
+    },
+}
+
+
+def _metric(code, entity, name_vi):
+    return {'code': code, 'name_vi': name_vi, 'name_en': '', 'entity_type': entity}
+
+
+METRIC_REGISTRY = {
+    'version': 'test',
+    'entity_types': {
+        'COMPANY': {
+            'INCOME': {'CIS_62': _metric('CIS_62', 'COMPANY', 'Lợi nhuận sau thuế'),
+                       'SHARED_1': _metric('SHARED_1', 'COMPANY', 'Đầu tư')},
+            'BALANCE_SHEET': {'CBS_270': _metric('CBS_270', 'COMPANY', 'Vốn chủ sở hữu')},
+        },
+        'BANK': {
+            'INCOME': {'BIS_22A': _metric('BIS_22A', 'BANK', 'Lợi nhuận sau thuế'),
+                       'SHARED_1': _metric('SHARED_1', 'BANK', 'Chứng khoán đầu tư')},
+        },
+    },
+    'calculated_metrics': {
+        'roe': {'formula': 'net_profit / total_equity', 'unit': '%', 'entity_types': ['COMPANY', 'BANK'],
+                'dependencies': {'COMPANY': ['CIS_62', 'CBS_270'], 'BANK': ['BIS_22A']}},
+        'nim': {'formula': 'nii / earning_assets', 'unit': '%', 'entity_types': ['BANK'],
+                'dependencies': {'BANK': ['BIS_22A']}},
+    },
+}
+
+
+@pytest.fixture
+def mapper(tmp_path, monkeypatch):
+    monkeypatch.setattr(metric_lookup, 'DEFAULT_CACHE_DIR', tmp_path / 'cache')
+    sector_path = tmp_path / 'sector_industry_registry.json'
+    metric_path = tmp_path / 'metric_registry.json'
+    sector_path.write_text(json.dumps(SECTOR_REGISTRY, ensure_ascii=False), encoding='utf-8')
+    metric_path.write_text(json.dumps(METRIC_REGISTRY, ensure_ascii=False), encoding='utf-8')
+    return UnifiedTickerMapper(str(sector_path), str(metric_path))
+
+
+def test_complete_info_batch(mapper):
+    """Test 1: Batch results equal per-ticker results and are independent copies"""
+    print("\n" + "=" * 60)
+    print("TEST 1: get_complete_info_batch")
+    print("=" * 60)
+
+    infos = mapper.get_complete_info_batch(['FPT', 'ACB', 'FPT', 'CTD'])
+    assert list(infos) == ['FPT', 'ACB', 'CTD']
+    for ticker, info in infos.items():
+        assert info == mapper.get_complete_info(ticker)
+
+    acb = infos['ACB']
+    assert acb['available_metrics'] == {'BIS_22A': 'Lợi nhuận sau thuế', 'SHARED_1': 'Chứng khoán đầu tư'}
+    assert acb['calculated_metrics'] == ['roe', 'nim']
+    assert acb['peer_tickers'] == ['VCB']
+    assert acb['calculator_class'] == 'BankFinancialCalculator'
+
+    # Mutating a result does not leak into the cached tables
+    infos['FPT']['available_metrics'].clear()
+    infos['FPT']['calculated_metrics'].append('xxx')
+    assert len(mapper.get_complete_info('HPG')['available_metrics']) == 3
+    assert mapper.get_complete_info('HPG')['calculated_metrics'] == ['roe']
+
+    with pytest.raises(ValueError, match='ZZZ'):
+        mapper.get_complete_info_batch(['ACB', 'ZZZ'])
+    assert list(mapper.get_complete_info_batch(['ACB', 'ZZZ'], skip_missing=True)) == ['ACB']
+
+    peer_info = mapper.get_peer_comparison_info('VCB')
+    assert peer_info['metric_codes']['nim'] == {'dependencies': ['BIS_22A'], 'formula': 'nii / earning_assets', 'unit': '%'}
+    print("✓ Batch lookups match per-ticker lookups")
+
+
+def test_resolve_tickers(mapper):
+    """Test 2: Metadata table for many tickers"""
+    print("\n" + "=" * 60)
+    print("TEST 2: resolve_tickers")
+    print("=" * 60)
+
+    table = mapper.resolve_tickers(pd.Series(['HPG', 'ZZZ', 'VCB', 'HPG']))
+    print(table)
+    assert table['ticker'].tolist() == ['HPG', 'ZZZ', 'VCB', 'HPG']
+    assert table['found'].tolist() == [True, False, True, True]
+    assert table['entity_type'].tolist() == ['COMPANY', None, 'BANK', 'COMPANY']
+    assert table['sector'].tolist() == ['Xây dựng', None, 'Ngân hàng', 'Xây dựng']
+    assert table['name'].tolist() == ['Hòa Phát', None, 'Vietcombank', 'Hòa Phát']
+    assert table['calculator_class'].tolist() == [
+        'CompanyFinancialCalculator', None, 'BankFinancialCalculator', 'CompanyFinancialCalculator'
+    ]
+    assert table['metric_count'].tolist() == [3, 0, 2, 3]
+    assert mapper.resolve_tickers([]).empty
+    print("✓ Metadata resolved in one call")
+
+
+def test_metric_index(mapper):
+    """Test 3: Tickers having a metric"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Metric Index")
+    print("=" * 60)
+
+    # Sector-order concatenation (CTD is in two sectors)
+    assert mapper.search_tickers_with_metric('CIS_62') == ['HPG', 'CTD', 'FPT', 'CTD']
+    assert mapper.search_tickers_with_metric('BIS_22A') == ['ACB', 'VCB']
+    # Code in several entities: first in COMPANY, BANK, INSURANCE, SECURITY order
+    assert mapper.search_tickers_with_metric('SHARED_1') == ['HPG', 'CTD', 'FPT', 'CTD']
+    assert mapper.search_tickers_with_metric('BIS_22A', 'Công nghệ') == ['FPT', 'CTD']
+    assert mapper.search_tickers_with_metric('XXX') == []
+
+    tickers = ['ACB', 'FPT', 'ZZZ', 'VCB']
+    mask = mapper.has_metric(tickers, 'BIS_22A')
+    assert isinstance(mask, np.ndarray)
+    assert mask.tolist() == [True, False, False, True]
+    assert mapper.has_metric(tickers, 'SHARED_1').tolist() == [True, True, False, True]
+    assert mapper.has_metric(tickers, 'XXX').tolist() == [False] * 4
+    assert mask.tolist() == [mapper.validate_metric_for_ticker(t, 'BIS_22A') for t in tickers]
+
+    series = pd.Series(['HPG', 'ACB'], index=[5, 7])
+    result = mapper.has_metric(series, 'CBS_270')
+    assert result.index.tolist() == [5, 7] and result.tolist() == [True, False]
+    print("✓ Metric index answers per-ticker availability")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Fundamental Calculator Kernels
+=============================================
+
+Tests for:
+- pivot_long_to_wide matches pivot_table(aggfunc='first')
+- Metric subset pivoting
+- period_growth (YTD vs previous Q4, QoQ/YoY by calendar key)
+- Signed YoY base matches pct_change(4) except across gaps
+- rolling_ttm (4-quarter sums, NaN across gaps)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+from PROCESSORS.fundamental.calculators.kernels import (
+    pivot_long_to_wide, period_growth, rolling_ttm
+)
+
+INDEX_COLS = ['SECURITY_CODE', 'REPORT_DATE', 'YEAR', 'QUARTER', 'FREQ_CODE']
+
+
+def _make_long(seed: int = 7) -> pd.DataFrame:
+    """Long-format fundamentals with duplicates, NaN values and an all-NaN metric."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2022-03-31', periods=6, freq='QE')
+    rows = []
+    for symbol in ['VCB', 'ACB', 'FPT']:
+        for date in dates:
+            for metric in ['CIS_10', 'CIS_20', 'CBS_100', 'CIS_2']:
+                rows.append((symbol, date, metric, rng.normal(100, 10)))
+    df = pd.DataFrame(rows, columns=['SECURITY_CODE', 'REPORT_DATE', 'METRIC_CODE', 'METRIC_VALUE'])
+    df['YEAR'] = df['REPORT_DATE'].dt.year
+    df['QUARTER'] = df['REPORT_DATE'].dt.quarter
+    df['FREQ_CODE'] = 'Q'
+
+    # Duplicate cells: first row NaN (skipped), second wins, third ignored
+    dup = df.iloc[[0, 0, 0]].copy()
+    dup['METRIC_VALUE'] = [np.nan, 1.5, 2.5]
+    df.loc[0, 'METRIC_VALUE'] = np.nan
+    # A metric with only NaN values and a key whose values are all NaN
+    all_nan = df.iloc[[1, 2]].copy()
+    all_nan['METRIC_CODE'] = 'CIS_99'
+    all_nan['METRIC_VALUE'] = np.nan
+    empty_key = df.iloc[[3]].copy()
+    empty_key['SECURITY_CODE'] = 'ZZZ'
+    empty_key['METRIC_VALUE'] = np.nan
+
+    df = pd.concat([df, dup, all_nan, empty_key], ignore_index=True)
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def _reference(df: pd.DataFrame, index_cols) -> pd.DataFrame:
+    pivot = df.pivot_table(
+        index=index_cols,
+        columns='METRIC_CODE',
+        values='METRIC_VALUE',
+        aggfunc='first'
+    ).reset_index()
+    pivot.columns.name = None
+    return pivot
+
+
+def test_pivot_matches_pivot_table():
+    """Test 1: Same frame as pivot_table(aggfunc='first')"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Pivot vs pivot_table")
+    print("=" * 60)
+
+    df = _make_long()
+    expected = _reference(df, INDEX_COLS)
+    result = pivot_long_to_wide(df, INDEX_COLS)
+
+    print(f"  Shape: {result.shape} (expected {expected.shape})")
+    assert list(result.columns) == list(expected.columns)
+    assert 'CIS_99' not in result.columns
+    assert 'ZZZ' not in set(result['SECURITY_CODE'])
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert result['REPORT_DATE'].dtype == expected['REPORT_DATE'].dtype
+    print("✓ Wide frame matches pivot_table")
+
+
+def test_pivot_first_non_null_duplicate():
+    """Test 2: First non-null value wins for duplicate cells"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Duplicate Cells")
+    print("=" * 60)
+
+    df = pd.DataFrame({
+        'SECURITY_CODE': ['AAA'] * 4,
+        'REPORT_DATE': pd.to_datetime(['2024-03-31'] * 4),
+        'METRIC_CODE': ['M1', 'M1', 'M1', 'M2'],
+        'METRIC_VALUE': [np.nan, 3.0, 4.0, 5.0],
+    })
+    result = pivot_long_to_wide(df, ['SECURITY_CODE', 'REPORT_DATE'])
+
+    assert len(result) == 1
+    assert result.loc[0, 'M1'] == 3.0
+    assert result.loc[0, 'M2'] == 5.0
+    print("✓ First non-null value kept")
+
+
+def test_pivot_metric_subset():
+    """Test 3: Only the requested metric codes are pivoted"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Metric Subset")
+    print("=" * 60)
+
+    df = _make_long()
+    metrics = ['CIS_20', 'CIS_10', 'NOT_IN_DATA']
+    subset = df[df['METRIC_CODE'].isin(metrics)]
+    expected = _reference(subset, INDEX_COLS)
+    result = pivot_long_to_wide(df, INDEX_COLS, metrics=metrics)
+
+    print(f"  Columns: {list(result.columns)}")
+    assert list(result.columns) == INDEX_COLS + ['CIS_10', 'CIS_20']
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    empty = pivot_long_to_wide(df, INDEX_COLS, metrics=['NOT_IN_DATA'])
+    assert empty.empty
+    assert list(empty.columns) == INDEX_COLS
+    print("✓ Metric subset pivoted")
+
+
+def _make_wide(seed: int = 3) -> pd.DataFrame:
+    """Wide quarterly data with a missing quarter, zero/negative bases and NaNs."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for symbol in ['VCB', 'ACB', 'TCB']:
+        dates = pd.date_range('2020-03-31', periods=16, freq='QE')
+        frame = pd.DataFrame({
+            'SECURITY_CODE': symbol,
+            'REPORT_DATE': dates,
+            'YEAR': dates.year,
+            'QUARTER': dates.quarter,
+            'total_assets': rng.normal(1000, 100, len(dates)),
+            'total_credit': rng.normal(500, 200, len(dates)),
+        })
+        frames.append(frame)
+    df = pd.concat(frames, ignore_index=True)
+    # ACB misses 2021Q4 and 2022Q1; TCB has a zero and a NaN base
+    df = df[~((df['SECURITY_CODE'] == 'ACB') & df['REPORT_DATE'].isin(pd.to_datetime(['2021-12-31', '2022-03-31'])))]
+    df.loc[(df['SECURITY_CODE'] == 'TCB') & (df['REPORT_DATE'] == '2020-12-31'), 'total_assets'] = 0.0
+    df.loc[(df['SECURITY_CODE'] == 'TCB') & (df['REPORT_DATE'] == '2021-12-31'), 'total_credit'] = np.nan
+    return df.sample(frac=1.0, random_state=seed)
+
+
+def _ytd_reference(df: pd.DataFrame, col: str) -> pd.Series:
+    """Row-by-row YTD growth vs Q4 of the previous year (previous BankCalculator logic)."""
+    q4_vals = df[df['QUARTER'] == 4].set_index(['SECURITY_CODE', 'YEAR'])[col].to_dict()
+    results = []
+    for _, row in df.iterrows():
+        q4_val = q4_vals.get((row['SECURITY_CODE'], row['YEAR'] - 1))
+        if q4_val and q4_val > 0 and pd.notna(row[col]):
+            results.append((row[col] - q4_val) / q4_val * 100)
+        else:
+            results.append(np.nan)
+    return pd.Series(results, index=df.index)
+
+
+def test_period_growth_ytd_matches_row_loop():
+    """Test 4: YTD growth matches the row-by-row Q4 lookup"""
+    print("\n" + "=" * 60)
+    print("TEST 4: YTD Growth")
+    print("=" * 60)
+
+    df = _make_wide()
+    growth = period_growth(df, ['total_assets', 'total_credit'], kind='ytd', base='positive')
+
+    for col in ['total_assets', 'total_credit']:
+        expected = _ytd_reference(df, col)
+        pd.testing.assert_series_equal(growth[col], expected, check_names=False)
+    # ACB 2022 has no 2021Q4 base
+    acb_2022 = growth.loc[(df['SECURITY_CODE'] == 'ACB') & (df['YEAR'] == 2022), 'total_assets']
+    assert acb_2022.isna().all()
+    print("✓ YTD growth matches row loop")
+
+
+def test_period_growth_yoy_qoq_calendar_aligned():
+    """Test 5: QoQ/YoY use the calendar prior quarter, not the prior row"""
+    print("\n" + "=" * 60)
+    print("TEST 5: QoQ / YoY Growth")
+    print("=" * 60)
+
+    df = _make_wide().sort_values(['SECURITY_CODE', 'REPORT_DATE'])
+    growth = {kind: period_growth(df, ['total_assets'], kind=kind)['total_assets'] for kind in ('qoq', 'yoy')}
+
+    for kind, months in (('qoq', 3), ('yoy', 12)):
+        prior_date = df['REPORT_DATE'] - pd.DateOffset(months=months) + pd.offsets.QuarterEnd(0)
+        prior = df[['SECURITY_CODE', 'REPORT_DATE', 'total_assets']].rename(
+            columns={'REPORT_DATE': 'prior_date', 'total_assets': 'prior'}
+        )
+        merged = df.assign(prior_date=prior_date).merge(prior, on=['SECURITY_CODE', 'prior_date'], how='left')
+        base = merged['prior'].abs().where(merged['prior'] != 0)
+        expected = ((merged['total_assets'] - merged['prior']) / base * 100).to_numpy()
+        np.testing.assert_allclose(growth[kind].to_numpy(), expected, equal_nan=True)
+
+    # 2022Q2 of ACB follows a gap: no QoQ value
+    mask = (df['SECURITY_CODE'] == 'ACB') & (df['REPORT_DATE'] == '2022-06-30')
+    assert growth['qoq'][mask].isna().all()
+    print("✓ QoQ/YoY growth aligned by calendar key")
+
+
+def test_rolling_ttm_matches_rolling_sum():
+    """Test 6: TTM equals rolling(4).sum() on consecutive quarters, NaN across gaps"""
+    print("\n" + "=" * 60)
+    print("TEST 6: TTM Kernel")
+    print("=" * 60)
+
+    df = _make_wide()
+    ttm = rolling_ttm(df, ['total_assets', 'total_credit', 'not_a_column'])
+    assert list(ttm.columns) == ['total_assets', 'total_credit']
+
+    ordered = df.sort_values(['SECURITY_CODE', 'REPORT_DATE'])
+    for col in ['total_assets', 'total_credit']:
+        expected = ordered.groupby('SECURITY_CODE')[col].transform(
+            lambda x: x.rolling(window=4, min_periods=4).sum()
+        )
+        # Windows ending within 3 quarters after ACB's gap are not comparable
+        after_gap = (ordered['SECURITY_CODE'] == 'ACB') & ordered['REPORT_DATE'].between('2022-04-01', '2022-12-31')
+        np.testing.assert_allclose(
+            ttm.loc[ordered.index[~after_gap], col].to_numpy(),
+            expected[~after_gap].to_numpy(),
+            equal_nan=True
+        )
+        assert ttm.loc[ordered.index[after_gap], col].isna().all()
+
+    # TCB 2021Q4 credit is NaN: the four windows containing it are NaN
+    tcb = ordered[ordered['SECURITY_CODE'] == 'TCB']
+    tcb_ttm = ttm.loc[tcb.index, 'total_credit']
+    assert tcb_ttm[tcb['REPORT_DATE'].between('2021-12-31', '2022-09-30')].isna().all()
+    assert tcb_ttm[tcb['REPORT_DATE'] == '2022-12-31'].notna().all()
+    print("✓ TTM sums match rolling sums; gaps give NaN")
+
+
+def test_period_growth_signed_matches_pct_change():
+    """Test 7: base='signed' equals pct_change(periods=4) on consecutive quarters"""
+    print("\n" + "=" * 60)
+    print("TEST 7: Signed YoY Growth")
+    print("=" * 60)
+
+    df = _make_wide().sort_values(['SECURITY_CODE', 'REPORT_DATE'])
+    df['total_credit'] = df['total_credit'] - 500  # negative bases keep their sign
+    growth = period_growth(df, ['total_credit'], kind='yoy', base='signed')['total_credit']
+
+    expected = df.groupby('SECURITY_CODE')['total_credit'].pct_change(periods=4, fill_method=None) * 100
+    # The positional shift pairs ACB's quarters across the gap with the wrong year
+    after_gap = (df['SECURITY_CODE'] == 'ACB') & (df['REPORT_DATE'] >= '2021-12-31')
+    np.testing.assert_allclose(growth[~after_gap].to_numpy(), expected[~after_gap].to_numpy(), equal_nan=True)
+
+    acb_2022q4 = (df['SECURITY_CODE'] == 'ACB') & (df['REPORT_DATE'] == '2022-12-31')
+    assert growth[acb_2022q4].isna().all() and expected[acb_2022q4].notna().all()
+    print("✓ Signed YoY growth matches pct_change, keyed across gaps")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Streaming CSV → Long Parquet Conversion
+======================================================
+
+Tests for:
+- convert_entity_streaming matches process_entity + add_derived_columns
+- First non-null value wins for duplicate (ticker, date, freq, metric) cells
+- Pandas fallback for files Arrow cannot parse
+- Dedup tracks only shared metric columns and repeated row keys
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+import PROCESSORS.fundamental.csv_to_full_parquet as converter
+
+CONFIG = converter.ENTITY_CONFIGS['company']
+SORT_KEYS = ['SECURITY_CODE', 'REPORT_DATE', 'FREQ_CODE', 'METRIC_CODE']
+
+
+def _write_csv(path: Path, metrics, n: int = 600, seed: int = 0, bad_value: bool = False):
+    """Wide CSV with padded tickers, duplicate row keys and NaN cells."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2018-03-31', periods=12, freq='QE').strftime('%Y-%m-%d')
+    df = pd.DataFrame({
+        'SECURITY_CODE': rng.choice(['AAA', 'BBB ', 'CCC', '\tDDD'], n),
+        'REPORT_DATE': rng.choice(dates, n),
+        'FREQ_CODE': rng.choice(['Q', 'Y'], n),
+        'AUDITED': rng.choice(['Y', 'N'], n),
+    })
+    df['YEAR'] = pd.to_datetime(df['REPORT_DATE']).dt.year
+    for metric in metrics:
+        values = rng.normal(size=n)
+        values[rng.random(n) < 0.3] = np.nan
+        df[metric] = values
+    if bad_value:
+        df[metrics[0]] = df[metrics[0]].astype(object)
+        df.loc[n - 3, metrics[0]] = 'n/a'
+    df.to_csv(path, index=False)
+
+
+def _legacy(csv_dir: Path, monkeypatch) -> pd.DataFrame:
+    """In-memory conversion (previous main() path), null values dropped."""
+    monkeypatch.setattr(converter, 'CSV_PATH', csv_dir)
+    df = converter.add_derived_columns(converter.process_entity('company', CONFIG))
+    return df.dropna(subset=['METRIC_VALUE'])
+
+
+def _assert_same_rows(expected: pd.DataFrame, result: pd.DataFrame):
+    assert len(result) == len(expected)
+    assert set(expected.columns) <= set(result.columns)
+    expected = expected.sort_values(SORT_KEYS).reset_index(drop=True)
+    result = result[list(expected.columns)].sort_values(SORT_KEYS).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_streaming_matches_in_memory(tmp_path, monkeypatch):
+    """Test 1: Same long rows as the in-memory conversion, across small batches"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Streaming vs In-Memory")
+    print("=" * 60)
+
+    _write_csv(tmp_path / 'COMPANY_BALANCE_SHEET.csv', [f'CBS_{i}' for i in range(20)], seed=1)
+    # Overlapping CBS metrics: first file's values win for duplicate cells
+    _write_csv(tmp_path / 'COMPANY_INCOME.csv', [f'CIS_{i}' for i in range(10)] + ['CBS_1', 'CBS_2'], seed=2)
+
+    expected = _legacy(tmp_path, monkeypatch)
+    monkeypatch.setattr(converter, 'CSV_BLOCK_SIZE', 1 << 14)
+    output = tmp_path / 'company_full.parquet'
+    stats = converter.convert_entity_streaming('company', CONFIG, output, csv_path=tmp_path)
+    result = pd.read_parquet(output)
+
+    print(f"  Rows: {stats['rows']:,} (expected {len(expected):,})")
+    assert stats == {'rows': len(expected), 'tickers': 4, 'metrics': 30}
+    assert not (tmp_path / 'company_full.parquet.tmp').exists()
+    assert set(result['SECURITY_CODE']) == {'AAA', 'BBB', 'CCC', 'DDD'}
+    assert result['QUARTER'].between(1, 4).all()
+    assert not result.duplicated(SORT_KEYS).any()
+    _assert_same_rows(expected, result)
+    print("✓ Streaming output matches in-memory conversion")
+
+
+def test_streaming_pandas_fallback(tmp_path, monkeypatch):
+    """Test 2: Non-numeric cells fall back to pandas without duplicating rows"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Pandas Fallback")
+    print("=" * 60)
+
+    _write_csv(tmp_path / 'COMPANY_BALANCE_SHEET.csv', [f'CBS_{i}' for i in range(8)], seed=3, bad_value=True)
+
+    expected = _legacy(tmp_path, monkeypatch)
+    monkeypatch.setattr(converter, 'CSV_BLOCK_SIZE', 1 << 12)
+    output = tmp_path / 'company_full.parquet'
+    stats = converter.convert_entity_streaming('company', CONFIG, output, csv_path=tmp_path)
+    result = pd.read_parquet(output)
+
+    print(f"  Rows: {stats['rows']:,} (expected {len(expected):,})")
+    _assert_same_rows(expected, result)
+    print("✓ Fallback output matches in-memory conversion")
+
+
+def test_streaming_no_files(tmp_path):
+    """Test 3: Missing CSV files write nothing"""
+    print("\n" + "=" * 60)
+    print("TEST 3: No Input Files")
+    print("=" * 60)
+
+    output = tmp_path / 'company_full.parquet'
+    assert converter.convert_entity_streaming('company', CONFIG, output, csv_path=tmp_path) == {}
+    assert not output.exists()
+    print("✓ Nothing written without input")
+
+
+def test_dedup_tracks_only_repeatable_cells(tmp_path):
+    """Test 4: Shared row keys alone do not make cells candidates for dedup"""
+    print("\n" + "=" * 60)
+    print("TEST 4: Dedup Scope")
+    print("=" * 60)
+
+    dates = pd.date_range('2018-03-31', periods=10, freq='QE').strftime('%Y-%m-%d')
+    keys = pd.DataFrame({'SECURITY_CODE': np.repeat(['AAA', 'BBB'], 10), 'REPORT_DATE': np.tile(dates, 2), 'FREQ_CODE': 'Q'})
+    keys.assign(CBS_1=1.0, CBS_2=2.0).to_csv(tmp_path / 'COMPANY_BALANCE_SHEET.csv', index=False)
+    keys.assign(CIS_1=3.0).to_csv(tmp_path / 'COMPANY_INCOME.csv', index=False)
+    files = converter.entity_files(CONFIG, tmp_path)
+    headers = [converter.read_csv_header(f) for f in files]
+    schema = converter.output_schema(headers, CONFIG['metric_prefixes'])
+
+    # Same row keys in both files, no shared metric: nothing tracked
+    dedup = converter._CellDeduplicator([['CBS_1', 'CBS_2'], ['CIS_1']], [pa.array([], pa.string())] * 2)
+    assert dedup.shared_metrics == 0 and not dedup.active
+    dedup.begin_file(1)
+    assert not dedup.active
+    stats = converter.write_long_parquet('company', files, headers, CONFIG['metric_prefixes'], schema,
+                                         tmp_path / 'out.parquet')
+    assert stats['rows'] == 60
+
+    # CBS_2 also in the income file, one repeated row key there
+    income = pd.concat([keys.assign(CIS_1=3.0, CBS_2=9.0), keys.iloc[[0]].assign(CIS_1=4.0, CBS_2=np.nan)])
+    income.to_csv(tmp_path / 'COMPANY_INCOME.csv', index=False)
+    headers = [converter.read_csv_header(f) for f in files]
+    repeated = [converter.find_duplicate_keys(f) for f in files]
+    assert [len(r) for r in repeated] == [0, 1]
+
+    dedup = converter._CellDeduplicator([['CBS_1', 'CBS_2'], ['CIS_1', 'CBS_2']], repeated)
+    assert dedup.shared_metrics == 1
+    assert dedup.check_cols.tolist() == [False, False] and dedup.record_cols.tolist() == [False, True]
+    dedup.begin_file(1)
+    assert dedup.check_cols.tolist() == [False, True] and dedup.record_cols.tolist() == [False, False]
+
+    converter.write_long_parquet('company', files, headers, CONFIG['metric_prefixes'], schema, tmp_path / 'out.parquet')
+    result = pd.read_parquet(tmp_path / 'out.parquet')
+    assert not result.duplicated(SORT_KEYS).any()
+    assert (result.loc[result['METRIC_CODE'] == 'CBS_2', 'METRIC_VALUE'] == 2.0).all()
+    first_cis = result[(result['METRIC_CODE'] == 'CIS_1') & (result['SECURITY_CODE'] == 'AAA')
+                       & (result['REPORT_DATE'] == dates[0])]
+    assert first_cis['METRIC_VALUE'].tolist() == [3.0]
+    print("✓ Only shared metric columns and repeated row keys are tracked")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the Formula Compiler
+===================================
+
+Tests for:
+- Vectorized kernels match the registered scalar formulas
+- Dependency ordering and shared intermediates (TTM → ROE/ROA/EPS)
+- Window operations, element-wise fallback and plan errors
+"""
+
+import inspect
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+from PROCESSORS.fundamental.calculators.kernels import rolling_ttm
+from PROCESSORS.fundamental.formulas.compiler import FormulaSpec, compile_formulas
+from PROCESSORS.fundamental.formulas.registry import formula_registry
+
+
+def _make_frame(seed: int = 5) -> pd.DataFrame:
+    """Two tickers × 12 quarters with zero and NaN values."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2021-03-31', periods=12, freq='QE')
+    df = pd.DataFrame({
+        'SECURITY_CODE': np.repeat(['AAA', 'BBB'], len(dates)),
+        'YEAR': np.tile(dates.year, 2),
+        'QUARTER': np.tile(dates.quarter, 2),
+        'npatmi': rng.normal(50, 20, 2 * len(dates)),
+        'total_equity': rng.normal(1000, 100, 2 * len(dates)),
+        'total_assets': rng.normal(5000, 300, 2 * len(dates)),
+        'shares': rng.normal(100, 10, 2 * len(dates)),
+    })
+    df.loc[2, 'total_equity'] = 0.0
+    df.loc[5, 'total_assets'] = np.nan
+    return df
+
+
+def test_vector_kernels_match_scalar_formulas():
+    """Test 1: Every vectorized kernel equals its scalar formula (NaN for None)"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Vector vs Scalar Formulas")
+    print("=" * 60)
+
+    rng = np.random.default_rng(11)
+    data = {c: rng.normal(10, 5, 300) for c in 'abcd'}
+    data['b'][::7] = 0.0
+    data['a'][::11] = np.nan
+    data['c'][::13] = np.nan
+
+    checked = 0
+    for entity_type in ('COMPANY', 'BANK'):
+        for name in formula_registry.list_formulas(entity_type):
+            kernel = formula_registry.get_vectorized(name)
+            if kernel is None:
+                continue
+            formula = formula_registry.get_formula(name, entity_type)
+            params = inspect.signature(formula).parameters.values()
+            args = [data[c] for c in 'abcd'[:sum(p.default is p.empty for p in params)]]
+
+            expected = []
+            for row in zip(*args):
+                try:
+                    value = formula(*[None if np.isnan(v) else v for v in row])
+                except TypeError:
+                    value = None
+                expected.append(np.nan if value is None else value)
+
+            np.testing.assert_allclose(kernel(*args), np.array(expected, dtype=float), equal_nan=True, err_msg=name)
+            checked += 1
+
+    print(f"  Kernels checked: {checked}")
+    assert checked > 30
+    print("✓ Vectorized kernels match scalar formulas")
+
+
+def test_plan_orders_and_shares_intermediates():
+    """Test 2: Specs in any order; TTM computed once and reused"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Plan Ordering")
+    print("=" * 60)
+
+    df = _make_frame()
+    plan = compile_formulas([
+        FormulaSpec('roe', 'calculate_roe', ('npatmi_ttm', 'total_equity')),
+        FormulaSpec('roa', 'calculate_roa', ('npatmi_ttm', 'total_assets')),
+        FormulaSpec('eps', 'calculate_eps', ('npatmi_ttm', 'shares')),
+        FormulaSpec('npatmi_ttm', 'ttm', ('npatmi',)),
+        FormulaSpec('npatmi_ttm_prev', 'prior_yoy', ('npatmi_ttm',)),
+        FormulaSpec('npatmi_ttm_growth', 'calculate_yoy_growth', ('npatmi_ttm', 'npatmi_ttm_prev')),
+    ], entity_type='COMPANY')
+
+    print(f"  Order: {plan.order}")
+    assert plan.order.index('npatmi_ttm') < plan.order.index('roe')
+    assert plan.order.index('npatmi_ttm_prev') < plan.order.index('npatmi_ttm_growth')
+    assert plan.required_columns == ['npatmi', 'shares', 'total_assets', 'total_equity']
+
+    result = plan.evaluate(df)
+    ttm = rolling_ttm(df, ['npatmi'])['npatmi']
+    pd.testing.assert_series_equal(result['npatmi_ttm'], ttm, check_names=False)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected_roe = np.where(df['total_equity'] != 0, ttm / df['total_equity'] * 100, np.nan)
+    np.testing.assert_allclose(result['roe'], expected_roe, equal_nan=True)
+    assert np.isnan(result.loc[5, 'roa'])
+
+    # YoY growth of TTM: row 11 (AAA 2023Q4) vs row 7 (AAA 2022Q4)
+    prev = ttm.iloc[7]
+    assert result.loc[11, 'npatmi_ttm_prev'] == prev
+    assert result.loc[11, 'npatmi_ttm_growth'] == round((ttm.iloc[11] - prev) / prev * 100, 2)
+    print("✓ Plan evaluated with shared TTM intermediate")
+
+
+def test_fallback_and_plan_errors():
+    """Test 3: Element-wise fallback, unknown formulas, cycles, missing columns"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Fallback and Errors")
+    print("=" * 60)
+
+    df = _make_frame()
+    # calculate_ldr has no vectorized kernel
+    plan = compile_formulas(
+        [FormulaSpec('ldr', 'calculate_ldr', ('total_equity', 'total_assets', 'shares'))],
+        entity_type='BANK'
+    )
+    result = plan.evaluate(df)
+    row = df.iloc[0]
+    assert result.loc[0, 'ldr'] == formula_registry.get_formula('calculate_ldr', 'BANK')(
+        row['total_equity'], row['total_assets'], row['shares']
+    )
+
+    with pytest.raises(ValueError):
+        compile_formulas([FormulaSpec('nim', 'calculate_nim', ('a', 'b'))], entity_type='COMPANY')
+    with pytest.raises(ValueError):
+        compile_formulas([
+            FormulaSpec('x', 'calculate_roe', ('y', 'total_equity')),
+            FormulaSpec('y', 'calculate_roa', ('x', 'total_assets')),
+        ])
+    with pytest.raises(KeyError):
+        compile_formulas([FormulaSpec('roe', 'calculate_roe', ('npatmi', 'missing'))]).evaluate(df)
+    print("✓ Fallback and errors handled")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Incremental Fundamental Ingestion
+================================================
+
+Tests for:
+- First ingest builds the output, re-runs without changes are no-ops
+- A changed CSV replaces only the affected partitions (same result as a full conversion)
+- changed_since(watermark) returns the changed symbol/periods
+- Removed CSV files drop their rows
+- A full ingest streams each CSV once (staging files and digests in the same pass)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+import PROCESSORS.fundamental.csv_to_full_parquet as converter
+from PROCESSORS.fundamental.ingest_manifest import (
+    IngestManifest, changed_since, current_version, partition_digests
+)
+
+CONFIG = converter.ENTITY_CONFIGS['company']
+SORT_KEYS = ['SECURITY_CODE', 'REPORT_DATE', 'FREQ_CODE', 'METRIC_CODE']
+
+
+def _make_wide(metrics, seed: int, n: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2018-03-31', periods=12, freq='QE').strftime('%Y-%m-%d')
+    df = pd.DataFrame({
+        'SECURITY_CODE': rng.choice(['AAA', 'BBB', 'CCC'], n),
+        'REPORT_DATE': rng.choice(dates, n),
+        'FREQ_CODE': 'Q',
+    })
+    for metric in metrics:
+        df[metric] = np.where(rng.random(n) < 0.3, np.nan, rng.normal(size=n))
+    return df
+
+
+def _setup(tmp_path: Path):
+    balance = _make_wide([f'CBS_{i}' for i in range(10)], seed=1)
+    # CBS_1 overlaps with the balance sheet: the balance sheet value wins
+    income = _make_wide([f'CIS_{i}' for i in range(5)] + ['CBS_1'], seed=2)
+    balance.to_csv(tmp_path / 'COMPANY_BALANCE_SHEET.csv', index=False)
+    income.to_csv(tmp_path / 'COMPANY_INCOME.csv', index=False)
+    return balance, income
+
+
+def _ingest(tmp_path: Path):
+    manifest = IngestManifest(tmp_path / '_ingest')
+    output = tmp_path / 'company_full.parquet'
+    return converter.ingest_entity('company', CONFIG, output, manifest, csv_path=tmp_path)
+
+
+def _assert_matches_full_conversion(tmp_path: Path):
+    reference = tmp_path / 'reference.parquet'
+    converter.convert_entity_streaming('company', CONFIG, reference, csv_path=tmp_path)
+    result = pd.read_parquet(tmp_path / 'company_full.parquet').sort_values(SORT_KEYS).reset_index(drop=True)
+    expected = pd.read_parquet(reference).sort_values(SORT_KEYS).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_first_ingest_and_noop(tmp_path):
+    """Test 1: First ingest is a full build; an unchanged re-run does nothing"""
+    print("\n" + "=" * 60)
+    print("TEST 1: First Ingest / No-op")
+    print("=" * 60)
+
+    _setup(tmp_path)
+    first = _ingest(tmp_path)
+    print(f"  First run: {first}")
+    assert first['files'] == 2
+    assert first['partitions'] == 12
+    assert first['version'] == 1
+    _assert_matches_full_conversion(tmp_path)
+
+    second = _ingest(tmp_path)
+    print(f"  Second run: {second}")
+    assert second == {'rows': first['rows'], 'files': 0, 'partitions': 0, 'changes': 0, 'version': 1}
+    print("✓ Unchanged files are not re-converted")
+
+
+def test_changed_file_replaces_partition(tmp_path):
+    """Test 2: One changed quarter → one partition replaced, change logged"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Changed File")
+    print("=" * 60)
+
+    _, income = _setup(tmp_path)
+    _ingest(tmp_path)
+    watermark = current_version(tmp_path / '_ingest')
+
+    mask = (income['SECURITY_CODE'] == 'BBB') & (income['REPORT_DATE'] == '2019-06-30')
+    income.loc[mask, 'CIS_0'] = 42.0
+    income.to_csv(tmp_path / 'COMPANY_INCOME.csv', index=False)
+
+    stats = _ingest(tmp_path)
+    print(f"  Incremental run: {stats}")
+    assert stats['files'] == 1
+    assert stats['partitions'] == 1
+    assert stats['version'] == watermark + 1
+    _assert_matches_full_conversion(tmp_path)
+
+    changes = changed_since(watermark, entity='company', root=tmp_path / '_ingest')
+    assert changes[['SECURITY_CODE', 'YEAR', 'QUARTER']].values.tolist() == [['BBB', 2019, 2]]
+    assert changed_since(stats['version'], root=tmp_path / '_ingest').empty
+    assert changed_since(watermark, entity='bank', root=tmp_path / '_ingest').empty
+    print("✓ Only the changed partition was replaced")
+
+
+def test_removed_file(tmp_path):
+    """Test 3: Rows of a removed CSV disappear from the output"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Removed File")
+    print("=" * 60)
+
+    _setup(tmp_path)
+    _ingest(tmp_path)
+    (tmp_path / 'COMPANY_INCOME.csv').unlink()
+
+    stats = _ingest(tmp_path)
+    print(f"  After removal: {stats}")
+    assert stats['files'] == 0
+    assert not (tmp_path / '_ingest' / 'staging' / 'company' / 'COMPANY_INCOME.parquet').exists()
+    output = pd.read_parquet(tmp_path / 'company_full.parquet')
+    assert not output['METRIC_CODE'].str.startswith('CIS').any()
+    _assert_matches_full_conversion(tmp_path)
+    print("✓ Removed file's rows dropped")
+
+
+def test_full_ingest_single_pass(tmp_path, monkeypatch):
+    """Test 4: One read per CSV writes the output, the staging files and the digests"""
+    print("\n" + "=" * 60)
+    print("TEST 4: Single-pass Full Ingest")
+    print("=" * 60)
+
+    _setup(tmp_path)
+    reads = []
+    wide_batches = converter._wide_batches
+
+    def counting_batches(filepath, id_cols, metric_cols):
+        if metric_cols:  # the key-only duplicate scan reads no metric columns
+            reads.append(filepath.name)
+        return wide_batches(filepath, id_cols, metric_cols)
+
+    monkeypatch.setattr(converter, '_wide_batches', counting_batches)
+    _ingest(tmp_path)
+    assert sorted(reads) == ['COMPANY_BALANCE_SHEET.csv', 'COMPANY_INCOME.csv']
+    _assert_matches_full_conversion(tmp_path)
+
+    # Staging files hold each file's own rows; digests equal a read-back
+    manifest = IngestManifest(tmp_path / '_ingest')
+    digests = manifest.load_digests('company').sort_values(['file', 'SECURITY_CODE', 'YEAR', 'QUARTER'])
+    for name in ['COMPANY_BALANCE_SHEET.csv', 'COMPANY_INCOME.csv']:
+        staging = manifest.staging_file('company', Path(name))
+        single = tmp_path / 'single.parquet'
+        converter.convert_entity_streaming('company', {**CONFIG, 'files': [name[len('COMPANY_'):-len('.csv')]]},
+                                           single, csv_path=tmp_path)
+        pd.testing.assert_frame_equal(pd.read_parquet(staging), pd.read_parquet(single))
+        expected = partition_digests(staging, name).sort_values(['SECURITY_CODE', 'YEAR', 'QUARTER'])
+        pd.testing.assert_frame_equal(
+            digests[digests['file'] == name].reset_index(drop=True),
+            expected.reset_index(drop=True),
+            check_dtype=False
+        )
+    print("✓ Each CSV streamed once; staging and digests match a separate pass")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Incremental Daily Valuation
+==========================================
+
+Tests for:
+- ValuationStateStore (per-symbol fundamental state, stale detection)
+- Incremental rows match the full merge_asof recompute
+- Row-group append to the existing output parquet
+"""
+
+import sys
+from pathlib import Path
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+from PROCESSORS.valuation.calculators.historical_pe_calculator import HistoricalPECalculator
+from PROCESSORS.valuation.calculators.incremental_state import (
+    ValuationStateStore, load_new_bars, append_parquet_rows
+)
+
+SYMBOLS = ['AAA', 'BBB']
+
+
+def _make_calculator(tmp_path):
+    """PE calculator wired to a small synthetic market/fundamental dataset."""
+    dates = pd.bdate_range('2023-01-01', '2024-06-30')
+    ohlcv = pd.concat([
+        pd.DataFrame({
+            'symbol': symbol,
+            'date': dates,
+            'close': np.linspace(10, 20, len(dates)) * (i + 1),
+            'market_cap': 1e9 * (i + 1),
+        })
+        for i, symbol in enumerate(SYMBOLS)
+    ], ignore_index=True)
+    ohlcv_path = tmp_path / 'ohlcv.parquet'
+    ohlcv.to_parquet(ohlcv_path, index=False)
+
+    report_dates = pd.date_range('2022-03-31', periods=8, freq='QE')
+    fundamentals = pd.concat([
+        pd.DataFrame({
+            'symbol': symbol,
+            'REPORT_DATE': report_dates,
+            'METRIC_VALUE': np.arange(8) * 1e6 + 1e7 * (i + 1),
+        })
+        for i, symbol in enumerate(SYMBOLS)
+    ], ignore_index=True)
+
+    calc = HistoricalPECalculator()
+    calc.output_path = tmp_path
+    calc.ohlcv_path = ohlcv_path
+    calc.symbol_entity_types = {s: 'COMPANY' for s in SYMBOLS}
+    calc.fundamental_data = fundamentals
+    calc.raw_earnings_df = fundamentals.sort_values(['symbol', 'REPORT_DATE'])
+    calc.daily_market_data = ohlcv.assign(shares_outstanding=ohlcv['market_cap'] / ohlcv['close'])
+    return calc
+
+
+def test_incremental_matches_full_recompute(tmp_path):
+    """Test 1: Appending incremental rows reproduces the full timeseries"""
+    print("\n" + "=" * 70)
+    print("TEST 1: Incremental vs Full Recompute")
+    print("=" * 70)
+
+    calc = _make_calculator(tmp_path)
+    full = calc.calculate_multiple_symbols_pe_timeseries(SYMBOLS, datetime(2018, 1, 1), datetime(2024, 6, 30))
+
+    output_path = tmp_path / 'historical_pe.parquet'
+    full[full['date'] <= '2024-03-31'].to_parquet(output_path)
+
+    store = ValuationStateStore(calc, 'historical_pe.parquet')
+    state = store.build(SYMBOLS, universe=SYMBOLS)
+    store.save(state)
+
+    bars = load_new_bars(calc.ohlcv_path, datetime(2024, 4, 1), datetime(2024, 6, 30))
+    new_rows = store.compute_incremental(store.load(), bars)
+    total = append_parquet_rows(output_path, new_rows)
+
+    result = pd.read_parquet(output_path).sort_values(['symbol', 'date']).reset_index(drop=True)
+    expected = full.sort_values(['symbol', 'date']).reset_index(drop=True)
+
+    print(f"  Rows after append: {total:,} (expected {len(expected):,})")
+    assert total == len(expected)
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+
+
+def test_stale_symbols_and_replacement(tmp_path):
+    """Test 2: New quarterly reports / new listings mark symbols stale; their rows are replaced"""
+    print("\n" + "=" * 70)
+    print("TEST 2: Stale Symbol Detection")
+    print("=" * 70)
+
+    calc = _make_calculator(tmp_path)
+    store = ValuationStateStore(calc, 'historical_pe.parquet')
+    state = store.build(SYMBOLS, universe=SYMBOLS)
+
+    latest_reports = pd.Series(
+        pd.to_datetime(['2024-03-31', '2023-12-31', '2024-03-31']),
+        index=['AAA', 'BBB', 'NEW']
+    )
+    stale = store.find_stale_symbols(state, latest_reports)
+    print(f"  Stale symbols: {sorted(stale)}")
+    assert stale == {'AAA', 'NEW'}
+
+    full = calc.calculate_multiple_symbols_pe_timeseries(SYMBOLS, datetime(2018, 1, 1), datetime(2024, 6, 30))
+    output_path = tmp_path / 'historical_pe.parquet'
+    full.to_parquet(output_path, index=False)
+
+    total = append_parquet_rows(output_path, full.iloc[:0], drop_symbols={'AAA'})
+    remaining = pd.read_parquet(output_path)
+    assert set(remaining['symbol']) == {'BBB'}
+    assert total == len(remaining)
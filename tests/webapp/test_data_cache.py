@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the process-wide SharedDataCache
+===============================================
+
+Tests for:
+- Hits share one loaded table; a rewritten file (new mtime) is reloaded
+- LRU eviction under the memory budget
+- Data version manifest: content hashes, rewritten-but-identical files
+- Concurrent writers don't lose each other's version bumps
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from WEBAPP.core.data_cache import SharedDataCache
+
+
+def _write(path: Path, n: int, value: float = 1.0, mtime: int = None):
+    pd.DataFrame({'symbol': ['AAA'] * n, 'close': np.full(n, value)}).to_parquet(path, index=False)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_hits_and_mtime_reload(tmp_path):
+    """Test 1: Repeated reads hit; a rewrite of the file is picked up"""
+    path = tmp_path / 'prices.parquet'
+    _write(path, 100, value=1.0, mtime=1_000_000_000)
+    cache = SharedDataCache(max_bytes=100 * 1024 * 1024)
+
+    first = cache.read_parquet(path)
+    second = cache.read_parquet(path)
+    second['extra'] = 1  # new column on the caller's copy only
+    assert 'extra' not in cache.read_parquet(path).columns
+    assert cache.get_table(path) is cache.get_table(path)
+
+    _write(path, 100, value=2.0, mtime=2_000_000_000)
+    reloaded = cache.read_parquet(path)
+
+    stats = cache.stats()
+    print(f"  Stats: {stats}")
+    assert first['close'].iloc[0] == 1.0
+    assert reloaded['close'].iloc[0] == 2.0
+    assert stats['misses'] == 2 and stats['reloads'] == 1 and stats['hits'] >= 3
+
+
+def test_lru_eviction(tmp_path):
+    """Test 2: Least recently used files are evicted under the budget"""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'file_{i}.parquet'
+        _write(path, 10_000)
+        paths.append(path)
+
+    single = SharedDataCache(max_bytes=10**9)
+    single.read_parquet(paths[0])
+    budget = int(single.stats()['bytes'] * 2.5)
+
+    cache = SharedDataCache(max_bytes=budget)
+    cache.read_parquet(paths[0])
+    cache.read_parquet(paths[1])
+    cache.read_parquet(paths[0])  # paths[1] is now least recently used
+    cache.read_parquet(paths[2])
+
+    stats = cache.stats()
+    print(f"  Stats: {stats}")
+    assert stats['evictions'] == 1
+    assert stats['bytes'] <= budget
+    cache.read_parquet(paths[0])
+    assert cache.stats()['hits'] == 2
+
+
+def test_manifest_driven_invalidation(tmp_path):
+    """Test 3: Tracked datasets reload only when the manifest hash changes"""
+    from config.data_mapping.data_versions import DataVersionWatcher, record_data_versions
+
+    data_root = tmp_path / 'DATA'
+    (data_root / 'processed').mkdir(parents=True)
+    changed_path = data_root / 'processed' / 'changed.parquet'
+    static_path = data_root / 'processed' / 'static.parquet'
+    _write(changed_path, 50, value=1.0)
+    _write(static_path, 50, value=1.0)
+
+    first = record_data_versions(data_root=data_root)
+    assert set(first) == {'processed/changed.parquet', 'processed/static.parquet'}
+    assert first['processed/changed.parquet']['rows'] == 50
+
+    cache = SharedDataCache(max_bytes=10**9, watcher=DataVersionWatcher(data_root))
+    cache.read_parquet(changed_path)
+    cache.read_parquet(static_path)
+
+    # Same content rewritten: no version change, cache stays valid
+    _write(static_path, 50, value=1.0, mtime=3_000_000_000)
+    _write(changed_path, 50, value=2.0)
+    second = record_data_versions(data_root=data_root)
+    print(f"  Changed datasets: {sorted(second)}")
+    assert set(second) == {'processed/changed.parquet'}
+
+    assert cache.read_parquet(changed_path)['close'].iloc[0] == 2.0
+    cache.read_parquet(static_path)
+    stats = cache.stats()
+    assert stats['reloads'] == 1 and stats['hits'] == 1
+
+
+def test_mid_file_change_bumps_version(tmp_path):
+    """Test 4: Same size and footer, one value changed inside a row group"""
+    from config.data_mapping.data_versions import load_manifest, record_data_versions, record_written_files
+
+    data_root = tmp_path / 'DATA'
+    (data_root / 'raw' / 'ohlcv').mkdir(parents=True)
+    path = data_root / 'raw' / 'ohlcv' / 'prices.parquet'
+    # No statistics: a changed value leaves footer and size untouched
+    values = np.arange(100_000, dtype=float)
+    pd.DataFrame({'close': values}).to_parquet(path, index=False, write_statistics=False)
+    record_data_versions(data_root=data_root)
+    before = load_manifest(data_root)
+
+    values[50_000] += 0.5
+    pd.DataFrame({'close': values}).to_parquet(path, index=False, write_statistics=False)
+    changed = record_written_files([path, tmp_path / 'outside.parquet'], data_root=data_root)
+    after = load_manifest(data_root)
+
+    entry = after['datasets']['raw/ohlcv/prices.parquet']
+    assert entry['size'] == before['datasets']['raw/ohlcv/prices.parquet']['size']
+    assert set(changed) == {'raw/ohlcv/prices.parquet'}
+    assert entry['hash'] != before['datasets']['raw/ohlcv/prices.parquet']['hash']
+    assert after['version'] == before['version'] + 1
+    assert record_written_files([tmp_path / 'outside.parquet'], data_root=data_root) == {}
+
+
+def test_concurrent_writers_keep_all_bumps(tmp_path):
+    """Test 5: Writers recording different outputs at once all land in the manifest"""
+    from concurrent.futures import ThreadPoolExecutor
+    from config.data_mapping.data_versions import load_manifest, record_written_files
+
+    data_root = tmp_path / 'DATA'
+    (data_root / 'processed').mkdir(parents=True)
+    paths = []
+    for i in range(24):
+        path = data_root / 'processed' / f'out_{i}.parquet'
+        pd.DataFrame({'v': [float(i)]}).to_parquet(path, index=False)
+        paths.append(path)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda p: record_written_files([p], data_root=data_root), paths))
+
+    manifest = load_manifest(data_root)
+    assert len(manifest['datasets']) == len(paths)
+    assert manifest['version'] == len(paths)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the shared DuckDB DataCatalog
+============================================
+
+Filtered catalog queries must return the same rows as loading the parquet
+file into pandas and filtering there.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from WEBAPP.core.data_catalog import get_catalog
+
+
+@pytest.fixture
+def ohlcv_view(tmp_path):
+    dates = pd.bdate_range('2023-01-01', '2024-12-31')
+    df = pd.concat([
+        pd.DataFrame({
+            'symbol': symbol,
+            'date': dates,
+            'close': np.arange(len(dates), dtype=float) + i,
+            'volume': np.arange(len(dates)) * (i + 1),
+        })
+        for i, symbol in enumerate(['AAA', 'BBB', "C'C"])
+    ], ignore_index=True)
+    path = tmp_path / "test_ohlcv.parquet"
+    df.sample(frac=1, random_state=0).to_parquet(path, index=False)
+
+    catalog = get_catalog()
+    catalog.register_parquet('test_ohlcv', path)
+    return catalog, df
+
+
+def test_query_matches_pandas(ohlcv_view):
+    """Test 1: symbol/date/column filters and latest-N match pandas"""
+    catalog, df = ohlcv_view
+
+    result = catalog.query('test_ohlcv', columns=['symbol', 'date', 'close'],
+                           symbols=['BBB', "C'C"], start_date='2024-03-01', end_date='2024-06-30')
+    expected = df[df['symbol'].isin(['BBB', "C'C"]) & (df['date'] >= '2024-03-01') & (df['date'] <= '2024-06-30')]
+    expected = expected.sort_values(['symbol', 'date']).reset_index(drop=True)[['symbol', 'date', 'close']]
+    print(f"  Filtered rows: {len(result):,}")
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    latest = catalog.query('test_ohlcv', symbols=['AAA'], latest=5)
+    expected = df[df['symbol'] == 'AAA'].tail(5).reset_index(drop=True)
+    pd.testing.assert_frame_equal(latest, expected, check_dtype=False)
+
+
+def test_query_validates_identifiers(ohlcv_view):
+    """Test 2: unknown columns raise; unknown views return empty"""
+    catalog, _ = ohlcv_view
+
+    with pytest.raises(KeyError):
+        catalog.query('test_ohlcv', columns=['close"; DROP VIEW test_ohlcv; --'])
+    assert catalog.query('no_such_dataset').empty
+    assert catalog.query('test_ohlcv', symbols=[]).empty